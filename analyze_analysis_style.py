@@ -2,31 +2,31 @@
 """
 Analysis Paper Style Extraction
 Analyzes Analysis papers to extract systematic style patterns for integration into philosophy pipeline
+
+By default every paper in analysis_cache/extracted_texts is analyzed
+independently (a bounded pool of concurrent calls, results cached per
+paper) and the analyses are merged hierarchically into one corpus-wide
+style guide. --sample runs the original three-PDF analysis.
 """
 
+import argparse
+from datetime import datetime
 from pathlib import Path
 import json
 from typing import List, Dict, Any
 import random
 
 from src.utils.api import APIHandler
+from src.utils.map_reduce import map_bounded, tree_reduce
+from src.utils.moves_corpus import content_hash
+from src.utils.prompt_budget import trim_to_tokens
+from src.utils.run_metrics import tool_usage_log
 
+STYLE_MODEL = "claude-3-5-sonnet-20241022"
+MAX_PAPER_TOKENS = 60000  # Analysis papers are short; this only guards against odd extractions
 
-def analyze_analysis_style():
-    """Analyze Analysis papers to extract style patterns"""
-    
-    # Select papers for analysis (mix of short and medium length)
-    papers_dir = Path("./Analysis_papers")
-    short_papers = ["anae044 (1).pdf", "anae045 (1).pdf", "anad086.pdf"]
-    medium_papers = ["anae047 (1).pdf", "anae043 (1).pdf", "anad104 (1).pdf"]
-    
-    # Select 2 short + 1 medium for comprehensive analysis (limit for context)
-    selected_papers = short_papers[:2] + medium_papers[:1]
-    
-    print(f"Analyzing style patterns from: {selected_papers}")
-    
-    # Style analysis prompt template for each paper
-    analysis_prompt_template = """You are analyzing a paper from the journal Analysis to extract systematic style patterns for automated philosophy paper generation. 
+# Style analysis prompt template for each paper
+PAPER_ANALYSIS_PROMPT = """You are analyzing a paper from the journal Analysis to extract systematic style patterns for automated philosophy paper generation. 
 
 This is paper {paper_index} of {total_papers} you'll analyze. Please analyze this specific paper and provide detailed observations on:
 
@@ -69,6 +69,76 @@ Provide specific examples and concrete guidelines from THIS PAPER that could be
 
 Paper title: {paper_name}"""
 
+# Final synthesis of per-paper analyses into the style guide
+STYLE_GUIDE_PROMPT = """You have analyzed {paper_count} papers from the journal Analysis. Now please synthesize these individual analyses into a comprehensive style guide for automated philosophy paper generation.
+
+Based on the {paper_count} paper analyses provided, create:
+
+## ANALYSIS JOURNAL STYLE GUIDE
+
+### 1. OPENING PATTERNS
+Synthesize the common patterns for how Analysis papers open and frame problems.
+
+### 2. ARGUMENT STRUCTURE  
+Identify the typical argument development patterns across the papers.
+
+### 3. LITERATURE ENGAGEMENT
+Describe the characteristic way Analysis papers engage with existing work.
+
+### 4. VOICE CHARACTERISTICS
+Define the distinctive voice and tone of Analysis papers.
+
+### 5. FLOW AND TRANSITIONS
+Characterize how Analysis papers manage transitions and flow.
+
+### 6. OBJECTION HANDLING
+Describe typical patterns for addressing objections.
+
+### 7. CONCLUSION STYLES
+Identify characteristic conclusion patterns.
+
+### 8. KEY DIFFERENTIATORS
+What makes Analysis papers distinctive vs. other philosophy journals?
+
+### 9. ACTIONABLE GUIDELINES
+Provide specific, concrete guidelines that could be programmed into an AI system to generate Analysis-style papers.
+
+Provide both descriptive analysis and prescriptive guidelines. Focus on patterns that appeared across multiple papers.
+
+INDIVIDUAL PAPER ANALYSES:
+"""
+
+# Intermediate merge of analyses (or already-merged profiles) in map-reduce mode
+PARTIAL_SYNTHESIS_PROMPT = """Below are {group_size} style analyses of papers from the journal Analysis. Some are already merged profiles covering several papers; together they cover {paper_count} papers.
+
+Merge them into ONE style profile organized under the same seven headings:
+1. Opening and problem framing
+2. Argument development patterns
+3. Literature integration
+4. Voice and tone
+5. Transitions and flow
+6. Objections and responses
+7. Conclusions
+
+For each pattern, state roughly how many of the {paper_count} papers show it, keep the most concrete examples and short quotes, and note where papers diverge. Keep patterns that recur in several papers even if they are not the majority.
+
+ANALYSES TO MERGE:
+"""
+
+
+def analyze_analysis_style():
+    """Analyze Analysis papers to extract style patterns"""
+    
+    # Select papers for analysis (mix of short and medium length)
+    papers_dir = Path("./Analysis_papers")
+    short_papers = ["anae044 (1).pdf", "anae045 (1).pdf", "anad086.pdf"]
+    medium_papers = ["anae047 (1).pdf", "anae043 (1).pdf", "anad104 (1).pdf"]
+    
+    # Select 2 short + 1 medium for comprehensive analysis (limit for context)
+    selected_papers = short_papers[:2] + medium_papers[:1]
+    
+    print(f"Analyzing style patterns from: {selected_papers}")
+    
     # Initialize API handler
     api_handler = APIHandler()
     
@@ -81,7 +151,7 @@ Paper title: {paper_name}"""
         print(f"\nAnalyzing paper {i+1}/{len(selected_papers)}: {paper_name}")
         
         # Create specific prompt for this paper
-        prompt = analysis_prompt_template.format(
+        prompt = PAPER_ANALYSIS_PROMPT.format(
             paper_index=i+1,
             total_papers=len(selected_papers),
             paper_name=paper_name
@@ -111,43 +181,7 @@ Paper title: {paper_name}"""
             continue
     
     # Create synthesis prompt to combine individual analyses
-    synthesis_prompt = f"""You have analyzed {len(paper_analyses)} papers from the journal Analysis. Now please synthesize these individual analyses into a comprehensive style guide for automated philosophy paper generation.
-
-Based on the {len(paper_analyses)} paper analyses provided, create:
-
-## ANALYSIS JOURNAL STYLE GUIDE
-
-### 1. OPENING PATTERNS
-Synthesize the common patterns for how Analysis papers open and frame problems.
-
-### 2. ARGUMENT STRUCTURE  
-Identify the typical argument development patterns across the papers.
-
-### 3. LITERATURE ENGAGEMENT
-Describe the characteristic way Analysis papers engage with existing work.
-
-### 4. VOICE CHARACTERISTICS
-Define the distinctive voice and tone of Analysis papers.
-
-### 5. FLOW AND TRANSITIONS
-Characterize how Analysis papers manage transitions and flow.
-
-### 6. OBJECTION HANDLING
-Describe typical patterns for addressing objections.
-
-### 7. CONCLUSION STYLES
-Identify characteristic conclusion patterns.
-
-### 8. KEY DIFFERENTIATORS
-What makes Analysis papers distinctive vs. other philosophy journals?
-
-### 9. ACTIONABLE GUIDELINES
-Provide specific, concrete guidelines that could be programmed into an AI system to generate Analysis-style papers.
-
-Provide both descriptive analysis and prescriptive guidelines. Focus on patterns that appeared across multiple papers.
-
-INDIVIDUAL PAPER ANALYSES:
-"""
+    synthesis_prompt = STYLE_GUIDE_PROMPT.format(paper_count=len(paper_analyses))
     
     # Add individual analyses to synthesis prompt
     for analysis in paper_analyses:
@@ -199,5 +233,129 @@ INDIVIDUAL PAPER ANALYSES:
         raise
 
 
+def _analyze_paper_text(api_handler: APIHandler, text_path: Path, index: int, total: int,
+                        cache_dir: Path) -> Dict[str, Any]:
+    """Map step: analyze one paper from its extracted text, reusing a cached result"""
+    text = text_path.read_text(encoding="utf-8")
+    prompt = PAPER_ANALYSIS_PROMPT.format(paper_index=index, total_papers=total, paper_name=text_path.stem)
+    cache_key = {"text_hash": content_hash(text), "prompt_hash": content_hash(PAPER_ANALYSIS_PROMPT)}
+    cache_file = cache_dir / f"{text_path.stem}.json"
+    if cache_file.exists():
+        with open(cache_file) as f:
+            cached = json.load(f)
+        if all(cached.get(key) == value for key, value in cache_key.items()):
+            return cached
+
+    prompt += f"\n\n<paper_text>\n{trim_to_tokens(text, MAX_PAPER_TOKENS)}\n</paper_text>"
+    analysis = api_handler._call_anthropic(
+        prompt=prompt,
+        config={"model": STYLE_MODEL, "max_tokens": 8192, "temperature": 0.3},
+    )
+    result = {**cache_key, "paper_name": text_path.stem, "analysis": analysis}
+    tmp_file = cache_file.with_name(cache_file.name + ".tmp")
+    with open(tmp_file, "w") as f:
+        json.dump(result, f, indent=2)
+    tmp_file.replace(cache_file)
+    print(f"✅ Analyzed {text_path.stem}")
+    return result
+
+
+def analyze_corpus_style(texts_dir: Path = Path("analysis_cache/extracted_texts"), workers: int = 6,
+                         fan_in: int = 8, limit: int = None) -> Dict[str, Any]:
+    """Map-reduce style analysis over the whole extracted Analysis corpus"""
+    text_files = sorted(texts_dir.glob("*.txt"))[:limit]
+    if not text_files:
+        raise FileNotFoundError(f"No extracted texts in {texts_dir}; run extract_analysis_cache.py first")
+
+    output_dir = Path("./outputs")
+    cache_dir = output_dir / "analysis_style" / "papers"
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    api_handler = APIHandler()
+    total = len(text_files)
+
+    # Map: one independent analysis per paper
+    print(f"Analyzing {total} papers ({workers} at a time)...")
+    results, failures = map_bounded(
+        lambda item: _analyze_paper_text(api_handler, item[1], item[0], total, cache_dir),
+        list(enumerate(text_files, 1)),
+        workers=workers,
+    )
+    for (_, path), error in failures:
+        print(f"❌ Error analyzing {path.name}: {error}")
+    paper_analyses = [{"paper_name": r["paper_name"], "analysis": r["analysis"]} for _, r in results]
+    if not paper_analyses:
+        raise RuntimeError("No papers were analyzed")
+
+    # Reduce: merge groups of analyses level by level; the merge that covers
+    # every paper produces the style guide itself
+    profiles = [{"papers": [a["paper_name"]], "analysis": a["analysis"]} for a in paper_analyses]
+    paper_count = len(profiles)
+
+    def combine(group: List[Dict[str, Any]], level: int) -> Dict[str, Any]:
+        papers = [paper for profile in group for paper in profile["papers"]]
+        final = len(papers) == paper_count
+        if final:
+            prompt = STYLE_GUIDE_PROMPT.format(paper_count=paper_count)
+        else:
+            prompt = PARTIAL_SYNTHESIS_PROMPT.format(group_size=len(group), paper_count=len(papers))
+        for profile in group:
+            label = profile["papers"][0] if len(profile["papers"]) == 1 else f"Merged profile of {len(profile['papers'])} papers"
+            prompt += f"\n\n--- {label} ---\n{profile['analysis']}\n"
+        merged = api_handler._call_anthropic(
+            prompt=prompt,
+            config={"model": STYLE_MODEL, "max_tokens": 8192, "temperature": 0.4},
+        )
+        return {"papers": papers, "analysis": merged, "final": final}
+
+    levels = []
+
+    def report_level(level: int, groups: int) -> None:
+        levels.append(groups)
+        print(f"\nReduce level {level}: {groups} merge(s)...")
+
+    top = tree_reduce(profiles, combine, fan_in=fan_in, workers=workers, on_level=report_level)
+    if not top.get("final"):
+        top = combine([top], len(levels) + 1)  # A single paper still gets the style guide format
+
+    analysis_output = {
+        "analyzed_papers": [a["paper_name"] for a in paper_analyses],
+        "failed_papers": [path.name for (_, path), _ in failures],
+        "individual_analyses": paper_analyses,
+        "reduction_levels": levels,
+        "synthesized_style_guide": top["analysis"],
+        "extraction_date": datetime.now().isoformat(),
+        "purpose": "Analysis style integration for philosophy paper pipeline"
+    }
+    with open(output_dir / "analysis_style_guide.json", "w") as f:
+        json.dump(analysis_output, f, indent=2)
+    with open(output_dir / "analysis_style_guide.md", "w") as f:
+        f.write("# Analysis Journal Style Guide\n\n")
+        f.write(f"*Synthesized from {paper_count} Analysis papers*\n\n")
+        f.write(top["analysis"])
+
+    print(f"\n✅ Corpus style analysis completed ({paper_count} papers, {len(failures)} failed)")
+    print("📄 Outputs saved to:")
+    print("   - outputs/analysis_style_guide.json")
+    print("   - outputs/analysis_style_guide.md")
+    return analysis_output
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Extract Analysis journal style patterns")
+    parser.add_argument("--sample", action="store_true",
+                        help="Analyze the original three hand-picked PDFs instead of the whole corpus")
+    parser.add_argument("--texts-dir", default="analysis_cache/extracted_texts")
+    parser.add_argument("--workers", type=int, default=6, help="Concurrent API calls")
+    parser.add_argument("--fan-in", type=int, default=8, help="Analyses merged per reduce call")
+    parser.add_argument("--limit", type=int, default=None, help="Analyze at most this many papers")
+    args = parser.parse_args()
+
+    if args.sample:
+        analyze_analysis_style()
+    else:
+        analyze_corpus_style(Path(args.texts_dir), workers=args.workers, fan_in=args.fan_in, limit=args.limit)
+
+
 if __name__ == "__main__":
-    analyze_analysis_style() 
\ No newline at end of file
+    with tool_usage_log("analyze_analysis_style"):
+        main()
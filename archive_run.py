@@ -1,18 +1,33 @@
 #!/usr/bin/env python3
 """
 Archive pipeline outputs after each run for quality tracking
+
+File contents are stored once in outputs/archive/blobs (keyed on SHA-256)
+and each run directory holds hardlinks to them, so identical files across
+runs take no extra space. With --compress, blobs that no run directory
+links to any more (e.g. after a run directory was deleted) are
+zstd-compressed; restoring a run unpacks them. outputs/archive/catalog.sqlite
+indexes runs and their metrics for listing, filtering and comparison.
 """
 
 import os
 import json
-import shutil
 from datetime import datetime
+from pathlib import Path
 import argparse
 
+from src.utils.run_archive import BlobStore, RunCatalog, numeric_metrics
+from src.utils.run_metrics import extract_run_metrics, paper_text_metrics
+
 class PipelineArchiver:
-    def __init__(self, archive_root="outputs/archive"):
+    def __init__(self, archive_root="outputs/archive", compress=False):
         self.archive_root = archive_root
         os.makedirs(self.archive_root, exist_ok=True)
+        self.blobs = BlobStore(Path(archive_root) / "blobs", compress=compress)
+        new_catalog = not os.path.exists(os.path.join(archive_root, "catalog.sqlite"))
+        self.catalog = RunCatalog(Path(archive_root) / "catalog.sqlite")
+        if new_catalog:
+            self._import_existing_archives()
         
     def archive_run(self, run_name=None, notes=""):
         """Archive key outputs from a pipeline run"""
@@ -44,23 +59,33 @@ class PipelineArchiver:
             "outputs/phase_3_1_draft.md": "phase_3_1_draft.md",
             "outputs/phase_3_1_progress.json": "phase_3_1_progress.json",
             
+            # Token and latency log
+            "outputs/api_usage.jsonl": "api_usage.jsonl",
+            
             # Config used
             "config/conceptual_config.yaml": "config_used.yaml"
         }
         
-        # Copy files and track what was archived
+        # Store each file once by content and link it into the run directory
         archived_files = []
         missing_files = []
+        file_records = []
+        new_bytes = 0
+        copied_bytes = 0
         
         for source, dest in files_to_archive.items():
             if os.path.exists(source):
-                dest_path = os.path.join(archive_path, dest)
-                # Create subdirectories if needed
-                os.makedirs(os.path.dirname(dest_path), exist_ok=True)
-                shutil.copy2(source, dest_path)
+                digest, stored_size, is_new = self.blobs.put(Path(source))
+                # Run directories link to plain blobs, so they stay readable as plain files
+                method = self.blobs.materialize(digest, Path(archive_path) / dest)
+                size = os.path.getsize(source)
+                file_records.append({"name": dest, "source": source, "digest": digest, "size": size})
+                new_bytes += stored_size if is_new else 0
+                copied_bytes += size if method == "copy" else 0
                 archived_files.append(source)
             else:
                 missing_files.append(source)
+        packed, saved_bytes = self.blobs.compress_unlinked()
                 
         # Auto-analyze paper if it exists
         paper_stats = None
@@ -75,8 +100,12 @@ class PipelineArchiver:
             "files_archived": archived_files,
             "files_missing": missing_files,
             "paper_stats": paper_stats,
-            "archive_path": archive_path
+            "archive_path": archive_path,
         }
+        # Full metric vector of the run (critic assessments, cycles, tokens, latency)
+        run_metrics = numeric_metrics(paper_stats)
+        run_metrics.update(extract_run_metrics(Path("outputs"))["metrics"])
+        self.catalog.record_run(metadata, file_records, run_metrics)
         
         # Save metadata
         metadata_path = os.path.join(archive_path, "archive_metadata.json")
@@ -89,6 +118,11 @@ class PipelineArchiver:
         print(f"Archived to: {archive_path}")
         print(f"Files archived: {len(archived_files)}")
         print(f"Files missing: {len(missing_files)}")
+        print(f"Space added: {(new_bytes + copied_bytes) / 1024:.1f} KB "
+              f"({new_bytes / 1024:.1f} KB of new content in the blob store, "
+              f"{copied_bytes / 1024:.1f} KB copied where hardlinks were unavailable)")
+        if packed:
+            print(f"Compressed {packed} blobs no run links to, saving {saved_bytes / 1024:.1f} KB")
         
         if paper_stats:
             print(f"\nPaper Statistics:")
@@ -108,40 +142,44 @@ class PipelineArchiver:
         try:
             with open(paper_path, 'r') as f:
                 content = f.read()
-                
-            # Count various elements (rough but useful)
-            stats = {
-                'word_count': len(content.split()),
-                'citation_count': content.count('(19') + content.count('(20'),
-                'quote_count': content.count('"') // 2,
-                'section_count': content.count('\n##'),
-                'subsection_count': content.count('\n###'),
-                'has_abstract': 'Abstract' in content or 'abstract' in content,
-                'has_objections': 'Objection' in content or 'objection' in content,
-                'references_count': content.count('\n- ') if 'References' in content else 0
-            }
-            return stats
+            return paper_text_metrics(content)
         except Exception as e:
             print(f"Error analyzing paper: {e}")
             return None
             
-    def list_archives(self):
-        """List all archived runs"""
-        archives = []
-        for run_dir in os.listdir(self.archive_root):
+    def _import_existing_archives(self):
+        """Catalog run directories archived before the catalog existed"""
+        for run_dir in sorted(os.listdir(self.archive_root)):
             metadata_path = os.path.join(self.archive_root, run_dir, "archive_metadata.json")
-            if os.path.exists(metadata_path):
-                with open(metadata_path, 'r') as f:
-                    metadata = json.load(f)
-                archives.append({
-                    'run_name': run_dir,
-                    'timestamp': metadata.get('timestamp'),
-                    'notes': metadata.get('notes'),
-                    'word_count': metadata.get('paper_stats', {}).get('word_count') if metadata.get('paper_stats') else None
-                })
-                
-        # Sort by timestamp
-        archives.sort(key=lambda x: x['timestamp'], reverse=True)
+            if not os.path.exists(metadata_path):
+                continue
+            with open(metadata_path, 'r') as f:
+                metadata = json.load(f)
+            metadata["run_name"] = run_dir
+            file_records = []
+            for path in sorted(Path(self.archive_root, run_dir).iterdir()):
+                if path.is_file() and path.name != "archive_metadata.json":
+                    # Move the content into the blob store and link it back, deduplicating old runs
+                    size = path.stat().st_size
+                    digest, _, _ = self.blobs.put(path)
+                    self.blobs.materialize(digest, path)
+                    file_records.append({"name": path.name, "digest": digest, "size": size})
+            self.catalog.record_run(metadata, file_records, numeric_metrics(metadata.get("paper_stats")))
+            
+    def list_archives(self, filters=None, notes_like=None):
+        """List archived runs, newest first
+
+        ``filters`` maps a metric to (operator, value), e.g.
+        {"word_count": (">=", 3000)}.
+        """
+        archives = []
+        for run in self.catalog.list_runs(filters=filters, notes_like=notes_like):
+            archives.append({
+                'run_name': run['run_name'],
+                'timestamp': run['timestamp'],
+                'notes': run['notes'],
+                'word_count': int(run['metrics']['word_count']) if 'word_count' in run['metrics'] else None
+            })
         
         print("\n=== Archived Runs ===")
         for arch in archives:
@@ -149,7 +187,37 @@ class PipelineArchiver:
             notes = f" - {arch['notes']}" if arch['notes'] else ""
             print(f"{arch['run_name']} - {arch['timestamp']} {wc}{notes}")
             
+        storage = self.catalog.storage_summary()
+        if storage["logical_bytes"]:
+            print(f"\n{storage['logical_bytes'] / 1024:.0f} KB archived, "
+                  f"{storage['distinct_bytes'] / 1024:.0f} KB of distinct content")
+            
         return archives
+        
+    def compare_runs(self, run_a, run_b):
+        """Print and return the metric differences between two runs"""
+        comparison = self.catalog.compare(run_a, run_b)
+        print(f"\n=== {run_a} → {run_b} ===")
+        for metric, values in comparison.items():
+            change = f"{values['change']:+g}" if values['change'] is not None else "n/a"
+            print(f"  {metric}: {values['a']} → {values['b']} ({change})")
+        return comparison
+        
+    def restore_run(self, run_name):
+        """Recreate a run directory from the blob store"""
+        archive_path = os.path.join(self.archive_root, run_name)
+        for record in self.catalog.files(run_name):
+            self.blobs.materialize(record["digest"], Path(archive_path) / record["name"])
+        return archive_path
+
+
+def _parse_filter(expression):
+    """'word_count>=3000' -> ('word_count', ('>=', 3000.0))"""
+    for op in ("<=", ">=", "!=", "<", ">", "="):
+        if op in expression:
+            metric, value = expression.split(op, 1)
+            return metric.strip(), (op, float(value))
+    raise argparse.ArgumentTypeError(f"Expected METRIC<op>VALUE, got {expression!r}")
 
 
 def main():
@@ -157,13 +225,24 @@ def main():
     parser.add_argument("--name", help="Name for this run (e.g., 'enhanced_pdf_test')")
     parser.add_argument("--notes", help="Notes about this run", default="")
     parser.add_argument("--list", action="store_true", help="List all archived runs")
+    parser.add_argument("--where", action="append", type=_parse_filter, default=[],
+                        help="With --list, filter on a metric (e.g. 'word_count>=3000'); repeatable")
+    parser.add_argument("--notes-like", help="With --list, only runs whose notes contain this text")
+    parser.add_argument("--compare", nargs=2, metavar=("RUN_A", "RUN_B"), help="Compare two runs' metrics")
+    parser.add_argument("--restore", metavar="RUN", help="Recreate a run directory from the blob store")
+    parser.add_argument("--compress", action="store_true",
+                        help="Compress blobs no run directory links to any more (needs zstandard)")
     
     args = parser.parse_args()
     
-    archiver = PipelineArchiver()
+    archiver = PipelineArchiver(compress=args.compress)
     
     if args.list:
-        archiver.list_archives()
+        archiver.list_archives(filters=dict(args.where), notes_like=args.notes_like)
+    elif args.compare:
+        archiver.compare_runs(*args.compare)
+    elif args.restore:
+        print(f"Restored to {archiver.restore_run(args.restore)}")
     else:
         archiver.archive_run(run_name=args.name, notes=args.notes)
 
@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Analysis Style Digest Builder
+Distills the extracted Analysis papers into a compact, categorized snippet
+store used by prompts in place of full PDF exemplars.
+
+Run extract_analysis_cache.py first so analysis_cache/extracted_texts exists.
+No API calls are made.
+"""
+
+import argparse
+import json
+from pathlib import Path
+
+from src.utils.style_digests import CATEGORY_LABELS, DEFAULT_DIGEST_PATH, build_digest_store
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build Analysis style digests")
+    parser.add_argument("--texts-dir", default="analysis_cache/extracted_texts",
+                        help="Directory of extracted Analysis paper texts")
+    parser.add_argument("--output", default=str(DEFAULT_DIGEST_PATH),
+                        help="Where to write the digest store")
+    parser.add_argument("--max-words", type=int, default=90,
+                        help="Maximum words per snippet")
+    parser.add_argument("--per-category", type=int, default=2,
+                        help="Maximum snippets per category from each paper")
+    args = parser.parse_args()
+
+    texts_dir = Path(args.texts_dir)
+    text_files = sorted(texts_dir.glob("*.txt")) if texts_dir.exists() else []
+    if not text_files:
+        print(f"❌ No extracted texts found in {texts_dir}")
+        print("   Run extract_analysis_cache.py first")
+        return
+
+    print(f"Distilling {len(text_files)} Analysis papers...")
+    texts = {path.stem: path.read_text(encoding="utf-8") for path in text_files}
+    store = build_digest_store(texts, max_words=args.max_words, per_category=args.per_category)
+
+    output_path = Path(args.output)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(output_path, "w", encoding="utf-8") as f:
+        json.dump(store, f, indent=2, ensure_ascii=False)
+
+    print(f"\n🎉 Style digests written to {output_path}")
+    for category, label in CATEGORY_LABELS.items():
+        print(f"   {label}: {len(store['categories'][category])} snippets")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,26 @@
 #!/usr/bin/env python3
 """
 Compare extracted philosophical moves with source text for quality validation
+
+By default every quote in the moves extractions (and in the Phase II.1
+literature readings, when present) is checked against the extracted paper
+texts in one pass, and a grounding report is written to
+outputs/quote_grounding/. Use --interactive for the old one-paper review.
 """
 
+import argparse
 import json
 from pathlib import Path
+from typing import Any, Dict, List
+
+from src.utils.quote_grounding import (
+    ANALYSIS_TEXTS_DIR,
+    DEFAULT_MATCH_THRESHOLD,
+    LITERATURE_TEXTS_DIR,
+    QuoteCorpus,
+    summarize_grounding,
+    verify_quotes,
+)
 
 
 def load_paper_text(filename):
@@ -17,27 +33,107 @@ def load_paper_text(filename):
 
 
 def find_quote_in_text(quote, text):
-    """Find where a quote appears in the source text"""
-    # Clean up quote and text for comparison
-    clean_quote = " ".join(quote.split())
-    
-    # Try to find exact match first
-    if clean_quote in text:
-        start = text.index(clean_quote)
-        # Get surrounding context (200 chars before and after)
-        context_start = max(0, start - 200)
-        context_end = min(len(text), start + len(clean_quote) + 200)
-        return text[context_start:context_end]
-    
-    # Try to find partial match (first 50 chars)
-    partial = clean_quote[:50]
-    if partial in text:
-        start = text.index(partial)
-        context_start = max(0, start - 200)
-        context_end = min(len(text), start + 500)
-        return text[context_start:context_end]
-    
-    return None
+    """Find where a quote appears in the source text (tolerant of small differences)"""
+    corpus = QuoteCorpus()
+    corpus.add_document("source", text)
+    match = corpus.locate(quote)
+    if match.status == "not_found":
+        return None
+    # Get surrounding context (200 chars before and after)
+    context_start = max(0, match.start - 200)
+    context_end = min(len(text), match.end + 200)
+    return text[context_start:context_end]
+
+
+def collect_move_claims(extractions_path: Path) -> List[Dict[str, Any]]:
+    """One claim per extracted move quote, tied to its source text file"""
+    with open(extractions_path, "r", encoding="utf-8") as f:
+        extractions = json.load(f)
+    claims = []
+    for extraction in extractions:
+        if not extraction:
+            continue
+        for move in extraction.get("philosophical_moves", []):
+            if move.get("quote"):
+                claims.append({
+                    "kind": "move",
+                    "document": extraction.get("source_file"),
+                    "move_name": move.get("move_name", ""),
+                    "quote": move["quote"],
+                })
+    return claims
+
+
+def collect_reading_claims(readings_path: Path) -> List[Dict[str, Any]]:
+    """One claim per quote extracted by InitialReader in Phase II.1"""
+    with open(readings_path, "r", encoding="utf-8") as f:
+        readings = json.load(f)
+    claims = []
+    for paper, reading in readings.items():
+        initial = reading.get("initial", {})
+        # Literature texts are indexed as <digest>/<paper>.txt; older readings lack the digest
+        digest = initial.get("source_digest")
+        document = f"{digest}/{paper}.txt" if digest else f"{paper}.txt"
+        for quote in initial.get("extracted_quotes", []):
+            if isinstance(quote, dict) and quote.get("text"):
+                claims.append({
+                    "kind": "literature",
+                    "document": document,
+                    "page": quote.get("page"),
+                    "quote": quote["text"],
+                })
+    return claims
+
+
+def write_grounding_report(results: List[Dict[str, Any]], output_dir: Path) -> Dict[str, Any]:
+    """Write the JSON results and a markdown summary listing ungrounded quotes"""
+    summary = summarize_grounding(results)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    with open(output_dir / "grounding_report.json", "w", encoding="utf-8") as f:
+        json.dump({"summary": summary, "results": results}, f, indent=2, ensure_ascii=False)
+
+    report = "# Quote Grounding Report\n\n"
+    report += f"Quotes checked: {summary['total']}\n"
+    for status, count in sorted(summary["by_status"].items()):
+        report += f"- {status}: {count}\n"
+    if summary["grounded_rate"] is not None:
+        report += f"\nGrounded: {summary['grounded_rate']:.1%} of quotes with a source text\n"
+
+    report += "\n## Not found in source\n\n"
+    for result in results:
+        if result["grounding"]["status"] == "not_found":
+            report += (f"- **{result.get('document')}** (best score {result['grounding']['score']}): "
+                       f"{result['quote'][:150]}\n")
+    with open(output_dir / "grounding_report.md", "w", encoding="utf-8") as f:
+        f.write(report)
+    return summary
+
+
+def ground_all_quotes(args) -> None:
+    """Batch check every claimed quote against the extracted texts"""
+    corpus = QuoteCorpus(threshold=args.threshold)
+    for texts_dir in (ANALYSIS_TEXTS_DIR, LITERATURE_TEXTS_DIR):
+        if texts_dir.exists():
+            # Literature texts sit in one subdirectory per PDF digest
+            print(f"📚 Indexed {corpus.add_directory(texts_dir, '**/*.txt')} texts from {texts_dir}")
+
+    claims = []
+    for path in map(Path, args.extractions):
+        if path.exists():
+            claims.extend(collect_move_claims(path))
+    if Path(args.readings).exists():
+        claims.extend(collect_reading_claims(Path(args.readings)))
+    if not claims:
+        print("No quotes found to check!")
+        return
+
+    results = verify_quotes(corpus, claims)
+    summary = write_grounding_report(results, Path(args.output_dir))
+
+    print(f"\n📊 Checked {summary['total']} quotes")
+    for status, count in sorted(summary["by_status"].items()):
+        print(f"   {status}: {count}")
+    print(f"📁 Report: {Path(args.output_dir) / 'grounding_report.md'}")
 
 
 def validate_single_paper():
@@ -100,5 +196,25 @@ def validate_single_paper():
     print(f"Quotes found in source: {accurate_count}/{len(extraction['philosophical_moves'])}")
 
 
+def main():
+    parser = argparse.ArgumentParser(description="Check extracted quotes against their source texts")
+    parser.add_argument("--interactive", action="store_true",
+                        help="Review the moves of a single paper interactively")
+    parser.add_argument("--extractions", nargs="+",
+                        default=["outputs/philosophical_moves_db_v2/raw_extractions.json"],
+                        help="Raw moves extraction files to check")
+    parser.add_argument("--readings", default="outputs/literature_readings.json",
+                        help="Phase II.1 literature readings to check")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_MATCH_THRESHOLD,
+                        help="Minimum fraction of quote words matched in order to count as grounded")
+    parser.add_argument("--output-dir", default="outputs/quote_grounding")
+    args = parser.parse_args()
+
+    if args.interactive:
+        validate_single_paper()
+    else:
+        ground_all_quotes(args)
+
+
 if __name__ == "__main__":
-    validate_single_paper() 
\ No newline at end of file
+    main() 
\ No newline at end of file
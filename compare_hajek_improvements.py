@@ -7,6 +7,8 @@ import json
 from pathlib import Path
 import difflib
 
+from src.utils.run_metrics import compare_runs, format_comparison
+
 
 def load_json_file(path):
     """Load JSON file if it exists"""
@@ -162,6 +164,9 @@ def main():
     print(f"📁 Baseline: {baseline_path}")
     print(f"📁 Improved: {improved_path}")
     
+    # Fixed metric vectors first (⚠️ marks a regression against the baseline)
+    print("\n" + format_comparison(compare_runs([baseline_path, improved_path])))
+    
     # Run comparisons
     compare_critic_feedback(baseline_path, improved_path)
     compare_philosophical_boldness(baseline_path, improved_path)
@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+Compare pipeline runs side by side on a fixed metric vector
+
+Each argument is a run directory (outputs/ or an archived run); the first
+is the baseline. Metrics that moved more than --tolerance in the wrong
+direction are marked ⚠️.
+
+    python compare_runs.py outputs/archive/run_20250605_141342 outputs
+"""
+
+import argparse
+import json
+from pathlib import Path
+
+from src.utils.run_metrics import DEFAULT_CACHE_DIR, compare_runs, format_comparison
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare pipeline runs on a fixed metric vector")
+    parser.add_argument("runs", nargs="+", type=Path, help="Run directories; the first is the baseline")
+    parser.add_argument("--tolerance", type=float, default=0.1,
+                        help="Relative change counted as a regression (default 0.1)")
+    parser.add_argument("--trajectories", action="store_true",
+                        help="Also print each run's critic assessment trajectories")
+    parser.add_argument("--json", type=Path, help="Also write the comparison as JSON to this file")
+    parser.add_argument("--no-cache", action="store_true", help="Recompute every run's metrics")
+    args = parser.parse_args()
+
+    missing = [str(run) for run in args.runs if not run.is_dir()]
+    if missing:
+        parser.error(f"Not a run directory: {', '.join(missing)}")
+
+    comparison = compare_runs(args.runs, cache_dir=None if args.no_cache else DEFAULT_CACHE_DIR,
+                              tolerance=args.tolerance)
+    print(format_comparison(comparison))
+
+    if args.trajectories:
+        for run, trajectories in zip(comparison["runs"], comparison["trajectories"]):
+            print(f"\n=== {run} ===")
+            for source, levels in trajectories.items():
+                print(f"  {source}: {' → '.join(levels)}")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(comparison, f, indent=2)
+        print(f"\nSaved comparison to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
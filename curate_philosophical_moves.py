@@ -7,18 +7,42 @@ import json
 from pathlib import Path
 from typing import Dict, List, Any
 
+from src.utils.moves_index import DEFAULT_INDEX_PATH, MovesIndex
+
+
+DB_PATH = Path("outputs/philosophical_moves_db_v2/moves_database.json")
+
+# Worker category -> (search terms, indexed fields they are matched against)
+WORKER_QUERIES = {
+    "abstract_development": ("scope thesis framing limitation", ["pattern"]),
+    "key_moves_development": ("objection response distinction counterexample", ["pattern"]),
+    "outline_development": ("structure systematic organization", ["pattern"]),
+    "section_writing": ("example consider case suppose", ["quote"]),
+    "critics_all": ("extreme boundary self-undermining prove-too-much", ["pattern"]),
+}
+
 
 def load_moves_database():
     """Load the consolidated moves database"""
-    db_path = Path("outputs/philosophical_moves_db_v2/moves_database.json")
-    with open(db_path, "r") as f:
+    with open(DB_PATH, "r") as f:
         return json.load(f)
 
 
+def open_moves_index() -> MovesIndex:
+    """Open the moves index, building it from the database if it is missing or stale"""
+    index = MovesIndex(DEFAULT_INDEX_PATH)
+    # Extraction keeps the index up to date paper by paper, so rebuild only when the counts disagree
+    moves = load_moves_database()["all_moves"] if DB_PATH.exists() else []
+    if len(index) != len(moves):
+        print("🗂️  Building moves index from moves_database.json...")
+        index.rebuild(moves)
+    return index
+
+
 def categorize_by_worker_relevance():
     """Organize moves by which pipeline workers would benefit most"""
     
-    db = load_moves_database()
+    index = open_moves_index()
     
     # Categories mapped to pipeline workers
     worker_categories = {
@@ -49,30 +73,9 @@ def categorize_by_worker_relevance():
         }
     }
     
-    # Sort moves into categories
-    for move in db["all_moves"]:
-        pattern = move.get("pattern", "").lower()
-        quote_lower = move.get("quote", "").lower()
-        
-        # Abstract development
-        if any(p in pattern for p in ["scope", "thesis", "framing", "limitation"]):
-            worker_categories["abstract_development"]["moves"].append(move)
-        
-        # Key moves development
-        if any(p in pattern for p in ["objection", "response", "distinction", "counterexample"]):
-            worker_categories["key_moves_development"]["moves"].append(move)
-        
-        # Outline development
-        if any(p in pattern for p in ["structure", "systematic", "organization"]):
-            worker_categories["outline_development"]["moves"].append(move)
-        
-        # Section writing
-        if any(p in quote_lower for p in ["example", "consider", "case", "suppose"]):
-            worker_categories["section_writing"]["moves"].append(move)
-        
-        # Critics (looking for Hájek-style moves)
-        if any(p in pattern for p in ["extreme", "boundary", "self-undermining", "prove too much"]):
-            worker_categories["critics_all"]["moves"].append(move)
+    # One indexed query per category, best matches first
+    for category, (terms, columns) in WORKER_QUERIES.items():
+        worker_categories[category]["moves"] = index.search(terms, k=None, columns=columns)
     
     return worker_categories
 
@@ -3,17 +3,31 @@
 Extract philosophical moves from ALL Analysis papers with improved context
 """
 
+import argparse
 import json
-import os
+import threading
 from pathlib import Path
-from typing import List, Dict, Any
-import time
+from typing import Any, Dict, Iterable, List, Optional, Set
 from datetime import datetime
 
 from src.utils.api import APIHandler
+from src.utils.map_reduce import map_bounded
+from src.utils.moves_corpus import (
+    ExtractionManifest,
+    MovesStore,
+    content_hash,
+    load_database,
+    save_database,
+)
+from src.utils.moves_index import MovesIndex
+from src.utils.near_duplicates import NearDuplicateIndex
+from src.utils.run_metrics import tool_usage_log
 
+# Jaccard similarity of pattern+quote shingles above which two moves are one
+DEFAULT_DUPLICATE_THRESHOLD = 0.8
 
-def extract_new_texts_first():
+
+def extract_new_texts_first(workers: int = 4) -> int:
     """Extract text from PDFs we haven't processed yet"""
     papers_dir = Path("./Analysis_papers")
     output_dir = Path("./analysis_cache/extracted_texts")
@@ -26,50 +40,51 @@ def extract_new_texts_first():
     existing_txts = {f.stem for f in output_dir.glob("*.txt")}
     
     # Find PDFs we haven't extracted
-    to_extract = []
-    for pdf in all_pdfs:
-        txt_name = pdf.stem
-        if txt_name not in existing_txts:
-            to_extract.append(pdf)
+    to_extract = [pdf for pdf in all_pdfs if pdf.stem not in existing_txts]
     
     print(f"📚 Found {len(all_pdfs)} PDFs total")
     print(f"📄 Already have {len(existing_txts)} TXT files")
     print(f"🆕 Need to extract {len(to_extract)} new papers")
     
-    if to_extract:
-        api_handler = APIHandler()
-        print("\n🔄 Extracting new PDFs to TXT...")
-        
-        for i, pdf_path in enumerate(to_extract[:10], 1):  # Limit to 10 at a time
-            print(f"\n[{i}/{min(10, len(to_extract))}] Extracting {pdf_path.name}...")
-            
-            prompt = """Please extract and return the complete text content of this PDF document. 
+    if not to_extract:
+        return len(existing_txts)
+    
+    api_handler = APIHandler()
+    print("\n🔄 Extracting new PDFs to TXT...")
+    
+    prompt = """Please extract and return the complete text content of this PDF document. 
 Format it cleanly with paragraph breaks but don't add any commentary or analysis - 
 just return the raw text content of the paper."""
+    
+    def extract(pdf_path: Path) -> bool:
+        try:
+            response = api_handler._call_anthropic_with_pdf(
+                prompt=prompt,
+                pdf_path=pdf_path,
+                config={
+                    "model": "claude-3-5-sonnet-20241022",
+                    "max_tokens": 8192,
+                    "temperature": 0.1
+                }
+            )
             
-            try:
-                response = api_handler._call_anthropic_with_pdf(
-                    prompt=prompt,
-                    pdf_path=pdf_path,
-                    config={
-                        "model": "claude-3-5-sonnet-20241022",
-                        "max_tokens": 8192,
-                        "temperature": 0.1
-                    }
-                )
-                
-                # Save extracted text
-                output_path = output_dir / f"{pdf_path.stem}.txt"
-                with open(output_path, "w", encoding="utf-8") as f:
-                    f.write(response)
-                    
-                print(f"✅ Extracted to {output_path.name}")
-                time.sleep(2)  # Rate limiting
-                
-            except Exception as e:
-                print(f"❌ Error: {e}")
+            # Save extracted text
+            output_path = output_dir / f"{pdf_path.stem}.txt"
+            with open(output_path, "w", encoding="utf-8") as f:
+                f.write(response)
+            
+            print(f"✅ Extracted {pdf_path.name} to {output_path.name}")
+            return True
+        
+        except Exception as e:
+            print(f"❌ Error extracting {pdf_path.name}: {e}")
+            return False
     
-    return len(existing_txts) + min(10, len(to_extract))
+    # Rate limits are handled by the API handler's retry/backoff
+    results, _ = map_bounded(extract, to_extract, workers)
+    extracted = sum(result for _, result in results)
+    
+    return len(existing_txts) + extracted
 
 
 def load_improved_prompt() -> str:
@@ -140,14 +155,16 @@ Return ONLY valid JSON with no additional text."""
         return None
 
 
-def consolidate_moves_v2(all_extractions: List[Dict[str, Any]]) -> Dict[str, Any]:
-    """Consolidate with focus on high-quality, self-contained moves"""
-    
-    consolidated = {
+def new_moves_database() -> Dict[str, Any]:
+    """Empty consolidated database"""
+    return {
         "extraction_date": datetime.now().isoformat(),
-        "papers_analyzed": len(all_extractions),
+        "papers_analyzed": 0,
+        "source_files": [],
+        "source_versions": {},  # Source file -> [text hash, prompt version] of its consolidated extraction
         "total_moves": 0,
         "high_quality_moves": 0,
+        "duplicate_moves": 0,
         "move_categories": {
             "offensive": [],
             "defensive": [],
@@ -158,114 +175,192 @@ def consolidate_moves_v2(all_extractions: List[Dict[str, Any]]) -> Dict[str, Any
         "pattern_frequency": {},
         "domain_distribution": {}
     }
-    
-    # Process each extraction
-    for extraction in all_extractions:
-        if not extraction:
+
+
+def _move_text(move: Dict[str, Any]) -> str:
+    """Text compared for near-duplicate detection"""
+    return f"{move.get('pattern', '')} {move.get('quote', '')}"
+
+
+def build_duplicate_index(consolidated: Dict[str, Any], threshold: float = DEFAULT_DUPLICATE_THRESHOLD) -> NearDuplicateIndex:
+    """Index the database's canonical moves for near-duplicate lookups"""
+    duplicates = NearDuplicateIndex(threshold=threshold)
+    for i, move in enumerate(consolidated["all_moves"]):
+        move.setdefault("move_id", f"{move.get('source_file', '')}:{i}")
+        duplicates.add(move["move_id"], _move_text(move), move)
+    return duplicates
+
+
+def _count_move(consolidated: Dict[str, Any], move: Dict[str, Any], delta: int) -> None:
+    """Add (delta=1) or remove (delta=-1) a move's contribution to the counters"""
+    consolidated["total_moves"] += delta
+    if move.get("quality") == "High":
+        consolidated["high_quality_moves"] += delta
+
+    for key, value in (("pattern_frequency", move.get("pattern", "")),
+                       ("domain_distribution", move.get("domain", "General"))):
+        if not value:
             continue
-            
-        paper_info = extraction.get("paper_info", {})
-        
-        for move in extraction.get("philosophical_moves", []):
-            # Add paper info
-            move["source_paper"] = paper_info.get("title", "Unknown")
-            move["source_author"] = paper_info.get("author", "Unknown")
-            
-            # Add to all moves
-            consolidated["all_moves"].append(move)
-            consolidated["total_moves"] += 1
-            
-            # Count high quality
-            if move.get("quality") == "High":
-                consolidated["high_quality_moves"] += 1
-            
-            # Categorize (using new classification)
-            for category in move.get("classification", []):
-                if category in consolidated["move_categories"]:
-                    consolidated["move_categories"][category].append(move)
-            
-            # Track patterns
-            pattern = move.get("pattern", "")
-            if pattern:
-                consolidated["pattern_frequency"][pattern] = \
-                    consolidated["pattern_frequency"].get(pattern, 0) + 1
-            
-            # Track domains
-            domain = move.get("domain", "General")
-            consolidated["domain_distribution"][domain] = \
-                consolidated["domain_distribution"].get(domain, 0) + 1
-    
+        counts = consolidated[key]
+        counts[value] = counts.get(value, 0) + delta
+        if counts[value] <= 0:
+            del counts[value]
+
+
+def _extraction_version(extraction: Dict[str, Any]) -> List[Optional[str]]:
+    """What an extraction was made from: the paper text and the prompt"""
+    return [extraction.get("text_hash"), extraction.get("prompt_version")]
+
+
+def catch_up_extractions(consolidated: Dict[str, Any], extractions: Iterable[Dict[str, Any]],
+                         duplicates: NearDuplicateIndex) -> Set[str]:
+    """Consolidate stored extractions the database does not reflect yet
+
+    A run can stop after storing an extraction but before saving the
+    database. This covers new papers and re-extractions (``--force``, a
+    changed text or prompt) alike. Returns the source files whose
+    canonical moves changed.
+    """
+    changed: Set[str] = set()
+    versions = consolidated.get("source_versions", {})
+    for extraction in extractions:
+        source_file = extraction.get("source_file")
+        if source_file not in consolidated["source_files"] or versions.get(source_file) != _extraction_version(extraction):
+            changed |= add_extraction(consolidated, extraction, duplicates)
+    return changed
+
+
+def remove_extraction(consolidated: Dict[str, Any], source_file: str,
+                      duplicates: Optional[NearDuplicateIndex] = None) -> Set[str]:
+    """Drop every move previously consolidated from source_file
+
+    A removed canonical move hands over to its first duplicate from another
+    paper. Returns the source files whose canonical moves changed.
+    """
+    if source_file not in consolidated["source_files"]:
+        return set()
+    if duplicates is None:
+        duplicates = build_duplicate_index(consolidated)
+    consolidated["source_files"].remove(source_file)
+    consolidated.get("source_versions", {}).pop(source_file, None)
+    consolidated["papers_analyzed"] -= 1
+    changed = {source_file}
+
+    kept = []
+    for move in consolidated["all_moves"]:
+        others = [dup for dup in move.get("duplicates", []) if dup.get("source_file") != source_file]
+        consolidated["duplicate_moves"] -= len(move.get("duplicates", [])) - len(others)
+        if move.get("source_file") != source_file:
+            if "duplicates" in move:
+                move["duplicates"] = others
+            kept.append(move)
+            continue
+
+        _count_move(consolidated, move, -1)
+        duplicates.remove(move["move_id"])
+        if others:
+            promoted, rest = dict(others[0]), others[1:]
+            if rest:
+                promoted["duplicates"] = rest
+            consolidated["duplicate_moves"] -= 1
+            _count_move(consolidated, promoted, 1)
+            duplicates.add(promoted["move_id"], _move_text(promoted), promoted)
+            changed.add(promoted.get("source_file", ""))
+            kept.append(promoted)
+    consolidated["all_moves"] = kept
+    return changed
+
+
+def add_extraction(consolidated: Dict[str, Any], extraction: Dict[str, Any],
+                   duplicates: Optional[NearDuplicateIndex] = None) -> Set[str]:
+    """Merge one paper's extraction, replacing any earlier extraction of it
+
+    Near duplicates of a move already in the database are recorded under
+    that move's ``duplicates`` (with their provenance) rather than stored
+    again. Returns the source files whose canonical moves changed.
+    """
+    if not extraction:
+        return set()
+    if duplicates is None:
+        duplicates = build_duplicate_index(consolidated)
+    source_file = extraction.get("source_file", "")
+    changed = remove_extraction(consolidated, source_file, duplicates) | {source_file}
+    consolidated["source_files"].append(source_file)
+    consolidated.setdefault("source_versions", {})[source_file] = _extraction_version(extraction)
+    consolidated["papers_analyzed"] += 1
+
+    paper_info = extraction.get("paper_info", {})
+
+    for i, move in enumerate(extraction.get("philosophical_moves", [])):
+        # Add paper info
+        move["source_paper"] = paper_info.get("title", "Unknown")
+        move["source_author"] = paper_info.get("author", "Unknown")
+        move["source_file"] = source_file
+        move["move_id"] = f"{source_file}:{i}"
+
+        canonical_id = duplicates.find(_move_text(move))
+        if canonical_id is not None:
+            canonical = duplicates.get(canonical_id)
+            canonical.setdefault("duplicates", []).append(move)
+            consolidated["duplicate_moves"] += 1
+            changed.add(canonical.get("source_file", ""))  # Its index payload now lists this duplicate
+            continue
+
+        # Add to all moves
+        consolidated["all_moves"].append(move)
+        duplicates.add(move["move_id"], _move_text(move), move)
+        _count_move(consolidated, move, 1)
+    return changed
+
+
+def finalize_moves_database(consolidated: Dict[str, Any]) -> Dict[str, Any]:
+    """Refresh the derived rankings after moves were added or removed"""
+    consolidated["extraction_date"] = datetime.now().isoformat()
+
+    # Categorize (using new classification)
+    consolidated["move_categories"] = {category: [] for category in consolidated["move_categories"]}
+    for move in consolidated["all_moves"]:
+        for category in move.get("classification", []):
+            if category in consolidated["move_categories"]:
+                consolidated["move_categories"][category].append(move)
+
     # Sort patterns by frequency
     consolidated["top_patterns"] = sorted(
         consolidated["pattern_frequency"].items(),
         key=lambda x: x[1],
         reverse=True
     )[:30]
-    
+
     # Find best self-contained examples
     consolidated["exemplar_moves"] = [
         m for m in consolidated["all_moves"]
-        if m.get("quality") == "High" and 
+        if m.get("quality") == "High" and
            len(m.get("quote", "")) > 200 and
            not m.get("context_notes")  # Prefer moves that didn't need extra notes
     ][:20]
-    
+
     return consolidated
 
 
-def main():
-    """Main extraction workflow"""
-    
-    print("🚀 Starting Comprehensive Philosophical Moves Extraction")
-    
-    # First, extract any new PDFs to TXT
-    total_available = extract_new_texts_first()
-    
-    # Initialize API handler
-    api_handler = APIHandler()
-    
-    # Get all text files
-    text_dir = Path("analysis_cache/extracted_texts")
-    text_files = list(text_dir.glob("*.txt"))
-    
-    print(f"\n📚 Total papers available for analysis: {len(text_files)}")
-    
-    # For now, let's process in batches to avoid rate limits
-    batch_size = 10
-    print(f"\n🔬 Processing first batch of {batch_size} papers...")
-    
-    # Extract moves from batch
-    all_extractions = []
-    for i, paper_path in enumerate(text_files[:batch_size], 1):
-        print(f"\n[{i}/{batch_size}] Processing {paper_path.name}")
-        extraction = extract_moves_from_paper(paper_path, api_handler)
-        if extraction:
-            all_extractions.append(extraction)
-        time.sleep(3)  # Rate limiting
-    
-    # Consolidate results
-    print("\n📊 Consolidating extracted moves...")
-    consolidated = consolidate_moves_v2(all_extractions)
-    
-    # Save results
-    output_dir = Path("outputs/philosophical_moves_db_v2")
-    output_dir.mkdir(parents=True, exist_ok=True)
-    
-    # Save raw extractions
-    with open(output_dir / "raw_extractions.json", "w") as f:
-        json.dump(all_extractions, f, indent=2)
-    
-    # Save consolidated database
-    with open(output_dir / "moves_database.json", "w") as f:
-        json.dump(consolidated, f, indent=2)
-    
-    # Generate report
+def consolidate_moves_v2(all_extractions: List[Dict[str, Any]],
+                         threshold: float = DEFAULT_DUPLICATE_THRESHOLD) -> Dict[str, Any]:
+    """Consolidate with focus on high-quality, self-contained moves"""
+    consolidated = new_moves_database()
+    duplicates = NearDuplicateIndex(threshold=threshold)
+    for extraction in all_extractions:
+        add_extraction(consolidated, extraction, duplicates)
+    return finalize_moves_database(consolidated)
+
+
+def write_report(consolidated: Dict[str, Any], output_dir: Path) -> None:
+    """Write the human-readable extraction report"""
     report = f"""# Philosophical Moves Extraction Report V2
 
 Generated: {consolidated['extraction_date']}
 Papers Analyzed: {consolidated['papers_analyzed']}
 Total Moves: {consolidated['total_moves']}
 High Quality Moves: {consolidated['high_quality_moves']}
+Near Duplicates Merged: {consolidated.get('duplicate_moves', 0)}
 
 ## Category Distribution (New Ontology)
 - Offensive: {len(consolidated['move_categories']['offensive'])}
@@ -281,19 +376,134 @@ High Quality Moves: {consolidated['high_quality_moves']}
     
     report += f"\n## Quality Metrics\n"
     report += f"- High-quality self-contained examples: {len(consolidated['exemplar_moves'])}\n"
-    report += f"- Average moves per paper: {consolidated['total_moves']/consolidated['papers_analyzed']:.1f}\n"
+    if consolidated['papers_analyzed']:
+        report += f"- Average moves per paper: {consolidated['total_moves']/consolidated['papers_analyzed']:.1f}\n"
     
     with open(output_dir / "extraction_report.md", "w") as f:
         f.write(report)
+
+
+def main():
+    """Main extraction workflow: only new or changed papers, processed concurrently"""
+    parser = argparse.ArgumentParser(description="Extract philosophical moves from the Analysis corpus")
+    parser.add_argument("--workers", type=int, default=4, help="Concurrent extraction calls")
+    parser.add_argument("--limit", type=int, default=None, help="Process at most this many papers this run")
+    parser.add_argument("--force", action="store_true", help="Re-extract every paper")
+    parser.add_argument("--skip-text-extraction", action="store_true", help="Don't convert new PDFs to text first")
+    parser.add_argument("--duplicate-threshold", type=float, default=DEFAULT_DUPLICATE_THRESHOLD,
+                        help="Pattern+quote similarity (0-1) at which moves are merged as near duplicates")
+    args = parser.parse_args()
+    
+    print("🚀 Starting Comprehensive Philosophical Moves Extraction")
+    
+    # First, extract any new PDFs to TXT
+    if not args.skip_text_extraction:
+        extract_new_texts_first(workers=args.workers)
+    
+    # Initialize API handler
+    api_handler = APIHandler()
+    
+    output_dir = Path("outputs/philosophical_moves_db_v2")
+    output_dir.mkdir(parents=True, exist_ok=True)
+    manifest = ExtractionManifest(output_dir / "manifest.json")
+    store = MovesStore(output_dir / "extractions.jsonl")
+    database_path = output_dir / "moves_database.json"
+    
+    # Get all text files
+    text_dir = Path("analysis_cache/extracted_texts")
+    text_files = sorted(text_dir.glob("*.txt"))
+    prompt_version = content_hash(load_improved_prompt())
+    
+    print(f"\n📚 Total papers available for analysis: {len(text_files)}")
+    
+    # Work out which papers are new or changed since their last extraction
+    pending = []
+    for paper_path in text_files:
+        text_hash = content_hash(paper_path.read_text(encoding="utf-8"))
+        if args.force or manifest.needs_extraction(paper_path.name, text_hash, prompt_version):
+            pending.append((paper_path, text_hash))
+    if args.limit is not None:
+        pending = pending[:args.limit]
+    
+    print(f"🔬 {len(pending)} new or changed papers to process ({args.workers} at a time)")
+    
+    # Existing database is updated in place; rebuild from the store if it is
+    # missing or predates near-duplicate merging
+    consolidated = load_database(database_path)
+    if consolidated is None or "duplicate_moves" not in consolidated:
+        consolidated = consolidate_moves_v2(store.latest(), args.duplicate_threshold)
+    duplicates = build_duplicate_index(consolidated, args.duplicate_threshold)
+    # Catch up on extractions stored by a run that stopped before saving
+    caught_up = catch_up_extractions(consolidated, store.latest(), duplicates)
+    db_lock = threading.Lock()
+    
+    # Searchable index kept in step with the database, one paper at a time
+    moves_index = MovesIndex(output_dir / "moves_index.sqlite")
+    if len(moves_index) != len(consolidated["all_moves"]):
+        moves_index.rebuild(consolidated["all_moves"])
+    else:
+        for source_file in caught_up:
+            moves_index.replace_paper(
+                source_file,
+                [move for move in consolidated["all_moves"] if move.get("source_file") == source_file],
+            )
+    
+    def process(item):
+        paper_path, text_hash = item
+        manifest.mark(paper_path.name, status="running", text_hash=text_hash, prompt_version=prompt_version)
+        extraction = extract_moves_from_paper(paper_path, api_handler)
+        if not extraction:
+            manifest.mark(paper_path.name, status="failed")
+            return False
+        
+        extraction["text_hash"] = text_hash
+        extraction["prompt_version"] = prompt_version
+        store.append(extraction)
+        with db_lock:
+            changed = add_extraction(consolidated, extraction, duplicates)
+            for source_file in changed:
+                moves_index.replace_paper(
+                    source_file,
+                    [move for move in consolidated["all_moves"] if move.get("source_file") == source_file],
+                )
+        manifest.mark(
+            paper_path.name,
+            status="done",
+            moves=len(extraction.get("philosophical_moves", [])),
+        )
+        return True
+    
+    # Workers run in this context, so their API calls go to the tool's usage log
+    processed, failures = map_bounded(process, pending, args.workers)
+    if failures:
+        raise failures[0][1]
+    results = [result for _, result in processed]
+    
+    # Save results
+    print("\n📊 Updating consolidated database...")
+    finalize_moves_database(consolidated)
+    save_database(database_path, consolidated)
+    
+    # Raw extractions kept for tools that read the JSON array
+    with open(output_dir / "raw_extractions.json", "w") as f:
+        json.dump(store.latest(), f, indent=2)
+    
+    write_report(consolidated, output_dir)
     
+    status_counts = manifest.counts()
     print(f"\n✅ Extraction complete!")
     print(f"📁 Results saved to: {output_dir}")
+    print(f"🆕 Processed this run: {sum(results)} succeeded, {len(results) - sum(results)} failed")
     print(f"📊 High-quality moves: {consolidated['high_quality_moves']}/{consolidated['total_moves']}")
+    print(f"🧬 Near duplicates merged: {consolidated['duplicate_moves']}")
     print(f"🌟 Self-contained exemplars: {len(consolidated['exemplar_moves'])}")
+    print(f"📋 Manifest: {status_counts.get('done', 0)} done, {status_counts.get('failed', 0)} failed")
     
-    print(f"\n💡 To process more papers, run again or modify batch_size")
-    print(f"📝 Remaining papers to process: {len(text_files) - batch_size}")
+    remaining = len(text_files) - status_counts.get("done", 0)
+    if remaining:
+        print(f"\n💡 Run again to process the remaining {remaining} papers (failed papers are retried)")
 
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    with tool_usage_log("extract_all_philosophical_moves"):
+        main()
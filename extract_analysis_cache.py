@@ -9,6 +9,7 @@ from pathlib import Path
 from datetime import datetime
 from typing import Dict, List, Any
 from src.utils.api import APIHandler
+from src.utils.run_metrics import tool_usage_log
 
 
 def extract_pdf_text(pdf_path: Path, api_handler: APIHandler) -> str:
@@ -174,4 +175,5 @@ def main():
 
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    with tool_usage_log("extract_analysis_cache"):
+        main()
@@ -5,6 +5,7 @@ Extract text from additional Analysis PDFs to expand our corpus
 
 from pathlib import Path
 from src.utils.api import APIHandler
+from src.utils.run_metrics import tool_usage_log
 import time
 
 
@@ -86,4 +87,5 @@ def main():
 
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    with tool_usage_log("extract_more_pdfs"):
+        main()
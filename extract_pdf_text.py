@@ -5,6 +5,7 @@ Simple PDF text extractor to let Claude read Analysis papers directly
 
 from pathlib import Path
 from src.utils.api import APIHandler
+from src.utils.run_metrics import tool_usage_log
 
 
 def extract_pdf_text(pdf_path: Path, output_path: Path):
@@ -63,4 +64,5 @@ def main():
 
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    with tool_usage_log("extract_pdf_text"):
+        main()
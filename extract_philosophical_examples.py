@@ -4,14 +4,15 @@ Philosophical Example Extraction Pipeline
 Extracts examples and other key philosophical moves from Analysis papers
 """
 
+import argparse
 import json
 import time
 from pathlib import Path
-from typing import List, Dict, Any
-import xml.etree.ElementTree as ET
-from xml.dom import minidom
+from typing import List, Dict, Any, Optional
 
 from src.utils.api import APIHandler, load_config
+from src.utils.examples_store import ExamplesDatabaseWriter, XML_FOOTER, XML_HEADER, example_to_xml
+from src.utils.run_metrics import tool_usage_log
 
 
 class PhilosophicalExampleExtractor:
@@ -81,8 +82,8 @@ Focus on the main philosophical content.
             print(f"Error extracting text from {pdf_path}: {str(e)}")
             return ""
     
-    def extract_examples_from_text(self, text: str, paper_title: str) -> List[Dict[str, Any]]:
-        """Use Claude to identify and extract philosophical examples from text"""
+    def extract_examples_from_text(self, text: str, paper_title: str) -> Optional[List[Dict[str, Any]]]:
+        """Use Claude to identify and extract philosophical examples from text; None on failure"""
         
         extraction_prompt = f"""
 You are analyzing a philosophy paper from the journal Analysis to extract examples that do real philosophical work.
@@ -143,9 +144,9 @@ Be selective - quality over quantity.
             
         except Exception as e:
             print(f"Error extracting examples: {str(e)}")
-            return []
+            return None
     
-    def _parse_examples_from_response(self, response: str, paper_title: str) -> List[Dict[str, Any]]:
+    def _parse_examples_from_response(self, response: str, paper_title: str) -> Optional[List[Dict[str, Any]]]:
         """Parse examples from Claude's XML response"""
         examples = []
         
@@ -212,46 +213,26 @@ Be selective - quality over quantity.
             
         except Exception as e:
             print(f"Error parsing examples: {str(e)}")
-            return []
+            return None
     
     def create_examples_database(self, examples_list: List[Dict[str, Any]]) -> str:
-        """Create XML database of all extracted examples"""
-        
-        root = ET.Element("philosophical_examples")
-        
-        for example in examples_list:
-            example_elem = ET.SubElement(root, "example")
-            
-            # Add paper title
-            title_elem = ET.SubElement(example_elem, "paper_title")
-            title_elem.text = example.get('paper_title', '')
-            
-            # Add type
-            type_elem = ET.SubElement(example_elem, "type")
-            type_elem.text = example.get('type', '')
-            
-            # Add purpose
-            purpose_elem = ET.SubElement(example_elem, "purpose")
-            purpose_elem.text = example.get('purpose', '')
-            
-            # Add context
-            context_elem = ET.SubElement(example_elem, "context")
-            context_elem.text = example.get('context', '')
-            
-            # Add text
-            text_elem = ET.SubElement(example_elem, "text")
-            text_elem.text = example.get('text', '')
-        
-        # Pretty print the XML
-        rough_string = ET.tostring(root, 'unicode')
-        reparsed = minidom.parseString(rough_string)
-        return reparsed.toprettyxml(indent="  ")
+        """Create XML database of the given examples"""
+        return XML_HEADER + "".join(example_to_xml(example) for example in examples_list) + XML_FOOTER
     
-    def process_papers(self, paper_paths: List[Path]) -> str:
-        """Process multiple papers and create combined examples database"""
-        all_examples = []
+    def process_papers(self, paper_paths: List[Path], force: bool = False) -> int:
+        """Process multiple papers, appending each one's examples to the database as it finishes
+
+        Papers already in the database are skipped unless ``force`` is set,
+        so an interrupted run picks up where it stopped. Returns the number
+        of examples in the compacted database.
+        """
+        writer = ExamplesDatabaseWriter(self.output_dir)
+        done = set() if force else writer.processed_sources()
         
         for paper_path in paper_paths:
+            if paper_path.name in done:
+                print(f"\nSkipping {paper_path.name} (already in database)")
+                continue
             print(f"\nProcessing {paper_path.name}...")
             
             # Extract actual paper title
@@ -265,43 +246,39 @@ Be selective - quality over quantity.
             
             # Extract examples
             examples = self.extract_examples_from_text(text, paper_title)
-            all_examples.extend(examples)
+            if examples is None:
+                # Not recorded, so the next run retries this paper
+                print(f"Failed to extract examples from {paper_path.name}; will retry on the next run")
+                continue
             
             # Save individual results using filename for the file
             individual_file = self.output_dir / f"{paper_path.stem}_examples.json"
             with open(individual_file, 'w') as f:
                 json.dump(examples, f, indent=2)
             
+            # Append to the JSONL and XML databases right away
+            writer.append(paper_path.name, examples)
             print(f"Saved {len(examples)} examples to {individual_file}")
             
             # Rate limiting
             time.sleep(2)
         
-        # Create combined XML database
-        if all_examples:
-            xml_database = self.create_examples_database(all_examples)
-            
-            # Save XML database
-            xml_file = self.output_dir / "philosophical_examples_database.xml"
-            with open(xml_file, 'w', encoding='utf-8') as f:
-                f.write(xml_database)
-            
-            # Save JSON backup
-            json_file = self.output_dir / "philosophical_examples_database.json"
-            with open(json_file, 'w') as f:
-                json.dump(all_examples, f, indent=2)
-            
-            print(f"\n✅ Created examples database with {len(all_examples)} examples")
-            print(f"📄 XML: {xml_file}")
-            print(f"📄 JSON: {json_file}")
-            
-            return xml_database
+        # Drop superseded records and write the combined JSON array
+        total = writer.compact()
+        if total:
+            print(f"\n✅ Examples database holds {total} examples")
+            print(f"📄 XML: {writer.xml_path}")
+            print(f"📄 JSON: {writer.json_path}")
         
-        return ""
+        return total
 
 
 def main():
     """Extract examples from specified Analysis papers"""
+    parser = argparse.ArgumentParser(description="Extract philosophical examples from Analysis papers")
+    parser.add_argument("--force", action="store_true", help="Re-extract papers already in the database")
+    args = parser.parse_args()
+    
     extractor = PhilosophicalExampleExtractor()
     
     # Target papers identified by user
@@ -321,9 +298,9 @@ def main():
     print(f"Papers: {[p.name for p in available_papers]}")
     
     # Extract examples
-    database = extractor.process_papers(available_papers)
+    total_examples = extractor.process_papers(available_papers, force=args.force)
     
-    if database:
+    if total_examples:
         print("🎉 Example extraction completed successfully!")
         print("\nNext steps:")
         print("1. Review extracted_examples/ directory")  
@@ -334,4 +311,5 @@ def main():
 
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    with tool_usage_log("extract_philosophical_examples"):
+        main()
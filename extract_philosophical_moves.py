@@ -11,6 +11,7 @@ import time
 from datetime import datetime
 
 from src.utils.api import APIHandler
+from src.utils.run_metrics import tool_usage_log
 
 
 def load_extraction_prompt() -> str:
@@ -226,4 +227,5 @@ def main():
 
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    with tool_usage_log("extract_philosophical_moves"):
+        main()
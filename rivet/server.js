@@ -6,8 +6,10 @@ const app = express();
 const listenPort = 4040;
 const debuggerServer = Rivet.startDebuggerServer({port: 8080});
 
-app.use(Express.urlencoded({ extended: true }))
-app.use(Express.json())
+// Large phase inputs (literature, developed moves) exceed the 100kb default;
+// gzipped request bodies are inflated by the body parser
+app.use(Express.urlencoded({ extended: true, limit: '50mb' }))
+app.use(Express.json({ limit: '50mb' }))
 
 
 app.get('/life', (req, res) => {
@@ -34,14 +36,14 @@ app.post('/litResearch', async (req, res) => {
       });
     }
     catch (err){
-      res.send({message: "Failed to execute graph"}).status(500)
+      res.status(500).send({message: "Failed to execute graph"})
       console.log("\n\n" + err + "\n\n")
       return;
     }
 
     console.log("Executed Graph: Literary Research Query")
 
-    res.send(graphOutput.output.value).status(200);
+    res.status(200).send(graphOutput.output.value);
 });
 
 app.post('/litResearch/papers', async (req, res) => {
@@ -69,18 +71,18 @@ app.post('/litResearch/papers', async (req, res) => {
     });
   }
   catch (err){
-    res.send({message: "Failed to execute graph"}).status(500)
+    res.status(500).send({message: "Failed to execute graph"})
     console.log("\n\n" + err + "\n\n")
     return;
   }
 
   console.log("Executed Graph: Get Literature Papers")
 
-  res.send(graphOutput.output.value).status(200);
+  res.status(200).send(graphOutput.output.value);
 });
 
 
-app.get('/mergedContext', async (req, res) => {
+const mergedContext = async (req, res) => {
 
   const openAIKey = req.body.openAIKey;
   const framework = req.body.framework;
@@ -88,7 +90,7 @@ app.get('/mergedContext', async (req, res) => {
   const key_moves = req.body.key_moves;
   const literature = req.body.literature;
   const final_selection = req.body.final_selection;
-  const development_moves = req.body.development_moves;
+  const development_moves = req.body.developed_moves ?? req.body.development_moves;
 
   let graphOutput = {}
 
@@ -127,15 +129,18 @@ app.get('/mergedContext', async (req, res) => {
   }
 
   catch (err){
-    res.send({message: "Failed to execute graph"}).status(500)
+    res.status(500).send({message: "Failed to execute graph"})
     console.log("\n\n" + err + "\n\n")
     return;
   }
 
   console.log("Executed Graph: Coalesce Previous Steps")
 
-  res.send(graphOutput.output.value).status(200);
-});
+  res.status(200).send(graphOutput.output.value);
+};
+
+app.post('/mergedContext', mergedContext);
+app.get('/mergedContext', mergedContext);
 
 // Start the server
 app.listen(listenPort, () => {
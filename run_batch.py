@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+Batch mode: run several papers through Phases II.1-III.2 concurrently.
+
+Each paper gets its own output directory (outputs/papers/<name>/) seeded
+with its Phase I final_selection.json. Papers run in parallel threads;
+within a paper the phases run in order. All papers share one API client
+pool, one response cache, one literature index and one global budget of
+concurrent API calls and tokens (parameters.batch in the config).
+
+Usage:
+    python run_batch.py --selections selections/*.json
+    python run_batch.py --selections a.json b.json --phases 2.1,2.2,2.3 --resume
+    python run_batch.py --selections a.json --trace   # outputs/papers/<name>/trace.json
+"""
+
+import argparse
+import importlib
+import json
+import os
+import shutil
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List
+
+from run_utils import caffeinate, run_directories, setup_logging
+from src.utils.api import load_config
+from src.utils.batch import ApiBudget, LiteratureIndex, ResponseCache, fresh_responses, install_batch_resources
+from src.utils.run_metrics import start_usage_log
+from src.utils.tracing import TRACE_ENV
+
+# Phase id -> (module, entry point), in pipeline order
+PHASES = {
+    "2.1": ("run_phase_2_1", "main"),
+    "2.2": ("run_phase_2_2", "main"),
+    "2.3": ("run_phase_2_3", "main"),
+    "2.4": ("run_phase_2_4", "main"),
+    "2.5": ("run_phase_2_5", "run_phase_one_five"),
+    "2.6": ("run_phase_2_6", "run_phase_2_6"),
+    "3.1": ("run_phase_3_1", "run_phase_3_1"),
+    "3.2": ("run_phase_3_2", "run_phase_3_2"),
+}
+
+BATCH_DIR = Path("./outputs/batch")
+PAPERS_ROOT = Path("./outputs/papers")
+
+
+def load_status(paper_dir: Path) -> Dict[str, Any]:
+    status_file = paper_dir / "batch_status.json"
+    if status_file.exists():
+        with open(status_file) as f:
+            return json.load(f)
+    return {"completed_phases": [], "phase_durations": {}}
+
+
+def save_status(paper_dir: Path, status: Dict[str, Any]) -> None:
+    tmp_file = paper_dir / "batch_status.json.tmp"
+    with open(tmp_file, "w") as f:
+        json.dump(status, f, indent=2)
+    tmp_file.replace(paper_dir / "batch_status.json")
+
+
+def prepare_paper(selection_file: Path) -> Path:
+    """Create the paper's output directory and seed it with its Phase I selection"""
+    paper_dir = PAPERS_ROOT / selection_file.stem
+    paper_dir.mkdir(parents=True, exist_ok=True)
+    target = paper_dir / "final_selection.json"
+    if not target.exists() or target.resolve() != selection_file.resolve():
+        shutil.copyfile(selection_file, target)
+    return paper_dir
+
+
+def run_paper(paper_dir: Path, phases: List[str], papers_dir: Path, resume: bool) -> Dict[str, Any]:
+    """Run one paper's phases in order inside its own output directory"""
+    status = load_status(paper_dir) if resume else {"completed_phases": [], "phase_durations": {}}
+    literature_dir = paper_dir / "papers" if (paper_dir / "papers").exists() else papers_dir
+    paper_start = time.time()
+
+    with run_directories(str(paper_dir), str(literature_dir)):
+        if not resume and phases[0] == next(iter(PHASES)):
+            start_usage_log()  # A fresh run of the paper: usage metrics cover this run only
+        for phase in phases:
+            if phase in status["completed_phases"]:
+                print(f"[{paper_dir.name}] Phase {phase} already complete, skipping")
+                continue
+
+            module_name, entry_point = PHASES[phase]
+            print(f"\n[{paper_dir.name}] Starting Phase {phase}")
+            phase_start = time.time()
+            # A phase that failed last time samples the model afresh instead of replaying its cached responses
+            rerun = status.get("failed_phase") == phase
+            try:
+                with fresh_responses() if rerun else nullcontext():
+                    getattr(importlib.import_module(module_name), entry_point)()
+            except (Exception, SystemExit) as e:  # Phase scripts call sys.exit on failure
+                status["failed_phase"] = phase
+                status["error"] = f"{type(e).__name__}: {e}"
+                save_status(paper_dir, status)
+                print(f"\n[{paper_dir.name}] ❌ Phase {phase} failed: {status['error']}")
+                traceback.print_exc()
+                break
+
+            status["phase_durations"][phase] = round(time.time() - phase_start, 1)
+            status["completed_phases"].append(phase)
+            status.pop("failed_phase", None)
+            status.pop("error", None)
+            save_status(paper_dir, status)
+            print(f"[{paper_dir.name}] ✓ Phase {phase} done in {status['phase_durations'][phase]}s")
+
+    status["paper"] = paper_dir.name
+    status["success"] = "failed_phase" not in status
+    status["duration"] = round(time.time() - paper_start, 1)
+    return status
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run several papers through the pipeline concurrently")
+    parser.add_argument("--selections", nargs="+", required=True,
+                        help="Phase I final_selection JSON files, one per paper")
+    parser.add_argument("--phases", default=",".join(PHASES),
+                        help="Comma-separated phases to run (default: all of II.1-III.2)")
+    parser.add_argument("--papers-dir", default="./papers",
+                        help="Shared literature PDFs (a paper's own papers/ directory takes precedence)")
+    parser.add_argument("--resume", action="store_true",
+                        help="Skip phases a paper has already completed")
+    parser.add_argument("--trace", action="store_true",
+                        help="Write a Chrome/Perfetto trace.json into each paper's output directory")
+    args = parser.parse_args()
+    if args.trace:
+        os.environ[TRACE_ENV] = "1"
+
+    phases = [phase.strip() for phase in args.phases.split(",") if phase.strip()]
+    unknown = [phase for phase in phases if phase not in PHASES]
+    if unknown:
+        raise ValueError(f"Unknown phases: {unknown}. Choose from {list(PHASES)}")
+
+    selection_files = [Path(path) for path in args.selections]
+    missing = [str(path) for path in selection_files if not path.exists()]
+    if missing:
+        raise ValueError(f"Selection files not found: {missing}")
+
+    setup_logging()
+    caffeinate()
+
+    settings = load_config().get("parameters", {}).get("batch", {})
+    BATCH_DIR.mkdir(parents=True, exist_ok=True)
+    api_budget = ApiBudget(
+        max_concurrent_calls=settings.get("max_concurrent_calls", 6),
+        token_budget=settings.get("token_budget"),
+    )
+    response_cache = ResponseCache(BATCH_DIR / "response_cache") if settings.get("response_cache", True) else None
+    install_batch_resources(api_budget, response_cache, LiteratureIndex(BATCH_DIR / "literature_index"))
+
+    paper_dirs = [prepare_paper(path) for path in selection_files]
+    max_papers = settings.get("max_concurrent_papers", 2)
+    print(f"Running {len(paper_dirs)} papers ({max_papers} at a time) through phases {', '.join(phases)}")
+
+    batch_start = time.time()
+    with ThreadPoolExecutor(max_workers=max_papers) as executor:
+        results = list(executor.map(
+            lambda paper_dir: run_paper(paper_dir, phases, Path(args.papers_dir), args.resume),
+            paper_dirs,
+        ))
+    install_batch_resources()
+    duration = time.time() - batch_start
+
+    completed = sum(1 for result in results if result["success"])
+    summary = {
+        "finished_at": datetime.now().isoformat(),
+        "phases": phases,
+        "duration_seconds": round(duration, 1),
+        "papers_completed": completed,
+        "papers_failed": len(results) - completed,
+        "papers_per_hour": round(completed / (duration / 3600), 2) if duration > 0 else None,
+        "api": api_budget.summary(),
+        "response_cache": {"hits": response_cache.hits, "misses": response_cache.misses} if response_cache else None,
+        "papers": results,
+    }
+    with open(BATCH_DIR / "batch_summary.json", "w") as f:
+        json.dump(summary, f, indent=2)
+
+    print("\n" + "=" * 60)
+    print("BATCH SUMMARY")
+    print("=" * 60)
+    for result in results:
+        state = "✅" if result["success"] else f"❌ (failed in Phase {result['failed_phase']})"
+        print(f"   {result['paper']}: {state} {result['duration']}s")
+    print(f"⏱️  {duration / 60:.1f} minutes, {summary['papers_per_hour']} papers/hour")
+    print(f"📊 {api_budget.calls} API calls, {api_budget.tokens_used} tokens")
+    print(f"📄 Summary: {BATCH_DIR / 'batch_summary.json'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -6,12 +6,14 @@ from src.phases.phase_one.conceptual_generate import ConceptualTopicGenerator
 from src.phases.phase_one.conceptual_evaluate import ConceptualTopicEvaluator
 from src.phases.phase_one.conceptual_topic_development import ConceptualTopicDeveloper
 from src.phases.phase_one.conceptual_final_select import FinalTopicSelector
+from src.utils.run_metrics import start_usage_log
 
 
 def run_phase_one_one():
     """Run stage 1 of Phase I"""
     try:
         print("\nStarting Phase I.1 pipeline...")
+        start_usage_log()  # A new run: API usage metrics cover this run only
 
         # Run each stage in sequence
         generator = ConceptualTopicGenerator()
@@ -4,12 +4,9 @@ import json
 import os
 import sys
 from dotenv import load_dotenv
-import requests
 
-from tavily import TavilyClient
-import markdownify
-
-from run_utils import check_rivet_life, load_final_selection
+from run_utils import check_rivet_life, load_final_selection, output_path
+from src.utils.rivet_client import rivet_client
 
 
 def get_lit_search_queries(final_selection):
@@ -21,24 +18,12 @@ def get_lit_search_queries(final_selection):
             "openAIKey": os.getenv("OPENAI_API_KEY"),
         }
 
-        headers = {"Content-Type": "application/json"}
-
-        response = requests.post(
-            "http://localhost:4040/litResearch",
-            data=json.dumps(request_data),
-            timeout=5000,
-            headers=headers,
-        )
-
-        if response.status_code == 200:
-            try:
-                return response.json()["queries"]
-            except ValueError:
-                print("Failed to decode JSON")
-        else:
+        response = rivet_client().run_graph("/litResearch", request_data)
+        try:
+            return json.loads(response)["queries"]
+        except (ValueError, KeyError):
             print("Search query generation request failed")
-            print(response.status_code)
-            print(response.content)
+            print(response)
             return
 
         print("Finished generating search queries")
@@ -58,20 +43,7 @@ def get_lit_papers(search_results, final_selection):
             "openAIKey": os.getenv("OPENAI_API_KEY"),
         }
 
-        headers = {"Content-Type": "application/json"}
-
-        response = requests.post(
-            "http://localhost:4040/litResearch/papers",
-            data=json.dumps(request_data),
-            timeout=5000,
-            headers=headers,
-        )
-
-        if response.status_code == 200:
-            try:
-                return response.content
-            except ValueError:
-                print("Failed to decode JSON")
+        return rivet_client().run_graph("/litResearch/papers", request_data)
 
     except Exception as e:
         print(f"\nError in Phase I.2 pipeline: {str(e)}")
@@ -81,6 +53,10 @@ def get_lit_papers(search_results, final_selection):
 def run_phase_one_two():
     """Run stage 2 of Phase I in sequence"""
 
+    # Only this phase uses them; keep importing the module cheap
+    from tavily import TavilyClient
+    import markdownify
+
     try:
         print("\nStarting Phase I.2 pipeline...")
         print("\nPlease make sure you started the rivet node server...")
@@ -126,8 +102,8 @@ def run_phase_one_two():
 
         print(papers)
 
-        print("\n\nSaving the output to ./outputs/literature_research_papers.md\n")
-        with open("./outputs/literature_research_papers.md", "w") as f:
+        print(f"\n\nSaving the output to {output_path('literature_research_papers.md')}\n")
+        with open(output_path("literature_research_papers.md"), "w") as f:
             f.write(papers)
 
         return papers
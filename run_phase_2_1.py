@@ -1,13 +1,12 @@
 # run_phase_two_one.py
 
-from pathlib import Path
 import json
 
-
-from run_utils import load_final_selection, setup_logging
+from run_utils import load_final_selection, output_path, papers_path, setup_logging, traced_phase
 from src.phases.phase_two.stages.stage_one.lit_processor import LiteratureManager
 
 
+@traced_phase("Phase II.1")
 def main():
     print("Starting Phase II.1: Literature Processing")
     setup_logging()
@@ -17,13 +16,13 @@ def main():
         final_selection = load_final_selection()
 
         # Get PDFs
-        papers_dir = Path("./papers")
+        papers_dir = papers_path()
         if not papers_dir.exists():
-            raise ValueError("Please create ./papers directory and add required PDFs")
+            raise ValueError(f"Please create {papers_dir} directory and add required PDFs")
 
         pdfs = list(papers_dir.glob("*.pdf"))
         if not pdfs:
-            raise ValueError("No PDFs found in ./papers directory")
+            raise ValueError(f"No PDFs found in {papers_dir} directory")
 
         print(f"\nFound {len(pdfs)} PDF files:")
         for pdf in pdfs:
@@ -32,8 +31,8 @@ def main():
         # Load config and process papers
         config = {
             "paths": {
-                "papers_dir": "./papers",
-                "output_dir": "./outputs",
+                "papers_dir": str(papers_dir),
+                "output_dir": str(output_path()),
                 "literature_output": {
                     "initial_readings": "literature_readings.json",
                     "synthesis": {
@@ -68,21 +67,10 @@ def main():
         result = manager.process_papers(pdfs, final_selection)
 
         # Save outputs properly
-        output_dir = Path("./outputs")
-
-        # Extract and save paper readings
-        paper_readings = {
-            paper_id: {
-                "initial": reading["initial"].modifications["initial_reading"],
-                "project_specific": reading["project_specific"].modifications[
-                    "project_specific_reading"
-                ],
-            }
-            for paper_id, reading in result["paper_readings"].items()
-        }
+        output_dir = output_path()
 
-        with open(output_dir / "literature_readings.json", "w") as f:
-            json.dump(paper_readings, f, indent=2)
+        # Readings were streamed to literature_readings.jsonl as each paper finished
+        result["readings_store"].export_json(output_dir / "literature_readings.json", result["paper_ids"])
 
         # Save synthesis
         if "synthesis" in result:
@@ -96,9 +84,9 @@ def main():
 
         print("\nPhase II.1 completed successfully!")
         print("\nOutputs saved to:")
-        print("- outputs/literature_readings.json")
-        print("- outputs/literature_synthesis.json")
-        print("- outputs/literature_synthesis.md")
+        print(f"- {output_dir / 'literature_readings.json'}")
+        print(f"- {output_dir / 'literature_synthesis.json'}")
+        print(f"- {output_dir / 'literature_synthesis.md'}")
 
     except Exception as e:
         print(f"\nError during Phase II.1: {str(e)}")
@@ -1,16 +1,18 @@
-import os
+import shutil
 import time
 from pathlib import Path
-import subprocess
-
 
 from run_utils import (
+    caffeinate,
     load_final_selection,
     load_framework,
     load_literature,
     load_outline,
+    output_path,
     setup_logging,
+    traced_phase,
 )
+from src.phases.core.speculation import SpeculativeStart, speculation_settings
 from src.phases.phase_two.stages.stage_two.workflows.abstract_workflow import (
     create_abstract_framework_workflow,
 )
@@ -21,8 +23,20 @@ from src.phases.phase_two.stages.stage_two.workflows.outline_workflow import (
     create_outline_workflow,
 )
 from src.utils.api import load_config
+from src.utils.artifacts import atomic_write_text
+
+
+def promote_workflow_output(source_dir: Path, target_dir: Path, workflow_name: str) -> None:
+    """Copy a workflow's final output and step files from source_dir into target_dir"""
+    step_dir = target_dir / workflow_name
+    if step_dir.exists():
+        shutil.rmtree(step_dir)
+    shutil.copytree(source_dir / workflow_name, step_dir)
+    final_output = f"{workflow_name}.json"
+    atomic_write_text(target_dir / final_output, (source_dir / final_output).read_text())
 
 
+@traced_phase("Phase II.2")
 def main():
     """Main execution for Phase 2"""
     phase_start_time = time.time()
@@ -31,14 +45,14 @@ def main():
     setup_logging()
 
     # Prevent sleep during execution
-    subprocess.Popen(["caffeinate", "-i", "-w", str(os.getpid())])
+    caffeinate()
 
     # Load configuration and inputs
     config = load_config()
 
     # Setup output directory
-    framework_dev_dir = Path("./outputs/framework_development")
-    framework_dev_dir.mkdir(exist_ok=True)
+    framework_dev_dir = output_path("framework_development")
+    framework_dev_dir.mkdir(parents=True, exist_ok=True)
 
     final_selection = load_final_selection()
     literature = load_literature()
@@ -60,6 +74,30 @@ def main():
         max_cycles=3,
     )
 
+    def create_outline(output_dir=framework_dev_dir):
+        return create_outline_workflow(
+            config, output_dir=output_dir, workflow_name="outline", max_cycles=3
+        )
+
+    # Speculative mode: start the outline from an intermediate framework version
+    # while the abstract workflow runs its remaining refinement cycles
+    speculation = speculation_settings(config)
+    speculative = None
+    # The speculative outline works in its own directory so a restart never
+    # mixes its versions and step files with the fresh run's
+    speculative_dir = framework_dev_dir / "speculative"
+    if speculation["enabled"]:
+        if speculative_dir.exists():
+            shutil.rmtree(speculative_dir)
+        speculative_outline = create_outline(speculative_dir)
+        speculative = SpeculativeStart(
+            lambda provisional: speculative_outline.execute(
+                {"framework": provisional, "literature": literature}
+            ),
+            after_version=speculation["start_after_version"],
+        )
+        abstract_framework_workflow.on_version(speculative.listener)
+
     abstract_framework_workflow.execute(abstract_initial_state)
     
     abstract_duration = time.time() - abstract_start_time
@@ -73,11 +111,30 @@ def main():
     outline_start_time = time.time()
     
     outline_initial_state = {"framework": framework, "literature": literature}
-    outline_workflow = create_outline_workflow(
-        config, output_dir=framework_dev_dir, workflow_name="outline", max_cycles=3
-    )
 
-    outline = outline_workflow.execute(outline_initial_state)
+    decision = "restart"
+    if speculative and speculative.started:
+        reconciliation = speculative.reconcile(framework, speculation)
+        decision = reconciliation.decision
+        print(f"🔮 Framework drift since the speculative start: {reconciliation.drift:.2f} → {decision}")
+        if decision == "restart":
+            speculative_outline.cancel()
+        try:
+            speculative.result()
+        except Exception as e:
+            print(f"Speculative outline development failed: {e}")
+            decision = "restart"
+        if decision == "refine":
+            speculative_outline.continue_cycles({"framework": framework}, cycles=1)
+        if decision != "restart" and not (speculative_dir / "outline.json").exists():
+            print("Speculative outline produced no final output")
+            decision = "restart"
+        if decision != "restart":
+            promote_workflow_output(speculative_dir, framework_dev_dir, "outline")
+
+    if decision == "restart":
+        outline_workflow = create_outline()
+        outline_workflow.execute(outline_initial_state)
     
     outline_duration = time.time() - outline_start_time
     print(f"⏱️  Outline Development completed in {outline_duration:.1f} seconds")
@@ -1,4 +1,3 @@
-from pathlib import Path
 import time
 
 from run_utils import (
@@ -7,7 +6,9 @@ from run_utils import (
     load_key_moves,
     load_literature,
     load_outline,
+    output_path,
     setup_logging,
+    traced_phase,
 )
 from src.phases.phase_two.stages.stage_three.workflows.master_workflow import (
     process_all_key_moves,
@@ -15,6 +16,7 @@ from src.phases.phase_two.stages.stage_three.workflows.master_workflow import (
 from src.utils.api import load_config
 
 
+@traced_phase("Phase II.3")
 def main():
     """Main execution for Phase II.3: Key Moves Development"""
     print("Starting Phase II.3: Key Moves Development")
@@ -32,8 +34,8 @@ def main():
     config = load_config()
 
     # Setup output directory
-    key_moves_dev_dir = Path("./outputs/key_moves_development")
-    key_moves_dev_dir.mkdir(exist_ok=True)
+    key_moves_dev_dir = output_path("key_moves_development")
+    key_moves_dev_dir.mkdir(parents=True, exist_ok=True)
 
     # Load required data
     framework = load_framework()
@@ -2,7 +2,6 @@ import json
 import os
 import sys
 from dotenv import load_dotenv
-import requests
 
 from run_utils import (
     check_rivet_life,
@@ -12,7 +11,10 @@ from run_utils import (
     load_key_moves,
     load_literature,
     load_outline,
+    output_path,
+    traced_phase,
 )
+from src.utils.rivet_client import rivet_client
 
 
 def get_merged_context(
@@ -31,26 +33,15 @@ def get_merged_context(
             "openAIKey": os.getenv("OPENAI_API_KEY"),
         }
 
-        headers = {"Content-Type": "application/json"}
-
-        response = requests.get(
-            "http://localhost:4040/mergedContext",
-            data=json.dumps(request_data),
-            timeout=5000,
-            headers=headers,
-        )
-
-        if response.status_code == 200:
-            try:
-                return response.content
-            except ValueError:
-                print("Failed to decode JSON")
+        # Unchanged inputs are answered from the Rivet result cache
+        return rivet_client().run_graph("/mergedContext", request_data)
 
     except Exception as e:
         print(f"\nError in calling the Rivet server: {str(e)}")
         sys.exit(1)
 
 
+@traced_phase("Phase II.5")
 def run_phase_one_five():
     """Run stage  Phase II.5 in sequence"""
 
@@ -77,7 +68,7 @@ def run_phase_one_five():
         )
         context = json.loads(context)
 
-        with open("./outputs/phase_3_context.json", "w") as f:
+        with open(output_path("phase_3_context.json"), "w") as f:
             f.write(json.dumps(context, indent=2))
         return context
 
@@ -1,48 +1,42 @@
-import json
 import os
 import sys
 from pathlib import Path
 from typing import Dict, Any, List
 
+from run_utils import output_path, traced_phase
+from src.utils.artifacts import artifact_exists, load_artifact, reference_artifact, save_artifact
+from src.utils.section_context import map_sections_to_content
+
+# Upstream artifacts the writing context refers to: name in the context -> registry name
+WRITING_INPUTS = {
+    "abstract_framework": "framework",
+    "developed_moves": "developed_moves",
+    "detailed_outline": "detailed_outline",
+    "literature_context": "phase_3_context",
+}
+
 
 def load_abstract_framework() -> Dict[str, Any]:
     """Load the final abstract framework from Phase II.2"""
-    try:
-        with open("./outputs/framework_development/abstract_framework.json") as f:
-            data = json.load(f)
-            return data.get("abstract_framework", {})
-    except FileNotFoundError:
-        raise ValueError("Could not find abstract_framework.json. Run Phase II.2 first.")
+    return load_artifact("framework", output_path())
 
 
 def load_developed_key_moves() -> List[Dict[str, Any]]:
     """Load the fully developed key moves from Phase II.3"""
-    try:
-        with open("./outputs/key_moves_development/key_moves_development/all_developed_moves.json") as f:
-            data = json.load(f)
-            return data.get("developed_moves", [])
-    except FileNotFoundError:
-        raise ValueError("Could not find all_developed_moves.json. Run Phase II.3 first.")
+    return load_artifact("developed_moves", output_path())
 
 
 def load_detailed_outline() -> Dict[str, Any]:
     """Load the final detailed outline from Phase II.4"""
-    try:
-        with open("./outputs/detailed_outline/detailed_outline_final.json") as f:
-            return json.load(f)
-    except FileNotFoundError:
-        raise ValueError("Could not find detailed_outline_final.json. Run Phase II.4 first.")
+    return load_artifact("detailed_outline", output_path())
 
 
 def load_literature_context() -> Dict[str, Any]:
     """Load the literature context from existing Phase II.5 output if available"""
-    try:
-        with open("./outputs/phase_3_context.json") as f:
-            data = json.load(f)
-            return data.get("literature", {})
-    except FileNotFoundError:
+    if not artifact_exists("phase_3_context", output_path()):
         print("No existing literature context found. This is okay - continuing without it.")
         return {}
+    return load_artifact("phase_3_context", output_path()).get("literature", {})
 
 
 def extract_section_structure(detailed_outline: Dict[str, Any]) -> List[Dict[str, Any]]:
@@ -156,6 +150,17 @@ def create_content_bank(developed_moves: List[Dict[str, Any]]) -> Dict[str, Any]
     }
 
 
+def writing_input_refs() -> Dict[str, Dict[str, Any]]:
+    """Content-addressed references to the upstream artifacts that exist"""
+    refs = {}
+    for name, artifact in WRITING_INPUTS.items():
+        if artifact_exists(artifact, output_path()):
+            refs[name] = reference_artifact(artifact, output_path())
+    if "literature_context" in refs:
+        refs["literature_context"]["key"] = "literature"
+    return refs
+
+
 def create_writing_context(
     abstract_framework: Dict[str, Any],
     developed_moves: List[Dict[str, Any]], 
@@ -167,6 +172,9 @@ def create_writing_context(
     sections = extract_section_structure(detailed_outline)
     content_bank = create_content_bank(developed_moves)
     
+    # Which arguments and examples each section's prompts carry in full
+    section_content_map = map_sections_to_content(sections, content_bank)
+    
     # Extract key paper information
     main_thesis = abstract_framework.get("main_thesis", "")
     abstract = abstract_framework.get("abstract", "")
@@ -180,15 +188,13 @@ def create_writing_context(
         },
         "sections": sections,
         "content_bank": content_bank,
-        "raw_inputs": {
-            "abstract_framework": abstract_framework,
-            "developed_moves": developed_moves,
-            "detailed_outline": detailed_outline,
-            "literature_context": literature_context
-        }
+        "section_content_map": section_content_map,
+        # References, not copies: Phase III loads these lazily if it needs them
+        "raw_inputs": writing_input_refs()
     }
 
 
+@traced_phase("Phase II.6")
 def run_phase_2_6():
     """Run Phase II.6: Create writing-optimized context for Phase III"""
     
@@ -225,9 +231,7 @@ def run_phase_2_6():
         print(f"   ✓ Created content bank with {len(writing_context['content_bank']['arguments'])} arguments")
         
         # Save the writing context
-        output_file = "./outputs/phase_3_writing_context.json"
-        with open(output_file, "w") as f:
-            json.dump(writing_context, f, indent=2)
+        output_file = save_artifact("writing_context", writing_context, output_path())
         
         print(f"\n✓ Phase II.6 complete! Writing context saved to: {output_file}")
         
@@ -241,7 +245,9 @@ def run_phase_2_6():
         
         print(f"\nSections:")
         for i, section in enumerate(writing_context['sections']):
-            print(f"  {i+1}. {section['section_name']} ({section['word_target']} words)")
+            moves = [str(move + 1) for move in writing_context['section_content_map'][i]['arguments']]
+            uses = f", moves {', '.join(moves)}" if moves else ""
+            print(f"  {i+1}. {section['section_name']} ({section['word_target']} words{uses})")
         
         print(f"\nContent bank:")
         print(f"  - {len(writing_context['content_bank']['arguments'])} developed arguments")
@@ -1,28 +1,86 @@
-import json
 import os
 import sys
 import time
 from pathlib import Path
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 
 from src.phases.phase_three.stages.stage_one.workers.writing.section_writer import SectionWritingWorker
+from src.phases.phase_three.stages.stage_one.workers.writing.length_adjuster import LengthAdjustmentWorker
 from src.phases.phase_three.stages.stage_one.workers.critic.section_critic import SectionCriticWorker
 from src.phases.phase_three.stages.stage_one.workers.refinement.section_refinement import SectionRefinementWorker
+from run_utils import output_path, traced_phase
 from src.utils.api import load_config
+from src.utils.artifact_refs import LazyArtifacts
+from src.utils.artifacts import atomic_write_json, load_artifact, save_artifact
+from src.utils.length_control import WordBudget, count_words, fit_length, length_settings
+from src.utils.tracing import span
 
 
 def load_writing_context() -> Dict[str, Any]:
-    """Load the writing context created by Phase II.6"""
-    try:
-        with open("./outputs/phase_3_writing_context.json") as f:
-            return json.load(f)
-    except FileNotFoundError:
-        raise ValueError("Could not find phase_3_writing_context.json. Run Phase II.6 first.")
+    """Load the writing context created by Phase II.6
+
+    The file is parsed once per process; upstream artifacts in
+    ``raw_inputs`` are only loaded if something reads them.
+    """
+    writing_context = dict(load_artifact("writing_context", output_path(), shared=True))
+
+    raw_inputs = writing_context.get("raw_inputs", {})
+    if raw_inputs and all(isinstance(ref, dict) and "sha256" in ref for ref in raw_inputs.values()):
+        writing_context["raw_inputs"] = LazyArtifacts(raw_inputs, output_path())
+    return writing_context
+
+
+def with_word_target(writing_context: Dict[str, Any], section_index: int, word_target: int) -> Dict[str, Any]:
+    """Shallow copy of the writing context with one section's word target replaced"""
+    sections = list(writing_context["sections"])
+    sections[section_index] = dict(sections[section_index], word_target=word_target)
+    return dict(writing_context, sections=sections)
+
+
+def control_length(writing_context: Dict[str, Any], section_index: int, content: str,
+                   config: Dict[str, Any]) -> str:
+    """Fix a small length miss with a paragraph-level rewrite instead of a full refinement"""
+    settings = length_settings(config)
+    if not settings["enabled"]:
+        return content
+    word_target = writing_context["sections"][section_index]["word_target"]
 
+    def rewrite(paragraphs, plan):
+        adjuster = LengthAdjustmentWorker(config)
+        output = adjuster.execute({
+            "writing_context": writing_context,
+            "section_index": section_index,
+            "paragraphs": paragraphs,
+            "plan": plan,
+        })
+        return output.modifications["paragraphs"]
+
+    with span("length control", "section", target=word_target):
+        try:
+            fitted, plan = fit_length(content, word_target, settings, rewrite)
+        except Exception as e:  # The fix is optional: any failure keeps the section as written
+            print(f"⚠️  Length adjustment failed ({type(e).__name__}), keeping the section as written: {e}")
+            return content
+
+    if plan.action in ("expand", "trim"):
+        print(f"📏 Length fix ({plan.action}, {len(plan.paragraph_targets)} paragraphs): "
+              f"{plan.actual} → {count_words(fitted)} words (target {word_target})")
+    elif plan.action == "leave":
+        print(f"📏 {plan.actual} words is too far from the {word_target}-word target for a local fix; "
+              "leaving it to critique")
+    return fitted
 
-def process_section_with_critique(writing_context: Dict[str, Any], section_index: int, config: Dict[str, Any]) -> Dict[str, Any]:
-    """Process a single section through the full 3-stage pipeline: write → critique → refine"""
+
+def process_section_with_critique(writing_context: Dict[str, Any], section_index: int, config: Dict[str, Any],
+                                  word_target: Optional[int] = None) -> Dict[str, Any]:
+    """Process a single section through the full 3-stage pipeline: write → critique → refine
+
+    ``word_target`` overrides the outline's target for this section (the
+    running word budget); word counts are always counted locally.
+    """
     
+    if word_target is not None:
+        writing_context = with_word_target(writing_context, section_index, word_target)
     section = writing_context["sections"][section_index]
     print(f"\n{'='*70}")
     print(f"Processing Section {section_index + 1}: {section['section_name']}")
@@ -45,8 +103,10 @@ def process_section_with_critique(writing_context: Dict[str, Any], section_index
     if write_output.status != "completed":
         raise Exception(f"Writing failed: {write_output.notes}")
     
-    initial_content = write_output.modifications["section_content"]
-    initial_word_count = write_output.modifications["word_count"]
+    initial_content = control_length(
+        writing_context, section_index, write_output.modifications["section_content"], config
+    )
+    initial_word_count = count_words(initial_content)
     print(f"✓ Initial draft complete: {initial_word_count} words")
     
     # STAGE 2: Critique the section
@@ -91,8 +151,10 @@ def process_section_with_critique(writing_context: Dict[str, Any], section_index
         if refinement_output.status != "completed":
             raise Exception(f"Refinement failed: {refinement_output.notes}")
         
-        final_content = refinement_output.modifications["section_content"]
-        final_word_count = refinement_output.modifications["word_count"]
+        final_content = control_length(
+            writing_context, section_index, refinement_output.modifications["section_content"], config
+        )
+        final_word_count = count_words(final_content)
         changes_made = refinement_output.modifications.get("changes_made", [])
         
         print(f"✓ Refinement complete: {final_word_count} words, {len(changes_made)} changes made")
@@ -101,6 +163,7 @@ def process_section_with_critique(writing_context: Dict[str, Any], section_index
     
     return {
         "section_content": final_content,
+        "word_target": section["word_target"],
         "word_count": final_word_count,
         "initial_word_count": initial_word_count,
         "assessment": assessment,
@@ -124,6 +187,7 @@ def save_progress(writing_context: Dict[str, Any], sections_data: List[Dict[str,
             {
                 "section_name": writing_context["sections"][i]["section_name"],
                 "target_words": writing_context["sections"][i]["word_target"],
+                "budget_words": sections_data[i].get("word_target", writing_context["sections"][i]["word_target"]),
                 "actual_words": sections_data[i]["word_count"],
                 "initial_words": sections_data[i]["initial_word_count"],
                 "assessment": sections_data[i]["assessment"],
@@ -144,10 +208,9 @@ def save_progress(writing_context: Dict[str, Any], sections_data: List[Dict[str,
         }
     }
     
-    with open("./outputs/phase_3_1_progress.json", "w") as f:
-        json.dump(progress_data, f, indent=2)
+    atomic_write_json(output_path("phase_3_1_progress.json"), progress_data)
     
-    print(f"📄 Progress saved to: ./outputs/phase_3_1_progress.json")
+    print(f"📄 Progress saved to: {output_path('phase_3_1_progress.json')}")
     print(f"   Sections completed: {sections_completed}/{len(writing_context['sections'])}")
     print(f"   Words written: {total_words}")
     print(f"   Sections refined: {sections_refined}")
@@ -169,6 +232,7 @@ def create_complete_draft(writing_context: Dict[str, Any], sections_data: List[D
     return "\n\n".join(paper_parts)
 
 
+@traced_phase("Phase III.1")
 def run_phase_3_1():
     """Run Phase III.1: Section-by-section writing with critique and refinement"""
     
@@ -192,14 +256,23 @@ def run_phase_3_1():
         print(f"   ✓ Found {len(sections)} sections to process")
         print(f"   ✓ Target paper length: {writing_context['paper_overview']['target_words']} words")
         
-        # Process each section through the full pipeline
+        # Process each section through the full pipeline; earlier sections' length
+        # misses shift the targets of later ones so the paper stays near its target
+        length_control = length_settings(config)
+        budget = WordBudget([section["word_target"] for section in sections], length_control["carry_over"])
         sections_processed = []
         total_words = 0
         total_refined = 0
         
         for i, section in enumerate(sections):
-            section_data = process_section_with_critique(writing_context, i, config)
+            with span(f"section {i + 1}", "section", title=section["section_name"]):
+                word_target = budget.target_for(i) if length_control["enabled"] else None
+                if word_target is not None and word_target != section["word_target"]:
+                    print(f"\n📐 Section {i + 1} target adjusted to {word_target} words "
+                          f"(planned {section['word_target']}) to absorb earlier sections")
+                section_data = process_section_with_critique(writing_context, i, config, word_target)
             sections_processed.append(section_data)
+            budget.record(i, section_data["word_count"])
             
             # Update running totals
             total_words += section_data["word_count"]
@@ -207,7 +280,7 @@ def run_phase_3_1():
                 total_refined += 1
             
             # Calculate target difference
-            target = section["word_target"]
+            target = section_data["word_target"]
             actual = section_data["word_count"]
             diff = actual - target
             diff_str = f"+{diff}" if diff > 0 else str(diff)
@@ -224,8 +297,7 @@ def run_phase_3_1():
         complete_draft = create_complete_draft(writing_context, sections_processed)
         
         # Save the draft
-        with open("./outputs/phase_3_1_draft.md", "w") as f:
-            f.write(complete_draft)
+        save_artifact("draft", complete_draft, output_path())
         
         end_time = time.time()
         duration = end_time - start_time
@@ -236,7 +308,7 @@ def run_phase_3_1():
         print(f"   Total words: {total_words}")
         print(f"   Target words: {writing_context['paper_overview']['target_words']}")
         print(f"   Sections refined: {total_refined}")
-        print(f"   Draft saved to: ./outputs/phase_3_1_draft.md")
+        print(f"   Draft saved to: {output_path('phase_3_1_draft.md')}")
         print(f"⏱️  Phase III.1 duration: {duration:.1f} seconds ({duration/60:.1f} minutes)")
         
         # Print section analysis
@@ -3,22 +3,26 @@ import os
 import sys
 import time
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, List
 
+from run_utils import output_path, traced_phase
 from src.phases.phase_three.stages.stage_two.workers.reader.paper_reader import PaperReaderWorker
 from src.phases.phase_three.stages.stage_two.workers.integration.paper_integration import PaperIntegrationWorker
+from src.phases.phase_three.stages.stage_two.workers.integration.section_integration import SectionIntegrationWorker
 from src.utils.api import load_config
+from src.utils.map_reduce import map_bounded
+from src.utils.paper_sections import PaperSection, split_sections, splice_sections, map_issues_to_sections
 
 
 def load_phase_3_1_output() -> Dict[str, Any]:
     """Load the output from Phase III.1"""
     try:
         # Load the draft paper
-        with open("./outputs/phase_3_1_draft.md", "r") as f:
+        with open(output_path("phase_3_1_draft.md"), "r") as f:
             draft_paper = f.read()
         
         # Load the progress metadata
-        with open("./outputs/phase_3_1_progress.json", "r") as f:
+        with open(output_path("phase_3_1_progress.json"), "r") as f:
             progress_data = json.load(f)
         
         return {
@@ -60,10 +64,114 @@ def analyze_paper_globally(phase_3_1_output: Dict[str, Any], config: Dict[str, A
     return analysis_output.modifications
 
 
-def integrate_improvements(phase_3_1_output: Dict[str, Any], analysis_results: Dict[str, Any], 
+def integrate_improvements(phase_3_1_output: Dict[str, Any], analysis_results: Dict[str, Any],
                          config: Dict[str, Any]) -> Dict[str, Any]:
-    """Integrate improvements into the paper based on analysis"""
-    
+    """Integrate improvements into the paper based on analysis
+
+    Sectioned mode (the default) revises only the sections the analysis
+    issues point at; full mode regenerates the whole paper in one call.
+    """
+    integration_config = config.get("parameters", {}).get("integration", {})
+    mode = integration_config.get("mode", "sectioned")
+
+    if mode == "sectioned":
+        sections = split_sections(phase_3_1_output["draft_paper"])
+        if sum(1 for section in sections if section.revisable and section.heading) >= 2:
+            return integrate_sections(phase_3_1_output, analysis_results, sections, integration_config, config)
+        print("   Draft has too few headed sections for sectioned integration, using full-paper mode")
+
+    return integrate_full_paper(phase_3_1_output, analysis_results, config)
+
+
+def _section_excerpt(section: PaperSection, from_end: bool, max_words: int = 150) -> str:
+    """Return the opening or closing words of a section for transition context"""
+    words = section.body.split()
+    if len(words) <= max_words:
+        return section.text.strip()
+    excerpt = " ".join(words[-max_words:] if from_end else words[:max_words])
+    return f"{section.heading}\n...{excerpt}" if from_end else f"{section.heading}\n{excerpt}..."
+
+
+def integrate_sections(phase_3_1_output: Dict[str, Any], analysis_results: Dict[str, Any],
+                       sections: List[PaperSection], integration_config: Dict[str, Any],
+                       config: Dict[str, Any]) -> Dict[str, Any]:
+    """Integrate improvements section by section, revising affected sections concurrently"""
+
+    print(f"\n✨ Stage 2: Sectioned Paper Integration")
+
+    issues = analysis_results.get("major_issues", []) + analysis_results.get("minor_issues", [])
+    issues += analysis_results.get("priority_actions", [])
+    issue_map = map_issues_to_sections(issues, sections)
+
+    section_map = "\n".join(
+        f"{'→ ' if section.index in issue_map else '  '}{section.heading.lstrip('# ')}"
+        for section in sections if section.heading
+    )
+    print(f"Mapped {len(issues)} issues onto {len(issue_map)} of {len(sections)} sections")
+    for section in sections:
+        if section.index in issue_map:
+            print(f"   • {section.heading.lstrip('# ')}: {len(issue_map[section.index])} issue(s)")
+
+    def revise(section: PaperSection) -> Dict[str, Any]:
+        previous_section = sections[section.index - 1] if section.index > 0 else None
+        next_section = sections[section.index + 1] if section.index + 1 < len(sections) else None
+        worker = SectionIntegrationWorker(config)
+        return worker.execute({
+            "section_index": section.index,
+            "section_text": section.text.strip(),
+            "section_heading": section.heading,
+            "section_issues": issue_map[section.index],
+            "paper_overview": phase_3_1_output["paper_overview"],
+            "section_map": section_map,
+            "previous_excerpt": _section_excerpt(previous_section, from_end=True) if previous_section else "",
+            "next_excerpt": _section_excerpt(next_section, from_end=False) if next_section else "",
+        })
+
+    targets = [section for section in sections if section.index in issue_map]
+    max_workers = max(1, min(integration_config.get("max_concurrent_sections", 4), len(targets) or 1))
+    results, failures = map_bounded(revise, targets, workers=max_workers)
+    for section, error in failures:
+        print(f"   ⚠️ Kept original text for {section.heading.lstrip('# ')}: revision failed ({error})")
+
+    replacements = {}
+    changes_made = []
+    for section, output in results:
+        if output.status == "completed":
+            replacements[section.index] = output.modifications["section_text"]
+            changes_made.append(
+                f"{section.heading.lstrip('# ')}: addressed {len(issue_map[section.index])} issue(s)"
+            )
+        else:
+            print(f"   ⚠️ Kept original text for {section.heading.lstrip('# ')}")
+
+    final_paper = splice_sections(sections, replacements)
+    final_word_count = len(final_paper.split())
+
+    print(f"✓ Integration complete: {final_word_count} words")
+    print(f"  Sections revised: {len(replacements)}/{len(sections)}")
+
+    return {
+        "final_paper": final_paper,
+        "integration_summary": (
+            f"Revised {len(replacements)} of {len(sections)} sections to address "
+            f"{len(issues)} analysis issues; remaining sections unchanged."
+        ),
+        "changes_made": changes_made,
+        "final_statistics": {
+            "Final word count": str(final_word_count),
+            "Sections": str(len(sections)),
+            "Sections revised": str(len(replacements)),
+            "Integration mode": "sectioned",
+        },
+        "final_word_count": final_word_count,
+        "sections_revised": [sections[index].heading.lstrip("# ") for index in sorted(replacements)],
+    }
+
+
+def integrate_full_paper(phase_3_1_output: Dict[str, Any], analysis_results: Dict[str, Any],
+                         config: Dict[str, Any]) -> Dict[str, Any]:
+    """Integrate improvements by regenerating the complete paper in one call"""
+
     print(f"\n✨ Stage 2: Paper Integration")
     print(f"Implementing improvements for final publication-ready version...")
     
@@ -102,7 +210,7 @@ def save_final_paper(integration_results: Dict[str, Any], analysis_results: Dict
     final_paper = integration_results["final_paper"]
     
     # Save final paper
-    final_paper_file = "./outputs/final_paper.md"
+    final_paper_file = output_path("final_paper.md")
     with open(final_paper_file, "w") as f:
         f.write(final_paper)
     
@@ -115,6 +223,7 @@ def save_final_paper(integration_results: Dict[str, Any], analysis_results: Dict
             "minor_issues_found": len(analysis_results["minor_issues"]),
             "integration_summary": integration_results["integration_summary"],
             "changes_implemented": len(integration_results["changes_made"]),
+            "sections_revised": integration_results.get("sections_revised", []),
             "final_statistics": integration_results["final_statistics"]
         },
         "phase_3_1_metadata": phase_3_1_output["metadata"],
@@ -127,7 +236,7 @@ def save_final_paper(integration_results: Dict[str, Any], analysis_results: Dict
     }
     
     # Save metadata
-    metadata_file = "./outputs/final_paper_metadata.json"
+    metadata_file = output_path("final_paper_metadata.json")
     with open(metadata_file, "w") as f:
         json.dump(metadata, f, indent=2)
     
@@ -137,6 +246,7 @@ def save_final_paper(integration_results: Dict[str, Any], analysis_results: Dict
     return final_paper_file
 
 
+@traced_phase("Phase III.2")
 def run_phase_3_2():
     """Run Phase III.2: Global Paper Integration and Final Polish"""
     
@@ -1,89 +1,100 @@
-import json
+import functools
 import logging
 import os
 import subprocess
-from typing import Any, Dict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, Optional
 
-import requests
+from src.utils.artifacts import load_artifact
+from src.utils.run_metrics import API_USAGE_FILE, usage_log
+from src.utils.tracing import trace_run
+
+# Per-paper output and literature directories; batch mode sets these per thread
+_output_dir: ContextVar[str] = ContextVar("output_dir", default="./outputs")
+_papers_dir: ContextVar[str] = ContextVar("papers_dir", default="./papers")
+
+
+def output_path(*parts: str) -> Path:
+    """Path inside the current run's output directory"""
+    return Path(_output_dir.get()).joinpath(*parts)
+
+
+def papers_path() -> Path:
+    """Directory holding the current run's literature PDFs"""
+    return Path(_papers_dir.get())
+
+
+@contextmanager
+def run_directories(output_dir: str, papers_dir: Optional[str] = None) -> Iterator[Path]:
+    """Point output_path/papers_path at another paper's directories"""
+    output_token = _output_dir.set(str(output_dir))
+    papers_token = _papers_dir.set(str(papers_dir)) if papers_dir else None
+    try:
+        with usage_log(Path(output_dir) / API_USAGE_FILE), \
+                trace_run(f"run {Path(output_dir).name}", Path(output_dir) / "trace.json"):
+            yield Path(output_dir)
+    finally:
+        _output_dir.reset(output_token)
+        if papers_token is not None:
+            _papers_dir.reset(papers_token)
+
+
+def traced_phase(name: str) -> Callable:
+    """Run a phase entry point as a trace span
+
+    Inside a traced run (batch mode) the phase is one span of the run's
+    trace; run standalone with PIPELINE_TRACE=1 it writes its own trace
+    to outputs/traces/.
+    """
+    def decorator(entry_point: Callable) -> Callable:
+        @functools.wraps(entry_point)
+        def wrapper(*args, **kwargs):
+            trace_file = output_path("traces", f"{entry_point.__module__}.json")
+            with trace_run(name, trace_file, cat="phase"):
+                return entry_point(*args, **kwargs)
+        return wrapper
+    return decorator
 
 
 def load_final_selection() -> Dict[str, Any]:
     """Load final selection from Phase I"""
-    try:
-        with open("./outputs/final_selection.json") as f:
-            return json.load(f)
-    except FileNotFoundError:
-        raise ValueError("Could not find final_selection.json. Run Phase I first.")
+    return load_artifact("final_selection", output_path())
 
 
 def load_framework() -> Dict[str, Any]:
     """Load framework"""
-    try:
-        with open("./outputs/framework_development/abstract_framework.json") as f:
-            return json.load(f)["abstract_framework"]
-    except FileNotFoundError:
-        raise ValueError("Could not find abstract_framework.json.")
+    return load_artifact("framework", output_path())
 
 
 def load_outline() -> Dict[str, Any]:
     """Load outline"""
-    try:
-        with open("./outputs/framework_development/outline.json") as f:
-            return json.load(f)["outline"]
-    except FileNotFoundError:
-        raise ValueError("Could not find outline.json.")
+    return load_artifact("outline", output_path())
 
 
 def load_key_moves() -> Dict[str, Any]:
     """Load key moves"""
-    try:
-        with open("./outputs/framework_development/key_moves.json") as f:
-            return json.load(f)["key_moves"]
-    except FileNotFoundError:
-        raise ValueError("Could not find key_moves.json.")
+    return load_artifact("key_moves", output_path())
 
 
 def load_developed_key_moves() -> Dict[str, Any]:
     """Load Developed key moves"""
-    try:
-        with open(
-            "./outputs/key_moves_development/key_moves_development/all_developed_moves.json"
-        ) as f:
-            return json.load(f)["developed_moves"]
-    except FileNotFoundError:
-        raise ValueError("Could not find all_developed_json.json.")
+    return load_artifact("developed_moves", output_path())
 
 
 def load_literature() -> Dict[str, Any]:
     """Load literature analysis from Phase II.1"""
-    try:
-        lit_readings = json.load(open("./outputs/literature_readings.json"))
-        lit_synthesis = json.load(open("./outputs/literature_synthesis.json"))
-        with open("./outputs/literature_synthesis.md") as f:
-            lit_narrative = f.read()
-        return {
-            "readings": lit_readings,
-            "synthesis": lit_synthesis,
-            "narrative": lit_narrative,
-        }
-    except FileNotFoundError as e:
-        raise ValueError(f"Missing literature files. Run Phase II.1 first. Error: {e}")
+    return {
+        "readings": load_artifact("literature_readings", output_path()),
+        "synthesis": load_artifact("literature_synthesis", output_path()),
+        "narrative": load_artifact("literature_narrative", output_path()),
+    }
 
 
 def load_developed_moves() -> Dict[str, Any]:
     """Load all developed key moves"""
-    try:
-        lit_readings = json.load(open("./outputs/literature_readings.json"))
-        lit_synthesis = json.load(open("./outputs/literature_synthesis.json"))
-        with open("./outputs/literature_synthesis.md") as f:
-            lit_narrative = f.read()
-        return {
-            "readings": lit_readings,
-            "synthesis": lit_synthesis,
-            "narrative": lit_narrative,
-        }
-    except FileNotFoundError as e:
-        raise ValueError(f"Missing literature files. Run Phase II.1 first. Error: {e}")
+    return load_developed_key_moves()
 
 
 def caffeinate():
@@ -104,13 +115,14 @@ def setup_logging():
     )
 
 
-def check_rivet_life() -> Dict[str, Any]:
+def check_rivet_life() -> None:
     """Check if Rivet server is up"""
-    try:
-        result = requests.get("http://localhost:4040/life", timeout=5000)
-        if result.ok:
-            print("Rivet alive")
-    except ConnectionError:
+    from src.utils.rivet_client import rivet_client
+
+    client = rivet_client()
+    if not client.alive():
         raise ValueError(
-            "Could not connect to the Rivet server. Please run `node ./rivet/app.js --watch` in another terminal process"
+            f"Could not connect to the Rivet server at {client.base_url}. "
+            "Please run `cd rivet && node server.js` in another terminal process"
         )
+    print("Rivet alive")
@@ -1,9 +1,10 @@
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Type
 
 from src.phases.phase_two.base.framework import ValidationError
 from src.utils.api import APIHandler
+from src.utils.batch import reject_last_response
 
 
 @dataclass
@@ -66,6 +67,28 @@ class BaseWorker(ABC):
             return self.prompts.get_system_prompt()
         return None
 
+    def _respond(self, prompt: str, system_prompt: Optional[str]) -> str:
+        """Get the model's response to the worker prompt"""
+        return self.api_handler.make_api_call(
+            stage=self.stage_name,
+            prompt=prompt,
+            system_prompt=system_prompt
+        )
+
+    def _checked_output(self, response: str, error: Type[Exception] = ValidationError) -> WorkerOutput:
+        """Process and validate a response; a rejected response is dropped from the response cache"""
+        try:
+            output = self.process_output(response)
+            valid = self.validate_output(output)
+        except Exception:
+            reject_last_response()
+            raise
+        if not valid:
+            reject_last_response()
+            print(response)
+            raise error("Worker output failed validation: ", self.stage_name)
+        return output
+
     def execute(self, state: Dict[str, Any]) -> WorkerOutput:
         """Main execution method"""
         input_data = self.process_input(state)
@@ -73,13 +96,5 @@ class BaseWorker(ABC):
         # Get system prompt if available
         system_prompt = self.get_system_prompt()
         
-        response = self.api_handler.make_api_call(
-            stage=self.stage_name, 
-            prompt=self._construct_prompt(input_data),
-            system_prompt=system_prompt
-        )
-        output = self.process_output(response)
-        if not self.validate_output(output):
-            print(response)
-            raise ValidationError("Worker output failed validation: ", self.stage_name)
-        return output
+        response = self._respond(self._construct_prompt(input_data), system_prompt)
+        return self._checked_output(response)
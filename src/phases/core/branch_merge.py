@@ -0,0 +1,148 @@
+import re
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+
+DEFAULT_SETTINGS = {
+    "enabled": False,
+    "min_shared_sections": 0.5,  # Below this share of the base's headings, a branch counts as restructured
+}
+
+_HEADING = re.compile(r"^(#{1,6})\s+(.+?)\s*#*\s*$", re.MULTILINE)
+_NUMBERING = re.compile(r"^[\d.\s]+|[*_`:]")
+
+
+def branch_settings(config: Dict[str, Any]) -> Dict[str, Any]:
+    """parameters.key_move_branches merged over the defaults"""
+    settings = dict(DEFAULT_SETTINGS)
+    settings.update(((config or {}).get("parameters") or {}).get("key_move_branches") or {})
+    return settings
+
+
+@dataclass
+class Section:
+    key: str  # Normalized heading; "" for the text before the first heading
+    heading: str  # Heading line as written, "" for the preamble
+    body: str
+
+    def render(self) -> str:
+        return f"{self.heading}\n{self.body}".strip() if self.heading else self.body.strip()
+
+
+def _normalize(text: str) -> str:
+    return " ".join(text.split())
+
+
+def split_sections(text: str) -> List[Section]:
+    """Markdown text split at its headings"""
+    sections = []
+    matches = list(_HEADING.finditer(text))
+    preamble = text[: matches[0].start()] if matches else text
+    if preamble.strip():
+        sections.append(Section("", "", preamble.strip()))
+    for position, match in enumerate(matches):
+        end = matches[position + 1].start() if position + 1 < len(matches) else len(text)
+        key = _NUMBERING.sub("", match.group(2)).strip().lower()
+        sections.append(Section(key, match.group(0).strip(), text[match.end():end].strip()))
+    return sections
+
+
+@dataclass
+class Conflict:
+    heading: str  # "" when whole documents conflict
+    base: str
+    versions: Dict[str, str]  # Branch name -> its version of the section
+
+
+@dataclass
+class MergeResult:
+    parts: List[Any] = field(default_factory=list)  # Merged text or the Conflict to resolve, in order
+    conflicts: List[Conflict] = field(default_factory=list)
+
+    def render(self, resolutions: Optional[List[str]] = None) -> str:
+        """The merged text, with conflicts replaced by their resolutions in order"""
+        if self.conflicts and (resolutions is None or len(resolutions) != len(self.conflicts)):
+            raise ValueError(f"{len(self.conflicts)} conflicts need resolutions")
+        resolved = iter(resolutions or [])
+        out = []
+        for part in self.parts:
+            if isinstance(part, Conflict):
+                text = next(resolved).strip()
+                out.append(f"{part.heading}\n{text}" if part.heading and not text.startswith("#") else text)
+            else:
+                out.append(part)
+        return "\n\n".join(part for part in out if part)
+
+
+def _occurrences(sections: List[Section]) -> List[Tuple[str, int]]:
+    """(key, n) for each section, n counting earlier sections with the same heading"""
+    seen: Dict[str, int] = {}
+    keys = []
+    for section in sections:
+        keys.append((section.key, seen.get(section.key, 0)))
+        seen[section.key] = seen.get(section.key, 0) + 1
+    return keys
+
+
+def merge_branches(base: str, branches: Dict[str, str], min_shared_sections: float = 0.5) -> MergeResult:
+    """Three-way merge of branch texts that each revised the same base text
+
+    Sections are matched by heading, and repeated headings (such as a
+    "Response" under each objection) by their order. A section changed in one branch
+    takes that branch's version; one changed identically everywhere is
+    taken once; one changed differently in several branches becomes a
+    ``Conflict``. Sections a branch added are kept after the section
+    they followed in that branch. If a branch kept too few of the base's
+    headings to match sections, the whole documents conflict.
+    """
+    base_sections = split_sections(base)
+    base_keys = _occurrences(base_sections)
+    split = {
+        name: dict(zip(_occurrences(sections), sections))
+        for name, sections in ((name, split_sections(text)) for name, text in branches.items())
+    }
+
+    for sections in split.values():
+        shared = len(set(base_keys) & set(sections))
+        if len(base_keys) < 2 or shared < min_shared_sections * len(base_keys):
+            conflict = Conflict("", base, dict(branches))
+            return MergeResult([conflict], [conflict])
+
+    # New sections of each branch, keyed by the base section they follow
+    added: Dict[Optional[Tuple[str, int]], List[str]] = {}
+    for sections in split.values():
+        anchor = None
+        for key, section in sections.items():
+            if key in base_keys:
+                anchor = key
+            else:
+                added.setdefault(anchor, []).append(section.render())
+
+    result = MergeResult()
+    result.parts.extend(added.get(None, []))
+    for key, base_section in zip(base_keys, base_sections):
+        versions = {name: sections[key] for name, sections in split.items() if key in sections}
+        changed = {name: section for name, section in versions.items()
+                   if _normalize(section.body) != _normalize(base_section.body)}
+        distinct = {_normalize(section.body) for section in changed.values()}
+        if not changed:
+            result.parts.append(base_section.render())
+        elif len(distinct) == 1:
+            result.parts.append(next(iter(changed.values())).render())
+        else:
+            conflict = Conflict(base_section.heading, base_section.body,
+                                {name: section.body for name, section in changed.items()})
+            result.parts.append(conflict)
+            result.conflicts.append(conflict)
+        result.parts.extend(added.get(key, []))
+    return result
+
+
+def parse_resolutions(response: str, count: int) -> Tuple[List[str], List[int]]:
+    """Texts of <resolved id="N"> blocks in order, and the 1-based ids that are missing"""
+    found = {
+        int(match.group(1)): match.group(2).strip()
+        for match in re.finditer(r'<resolved id="?(\d+)"?>(.*?)</resolved>', response, re.DOTALL)
+    }
+    missing = [number for number in range(1, count + 1) if not found.get(number)]
+    return [found.get(number, "") for number in range(1, count + 1)], missing
@@ -0,0 +1,105 @@
+import contextvars
+import difflib
+import json
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional, Sequence
+
+
+DEFAULT_SETTINGS = {
+    "enabled": False,
+    "start_after_version": 3,  # Upstream output version the downstream workflow starts from
+    "keep_below": 0.05,  # Drift up to this keeps the speculative result as is
+    "refine_below": 0.3,  # Drift up to this re-runs one critique/refinement cycle; above restarts
+    "compare_fields": ["main_thesis", "core_contribution", "key_moves", "abstract"],
+}
+
+
+def speculation_settings(config: Dict[str, Any]) -> Dict[str, Any]:
+    """parameters.speculation merged over the defaults"""
+    settings = dict(DEFAULT_SETTINGS)
+    settings.update((config.get("parameters") or {}).get("speculation") or {})
+    return settings
+
+
+def _words(value: Any) -> list:
+    text = value if isinstance(value, str) else json.dumps(value, sort_keys=True, ensure_ascii=False)
+    return text.split()
+
+
+def _field_drift(provisional: Any, final: Any) -> float:
+    if provisional == final:
+        return 0.0
+    if isinstance(provisional, list) and isinstance(final, list) and len(provisional) != len(final):
+        return 1.0  # A different number of items changes the downstream structure
+    return 1.0 - difflib.SequenceMatcher(None, _words(provisional), _words(final), autojunk=False).ratio()
+
+
+def input_drift(provisional: Any, final: Any, fields: Optional[Sequence[str]] = None) -> float:
+    """How far the final upstream output moved from the provisional one (0 = same, 1 = unrelated)
+
+    For dicts only ``fields`` are compared (the rest is refinement
+    bookkeeping such as changes_made); the largest per-field drift wins.
+    """
+    if isinstance(provisional, dict) and isinstance(final, dict):
+        keys = [key for key in (fields or sorted(set(provisional) | set(final))) if key in provisional or key in final]
+        return max((_field_drift(provisional.get(key), final.get(key)) for key in keys), default=0.0)
+    return _field_drift(provisional, final)
+
+
+def reconcile_decision(drift: float, keep_below: float, refine_below: float) -> str:
+    """'keep', 'refine' or 'restart' for a given input drift"""
+    if drift <= keep_below:
+        return "keep"
+    if drift <= refine_below:
+        return "refine"
+    return "restart"
+
+
+@dataclass
+class Reconciliation:
+    decision: str
+    drift: float
+
+
+class SpeculativeStart:
+    """Starts a downstream job from a provisional upstream version, then reconciles
+
+    Register ``listener`` with the upstream workflow's ``on_version``; when
+    version ``after_version`` is recorded, ``start(version)`` runs on a
+    background thread while the upstream workflow keeps refining. Once the
+    final upstream output is known, ``reconcile`` compares it with the
+    provisional input and returns the decision; the caller keeps, refines
+    or restarts the downstream work accordingly.
+    """
+
+    def __init__(self, start: Callable[[Any], Any], after_version: int):
+        self._start = start
+        self.after_version = after_version
+        self.provisional: Any = None
+        self._context = contextvars.copy_context()  # Run under the caller's context (trace span, output dir)
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="speculative")
+        self._future: Optional["Future[Any]"] = None
+
+    @property
+    def started(self) -> bool:
+        return self._future is not None
+
+    def listener(self, number: int, version: Any) -> None:
+        if number == self.after_version and not self.started:
+            print(f"\n🔮 Starting downstream work speculatively from version {number}")
+            self.provisional = version
+            self._future = self._executor.submit(self._context.run, self._start, version)
+
+    def result(self) -> Any:
+        """Wait for the speculative job and return its result (re-raises its error)"""
+        try:
+            return self._future.result() if self._future else None
+        finally:
+            self._executor.shutdown(wait=False)
+
+    def reconcile(self, final: Any, settings: Dict[str, Any]) -> Reconciliation:
+        if not self.started:
+            return Reconciliation("restart", 1.0)
+        drift = input_drift(self.provisional, final, settings.get("compare_fields"))
+        return Reconciliation(reconcile_decision(drift, settings["keep_below"], settings["refine_below"]), drift)
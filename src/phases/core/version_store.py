@@ -0,0 +1,148 @@
+import difflib
+import json
+from pathlib import Path
+from typing import Any, List, Optional
+
+
+def _serialize(version: Any) -> str:
+    """Render a version as stable text for storage and diffing"""
+    if isinstance(version, str):
+        return version
+    return json.dumps(version, indent=2, sort_keys=True, ensure_ascii=False)
+
+
+def _estimate_tokens(text: str) -> int:
+    """Rough token estimate (~4 characters per token)"""
+    return (len(text) + 3) // 4
+
+
+class VersionStore:
+    """Keeps every version of a workflow output, giving prompts a bounded history
+
+    Full versions are written to ``storage_dir`` when one is given (and only
+    the latest is kept in memory); otherwise they are held in memory. Prompts
+    get ``compact_history()``: one entry per earlier version summarizing what
+    changed in the following version, with the newest changes shown in the
+    most detail and older ones collapsed to line counts once the token budget
+    is spent.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        storage_dir: Optional[Path] = None,
+        token_budget: int = 1500,
+        max_diff_lines: int = 40,
+    ):
+        self.name = name
+        self.storage_dir = Path(storage_dir) if storage_dir else None
+        self.token_budget = token_budget
+        self.max_diff_lines = max_diff_lines
+        self._versions: List[Any] = []  # Only used without storage_dir
+        self._deltas: List[str] = []  # _deltas[i] describes version i+1 -> i+2
+        self._stats: List[str] = []
+        self._latest: Any = None
+        self._latest_text: Optional[str] = None
+        self._count = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    @property
+    def latest(self) -> Any:
+        return self._latest
+
+    def _version_path(self, number: int) -> Path:
+        return self.storage_dir / f"{self.name}_v{number}.json"
+
+    def add(self, version: Any) -> int:
+        """Record a new version and return its 1-based version number"""
+        text = _serialize(version)
+        if self._latest_text is not None:
+            self._record_delta(self._latest_text, text)
+
+        self._count += 1
+        if self.storage_dir:
+            self.storage_dir.mkdir(parents=True, exist_ok=True)
+            with open(self._version_path(self._count), "w", encoding="utf-8") as f:
+                json.dump({"version": self._count, "content": version}, f, indent=2)
+        else:
+            self._versions.append(version)
+
+        self._latest = version
+        self._latest_text = text
+        return self._count
+
+    def get(self, number: int) -> Any:
+        """Load a full version by 1-based number (negative numbers count from the end)"""
+        if number < 0:
+            number = self._count + 1 + number
+        if not 1 <= number <= self._count:
+            raise IndexError(f"{self.name} has no version {number}")
+        if number == self._count:
+            return self._latest
+        if not self.storage_dir:
+            return self._versions[number - 1]
+        with open(self._version_path(number), encoding="utf-8") as f:
+            return json.load(f)["content"]
+
+    def all(self) -> List[Any]:
+        """Load every full version, oldest first"""
+        return [self.get(number) for number in range(1, self._count + 1)]
+
+    def _record_delta(self, old_text: str, new_text: str) -> None:
+        diff = [
+            line
+            for line in difflib.unified_diff(
+                old_text.splitlines(), new_text.splitlines(), lineterm="", n=0
+            )
+            if line[:1] in "+-" and not line.startswith(("+++", "---"))
+        ]
+        added = sum(1 for line in diff if line.startswith("+"))
+        removed = len(diff) - added
+        version = self._count
+        stats = f"Version {version} -> {version + 1}: {added} lines added, {removed} removed"
+
+        shown = [line if len(line) <= 200 else line[:200] + "..." for line in diff[: self.max_diff_lines]]
+        if len(diff) > self.max_diff_lines:
+            shown.append(f"... ({len(diff) - self.max_diff_lines} more changed lines)")
+        detail = stats + ("\n" + "\n".join(shown) if shown else " (no textual changes)")
+
+        self._stats.append(stats)
+        self._deltas.append(detail)
+
+    def compact_history(self, include_latest: bool = False, token_budget: Optional[int] = None) -> List[str]:
+        """Return a bounded description of earlier versions, oldest first
+
+        Each earlier version gets one entry. Entries are filled newest-first
+        with full change summaries until ``token_budget`` is reached; older
+        entries fall back to their one-line statistics. With
+        ``include_latest`` a placeholder for the current version is appended,
+        so the list length equals the number of versions.
+        """
+        budget = self.token_budget if token_budget is None else token_budget
+        entries = list(self._stats)
+        used = sum(_estimate_tokens(stat) for stat in self._stats)
+        for i in range(len(self._deltas) - 1, -1, -1):
+            extra = _estimate_tokens(self._deltas[i]) - _estimate_tokens(self._stats[i])
+            if used + extra > budget:
+                break
+            entries[i] = self._deltas[i]
+            used += extra
+
+        if include_latest and self._count:
+            entries.append(f"Version {self._count}: current version (provided in full)")
+        return entries
+
+
+def format_version_history(previous_versions: List[Any]) -> str:
+    """Render compact history entries for inclusion in a prompt"""
+    entries = [entry for entry in previous_versions or [] if isinstance(entry, str) and entry.startswith("Version ")]
+    if not entries:
+        return ""
+    return "\nChanges across earlier versions (most recent in most detail):\n" + "\n\n".join(entries) + "\n"
+
+
+def history_budget_from_config(config: dict, default: int = 1500) -> int:
+    """Read the version history token budget from the pipeline config"""
+    return config.get("parameters", {}).get("version_history", {}).get("token_budget", default)
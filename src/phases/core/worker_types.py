@@ -1,3 +1,14 @@
+from typing import Dict, List, Optional, Sequence
+
+from src.utils.aspect_critique import (
+    DEFAULT_ASSESSMENT_LABELS,
+    AspectCritique,
+    AspectPrompt,
+    aspect_critic_settings,
+    render_critique,
+    run_aspect_critiques,
+    split_critique_prompt,
+)
 from .base_worker import BaseWorker
 
 
@@ -8,9 +19,52 @@ class DevelopmentWorker(BaseWorker):
 
 
 class CriticWorker(BaseWorker):
-    """For critiquing tasks"""
+    """For critiquing tasks
+
+    For critics with ``aspect_parallel`` set, and with
+    ``parameters.aspect_critics.enabled``, the critique prompt's rubric
+    is split into focused aspect prompts that run concurrently; their
+    answers are merged into the critic's usual output format.
+    """
 
     worker_type = "critic"
+    aspect_parallel = False  # Set by critics whose output can be assembled from aspect critiques
+    aspect_groups: Optional[Dict[str, Sequence[int]]] = None  # Aspect name -> 1-based rubric items
+    assessment_labels: Dict[str, str] = DEFAULT_ASSESSMENT_LABELS
+
+    def _model_stage(self) -> str:
+        """Key of this critic's entry in config["models"]"""
+        return self.stage_name
+
+    def _respond(self, prompt: str, system_prompt: Optional[str]) -> str:
+        settings = aspect_critic_settings(self.config)
+        aspect_prompts = []
+        if self.aspect_parallel and settings["enabled"]:
+            aspect_prompts = split_critique_prompt(prompt, settings["max_aspects"], self.aspect_groups)
+        if len(aspect_prompts) < 2:
+            return self.api_handler.make_api_call(stage=self._model_stage(), prompt=prompt, system_prompt=system_prompt)
+
+        stage = f"{self._model_stage()}_aspect"
+        model_config = self._aspect_model_config(settings["max_tokens"])
+        print(f"Critiquing {len(aspect_prompts)} aspects concurrently: {', '.join(a.name for a in aspect_prompts)}")
+
+        def critique(aspect: AspectPrompt) -> str:
+            return self.api_handler.make_api_call(
+                stage=stage, prompt=aspect.prompt, system_prompt=system_prompt, model_config=model_config
+            )
+
+        critiques = run_aspect_critiques(critique, aspect_prompts, settings["max_concurrent"])
+        return self._render_aspect_critique(critiques)
+
+    def _aspect_model_config(self, max_tokens: int) -> Dict:
+        """Model config for aspect calls: a copy of the critic's with a smaller output cap"""
+        aspect_config = dict(self.api_handler.config["models"][self._model_stage()])
+        aspect_config["max_tokens"] = min(aspect_config.get("max_tokens", max_tokens), max_tokens)
+        return aspect_config
+
+    def _render_aspect_critique(self, critiques: List[AspectCritique]) -> str:
+        """Merge aspect critiques into the text process_output parses"""
+        return render_critique(critiques, self.assessment_labels)
 
     def _extract_summary(self, summary_text: str) -> str:
         """Extract summary assessment from text"""
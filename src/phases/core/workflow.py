@@ -1,9 +1,13 @@
 from dataclasses import dataclass
-from typing import List, Dict, Any, Optional
+from typing import Callable, List, Dict, Any, Optional
 from pathlib import Path
 import json
+import threading
 from .base_worker import BaseWorker, WorkerOutput
 from .exceptions import WorkflowError
+from .version_store import VersionStore
+from src.utils.artifacts import atomic_write_text, flush_writes, write_behind
+from src.utils.tracing import span
 
 
 @dataclass
@@ -25,16 +29,44 @@ class Workflow:
         cycle_steps: List[WorkflowStep],
         output_dir: Optional[Path] = None,
         max_cycles: int = 1,
+        history_token_budget: int = 1500,
     ):
         self.state: Dict[str, Any] = {}
         self.current_cycle = 0
         self.workflow_name = workflow_name
-        self.output_versions = []
+        self.version_store = VersionStore(
+            workflow_name,
+            storage_dir=output_dir / workflow_name / "versions" if output_dir else None,
+            token_budget=history_token_budget,
+        )
 
         self.initial_step = initial_step
         self.cycle_steps = cycle_steps
         self.output_dir = output_dir
         self.max_cycles = max_cycles
+        self._version_listeners: List[Callable[[int, Any], None]] = []
+        self._cancelled = threading.Event()
+
+    def on_version(self, listener: Callable[[int, Any], None]) -> None:
+        """Call listener(version_number, version) whenever an output version is recorded"""
+        self._version_listeners.append(listener)
+
+    def cancel(self) -> None:
+        """Stop at the next step boundary (safe to call from another thread)
+
+        A cancelled workflow returns its state as is and does not write its
+        final output file.
+        """
+        self._cancelled.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    @property
+    def output_versions(self) -> List[Any]:
+        """All full output versions, loaded from the version store"""
+        return self.version_store.all()
 
     def _map_state(
         self, mapping: Dict[str, str], source: Dict[str, Any]
@@ -78,13 +110,25 @@ class Workflow:
                     )
         return result
 
+    def _record_version(self, version: Any):
+        """Stores a new output version and refreshes the compact history in state
+
+        Steps that need earlier versions map ``version_history``: one short
+        change summary per version (the latest as a placeholder), bounded by
+        the workflow's history token budget.
+        """
+        number = self.version_store.add(version)
+        self.state["version_history"] = self.version_store.compact_history(include_latest=True)
+        for listener in self._version_listeners:
+            listener(number, version)
+
     def _update_state(self, mapping: Dict[str, str], worker_output: WorkerOutput):
         """Updates workflow state with worker output"""
 
         for target_path, source_path in mapping.items():
 
             if source_path == "modifications" and target_path == "output_versions":
-                self.output_versions.append(getattr(worker_output, "modifications"))
+                self._record_version(getattr(worker_output, "modifications"))
                 continue
 
             if source_path == "modifications":
@@ -92,11 +136,12 @@ class Workflow:
                 continue
 
             if target_path == "previous_versions":
-                self.state[target_path] = self.output_versions[:-1]
+                # Compact deltas of earlier versions rather than whole copies
+                self.state[target_path] = self.version_store.compact_history()
                 continue
 
             if target_path == "output_versions":
-                self.output_versions.append(
+                self._record_version(
                     getattr(worker_output, "modifications")[source_path]
                 )
                 continue
@@ -130,21 +175,22 @@ class Workflow:
         )
         step_dir.mkdir(parents=True, exist_ok=True)
 
-        # Save main output
-        with open(step_dir / (step.name + ".json"), "w", encoding="utf-8") as f:
-            json.dump(
-                {step.name: worker_output.modifications},
-                f,
-                indent=2,
-            )
+        # Serialize now, write in the background (atomically) while the next step runs
+        write_behind().submit(
+            step_dir / (step.name + ".json"),
+            json.dumps({step.name: worker_output.modifications}, indent=2),
+        )
 
         # Save any markdown content
         if "content" in getattr(worker_output, "modifications"):
-            with open(step_dir / (step.name + ".md"), "w") as f:
-                f.write(getattr(worker_output, "modifications")["content"])
+            write_behind().submit(step_dir / (step.name + ".md"), getattr(worker_output, "modifications")["content"])
 
     def execute(self, initial_state: Dict[str, Any]) -> Dict[str, Any]:
         """Execute workflow for specified number of cycles"""
+        with span(self.workflow_name, "workflow", max_cycles=self.max_cycles):
+            return self._execute(initial_state)
+
+    def _execute(self, initial_state: Dict[str, Any]) -> Dict[str, Any]:
         self.state = initial_state.copy()
 
         # Execute initial step (development)
@@ -161,7 +207,8 @@ class Workflow:
 
         # Execute worker
         try:
-            initial_step_output = self.initial_step.worker.execute(mapped_initial_state)
+            with span(self.initial_step.name, "step", worker=type(self.initial_step.worker).__name__):
+                initial_step_output = self.initial_step.worker.execute(mapped_initial_state)
 
             # Update workflow state
             try:
@@ -183,49 +230,78 @@ class Workflow:
             # Don't continue with cycle steps if initial step fails
             return self.state
 
-        for cycle in range(self.max_cycles):
-            self.current_cycle = cycle
-            print(f"\nStarting workflow cycle {cycle + 1}/{self.max_cycles}")
+        self._run_cycles(range(self.max_cycles))
+        if not self.cancelled:
+            self._write_final_output()
 
-            for step in self.cycle_steps:
-                print(f"\nExecuting step: {self.workflow_name} {step.name} {cycle + 1}")
+        return self.state
 
-                # Map workflow state to worker input
-                try:
-                    step_context = self._map_state(step.input_mapping, self.state)
-                except WorkflowError as e:
-                    print(f"Error mapping state for step {step.name}: {str(e)}")
-                    # Continue to next step instead of failing the entire workflow
-                    continue
+    def continue_cycles(self, updates: Dict[str, Any], cycles: int = 1) -> Dict[str, Any]:
+        """Run extra critique/refinement cycles on the current state after applying updates
+
+        Used to reconcile work that started from provisional inputs: the
+        existing output is kept and revised against the updated inputs
+        rather than developed again from scratch.
+        """
+        self.state.update(updates)
+        start = self.current_cycle + 1
+        with span(f"{self.workflow_name} (continued)", "workflow", cycles=cycles):
+            self._run_cycles(range(start, start + cycles))
+        if not self.cancelled:
+            self._write_final_output()
+        return self.state
 
-                try:
-                    # Execute worker
+    def _write_final_output(self):
+        atomic_write_text(
+            self.output_dir / (self.workflow_name + ".json"),
+            json.dumps({self.workflow_name: self.version_store.latest}, indent=2),
+        )
+        flush_writes()
+
+    def _run_cycles(self, cycles: range):
+        """Execute the cycle steps for each cycle number, stopping early if cancelled"""
+        for cycle in cycles:
+            self.current_cycle = cycle
+            print(f"\nStarting workflow cycle {cycle + 1}/{cycles.stop}")
+            with span(f"cycle {cycle + 1}", "cycle"):
+                self._run_cycle_steps(cycle)
+            if self.cancelled:
+                return
+
+    def _run_cycle_steps(self, cycle: int):
+        """Execute each cycle step once, skipping steps that fail"""
+        for step in self.cycle_steps:
+            if self.cancelled:
+                print(f"\n{self.workflow_name} cancelled before {step.name} {cycle + 1}")
+                return
+            print(f"\nExecuting step: {self.workflow_name} {step.name} {cycle + 1}")
+
+            # Map workflow state to worker input
+            try:
+                step_context = self._map_state(step.input_mapping, self.state)
+            except WorkflowError as e:
+                print(f"Error mapping state for step {step.name}: {str(e)}")
+                # Continue to next step instead of failing the entire workflow
+                continue
+
+            try:
+                # Execute worker
+                with span(step.name, "step", worker=type(step.worker).__name__):
                     step_output = step.worker.execute(step_context)
 
-                    # Save output
-                    if step.save_output:
-                        self._save_step_output(step, step_output)
-
-                    # Update workflow state
-                    try:
-                        self._update_state(step.output_mapping, step_output)
-                    except WorkflowError as e:
-                        print(f"Error updating state for step {step.name}: {str(e)}")
-                        # Continue to next step instead of failing the workflow
-                        continue
-
-                except Exception as e:
-                    print(f"Error executing step {step.name}: {str(e)}")
-                    # Continue to next step instead of failing the entire workflow
-                    continue
+                # Save output
+                if step.save_output:
+                    self._save_step_output(step, step_output)
 
-        with open(
-            self.output_dir / (self.workflow_name + ".json"), "w", encoding="utf-8"
-        ) as f:
-            json.dump(
-                {self.workflow_name: self.output_versions[-1]},
-                f,
-                indent=2,
-            )
+                # Update workflow state
+                try:
+                    self._update_state(step.output_mapping, step_output)
+                except WorkflowError as e:
+                    print(f"Error updating state for step {step.name}: {str(e)}")
+                    # Continue to next step instead of failing the workflow
+                    continue
 
-        return self.state
+            except Exception as e:
+                print(f"Error executing step {step.name}: {str(e)}")
+                # Continue to next step instead of failing the entire workflow
+                continue
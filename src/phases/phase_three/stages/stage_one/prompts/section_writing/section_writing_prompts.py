@@ -1,13 +1,20 @@
 import json
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional
 import random
 from pathlib import Path
 
+from src.utils.prompt_budget import PromptAssembler, DEFAULT_PROMPT_TOKEN_BUDGET
+from src.utils.length_control import count_words
+from src.utils.section_context import format_other_arguments, section_content_bank
+from src.utils.style_digests import classify_section, style_digest_block
+
 
 class SectionWritingPrompts:
     """Prompts for section-by-section writing"""
 
-    def __init__(self):
+    def __init__(self, token_budget: int = DEFAULT_PROMPT_TOKEN_BUDGET, config: Optional[Dict[str, Any]] = None):
+        self.token_budget = token_budget
+        self.config = config
         self.system_prompt = """You are a world-class philosophy writer specializing in Analysis journal's distinctive style. Analysis papers are known for their conversational rigor - they make sophisticated philosophical arguments while remaining remarkably accessible and engaging. 
 
 Your task is to write sections that sound like they belong in Analysis: conversational but philosophically precise, example-driven rather than abstract, and strategically focused rather than comprehensive.
@@ -165,8 +172,13 @@ Good philosophy takes risks. Your job is to defend a thesis, not survey opinions
     }
 }"""
 
-    def _select_analysis_exemplars(self) -> str:
-        """Randomly select Analysis PDFs as style exemplars"""
+    def _select_analysis_exemplars(self, section_type: str = "argument") -> str:
+        """Select Analysis style exemplars: digest snippets if built, else random PDFs"""
+        self.selected_analysis_pdfs = []
+        digest = style_digest_block(self.config, section_type)
+        if digest:
+            return digest
+
         analysis_dir = Path("./Analysis_papers")
         if not analysis_dir.exists():
             return "No Analysis exemplars available for this run."
@@ -210,7 +222,7 @@ CRITICAL: Your writing must match this Analysis style - conversational, accessib
         
         section = writing_context["sections"][section_index]
         paper_overview = writing_context["paper_overview"]
-        content_bank = writing_context["content_bank"]
+        content_bank = section_content_bank(writing_context, section_index)
         
         # Create section context
         previous_sections = []
@@ -225,25 +237,21 @@ CRITICAL: Your writing must match this Analysis style - conversational, accessib
         previous_context = "\n".join(previous_sections) if previous_sections else "None (this is the first section)"
         upcoming_context = "\n".join(upcoming_sections) if upcoming_sections else "None (this is the final section)"
         
-        # Get Analysis exemplars
-        exemplar_info = self._select_analysis_exemplars()
+        # Get Analysis exemplars suited to this kind of section
+        section_type = classify_section(section["section_name"], section_index, len(writing_context["sections"]))
+        exemplar_info = self._select_analysis_exemplars(section_type)
         
-        return f"""<context>
+        assembler = PromptAssembler(self.token_budget)
+        assembler.add("context", """<context>
 You are part of an automated philosophy paper generation pipeline. This is Phase III.1 (Section Writing).
 You are writing one specific section of a philosophy paper for Analysis journal.
 Previous phases have developed the thesis, arguments, and detailed outline.
 Your task is to write publication-ready prose for this specific section following Analysis journal style.
-</context>
-
-<analysis_style_guidance>
-{self.analysis_style_guide}
-
-{self.philosophical_heuristics}
-
-{exemplar_info}
-</analysis_style_guidance>
-
-<task>
+</context>""", required=True)
+        assembler.add("style_guide", self.analysis_style_guide, tag="analysis_style_guidance", priority=3)
+        assembler.add("heuristics", self.philosophical_heuristics, tag="analysis_style_guidance", priority=2)
+        assembler.add("exemplars", exemplar_info, tag="analysis_style_guidance", priority=1)
+        assembler.add("task", f"""<task>
 Write section {section_index + 1} of the philosophy paper: "{section['section_name']}"
 Target {section['word_target']} words for this section.
 Create philosophically rigorous prose that advances the paper's thesis using Analysis journal style.
@@ -270,20 +278,16 @@ PREVIOUS SECTIONS:
 
 UPCOMING SECTIONS:
 {upcoming_context}
-</structural_context>
-
-<content_bank>
-ARGUMENTS READY FOR USE:
-{json.dumps(content_bank['arguments'], indent=2)}
-
-EXAMPLES AVAILABLE:
-{json.dumps(content_bank['examples'], indent=2)}
-
-CITATIONS IDENTIFIED:
-{json.dumps(content_bank['citations'], indent=2)}
-</content_bank>
-
-<requirements>
+</structural_context>""", required=True)
+        assembler.add("arguments", f"""ARGUMENTS READY FOR USE IN THIS SECTION:
+{json.dumps(content_bank['arguments'], indent=2)}""", tag="content_bank", priority=5)
+        assembler.add("other_arguments", f"""ARGUMENTS DEVELOPED IN OTHER SECTIONS (summaries; refer to them, don't redevelop them):
+{format_other_arguments(content_bank)}""", tag="content_bank", priority=3)
+        assembler.add("examples", f"""EXAMPLES AVAILABLE:
+{json.dumps(content_bank['examples'], indent=2)}""", tag="content_bank", priority=4)
+        assembler.add("citations", f"""CITATIONS IDENTIFIED:
+{json.dumps(content_bank['citations'], indent=2)}""", tag="content_bank", priority=2)
+        assembler.add("instructions", f"""<requirements>
 # TAKE A STAND (RLHF-Proofing for Section Writing)
 Your training pushes you to:
 - Present all philosophical views as equally plausible
@@ -304,7 +308,8 @@ Good philosophy takes risks. Your job is to defend a thesis, not survey opinions
 
 <output_format>
 {self.output_format}
-</output_format>"""
+</output_format>""", required=True)
+        return assembler.build()
 
     def construct_critic_prompt(self, writing_context: Dict[str, Any], section_index: int, 
                               current_content: str, paper_overview: Dict[str, Any]) -> str:
@@ -325,7 +330,8 @@ Good philosophy takes risks. Your job is to defend a thesis, not survey opinions
         previous_context = "\n".join(previous_sections) if previous_sections else "None (this is the first section)"
         upcoming_context = "\n".join(upcoming_sections) if upcoming_sections else "None (this is the final section)"
         
-        return f"""<context>
+        assembler = PromptAssembler(self.token_budget)
+        assembler.add("task", f"""<context>
 You are part of an automated philosophy paper generation pipeline. This is Phase III.1 (Section Writing).
 You are a brutally honest philosophy journal reviewer providing unfiltered critique of a section.
 Your goal is to identify every weakness that would lead to desk rejection.
@@ -346,21 +352,18 @@ ABSTRACT: {paper_overview['abstract'][:200]}...
 
 CURRENT SECTION: Section {section_index + 1} - {section['section_name']}
 TARGET WORDS: {section['word_target']}
-</paper_information>
-
-<structural_context>
+</paper_information>""", required=True)
+        assembler.add("structural_context", f"""<structural_context>
 PREVIOUS SECTIONS:
 {previous_context}
 
 UPCOMING SECTIONS:
 {upcoming_context}
-</structural_context>
-
-<current_section>
+</structural_context>""", priority=1)
+        assembler.add("current_section", f"""<current_section>
 {current_content}
-</current_section>
-
-<evaluation_criteria>
+</current_section>""", required=True)
+        assembler.add("instructions", f"""<evaluation_criteria>
 1. PHILOSOPHICAL RIGOR AND DEPTH
    - Are arguments clearly stated and well-supported?
    - Is the reasoning valid and sound?
@@ -511,7 +514,8 @@ UPCOMING SECTIONS:
 - Provide specific, actionable feedback for improvement
 - Focus on making the section stronger by identifying real problems
 - Don't hold back - your goal is to make the paper better
-</requirements>"""
+</requirements>""", required=True)
+        return assembler.build()
 
     def construct_revision_prompt(self, writing_context: Dict[str, Any], section_index: int, 
                                 current_content: str, revision_notes: str) -> str:
@@ -558,7 +562,51 @@ Preserve core arguments while improving presentation and style consistency.
 <output_format>
 {self.output_format}
 </output_format>"""
-    
+
+    def construct_length_adjustment_prompt(self, writing_context: Dict[str, Any], section_index: int,
+                                           paragraphs: List[str], paragraph_targets: Dict[int, int],
+                                           word_target: int) -> str:
+        """Generate prompt for expanding or trimming selected paragraphs of a section"""
+
+        section = writing_context["sections"][section_index]
+        numbered = "\n\n".join(f"[P{i + 1}] {paragraph}" for i, paragraph in enumerate(paragraphs))
+        instructions = "\n".join(
+            f"- P{i + 1}: currently {count_words(paragraphs[i])} words, rewrite to about {words} words"
+            for i, words in sorted(paragraph_targets.items())
+        )
+        expanding = sum(paragraph_targets.values()) > sum(count_words(paragraphs[i]) for i in paragraph_targets)
+
+        return f"""<context>
+You are part of an automated philosophy paper generation pipeline. This is Phase III.1 (Section Writing).
+The section below is complete, but its length misses the target of {word_target} words.
+Only the listed paragraphs will be replaced; every other paragraph stays exactly as it is.
+</context>
+
+<task>
+{"Expand" if expanding else "Trim"} the listed paragraphs of section {section_index + 1}: "{section['section_name']}"
+{instructions}
+</task>
+
+<current_section>
+{numbered}
+</current_section>
+
+<requirements>
+- {"Develop what the paragraph already argues: make an implicit premise explicit, work through the example in more detail, or answer the obvious objection. Do not introduce new claims or citations." if expanding else "Cut repetition, hedging and throat-clearing. Keep every premise, example, citation and conclusion the paragraph needs."}
+- Keep the paragraph's opening and closing sentences doing the same job, so transitions to the neighbouring paragraphs still work
+- Follow Analysis journal style: first person, direct, concrete
+- Hit each paragraph's word count within about 10%
+- Response must be valid JSON; use \\n for any line breaks inside strings
+</requirements>
+
+<output_format>
+{{
+    "paragraphs": [
+        {{"paragraph": <number from the list, e.g. 3 for P3>, "text": "The rewritten paragraph"}}
+    ]
+}}
+</output_format>"""
+
     def get_system_prompt(self) -> str:
         """Return the system prompt for API calls"""
         return self.system_prompt
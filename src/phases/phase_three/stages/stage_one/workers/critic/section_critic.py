@@ -1,17 +1,30 @@
-from typing import Dict, Any
+from typing import Dict, Any, List
 
 from src.phases.core.base_worker import WorkerInput, WorkerOutput
 from src.phases.core.worker_types import CriticWorker
+from src.utils.aspect_critique import AspectCritique, labelled, merge_level
 from src.phases.phase_three.stages.stage_one.prompts.section_writing.section_writing_prompts import (
     SectionWritingPrompts,
 )
+from src.utils.prompt_budget import stage_token_budget
 
 
 class SectionCriticWorker(CriticWorker):
+
+    aspect_parallel = True
+    # Rubric items grouped to match the Section Analysis subsections validate_output expects
+    aspect_groups = {
+        "Philosophical Content Assessment": (1, 2),
+        "Structural Integration Assessment": (3,),
+        "Writing Quality Assessment": (4,),
+        "Scope and Focus Assessment": (5, 6),
+    }
     
     def __init__(self, config: Dict[str, Any]):
         super().__init__(config)
-        self.prompts = SectionWritingPrompts()
+        self.prompts = SectionWritingPrompts(
+            token_budget=stage_token_budget(config, "section_critic"), config=config
+        )
         self._state = {"iterations": 0, "previous_critiques": []}
         self.stage_name = "section_critic"
 
@@ -27,6 +40,33 @@ class SectionCriticWorker(CriticWorker):
         """Return the system prompt for API calls"""
         return self.prompts.get_critic_system_prompt()
 
+    def _render_aspect_critique(self, critiques: List[AspectCritique]) -> str:
+        """Merge aspect critiques into the section critique format"""
+        def bullets(entries: List[str]) -> str:
+            return "\n".join(f"- {entry}" for entry in entries) or "[None identified]"
+
+        by_name = {critique.name: critique for critique in critiques}
+        analysis = "\n\n".join(
+            f"## {name}\n{by_name[name].findings if name in by_name else 'Not assessed (aspect critique failed).'}"
+            for name in self.aspect_groups
+        )
+        structural = by_name.get("Structural Integration Assessment")
+        transitions = structural.findings if structural else "Not assessed (aspect critique failed)."
+        recommendations = "\n".join(
+            f"{i}. {entry}" for i, entry in enumerate(labelled(critiques, "recommendations"), 1)
+        ) or "1. No changes recommended."
+        return "\n\n".join([
+            "# Scratch Work\nAssessed in parallel by aspect: " + ", ".join(c.name for c in critiques) + ".",
+            f"# Section Analysis\n{analysis}",
+            "# Critical Issues Identified",
+            f"## Major Issues\n{bullets(labelled(critiques, 'major'))}",
+            f"## Minor Issues\n{bullets(labelled(critiques, 'minor'))}",
+            f"## Strengths to Preserve\n{bullets(labelled(critiques, 'strengths'))}",
+            f"# Transition Analysis\n{transitions}",
+            f"# Improvement Recommendations\n{recommendations}",
+            f"# Summary Assessment\n{self.assessment_labels[merge_level(critiques)]}",
+        ])
+
     def process_input(self, state: Dict[str, Any]) -> WorkerInput:
         """Prepare input for section critique"""
         section_index = state.get("section_index", 0)
@@ -98,7 +138,7 @@ class SectionCriticWorker(CriticWorker):
     def _extract_critical_issues(self, response: str) -> Dict[str, list]:
         """Extract major and minor issues from the critique"""
         try:
-            issues_section = response.split("# Critical Issues Identified")[1].split("#")[0]
+            issues_section = response.split("# Critical Issues Identified")[1].split("\n# ")[0]
             
             major_issues = []
             minor_issues = []
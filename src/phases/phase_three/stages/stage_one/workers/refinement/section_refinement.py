@@ -6,13 +6,18 @@ from src.phases.core.worker_types import RefinementWorker
 from src.phases.phase_three.stages.stage_one.prompts.section_writing.section_writing_prompts import (
     SectionWritingPrompts,
 )
+from src.utils.prompt_budget import PromptAssembler, stage_token_budget
+from src.utils.section_context import format_other_arguments, section_content_bank
+from src.utils.style_digests import classify_section, style_digest_block
 
 
 class SectionRefinementWorker(RefinementWorker):
     
     def __init__(self, config: Dict[str, Any]):
         super().__init__(config)
-        self.prompts = SectionWritingPrompts()
+        self.prompts = SectionWritingPrompts(
+            token_budget=stage_token_budget(config, "section_refinement"), config=config
+        )
         self._state = {"iterations": 0, "refinement_history": []}
         self.stage_name = "section_refinement"
 
@@ -30,7 +35,7 @@ class SectionRefinementWorker(RefinementWorker):
         """Generate prompt for refining a section based on critique"""
         
         section = writing_context["sections"][section_index]
-        content_bank = writing_context["content_bank"]
+        content_bank = section_content_bank(writing_context, section_index)
         
         # Create section context
         previous_sections = []
@@ -45,42 +50,37 @@ class SectionRefinementWorker(RefinementWorker):
         previous_context = "\n".join(previous_sections) if previous_sections else "None (this is the first section)"
         upcoming_context = "\n".join(upcoming_sections) if upcoming_sections else "None (this is the final section)"
         
-        return f"""
-You are refining a philosophy paper section based on detailed critic feedback. Your task is to improve the section while maintaining its core function and advancing the paper's thesis.
-
-PAPER OVERVIEW:
+        assembler = PromptAssembler(self.prompts.token_budget)
+        assembler.add("context", """You are refining a philosophy paper section based on detailed critic feedback. Your task is to improve the section while maintaining its core function and advancing the paper's thesis.""", required=True)
+        assembler.add("section", f"""PAPER OVERVIEW:
 Thesis: {paper_overview['thesis']}
 Target Length: {paper_overview['target_words']} words total
 
 SECTION TO REFINE:
 Section {section_index + 1}: {section['section_name']}
 Target Words: {section['word_target']}
-Expected Content: {section['content_guidance']}
-
-STRUCTURAL CONTEXT:
+Expected Content: {section['content_guidance']}""", required=True)
+        assembler.add("structural_context", f"""STRUCTURAL CONTEXT:
 Previous Sections:
 {previous_context}
 
 Upcoming Sections:
-{upcoming_context}
-
-CURRENT SECTION CONTENT:
-{current_content}
-
-CRITIC FEEDBACK:
-{critique}
-
-CONTENT BANK AVAILABLE:
-Arguments Ready for Use:
-{json.dumps(content_bank['arguments'], indent=2)}
-
-Examples Available:
-{json.dumps(content_bank['examples'], indent=2)}
-
-Citations Identified:
-{json.dumps(content_bank['citations'], indent=2)}
-
-REFINEMENT GUIDELINES:
+{upcoming_context}""", priority=6)
+        assembler.add("current_section", f"""CURRENT SECTION CONTENT:
+{current_content}""", required=True)
+        assembler.add("critique", f"""CRITIC FEEDBACK:
+{critique}""", required=True)
+        assembler.add("arguments", f"""ARGUMENTS READY FOR USE IN THIS SECTION:
+{json.dumps(content_bank['arguments'], indent=2)}""", tag="content_bank", priority=5)
+        assembler.add("other_arguments", f"""ARGUMENTS DEVELOPED IN OTHER SECTIONS (summaries):
+{format_other_arguments(content_bank)}""", tag="content_bank", priority=3)
+        assembler.add("examples", f"""EXAMPLES AVAILABLE:
+{json.dumps(content_bank['examples'], indent=2)}""", tag="content_bank", priority=4)
+        assembler.add("citations", f"""CITATIONS IDENTIFIED:
+{json.dumps(content_bank['citations'], indent=2)}""", tag="content_bank", priority=2)
+        section_type = classify_section(section["section_name"], section_index, len(writing_context["sections"]))
+        assembler.add("style_digest", style_digest_block(self.prompts.config, section_type), priority=1)
+        assembler.add("instructions", f"""REFINEMENT GUIDELINES:
 
 1. ADDRESS CRITIC FEEDBACK
    - Directly respond to major issues identified by the critic
@@ -134,8 +134,8 @@ OUTPUT FORMAT:
     }}
 }}
 
-Focus on creating a substantially improved section that directly addresses the critic's feedback while maintaining philosophical rigor and clear integration with the overall paper structure.
-"""
+Focus on creating a substantially improved section that directly addresses the critic's feedback while maintaining philosophical rigor and clear integration with the overall paper structure.""", required=True)
+        return assembler.build()
 
     def process_input(self, state: Dict[str, Any]) -> WorkerInput:
         """Prepare input for section refinement"""
@@ -0,0 +1,85 @@
+import json
+from typing import Dict, Any, List, Optional
+
+from src.phases.core.base_worker import WorkerInput, WorkerOutput
+from src.phases.core.worker_types import DevelopmentWorker
+from src.phases.phase_three.stages.stage_one.prompts.section_writing.section_writing_prompts import (
+    SectionWritingPrompts,
+)
+from src.utils.length_control import LengthPlan
+
+
+class LengthAdjustmentWorker(DevelopmentWorker):
+    """Expands or trims selected paragraphs of a written section to hit its word target"""
+
+    def __init__(self, config: Dict[str, Any]):
+        super().__init__(config)
+        self.prompts = SectionWritingPrompts(config=config)
+        self.stage_name = "section_length_adjustment"
+        self._state = {"paragraphs": []}
+
+    def _respond(self, prompt: str, system_prompt: Optional[str]) -> str:
+        models = self.api_handler.config["models"]
+        # Older configs: reuse the section writer's model
+        model_config = models.get(self.stage_name) or models["section_writing"]
+        return self.api_handler.make_api_call(
+            stage=self.stage_name, prompt=prompt, system_prompt=system_prompt, model_config=model_config
+        )
+
+    def _construct_prompt(self, input_data: WorkerInput) -> str:
+        return self.prompts.construct_length_adjustment_prompt(
+            writing_context=input_data.context["writing_context"],
+            section_index=input_data.parameters["section_index"],
+            paragraphs=input_data.context["paragraphs"],
+            paragraph_targets=input_data.parameters["paragraph_targets"],
+            word_target=input_data.parameters["word_target"],
+        )
+
+    def process_input(self, state: Dict[str, Any]) -> WorkerInput:
+        """Prepare input for a paragraph-level length fix"""
+        plan: LengthPlan = state["plan"]
+        self._state["paragraphs"] = sorted(plan.paragraph_targets)
+        return WorkerInput(
+            context={
+                "writing_context": state["writing_context"],
+                "paragraphs": state["paragraphs"],
+            },
+            parameters={
+                "section_index": state["section_index"],
+                "paragraph_targets": plan.paragraph_targets,
+                "word_target": plan.target,
+            },
+        )
+
+    def process_output(self, response: str) -> WorkerOutput:
+        """Map the numbered paragraphs in the response back to 0-based indices"""
+        try:
+            response_clean = response.replace("```json", "").replace("```", "").strip()
+            rewritten = json.loads(response_clean).get("paragraphs", [])
+            replacements = {
+                int(item["paragraph"]) - 1: item["text"]
+                for item in rewritten
+                if isinstance(item, dict) and str(item.get("text", "")).strip()
+            }
+            return WorkerOutput(
+                modifications={"paragraphs": replacements},
+                notes={"requested": self._state["paragraphs"]},
+                status="completed",
+            )
+        except (json.JSONDecodeError, AttributeError, KeyError, TypeError, ValueError) as e:
+            print(f"\nLength adjustment parsing failed. Error: {str(e)}")
+            return WorkerOutput(
+                modifications={},
+                notes={"error": f"Failed to parse response: {str(e)}"},
+                status="failed",
+            )
+
+    def validate_output(self, output: WorkerOutput) -> bool:
+        """Every requested paragraph must come back, and nothing else"""
+        if output.status != "completed":
+            return False
+        returned: List[int] = sorted(output.modifications["paragraphs"])
+        if returned != self._state["paragraphs"]:
+            print(f"Failed: expected paragraphs {self._state['paragraphs']}, got {returned}")
+            return False
+        return True
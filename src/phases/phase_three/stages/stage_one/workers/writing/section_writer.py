@@ -7,13 +7,16 @@ from src.phases.core.worker_types import DevelopmentWorker
 from src.phases.phase_three.stages.stage_one.prompts.section_writing.section_writing_prompts import (
     SectionWritingPrompts,
 )
-from src.phases.phase_two.base.framework import ValidationError
+from src.utils.length_control import count_words
+from src.utils.prompt_budget import stage_token_budget
 
 
 class SectionWritingWorker(DevelopmentWorker):
     def __init__(self, config: Dict[str, Any]):
         super().__init__(config)
-        self.prompts = SectionWritingPrompts()
+        self.prompts = SectionWritingPrompts(
+            token_budget=stage_token_budget(config, "section_writing"), config=config
+        )
         self._state = {"current_section_index": 0, "sections_completed": []}
         self.stage_name = "section_writing"
 
@@ -65,7 +68,7 @@ class SectionWritingWorker(DevelopmentWorker):
                 modifications=modifications,
                 notes={
                     "section_index": section_index,
-                    "word_count": modifications.get("word_count", 0),
+                    "word_count": count_words(modifications.get("section_content", "")),
                     "content_bank_usage": modifications.get("content_bank_usage", []),
                 },
                 status="completed",
@@ -112,7 +115,7 @@ class SectionWritingWorker(DevelopmentWorker):
 
         # Check word count
         word_count = output.modifications.get("word_count", 0)
-        actual_word_count = len(section_content.split())
+        actual_word_count = count_words(section_content)
         
         print(f"\nSection word count: {word_count} (reported) vs {actual_word_count} (actual)")
         
@@ -146,7 +149,7 @@ class SectionWritingWorker(DevelopmentWorker):
         # Get system prompt if available
         system_prompt = self.get_system_prompt()
         
-        # Construct prompt first - this triggers PDF selection in _select_analysis_exemplars
+        # Construct prompt first - this triggers exemplar selection in _select_analysis_exemplars
         prompt = self._construct_prompt(input_data)
         
         # Now get selected Analysis PDFs for style reference
@@ -162,15 +165,11 @@ class SectionWritingWorker(DevelopmentWorker):
                 system_prompt=system_prompt
             )
         else:
-            print("No Analysis papers available, proceeding without style exemplars")
+            print("No Analysis PDFs attached (using style digests or none available)")
             response = self.api_handler.make_api_call(
                 stage=self.stage_name, 
                 prompt=prompt,
                 system_prompt=system_prompt
             )
             
-        output = self.process_output(response)
-        if not self.validate_output(output):
-            print(response)
-            raise ValidationError("Worker output failed validation: ", self.stage_name)
-        return output 
\ No newline at end of file
+        return self._checked_output(response) 
\ No newline at end of file
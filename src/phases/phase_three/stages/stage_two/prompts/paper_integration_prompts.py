@@ -161,6 +161,65 @@ The paper should meet Analysis publication standards and be approximately {paper
 - Make the paper publication-ready for Analysis journal submission
 </requirements>"""
     
+    def construct_section_integration_prompt(self, section_text: str, section_issues: list,
+                                           paper_overview: Dict[str, Any], section_map: str,
+                                           previous_excerpt: str = "", next_excerpt: str = "") -> str:
+        """Generate prompt for integrating improvements into a single section of the paper"""
+
+        section_words = len(section_text.split())
+        issues_text = "\n".join(f"- {issue.lstrip('-* ').strip()}" for issue in section_issues)
+
+        return f"""<context>
+You are part of an automated philosophy paper generation pipeline. This is Phase III.2 (Global Integration).
+The complete paper has been analyzed and the issues below were traced to ONE section.
+You are revising only that section. The rest of the paper is left untouched, so your section must still fit between its neighbours.
+IMPORTANT: This is an automated API call. Deliver the COMPLETE revised section immediately.
+</context>
+
+<analysis_publication_standards>
+{self.analysis_publication_standards}
+</analysis_publication_standards>
+
+<paper_information>
+THESIS: {paper_overview['thesis']}
+TARGET LENGTH: {paper_overview['target_words']} words (whole paper)
+TARGET JOURNAL: Analysis
+</paper_information>
+
+<paper_structure>
+{section_map}
+</paper_structure>
+
+<preceding_text>
+{previous_excerpt or "None (this is the opening of the paper)"}
+</preceding_text>
+
+<section_to_revise>
+{section_text}
+</section_to_revise>
+
+<following_text>
+{next_excerpt or "None (this is the end of the paper)"}
+</following_text>
+
+<issues_to_address>
+{issues_text}
+</issues_to_address>
+
+<integration_principles>
+1. PRESERVE INTELLECTUAL CONTENT - Keep the section's arguments, examples and citations unless an issue requires changing them
+2. FIX ONLY WHAT IS LISTED - Address the issues above; do not rewrite for its own sake
+3. KEEP THE JOINS - The opening must follow from the preceding text and the close must lead into the following text
+4. STAY IN LENGTH - Keep within roughly 10% of the current {section_words} words
+5. TAKE PHILOSOPHICAL STANDS - Keep bold claims bold; do not add hedging
+</integration_principles>
+
+<output_format>
+Provide ONLY the revised section in markdown.
+Start with the section's existing heading line, unchanged.
+Do not include the paper title, other sections, meta-commentary, or requests for continuation.
+</output_format>"""
+
     def get_system_prompt(self) -> str:
         """Return the system prompt for API calls"""
         return self.system_prompt 
\ No newline at end of file
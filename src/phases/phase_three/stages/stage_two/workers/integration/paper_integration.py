@@ -4,6 +4,7 @@ from pathlib import Path
 from src.phases.core.base_worker import WorkerInput, WorkerOutput
 from src.phases.core.worker_types import RefinementWorker
 from src.phases.phase_three.stages.stage_two.prompts.paper_integration_prompts import PaperIntegrationPrompts
+from src.utils.style_digests import load_style_digests, style_digest_block
 
 
 class PaperIntegrationWorker(RefinementWorker):
@@ -21,6 +22,9 @@ class PaperIntegrationWorker(RefinementWorker):
 
     def _get_analysis_pdfs(self, pdf_count: int = 1) -> list:
         """Select Analysis PDFs for final publication standards guidance"""
+        if load_style_digests(self.config) is not None:
+            # Compact style snippets go in the prompt instead of full PDFs
+            return []
         analysis_dir = Path("Analysis_papers")
         if not analysis_dir.exists():
             print(f"⚠️ Analysis papers directory not found at {analysis_dir}")
@@ -50,6 +54,9 @@ class PaperIntegrationWorker(RefinementWorker):
         
         # Construct prompt
         prompt = self._construct_prompt(input_data)
+        style_digest = style_digest_block(self.config, "full_paper")
+        if style_digest:
+            prompt = f"{prompt}\n\n<analysis_style_digest>\n{style_digest}\n</analysis_style_digest>"
         
         # Get system prompt if available
         system_prompt = self.get_system_prompt() if hasattr(self, 'get_system_prompt') else None
@@ -0,0 +1,107 @@
+from typing import Dict, Any
+
+from src.phases.core.base_worker import WorkerInput, WorkerOutput
+from src.phases.core.worker_types import RefinementWorker
+from src.phases.phase_three.stages.stage_two.prompts.paper_integration_prompts import PaperIntegrationPrompts
+
+
+class SectionIntegrationWorker(RefinementWorker):
+    """Integrates global analysis issues into a single section of the paper
+
+    Used by Phase III.2's sectioned mode: each affected section is revised in
+    its own bounded call while unaffected sections pass through untouched.
+    """
+
+    def __init__(self, config: Dict[str, Any]):
+        super().__init__(config)
+        self._state = {"iterations": 0}
+        self.stage_name = "section_integration"
+        self.prompts = PaperIntegrationPrompts()
+
+    def _construct_prompt(self, input_data: WorkerInput) -> str:
+        return self.prompts.construct_section_integration_prompt(
+            section_text=input_data.context["section_text"],
+            section_issues=input_data.context["section_issues"],
+            paper_overview=input_data.context["paper_overview"],
+            section_map=input_data.context["section_map"],
+            previous_excerpt=input_data.context.get("previous_excerpt", ""),
+            next_excerpt=input_data.context.get("next_excerpt", ""),
+        )
+
+    def process_input(self, state: Dict[str, Any]) -> WorkerInput:
+        """Prepare input for section integration"""
+        return WorkerInput(
+            context={
+                "section_text": state["section_text"],
+                "section_heading": state.get("section_heading", ""),
+                "section_issues": state["section_issues"],
+                "paper_overview": state["paper_overview"],
+                "section_map": state["section_map"],
+                "previous_excerpt": state.get("previous_excerpt", ""),
+                "next_excerpt": state.get("next_excerpt", ""),
+            },
+            parameters={
+                "stage": "section_integration",
+                "section_index": state.get("section_index", 0),
+            },
+        )
+
+    def execute(self, state: Dict[str, Any]) -> WorkerOutput:
+        """Main execution method; falls back to the original text on unusable output"""
+        input_data = self.process_input(state)
+        response = self.api_handler.make_api_call(
+            stage=self.stage_name,
+            prompt=self._construct_prompt(input_data),
+            system_prompt=self.get_system_prompt(),
+        )
+        output = self.process_output(response)
+        output.modifications = self._restore_heading(output.modifications, input_data)
+
+        if not self.validate_output(output, input_data):
+            print(f"⚠️ {self.stage_name} output rejected, keeping original section")
+            return WorkerOutput(
+                status="unchanged",
+                modifications={
+                    "section_text": input_data.context["section_text"],
+                    "response_content": response,
+                },
+                notes={"reason": "Revised section failed validation"},
+            )
+        return output
+
+    def process_output(self, response: str) -> WorkerOutput:
+        """Process the section integration response"""
+        self._state["iterations"] += 1
+        section_text = response.strip()
+        if section_text.startswith("```"):
+            section_text = section_text.replace("```markdown", "").replace("```", "").strip()
+        return WorkerOutput(
+            status="completed",
+            modifications={
+                "section_text": section_text,
+                "response_content": response,
+            },
+            notes={"word_count": len(section_text.split())},
+        )
+
+    def _restore_heading(self, modifications: Dict[str, Any], input_data: WorkerInput) -> Dict[str, Any]:
+        """Ensure the revised section keeps its original heading line"""
+        heading = input_data.context["section_heading"]
+        section_text = modifications.get("section_text", "")
+        if heading and not section_text.lstrip().startswith("#"):
+            modifications["section_text"] = f"{heading}\n\n{section_text}"
+        return modifications
+
+    def validate_output(self, output: WorkerOutput, input_data: WorkerInput = None) -> bool:
+        """Reject empty or truncated revisions"""
+        section_text = output.modifications.get("section_text", "")
+        if not section_text.strip():
+            print("Failed: Empty section returned")
+            return False
+        if input_data is not None:
+            original_words = len(input_data.context["section_text"].split())
+            revised_words = len(section_text.split())
+            if revised_words < original_words * 0.5:
+                print(f"Failed: Revised section too short ({revised_words} vs {original_words} words)")
+                return False
+        return True
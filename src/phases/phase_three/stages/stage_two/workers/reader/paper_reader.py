@@ -4,6 +4,7 @@ from pathlib import Path
 from src.phases.core.base_worker import WorkerInput, WorkerOutput
 from src.phases.core.worker_types import CriticWorker
 from src.phases.phase_three.stages.stage_two.prompts.paper_reader_prompts import PaperReaderPrompts
+from src.utils.style_digests import load_style_digests, style_digest_block
 
 
 class PaperReaderWorker(CriticWorker):
@@ -21,6 +22,9 @@ class PaperReaderWorker(CriticWorker):
 
     def _get_analysis_pdfs(self, pdf_count: int = 1) -> list:
         """Select Analysis PDFs for publication quality assessment"""
+        if load_style_digests(self.config) is not None:
+            # Compact style snippets go in the prompt instead of full PDFs
+            return []
         analysis_dir = Path("Analysis_papers")
         if not analysis_dir.exists():
             print(f"⚠️ Analysis papers directory not found at {analysis_dir}")
@@ -252,6 +256,9 @@ class PaperReaderWorker(CriticWorker):
         
         # Construct prompt
         prompt = self._construct_prompt(input_data)
+        style_digest = style_digest_block(self.config, "full_paper")
+        if style_digest:
+            prompt = f"{prompt}\n\n<analysis_style_digest>\n{style_digest}\n</analysis_style_digest>"
         
         # Get system prompt if available
         system_prompt = self.get_system_prompt() if hasattr(self, 'get_system_prompt') else None
@@ -1,6 +1,7 @@
 from abc import ABC, abstractmethod
 from typing import Dict, Any, Optional
 from dataclasses import dataclass
+from src.utils.batch import reject_last_response
 from .worker import PhaseIIWorker, WorkerInput, WorkerOutput
 
 class WorkerError(Exception):
@@ -40,6 +41,7 @@ class FrameworkWorker(PhaseIIWorker):
         """Enhanced run with validation"""
         output = super().run(state)
         if not self.validate_output(output):
+            reject_last_response()
             raise ValidationError("Worker output failed validation")
         return output
 
@@ -4,6 +4,7 @@ from dataclasses import dataclass
 import os
 from pathlib import Path
 from src.utils.api import APIHandler
+from src.utils.batch import reject_last_response
 
 @dataclass
 class WorkerInput:
@@ -51,7 +52,11 @@ class PhaseIIWorker(ABC):
             stage=getattr(self, 'stage_name', self.__class__.__name__.lower()),
             prompt=self._construct_prompt(input_data)
         )
-        return self.process_output(response)
+        try:
+            return self.process_output(response)
+        except Exception:
+            reject_last_response()  # Do not replay an unusable response from the cache
+            raise
         
     @abstractmethod
     def _construct_prompt(self, input_data: WorkerInput) -> str:
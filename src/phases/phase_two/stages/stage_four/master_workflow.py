@@ -1,9 +1,10 @@
 import json
 import os
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, Optional
 from datetime import datetime
 
 from src.phases.core.base_workflow import BaseWorkflow
+from src.phases.core.version_store import VersionStore, history_budget_from_config
 from src.phases.phase_two.stages.stage_four.workers.planner.outline_planning import OutlinePlanningWorker
 from src.phases.phase_two.stages.stage_four.workers.planner.outline_development import OutlineDevelopmentWorker
 from src.phases.phase_two.stages.stage_four.workers.critic.outline_critic import OutlineCriticWorker
@@ -33,6 +34,8 @@ class DetailedOutlineDevelopmentWorkflow(BaseWorkflow):
         ]
         self.iterations_per_phase = 2
         self.max_iterations = 12
+        self.history_token_budget = history_budget_from_config(config)
+        self.versions_dir = None  # Set to persist full versions of each phase to disk
         
         # Initialize workers
         self.planning_worker = OutlinePlanningWorker(config)
@@ -140,8 +143,13 @@ class DetailedOutlineDevelopmentWorkflow(BaseWorkflow):
         # Update state with initial development - development_output is now the modifications dictionary
         initial_outline_content = development_output.get("core_content", "")
         phase_state["current_outline_development"] = initial_outline_content
-        previous_versions = [initial_outline_content]
-        phase_state["previous_versions"] = previous_versions
+        versions = VersionStore(
+            phase,
+            storage_dir=self.versions_dir,
+            token_budget=self.history_token_budget,
+        )
+        versions.add(initial_outline_content)
+        phase_state["previous_versions"] = versions.compact_history(include_latest=True)
         
         # Debug print the initial development
         print(f"Initial development content (first 100 chars): {initial_outline_content[:100]}...")
@@ -188,9 +196,9 @@ class DetailedOutlineDevelopmentWorkflow(BaseWorkflow):
                 refined_development = refinement_output.get("refined_development", "")
                 phase_state["current_outline_development"] = refined_development
                 
-                # Store this version in history
-                previous_versions.append(refined_development)
-                phase_state["previous_versions"] = previous_versions
+                # Store this version in history; prompts only see compact deltas
+                versions.add(refined_development)
+                phase_state["previous_versions"] = versions.compact_history(include_latest=True)
                 
                 # Log changes made
                 changes = refinement_output.get("changes_made", [])
@@ -205,8 +213,8 @@ class DetailedOutlineDevelopmentWorkflow(BaseWorkflow):
             iteration += 1
         
         # Select the best version from this phase
-        if previous_versions:
-            best_output = self._select_best_output(previous_versions, phase)
+        if len(versions):
+            best_output = self._select_best_output(versions, phase)
             
             # Update the state's phase_outputs to include this phase's output
             state["phase_outputs"][phase] = best_output
@@ -221,17 +229,17 @@ class DetailedOutlineDevelopmentWorkflow(BaseWorkflow):
         state["phase_outputs"][phase] = empty_output
         return empty_output, iteration
     
-    def _select_best_output(self, versions: List[str], phase: str) -> str:
+    def _select_best_output(self, versions: VersionStore, phase: str) -> str:
         """
         Select the best output from all versions in this phase.
         Usually this is the latest version, but we might implement more
         sophisticated selection criteria in the future.
         """
-        if not versions:
+        if not len(versions):
             return "No content developed"
         
         # For now, return the latest version
-        return versions[-1]
+        return versions.latest
     
     def _determine_best_phase_output(self) -> tuple[str, str]:
         """
@@ -1,5 +1,7 @@
 from typing import Dict, Any, List, Optional
 
+from src.phases.core.version_store import format_version_history
+
 
 class OutlineCriticPrompts:
     """Prompts for critiquing detailed outline development in Phase II.4."""
@@ -105,6 +107,7 @@ This is iteration {iteration+1} of the outline development process. Please consi
 - This critique should focus on comparing the current version to the previous ones
 - Identify improvements already made and areas still needing attention
 """
+            previous_versions_text += format_version_history(previous_versions)
         
         prompt = f"""<context>
 You are part of an automated philosophy paper generation pipeline. This is Phase II.4 (Detailed Outline Development).
@@ -236,6 +239,7 @@ This is iteration {iteration+1} of the outline development process. Please consi
 - This critique should focus on comparing the current version to the previous ones
 - Identify improvements already made and areas still needing attention
 """
+            previous_versions_text += format_version_history(previous_versions)
         
         prompt = f"""<context>
 You are part of an automated philosophy paper generation pipeline. This is Phase II.4 (Detailed Outline Development).
@@ -364,6 +368,7 @@ This is iteration {iteration+1} of the outline development process. Please consi
 - This critique should focus on comparing the current version to the previous ones
 - Identify improvements already made and areas still needing attention
 """
+            previous_versions_text += format_version_history(previous_versions)
         
         prompt = f"""<context>
 You are part of an automated philosophy paper generation pipeline. This is Phase II.4 (Detailed Outline Development).
@@ -3,6 +3,9 @@ import json
 import random
 from pathlib import Path
 
+from src.utils.prompt_budget import PromptAssembler, DEFAULT_PROMPT_TOKEN_BUDGET
+from src.utils.style_digests import style_digest_block
+
 
 class OutlineDevelopmentPrompts:
     """
@@ -15,11 +18,17 @@ class OutlineDevelopmentPrompts:
     4. Structural Validation: Validating the structure of the outline
     """
     
-    def __init__(self):
+    def __init__(self, token_budget: int = DEFAULT_PROMPT_TOKEN_BUDGET, config: Optional[Dict[str, Any]] = None):
+        self.token_budget = token_budget
+        self.config = config
         self.system_prompt = """You are an expert philosophy researcher developing a detailed paper outline. Your role is to create comprehensive structural blueprints that guide paper development through multiple phases. You must produce clear, actionable outlines with specific content guidance for an automated pipeline."""
     
     def _select_analysis_exemplars(self) -> str:
-        """Select Analysis PDFs as style exemplars"""
+        """Select Analysis style exemplars: digest snippets if built, else PDF names"""
+        digest = style_digest_block(self.config, "outline")
+        if digest:
+            return digest
+
         analysis_dir = Path("./Analysis_papers")
         if not analysis_dir.exists():
             return "No Analysis exemplars available for this run."
@@ -136,41 +145,34 @@ Use these Analysis journal patterns in your outline structure:
 - "But this raises a further question..."
 """
 
-        prompt = f"""<context>
+        assembler = PromptAssembler(self.token_budget)
+        assembler.add("context", """<context>
 You are part of an automated philosophy paper generation pipeline. This is Phase II.4 (Detailed Outline Development).
 This is the FRAMEWORK INTEGRATION phase, where you establish the structure and organization of the paper.
 Your output will guide all subsequent paper development phases.
 The outline must integrate the abstract framework into a logical section/subsection structure.
-</context>
-
-{anti_rlhf_prompt}
-
-{pattern_examples}
-
-{exemplar_info}
-
-<task>
+</context>""", required=True)
+        assembler.add("anti_rlhf", anti_rlhf_prompt, priority=3)
+        assembler.add("pattern_examples", pattern_examples, priority=0)
+        assembler.add("exemplars", exemplar_info, priority=1)
+        assembler.add("task", """<task>
 Develop a detailed outline that integrates the abstract framework into a logical structure.
 Create comprehensive sections with clear mappings to key moves.
 Allocate appropriate word counts for each section (target: 8,000-10,000 words).
 Ensure all key moves are addressed with proper logical flow.
-</task>
-
-<input_data>
-ABSTRACT:
+</task>""", required=True)
+        assembler.add("framework", f"""ABSTRACT:
 {abstract}
 
 MAIN THESIS:
 {main_thesis}
 
 FRAMEWORK KEY MOVES:
-{framework_key_moves_text}
-
-DEVELOPED KEY MOVES:
-{developed_key_moves_text}{previous_outputs_section}
-</input_data>
-
-<requirements>
+{framework_key_moves_text}""", tag="input_data", required=True)
+        assembler.add("developed_key_moves", f"""DEVELOPED KEY MOVES:
+{developed_key_moves_text}""", tag="input_data", priority=4)
+        assembler.add("previous_outputs", previous_outputs_section, tag="input_data", priority=1, keep="end")
+        assembler.add("instructions", """<requirements>
 Create a comprehensive outline that:
 1. Establishes logical section/subsection structure
 2. Explicitly maps key moves to specific sections
@@ -195,7 +197,8 @@ Present your outline in Markdown format:
 - Include clear labels for word counts and key move mappings
 - Ensure scholarly philosophical paper structure
 - Include intro, literature review, main arguments, objections/responses, conclusion
-</output_format>"""
+</output_format>""", required=True)
+        prompt = assembler.build()
         
         return prompt
     
@@ -310,41 +313,33 @@ Use these Analysis journal patterns in your outline structure:
 - "But this raises a further question..."
 """
 
-        prompt = f"""<context>
+        assembler = PromptAssembler(self.token_budget)
+        assembler.add("context", """<context>
 You are part of an automated philosophy paper generation pipeline. This is Phase II.4 (Detailed Outline Development).
 This is the LITERATURE MAPPING phase, where you incorporate scholarly context into the outline.
 You are refining the outline by mapping relevant literature to specific sections.
 Your output will ensure proper engagement with existing philosophical debates.
-</context>
-
-{anti_rlhf_prompt}
-
-{pattern_examples}
-
-{exemplar_info}
-
-<task>
+</context>""", required=True)
+        assembler.add("anti_rlhf", anti_rlhf_prompt, priority=3)
+        assembler.add("pattern_examples", pattern_examples, priority=0)
+        assembler.add("exemplars", exemplar_info, priority=1)
+        assembler.add("task", """<task>
 Refine the outline by mapping relevant literature to specific sections.
 Add subsections or notes for literature review components.
 Ensure proper engagement with existing philosophical debates.
 Map specific arguments from papers to relevant sections.
-</task>
-
-<input_data>
-ABSTRACT:
+</task>""", required=True)
+        assembler.add("framework", f"""ABSTRACT:
 {abstract}
 
 MAIN THESIS:
-{main_thesis}
-
-DEVELOPED KEY MOVES:
-{developed_key_moves_text}
-
-LITERATURE TO INCORPORATE:
-{literature_text}{previous_outputs_section}
-</input_data>
-
-<requirements>
+{main_thesis}""", tag="input_data", required=True)
+        assembler.add("developed_key_moves", f"""DEVELOPED KEY MOVES:
+{developed_key_moves_text}""", tag="input_data", priority=4)
+        assembler.add("literature", f"""LITERATURE TO INCORPORATE:
+{literature_text}""", tag="input_data", priority=2)
+        assembler.add("previous_outputs", previous_outputs_section, tag="input_data", priority=1, keep="end")
+        assembler.add("instructions", """<requirements>
 Focus on:
 1. Identifying where each paper should be discussed
 2. Adding subsections/notes for literature review
@@ -368,7 +363,8 @@ Present your outline in Markdown format:
 - Use headings for sections/subsections
 - Use bullet points for descriptions and notes
 - Include clear labels for literature mappings
-</output_format>"""
+</output_format>""", required=True)
+        prompt = assembler.build()
         
         return prompt
     
@@ -460,38 +456,31 @@ Use these Analysis journal patterns in your outline structure:
 - "But this raises a further question..."
 """
 
-        prompt = f"""<context>
+        assembler = PromptAssembler(self.token_budget)
+        assembler.add("context", """<context>
 You are part of an automated philosophy paper generation pipeline. This is Phase II.4 (Detailed Outline Development).
 This is the CONTENT DEVELOPMENT phase, where you provide comprehensive guidance on philosophical arguments.
 Your output will serve as the foundation for Phase III writing.
 The goal is a blueprint so detailed that Phase III writers need not make significant content decisions.
-</context>
-
-{anti_rlhf_prompt}
-
-{pattern_examples}
-
-{exemplar_info}
-
-<task>
+</context>""", required=True)
+        assembler.add("anti_rlhf", anti_rlhf_prompt, priority=3)
+        assembler.add("pattern_examples", pattern_examples, priority=0)
+        assembler.add("exemplars", exemplar_info, priority=1)
+        assembler.add("task", """<task>
 Develop highly detailed content for each section in the outline.
 Provide comprehensive guidance on philosophical arguments, objections, and responses.
 Articulate specific philosophical arguments with precise claims and supporting points.
 Include explicit guidance on examples, thought experiments, and methodological approaches.
-</task>
-
-<input_data>
-ABSTRACT:
+</task>""", required=True)
+        assembler.add("framework", f"""ABSTRACT:
 {abstract}
 
 MAIN THESIS:
-{main_thesis}
-
-DEVELOPED KEY MOVES:
-{developed_key_moves_text}{previous_outputs_section}
-</input_data>
-
-<requirements>
+{main_thesis}""", tag="input_data", required=True)
+        assembler.add("developed_key_moves", f"""DEVELOPED KEY MOVES:
+{developed_key_moves_text}""", tag="input_data", priority=4)
+        assembler.add("previous_outputs", previous_outputs_section, tag="input_data", priority=1, keep="end")
+        assembler.add("instructions", """<requirements>
 Focus on:
 1. Developing extremely detailed content notes for each section
 2. Articulating specific philosophical arguments with claims/premises/conclusions
@@ -525,7 +514,8 @@ Under each section heading, organize content guidance in these categories:
 - **Methodological Notes**: Approach for developing the section
 
 Be extremely concrete and specific in guidance, avoiding vague descriptions.
-</output_format>"""
+</output_format>""", required=True)
+        prompt = assembler.build()
         
         return prompt
     
@@ -619,38 +609,31 @@ Use these Analysis journal patterns in your outline structure:
 - "But this raises a further question..."
 """
 
-        prompt = f"""<context>
+        assembler = PromptAssembler(self.token_budget)
+        assembler.add("context", """<context>
 You are part of an automated philosophy paper generation pipeline. This is Phase II.4 (Detailed Outline Development).
 This is the STRUCTURAL VALIDATION phase, where you ensure the outline is comprehensive and ready for drafting.
 Your task is to validate and finalize the outline structure with detailed content guidance.
 The final outline must be so detailed that Phase III writers can follow it directly.
-</context>
-
-{anti_rlhf_prompt}
-
-{pattern_examples}
-
-{exemplar_info}
-
-<task>
+</context>""", required=True)
+        assembler.add("anti_rlhf", anti_rlhf_prompt, priority=3)
+        assembler.add("pattern_examples", pattern_examples, priority=0)
+        assembler.add("exemplars", exemplar_info, priority=1)
+        assembler.add("task", """<task>
 Validate and finalize the outline structure ensuring it forms a cohesive philosophical paper.
 Ensure the outline has exceptionally detailed content guidance.
 Verify logical flow and that all key moves are properly addressed.
 Confirm the outline serves as a comprehensive blueprint for Phase III.
-</task>
-
-<input_data>
-ABSTRACT:
+</task>""", required=True)
+        assembler.add("framework", f"""ABSTRACT:
 {abstract}
 
 MAIN THESIS:
-{main_thesis}
-
-DEVELOPED KEY MOVES:
-{developed_key_moves_text}{previous_outputs_section}
-</input_data>
-
-<requirements>
+{main_thesis}""", tag="input_data", required=True)
+        assembler.add("developed_key_moves", f"""DEVELOPED KEY MOVES:
+{developed_key_moves_text}""", tag="input_data", priority=4)
+        assembler.add("previous_outputs", previous_outputs_section, tag="input_data", priority=1, keep="end")
+        assembler.add("instructions", """<requirements>
 Focus on:
 1. Verifying logical flow of argument structure with specific claims/premises/conclusions
 2. Ensuring all key moves properly addressed with detailed content notes
@@ -687,7 +670,8 @@ For each section ensure structured content guidance includes:
 - **Methodological Notes**: Approach for developing the section
 
 Final outline must enable Phase III writers to proceed without significant content decisions.
-</output_format>"""
+</output_format>""", required=True)
+        prompt = assembler.build()
         
         return prompt
     
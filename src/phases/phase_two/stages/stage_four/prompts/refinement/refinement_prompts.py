@@ -1,6 +1,8 @@
 from typing import Dict, Any, List, Optional
 import json
 
+from src.phases.core.version_store import format_version_history
+
 
 class OutlineRefinementPrompts:
     """Prompts for refining detailed outline development in Phase II.4."""
@@ -143,6 +145,7 @@ This is iteration {iteration+1} of the outline development process. Please consi
 - This refinement should build on improvements already made
 - Focus on addressing the specific recommendations from the critique
 """
+            previous_versions_text += format_version_history(previous_versions)
         
         prompt = f"""<context>
 You are part of an automated philosophy paper generation pipeline. This is Phase II.4 (Detailed Outline Development).
@@ -247,6 +250,7 @@ This is iteration {iteration+1} of the outline development process. Please consi
 - This refinement should build on improvements already made
 - Focus on addressing the specific recommendations from the critique
 """
+            previous_versions_text += format_version_history(previous_versions)
         
         prompt = f"""<context>
 You are part of an automated philosophy paper generation pipeline. This is Phase II.4 (Detailed Outline Development).
@@ -338,6 +342,7 @@ Include:
 ## Previous Version History
 There are {len(previous_versions)} versions in the history. Use this information to avoid repeating problems that have already been addressed and build on improvements already made.
 """
+            previous_versions_text += format_version_history(previous_versions)
         
         prompt = f"""<context>
 You are part of an automated philosophy paper generation pipeline. This is Phase II.4 (Detailed Outline Development).
@@ -471,6 +476,7 @@ This is iteration {iteration+1} of the outline development process. Please consi
 - This refinement should build on improvements already made
 - Focus on addressing the specific recommendations from the critique
 """
+            previous_versions_text += format_version_history(previous_versions)
         
         prompt = f"""<context>
 You are part of an automated philosophy paper generation pipeline. This is Phase II.4 (Detailed Outline Development).
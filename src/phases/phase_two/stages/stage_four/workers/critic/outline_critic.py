@@ -4,6 +4,7 @@ from datetime import datetime
 
 from src.phases.core.base_worker import WorkerInput, WorkerOutput
 from src.phases.core.worker_types import CriticWorker
+from src.utils.aspect_critique import AspectCritique, labelled, merge_level
 from src.phases.phase_two.stages.stage_four.prompts.critic.critic_prompts import OutlineCriticPrompts
 from src.utils.api import APIHandler  # Add import for API handler
 
@@ -16,6 +17,14 @@ class OutlineCriticWorker(CriticWorker):
     phase (framework integration, literature mapping, etc).
     """
 
+    aspect_parallel = True
+    # The master workflow skips refinement on VERY GOOD / EXCELLENT
+    assessment_labels = {
+        "MAJOR_REVISION": "MAJOR REVISION NEEDED",
+        "MINOR_REFINEMENT": "MINOR REFINEMENT NEEDED",
+        "MINIMAL_CHANGES": "VERY GOOD",
+    }
+
     def __init__(self, config: Dict[str, Any]):
         super().__init__(config)
         self.prompts = OutlineCriticPrompts()
@@ -52,11 +61,27 @@ class OutlineCriticWorker(CriticWorker):
         """Execute the LLM call with the given prompt."""
         print(f"\nExecuting LLM call for {self.stage_name} (phase: {self._state['development_phase']})...")
         
-        # Use the API handler to make actual API calls
-        # The config has a model configuration for detailed_outline_critic
-        model_stage = "detailed_outline_critic"
-        
-        return self.api_handler.make_api_call(model_stage, prompt)
+        # Model configuration lives under detailed_outline_critic (see _model_stage)
+        return self._respond(prompt, None)
+
+    def _model_stage(self) -> str:
+        return "detailed_outline_critic"
+
+    def _render_aspect_critique(self, critiques: List[AspectCritique]) -> str:
+        """Merge aspect critiques, assessment and recommendations first for the extractors below"""
+        recommendations = "\n".join(
+            f"{i}. {entry}" for i, entry in enumerate(labelled(critiques, "recommendations"), 1)
+        )
+        issues = "\n".join(f"- {entry}" for entry in labelled(critiques, "major") + labelled(critiques, "minor"))
+        strengths = "\n".join(f"- {entry}" for entry in labelled(critiques, "strengths"))
+        findings = "\n\n".join(f"### {critique.name}\n{critique.findings}" for critique in critiques)
+        return "\n\n".join([
+            f"# Outline Critique\n\nOverall Assessment: {self.assessment_labels[merge_level(critiques)]}",
+            f"## Recommendations\n{recommendations}",
+            f"## Areas for Improvement\n{issues or '- None identified'}",
+            f"## Strengths\n{strengths or '- None noted'}",
+            f"## Analysis by Aspect\n\n{findings}",
+        ])
 
     def _construct_prompt(self, input_data: WorkerInput) -> str:
         """Construct the appropriate critique prompt based on the development phase."""
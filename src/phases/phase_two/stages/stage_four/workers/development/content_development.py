@@ -98,11 +98,7 @@ class ContentDevelopmentWorker(DevelopmentWorker):
                 system_prompt=system_prompt
             )
             
-        output = self.process_output(response)
-        if not self.validate_output(output):
-            print(response)
-            raise ValidationError("Worker output failed validation: ", self.stage_name)
-        return output
+        return self._checked_output(response, ValidationError)
 
     def process_input(self, state: Dict[str, Any]) -> WorkerInput:
         """Prepare input for content development."""
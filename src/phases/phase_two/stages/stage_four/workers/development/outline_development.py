@@ -6,6 +6,7 @@ from src.phases.core.worker_types import DevelopmentWorker
 from src.phases.phase_two.stages.stage_four.prompts.development.development_prompts import (
     OutlineDevelopmentPrompts,
 )
+from src.utils.prompt_budget import stage_token_budget
 
 
 class OutlineDevelopmentWorker(DevelopmentWorker):
@@ -19,7 +20,9 @@ class OutlineDevelopmentWorker(DevelopmentWorker):
 
     def __init__(self, config: Dict[str, Any]):
         super().__init__(config)
-        self.prompts = OutlineDevelopmentPrompts()
+        self.prompts = OutlineDevelopmentPrompts(
+            token_budget=stage_token_budget(config, "detailed_outline_development"), config=config
+        )
         self.stage_name = "detailed_outline_development"
         self._state = {
             "iterations": 0,
@@ -6,6 +6,8 @@ from pathlib import Path
 from src.phases.core.base_worker import BaseWorker, WorkerInput, WorkerOutput
 from src.phases.phase_two.stages.stage_four.prompts.development.development_prompts import OutlineDevelopmentPrompts
 from src.utils.api import APIHandler
+from src.utils.prompt_budget import stage_token_budget
+from src.utils.style_digests import load_style_digests
 
 
 @dataclass
@@ -21,13 +23,18 @@ class OutlineDevelopmentWorker(BaseWorker):
         super().__init__(config)
         self.name = "detailed_outline_development"
         self.description = "Develops the detailed outline according to the development plan."
-        self.prompts = OutlineDevelopmentPrompts()
+        self.prompts = OutlineDevelopmentPrompts(
+            token_budget=stage_token_budget(config, "detailed_outline_development"), config=config
+        )
         self.api_handler = APIHandler(config)  # Initialize API handler
         self.stage_name = "detailed_outline_development"  # For compatibility with BaseWorker
         self.selected_analysis_pdfs = []  # Store selected Analysis PDFs
 
     def _get_analysis_pdfs(self, pdf_count: int = 1) -> list:
         """Select Analysis PDFs for structural guidance"""
+        if load_style_digests(self.config) is not None:
+            # Compact style snippets go in the prompt instead of full PDFs
+            return []
         analysis_dir = Path("Analysis_papers")
         if not analysis_dir.exists():
             print(f"⚠️ Analysis papers directory not found at {analysis_dir}")
@@ -2,6 +2,7 @@ from pathlib import Path
 from typing import Dict, Any
 
 from src.phases.core.workflow import Workflow, WorkflowStep
+from src.phases.core.version_store import history_budget_from_config
 from src.phases.phase_two.stages.stage_four.workers.critic.outline_critic import OutlineCriticWorker
 from src.phases.phase_two.stages.stage_four.workers.development.framework_integration import FrameworkIntegrationWorker
 from src.phases.phase_two.stages.stage_four.workers.development.literature_mapping import LiteratureMappingWorker
@@ -71,7 +72,7 @@ def create_detailed_outline_workflow(
         "current_critique": "?current_critique",  # Optional critique 
         "critique_assessment": "?critique_assessment",  # Optional assessment
         "critique_recommendations": "?critique_recommendations",  # Optional recommendations
-        "previous_versions": "?current_outline_development",  # Optional previous versions
+        "previous_versions": "?version_history",  # Compact history of earlier versions
     })
     
     return Workflow(
@@ -111,4 +112,5 @@ def create_detailed_outline_workflow(
             ),
         ],
         output_dir=output_dir,
+        history_token_budget=history_budget_from_config(config),
     ) 
\ No newline at end of file
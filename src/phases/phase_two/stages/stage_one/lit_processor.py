@@ -3,7 +3,11 @@
 from pathlib import Path
 import json
 import re
-from typing import Dict, Any, List, Tuple
+from typing import Dict, Any, List, Optional, Tuple
+from run_utils import output_path
+from src.utils.batch import _file_digest, get_literature_index
+from src.utils.literature_store import ReadingsStore, reading_key
+from src.utils.quote_grounding import LITERATURE_TEXTS_DIR, QuoteCorpus
 from src.utils.json_utils import JSONHandler
 from ...base.worker import PhaseIIWorker, WorkerInput, WorkerOutput
 from .prompts import InitialReadPrompts, ProjectSpecificPrompts, SynthesisPrompts
@@ -79,11 +83,17 @@ class InitialReader(PhaseIIWorker):
         )
         quote_output = self.process_output(quote_response, stage="quotes")
         quotes = quote_output.modifications["quotes"]
+        grounding = self._ground_quotes(Path(input_data.context["paper_path"]), quotes)
         
         # Stage 2: Deep analysis using quotes
         print("  Stage 2: Conducting deep analysis...")
-        # Format quotes for inclusion in the analysis prompt
-        quotes_formatted = json.dumps(quotes, indent=2)
+        # Format quotes for inclusion in the analysis prompt, leaving out any
+        # the paper's text shows were not actually in it
+        quotes_formatted = json.dumps(
+            [quote for quote in quotes
+             if not (isinstance(quote, dict) and quote.get("grounding", {}).get("status") == "not_found")],
+            indent=2,
+        )
         analysis_prompt = self.prompts.get_prompt(
             paper_path=str(input_data.context["paper_path"]), 
             stage="analysis"
@@ -102,9 +112,58 @@ class InitialReader(PhaseIIWorker):
         # Add the extracted quotes to the final output
         if "initial_reading" in final_output.modifications:
             final_output.modifications["initial_reading"]["extracted_quotes"] = quotes
+            final_output.modifications["initial_reading"]["quote_grounding"] = grounding
+            # Names the cached text the quotes were checked against (<digest>/<stem>.txt)
+            final_output.modifications["initial_reading"]["source_digest"] = self._text_cache_path(
+                Path(input_data.context["paper_path"])
+            ).parent.name
         
         return final_output
 
+    @staticmethod
+    def _text_cache_path(paper_path: Path) -> Path:
+        """Where the PDF's locally extracted text is cached
+
+        The cache is keyed on the file's content, so same-named PDFs from
+        different papers' directories never share a text.
+        """
+        return LITERATURE_TEXTS_DIR / _file_digest(paper_path)[:16] / f"{paper_path.stem}.txt"
+
+    def _local_paper_text(self, paper_path: Path) -> str:
+        """Text of the PDF extracted locally, cached under analysis_cache/literature_texts"""
+        cache_path = self._text_cache_path(paper_path)
+        if cache_path.exists():
+            return cache_path.read_text(encoding="utf-8")
+        try:
+            from .pdf_processor import DualPDFProcessor
+        except ImportError:  # pdfplumber / PyMuPDF not installed
+            return ""
+        text = DualPDFProcessor().extract_text(paper_path)["content"] or ""
+        if text:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            cache_path.write_text(text, encoding="utf-8")
+        return text
+
+    def _ground_quotes(self, paper_path: Path, quotes: List[Any]) -> Dict[str, Any]:
+        """Annotate each extracted quote with where (and whether) it occurs in the paper"""
+        text = self._local_paper_text(paper_path)
+        if not text:
+            return {"checked": False, "reason": "No local text for this PDF"}
+
+        corpus = QuoteCorpus()
+        corpus.add_document(paper_path.name, text)
+        counts: Dict[str, int] = {}
+        for quote in quotes:
+            if not isinstance(quote, dict):
+                continue
+            match = corpus.locate(quote.get("text", ""))
+            quote["grounding"] = {"status": match.status, "score": match.score, "start": match.start}
+            counts[match.status] = counts.get(match.status, 0) + 1
+
+        if counts.get("not_found"):
+            print(f"  ⚠️ {counts['not_found']}/{len(quotes)} extracted quotes not found in the paper text")
+        return {"checked": True, "counts": counts}
+
 
 class ProjectSpecificReader(PhaseIIWorker):
     """Second read: Project-specific analysis"""
@@ -192,16 +251,8 @@ class LiteratureSynthesizer(PhaseIIWorker):
 
     def prepare_input(self, state: Dict[str, Any]) -> WorkerInput:
         """Prepare for synthesis"""
-        # Extract the actual readings from WorkerOutput objects
-        paper_readings = {
-            paper_id: {
-                "initial": reading["initial"].modifications["initial_reading"],
-                "project_specific": reading["project_specific"].modifications[
-                    "project_specific_reading"
-                ],
-            }
-            for paper_id, reading in state["paper_readings"].items()
-        }
+        # Full readings are only loaded from the store for the synthesis prompt
+        paper_readings = dict(state["readings_store"].iter_readings(state.get("paper_ids")))
 
         return WorkerInput(
             outline_state=state,
@@ -312,36 +363,62 @@ class LiteratureSynthesizer(PhaseIIWorker):
 
 
 class LiteratureManager:
-    """Manages the complete literature processing workflow"""
+    """Manages the complete literature processing workflow
 
-    def __init__(self, config: Dict):
+    Every reading is appended to a ``ReadingsStore`` in the output
+    directory as soon as it completes, and only a short summary per paper
+    is kept in ``state["paper_readings"]``. Rerunning on the same output
+    directory resumes: readings whose inputs are unchanged are not redone.
+    """
+
+    def __init__(self, config: Dict, store: Optional[ReadingsStore] = None):
         self.config = config
         self.initial_reader = InitialReader(config)
         self.project_reader = ProjectSpecificReader(config)
         self.synthesizer = LiteratureSynthesizer(config)
+        self.store = store or ReadingsStore(output_path())
 
     def process_papers(
         self, papers: List[Path], final_selection: Dict
     ) -> Dict[str, Any]:
         """Process all papers through all stages"""
-        state = {"final_selection": final_selection, "paper_readings": {}}
+        state = {
+            "final_selection": final_selection,
+            "paper_ids": [paper.stem for paper in papers],
+            "readings_store": self.store,
+        }
 
         # First pass: Initial reading of all papers
         print("\n=== Stage 1: Initial Reading ===")
         for i, paper in enumerate(papers):
             print(f"\nProcessing paper {i+1}/{len(papers)}: {paper.name}")
+            key = reading_key(paper)
+            if self.store.has(paper.stem, "initial", key):
+                print("  ♻️  Resuming: initial reading already saved")
+                continue
             state["current_paper"] = paper
-            reading = self.initial_reader.run(state)
-            state["paper_readings"][paper.stem] = {"initial": reading}
+            reading = self._initial_reading(state, paper)
+            self.store.put(paper.stem, "initial", reading.modifications["initial_reading"], key)
 
         # Second pass: Project-specific reading
         print("\n=== Stage 2: Project-Specific Analysis ===")
         for i, paper in enumerate(papers):
             print(f"\nAnalyzing paper {i+1}/{len(papers)}: {paper.name}")
+            key = reading_key(paper, final_selection)
+            if self.store.has(paper.stem, "project_specific", key):
+                print("  ♻️  Resuming: project-specific reading already saved")
+                continue
             state["current_paper"] = paper
-            state["initial_reading"] = state["paper_readings"][paper.stem]["initial"]
+            state["initial_reading"] = WorkerOutput(
+                modifications={"initial_reading": self.store.get(paper.stem, "initial")},
+                notes={"paper_processed": paper.name},
+                status="completed",
+            )
             reading = self.project_reader.run(state)
-            state["paper_readings"][paper.stem]["project_specific"] = reading
+            self.store.put(paper.stem, "project_specific",
+                           reading.modifications["project_specific_reading"], key)
+        state.pop("initial_reading", None)
+        state["paper_readings"] = {paper_id: self.store.summaries.get(paper_id, {}) for paper_id in state["paper_ids"]}
 
         # Final synthesis
         print("\n=== Stage 3: Literature Synthesis ===")
@@ -349,3 +426,23 @@ class LiteratureManager:
         state["synthesis"] = synthesis
 
         return state
+
+    def _initial_reading(self, state: Dict[str, Any], paper: Path) -> WorkerOutput:
+        """Run the initial reading, reusing the batch literature index when one is installed"""
+        index = get_literature_index()
+        if index is None:
+            return self.initial_reader.run(state)
+
+        key = index.key_for(paper)
+        with index.locked(key):
+            cached = index.get(key)
+            if cached is not None:
+                print("  ♻️  Reusing initial reading from the shared literature index")
+                return WorkerOutput(
+                    modifications={"initial_reading": cached},
+                    notes={"paper_processed": paper.name, "from_literature_index": True},
+                    status="completed",
+                )
+            reading = self.initial_reader.run(state)
+            index.put(key, reading.modifications["initial_reading"])
+            return reading
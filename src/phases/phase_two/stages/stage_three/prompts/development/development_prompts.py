@@ -1,10 +1,34 @@
 from typing import Dict, Any, Optional, List
 
+from src.utils.moves_index import relevant_moves_block
+
 
 class MoveDevelopmentPrompts:
     """Prompts for developing key moves in Phase II.3."""
 
-    def __init__(self):
+    def __init__(self, config: Optional[Dict[str, Any]] = None):
+        self.config = config
+        self.default_moves_examples = """1. **Inductive Plausibility Defense**
+   Pattern: For controversial principle P: (1) show P holds for uncontroversial cases, (2) argue no clear counterexamples, (3) claim prima facie warrant
+   Example: "First, he argues that, quite plausibly, at least some of the truthmaker maximalist approaches on the market are logically consistent. Then he proceeds inductively and claims that the fact that it is clearly logically possible for some representative truths to have a truthmaker ('Obama is male; wombats are marsupials; 1 + 1 = 2') gives us 'warrant – not a proof, but reason nonetheless – to accept (P)'"
+   Achievement: Provides defeasible support for controversial principles without claiming certainty
+
+2. **Alternative Principle Construction**
+   Pattern: When principle P faces objection O: (1) construct weaker principle P+ that avoids O, (2) show P+ still sufficient for main conclusion, (3) argue P+ equally plausible as P
+   Example: "However, in order to ward off this objection it appears sufficient to replace (PG) with the following, similarly plausible principle: (PG+) (◊GA ∧ (A ∧ B)) → ◊(GA ∧ B). The same train of thought used above to defend (PG) can also be used to defend (PG+). Equipped with (PG+) we can then argue as follows..."
+   Achievement: Maintains argumentative power while accommodating legitimate objections
+
+3. **Scope Restriction Maneuver**
+   Pattern: When universal claim faces counterexamples: (1) acknowledge the exceptions, (2) restrict scope appropriately, (3) argue restricted conclusion still philosophically important
+   Example: "However, even if we accept the existence of either essentialist facts or totality facts... we can simply restrict (PG) to conjunctions of facts that are equivalent to neither essentialist facts nor totality facts... a result that is surely surprising enough on its own."
+   Achievement: Preserves main argument by acknowledging limitations while showing result remains significant"""
+
+        self.default_pattern_guide = """PATTERN SELECTION GUIDE:
+- Defending a controversial principle? → Use Inductive Plausibility Defense
+- Facing a specific objection to your principle? → Use Alternative Principle Construction
+- Your universal claim has exceptions? → Use Scope Restriction Maneuver
+- Not sure? Default to standard argumentation"""
+
         self.system_prompt = """You are an expert philosophy researcher developing key argumentative moves for an Analysis journal paper. Your role is to develop substantive philosophical content that advances the paper's thesis through rigorous argumentation. You must work within the constraints of available literature and produce clear, compelling philosophical prose."""
 
         self.curated_examples_database = """<philosophical_examples_from_analysis>
@@ -178,6 +202,8 @@ Key patterns for Analysis journal examples:
         lit_synthesis = literature.get("synthesis", {})
         lit_narrative = literature.get("narrative", "")
 
+        moves_examples = self._moves_examples_block(move)
+
         prompt = f"""<context>
 You are part of an automated philosophy paper generation pipeline. This is Phase II.3 (Key Moves Development).
 - Phase I identified the paper topic and gathered literature
@@ -256,28 +282,7 @@ Choose the approach that best serves this specific argument.
 </requirements>
 
 <philosophical_moves_examples>
-Here are proven philosophical move patterns from published Analysis papers:
-
-1. **Inductive Plausibility Defense**
-   Pattern: For controversial principle P: (1) show P holds for uncontroversial cases, (2) argue no clear counterexamples, (3) claim prima facie warrant
-   Example: "First, he argues that, quite plausibly, at least some of the truthmaker maximalist approaches on the market are logically consistent. Then he proceeds inductively and claims that the fact that it is clearly logically possible for some representative truths to have a truthmaker ('Obama is male; wombats are marsupials; 1 + 1 = 2') gives us 'warrant – not a proof, but reason nonetheless – to accept (P)'"
-   Achievement: Provides defeasible support for controversial principles without claiming certainty
-
-2. **Alternative Principle Construction**
-   Pattern: When principle P faces objection O: (1) construct weaker principle P+ that avoids O, (2) show P+ still sufficient for main conclusion, (3) argue P+ equally plausible as P
-   Example: "However, in order to ward off this objection it appears sufficient to replace (PG) with the following, similarly plausible principle: (PG+) (◊GA ∧ (A ∧ B)) → ◊(GA ∧ B). The same train of thought used above to defend (PG) can also be used to defend (PG+). Equipped with (PG+) we can then argue as follows..."
-   Achievement: Maintains argumentative power while accommodating legitimate objections
-
-3. **Scope Restriction Maneuver**
-   Pattern: When universal claim faces counterexamples: (1) acknowledge the exceptions, (2) restrict scope appropriately, (3) argue restricted conclusion still philosophically important
-   Example: "However, even if we accept the existence of either essentialist facts or totality facts... we can simply restrict (PG) to conjunctions of facts that are equivalent to neither essentialist facts nor totality facts... a result that is surely surprising enough on its own."
-   Achievement: Preserves main argument by acknowledging limitations while showing result remains significant
-
-PATTERN SELECTION GUIDE:
-- Defending a controversial principle? → Use Inductive Plausibility Defense
-- Facing a specific objection to your principle? → Use Alternative Principle Construction
-- Your universal claim has exceptions? → Use Scope Restriction Maneuver
-- Not sure? Default to standard argumentation
+{moves_examples}
 
 OBJECTION ANTICIPATION:
 For each major claim, actively seek objections:
@@ -328,6 +333,22 @@ FINAL CHECKLIST:
 
         return prompt
 
+    def _moves_examples_block(self, move: str) -> str:
+        """Move patterns for this key move: top matches from the moves index, else the defaults"""
+        indexed = relevant_moves_block(self.config, move)
+        if indexed:
+            return (
+                "Here are philosophical move patterns from published Analysis papers that fit this move:\n\n"
+                f"{indexed}\n\n"
+                "PATTERN SELECTION GUIDE:\n"
+                "- Use whichever pattern above matches what your argument needs at this point\n"
+                "- Not sure? Default to standard argumentation"
+            )
+        return (
+            "Here are proven philosophical move patterns from published Analysis papers:\n\n"
+            f"{self.default_moves_examples}\n\n{self.default_pattern_guide}"
+        )
+
     def get_examples_development_prompt(
         self,
         move: str,
@@ -553,6 +574,63 @@ IMPORTANT:
 
         return prompt
 
+    def get_branch_merge_prompt(self, move: str, conflicts: List[Any]) -> str:
+        """
+        Construct prompt for reconciling the examples and literature branches of a key move.
+
+        Both branches revised the same initial development concurrently. Sections only
+        one branch changed were merged locally; each conflict here is a section both
+        branches rewrote, given with its initial version and the two revisions.
+        """
+        blocks = []
+        for number, conflict in enumerate(conflicts, 1):
+            versions = "\n\n".join(
+                f"<{branch}_version>\n{text}\n</{branch}_version>" for branch, text in conflict.versions.items()
+            )
+            heading = f" ({conflict.heading.lstrip('#').strip()})" if conflict.heading else ""
+            blocks.append(f"""<conflict id="{number}"{heading}>
+<initial_version>
+{conflict.base}
+</initial_version>
+
+{versions}
+</conflict>""")
+        conflict_blocks = "\n\n".join(blocks)
+
+        return f"""<context>
+You are part of an automated philosophy paper generation pipeline. This is Phase II.3 (Key Moves Development).
+Two revisions of the same key move development were made independently from one initial version:
+the examples revision added or sharpened examples, and the literature revision integrated scholarly literature.
+Everything the revisions did not both rewrite has already been combined. You reconcile what remains.
+</context>
+
+<key_move>
+{move}
+</key_move>
+
+<task>
+For each conflict below, write ONE version of the passage that keeps the examples from the examples
+version AND the literature engagement from the literature version, on top of the argument of the
+initial version. Where they overlap, keep the stronger formulation once; do not repeat points.
+</task>
+
+{conflict_blocks}
+
+<requirements>
+- Publication-ready scholarly prose in Analysis journal style, as in the revisions
+- Keep every citation from the literature version that the passage still uses
+- Keep every example from the examples version, fully developed
+- Do not add new examples, citations or arguments
+- Keep the passage's heading if it has one; do not add commentary about the merge
+</requirements>
+
+<output_format>
+One block per conflict, in order:
+<resolved id="1">
+The reconciled passage
+</resolved>
+</output_format>"""
+
     def get_system_prompt(self) -> str:
         """Return the system prompt for API calls"""
         return self.system_prompt
@@ -16,6 +16,8 @@ class MoveCriticWorker(CriticWorker):
     and alignment with the overall framework.
     """
 
+    aspect_parallel = True
+
     def __init__(self, config: Dict[str, Any]):
         super().__init__(config)
         self.prompts = MoveCriticPrompts()
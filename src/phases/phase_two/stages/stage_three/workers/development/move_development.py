@@ -20,7 +20,7 @@ class MoveDevelopmentWorker(DevelopmentWorker):
 
     def __init__(self, config: Dict[str, Any]):
         super().__init__(config)
-        self.prompts = MoveDevelopmentPrompts()
+        self.prompts = MoveDevelopmentPrompts(config)
         self.stage_name = "move_development"
         self._state = {
             "iterations": 0,
@@ -107,11 +107,7 @@ class MoveDevelopmentWorker(DevelopmentWorker):
                 system_prompt=system_prompt
             )
             
-        output = self.process_output(response)
-        if not self.validate_output(output):
-            print(response)
-            raise ValidationError("Worker output failed validation: ", self.stage_name)
-        return output
+        return self._checked_output(response, ValidationError)
 
     def process_input(self, state: Dict[str, Any]) -> WorkerInput:
         """Prepare input for key move development."""
@@ -0,0 +1,61 @@
+from typing import Dict, Any, Optional
+
+from src.phases.core.base_worker import WorkerInput, WorkerOutput
+from src.phases.core.branch_merge import parse_resolutions
+from src.phases.core.worker_types import DevelopmentWorker
+from src.phases.phase_two.stages.stage_three.prompts.development.development_prompts import (
+    MoveDevelopmentPrompts,
+)
+
+
+class MoveMergeWorker(DevelopmentWorker):
+    """
+    Worker that reconciles the sections both concurrent branches of a key move rewrote.
+
+    Takes the conflicts left by the local structural merge and returns one
+    reconciled passage per conflict.
+    """
+
+    def __init__(self, config: Dict[str, Any]):
+        super().__init__(config)
+        self.prompts = MoveDevelopmentPrompts(config)
+        self.stage_name = "move_merge"
+        self._state = {"conflicts": 0}
+
+    def _respond(self, prompt: str, system_prompt: Optional[str]) -> str:
+        models = self.api_handler.config["models"]
+        # Configs without a merge entry use the development model
+        model_config = models.get(self.stage_name) or models["move_development"]
+        return self.api_handler.make_api_call(
+            stage=self.stage_name, prompt=prompt, system_prompt=system_prompt, model_config=model_config
+        )
+
+    def _construct_prompt(self, input_data: WorkerInput) -> str:
+        return self.prompts.get_branch_merge_prompt(
+            move=input_data.parameters["move"],
+            conflicts=input_data.context["conflicts"],
+        )
+
+    def process_input(self, state: Dict[str, Any]) -> WorkerInput:
+        """Prepare the conflicts for reconciliation"""
+        self._state["conflicts"] = len(state["conflicts"])
+        return WorkerInput(
+            context={"conflicts": state["conflicts"]},
+            parameters={"move": state["move"], "phase": "move_merge"},
+        )
+
+    def process_output(self, response: str) -> WorkerOutput:
+        """Extract the reconciled passages in conflict order"""
+        resolutions, missing = parse_resolutions(response, self._state["conflicts"])
+        return WorkerOutput(
+            modifications={"resolutions": resolutions},
+            notes={"missing": missing},
+            status="completed" if not missing else "failed",
+        )
+
+    def validate_output(self, output: WorkerOutput) -> bool:
+        """Every conflict needs a reconciled passage"""
+        if output.notes["missing"]:
+            print(f"Failed: no reconciled passage for conflicts {output.notes['missing']}")
+            return False
+        return True
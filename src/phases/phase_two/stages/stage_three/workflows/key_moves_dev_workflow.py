@@ -2,6 +2,7 @@ from pathlib import Path
 from typing import Dict, Any
 
 from src.phases.core.workflow import Workflow, WorkflowStep
+from src.phases.core.version_store import history_budget_from_config
 from src.phases.phase_two.stages.stage_three.workers.critic.move_critic import (
     MoveCriticWorker,
 )
@@ -55,7 +56,7 @@ def create_key_moves_dev_workflow(
             "current_critique": "?current_critique",  # Optional critique
             "critique_assessment": "?critique_assessment",  # Optional assessment
             "critique_recommendations": "?critique_recommendations",  # Optional recommendations
-            "previous_versions": "?current_move_development",  # Optional previous versions
+            "previous_versions": "?version_history",  # Compact history of earlier versions
         }
     )
 
@@ -96,4 +97,5 @@ def create_key_moves_dev_workflow(
             ),
         ],
         output_dir=output_dir,
+        history_token_budget=history_budget_from_config(config),
     )
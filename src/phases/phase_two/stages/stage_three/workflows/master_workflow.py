@@ -2,12 +2,312 @@ from pathlib import Path
 import json
 import logging
 import time
-from typing import Dict, Any, List
+from typing import Dict, Any, Callable, List
 import datetime
 
+from src.phases.core.branch_merge import branch_settings, merge_branches
+from src.utils.map_reduce import map_bounded
+from src.utils.tracing import span
 from src.phases.phase_two.stages.stage_three.workflows.key_moves_dev_workflow import (
     create_key_moves_dev_workflow,
 )
+from src.phases.phase_two.stages.stage_three.workers.development.move_merge import (
+    MoveMergeWorker,
+)
+
+
+def _run_development_phase(
+    config: Dict[str, Any],
+    moves_output_dir: Path,
+    workflow_name: str,
+    framework: Dict[str, Any],
+    outline: Dict[str, Any],
+    key_moves: Dict[str, Any],
+    literature: Dict[str, Any],
+    i: int,
+    move: str,
+    phase: str,
+    previous_phase_result: Any,
+) -> Dict[str, Any]:
+    """
+    Run one development phase of a key move: development plus critique/refinement cycles.
+
+    Returns the phase's content (or an error message), the result the next phase
+    builds on (None if the phase failed), its refinement history and its duration.
+    """
+    phase_results = {}
+    refinement_history = []
+    next_result = None
+
+    with span(f"key move {i+1} {phase}", "stage"):
+        phase_start_time = time.time()
+
+        print(f"\nExecuting step: {phase} development")
+        logging.info(f"Processing development phase: {phase}")
+
+        # For phases after initial, use the previous phase's result
+        initial_state = {
+            "framework": framework,
+            "outline": outline,
+            "key_moves": key_moves,  # Always pass the original key_moves
+            "literature": literature,
+            "move_index": i,  # Pass the index of the current move
+            "development_phase": phase,  # Set the current development phase
+        }
+
+        # Add the previous phase result if available
+        if previous_phase_result is not None:
+            # Pass the previous phase's refined content as the current content
+            if (
+                isinstance(previous_phase_result, dict)
+                and "refined_development" in previous_phase_result
+            ):
+                initial_state["current_move_development"] = previous_phase_result[
+                    "refined_development"
+                ]
+            else:
+                logging.warning(
+                    f"Previous phase result doesn't contain expected structure: {type(previous_phase_result)}"
+                )
+                # Try to extract useful content anyway
+                if isinstance(previous_phase_result, dict):
+                    # Try different possible locations of the content
+                    for key in [
+                        "core_content",
+                        "refined_development",
+                        "full_content",
+                    ]:
+                        if key in previous_phase_result:
+                            initial_state["current_move_development"] = (
+                                previous_phase_result[key]
+                            )
+                            break
+                else:
+                    # If it's a string, pass it directly as the current content
+                    initial_state["current_move_development"] = previous_phase_result
+
+        # Create and execute the workflow for this phase
+        workflow = create_key_moves_dev_workflow(
+            config=config,
+            output_dir=moves_output_dir,
+            workflow_name=f"{workflow_name}_{phase}",
+            max_cycles=config.get("key_move_max_cycles", 3),
+        )
+
+        # Execute the workflow and get the result, handling potential errors
+        try:
+            result = workflow.execute(initial_state)
+
+            # Extract only the final refined output for this phase (the most important part)
+            if isinstance(result, dict) and "current_move_development" in result:
+                # The result might contain the full cycle history - extract just the final refinement
+                final_refinement = result["current_move_development"]
+
+                # Record any critique/refinement history if available
+                if "critiques" in result and "refinements" in result:
+                    for cycle_idx, (critique, refinement) in enumerate(
+                        zip(
+                            result.get("critiques", []),
+                            result.get("refinements", []),
+                        )
+                    ):
+                        # Handle both dict and string critique/refinement objects
+                        if isinstance(critique, dict):
+                            assessment = critique.get("assessment", "UNKNOWN")
+                            recommendations = critique.get("recommendations", [])
+                        else:
+                            assessment = "UNKNOWN"
+                            recommendations = []
+
+                        if isinstance(refinement, dict):
+                            changes_made = refinement.get("changes_made", [])
+                        else:
+                            changes_made = []
+
+                        refinement_history.append(
+                            {
+                                "phase": phase,
+                                "cycle": cycle_idx + 1,
+                                "assessment": assessment,
+                                "recommendations": recommendations,
+                                "changes_made": changes_made,
+                            }
+                        )
+            else:
+                # If we don't have the expected structure, just use the whole result
+                final_refinement = result
+
+            # Save a simplified version of the result (just the final output) to JSON
+            output_file = moves_output_dir / f"{workflow_name}_{phase}_final.json"
+
+            # Extract just the essential content if possible
+            final_content = ""
+            if isinstance(final_refinement, dict):
+                if "refined_development" in final_refinement:
+                    final_content = final_refinement["refined_development"]
+                elif "core_content" in final_refinement:
+                    final_content = final_refinement["core_content"]
+                else:
+                    # Try to get sections and combine them
+                    sections = final_refinement.get("sections", {})
+                    if sections:
+                        final_content = "\n\n".join(
+                            [
+                                f"# {section}\n{content}"
+                                for section, content in sections.items()
+                            ]
+                        )
+                    else:
+                        # Last resort
+                        final_content = str(final_refinement)
+            else:
+                final_content = str(final_refinement)
+
+            # Save just the essential content
+            with open(output_file, "w") as f:
+                json.dump({"content": final_content}, f, indent=2)
+
+            # Store this phase's result
+            phase_results[phase] = final_content
+
+            # The next phase builds on this phase's result
+            next_result = final_refinement
+
+            phase_duration = time.time() - phase_start_time
+            print(f"⏱️  {phase.title()} development completed in {phase_duration:.1f} seconds")
+            logging.info(f"Completed {phase} phase for key move {i+1}")
+
+        except Exception as e:
+            logging.error(
+                f"Error processing {phase} phase for key move {i+1}: {str(e)}"
+            )
+
+            # Look for initial development content that might be available despite the error
+            # This ensures we capture the developed content even if critique fails
+            if (
+                phase == "initial"
+                and initial_state.get("development_phase") == "initial"
+            ):
+                try:
+                    # Check if we can find the initial development output file
+                    dev_output_path = (
+                        moves_output_dir / f"{workflow_name}_{phase}.json"
+                    )
+                    if dev_output_path.exists():
+                        with open(dev_output_path, "r") as f:
+                            dev_data = json.load(f)
+                            if (
+                                "output" in dev_data
+                                and "modifications" in dev_data["output"]
+                            ):
+                                mods = dev_data["output"]["modifications"]
+                                if "core_content" in mods:
+                                    # We found the content! Use it instead of the error message
+                                    content = mods["core_content"]
+                                    logging.info(
+                                        "Recovered content from development phase despite critique error"
+                                    )
+                                    phase_results[phase] = content
+                                    next_result = {"core_content": content}
+                except Exception as recovery_error:
+                    logging.error(
+                        f"Failed to recover content after error: {str(recovery_error)}"
+                    )
+
+            # If we couldn't recover content, use the error message
+            if phase not in phase_results:
+                # Create a minimal result for this phase to allow continuing
+                error_result = {
+                    "error": str(e),
+                    "phase": phase,
+                    "move_index": i,
+                    "move": move,
+                    "status": "failed",
+                }
+
+                # Save the error result
+                error_file = (
+                    moves_output_dir / f"{workflow_name}_{phase}_error.json"
+                )
+                with open(error_file, "w") as f:
+                    json.dump(error_result, f, indent=2)
+
+                # Store this phase's error result
+                phase_results[phase] = f"Error in {phase} phase: {str(e)}"
+
+    return {
+        "content": phase_results[phase],
+        "result": next_result,
+        "history": refinement_history,
+        "duration": time.time() - phase_start_time,
+    }
+
+
+def _develop_in_branches(
+    config: Dict[str, Any],
+    moves_output_dir: Path,
+    workflow_name: str,
+    move: str,
+    run_phase: Callable[[str, Any], Dict[str, Any]],
+    record: Callable[[str, Dict[str, Any]], None],
+    branch_phases: List[str],
+    initial_run: Dict[str, Any],
+    settings: Dict[str, Any],
+) -> str:
+    """
+    Run the branch phases concurrently from the initial development, then merge them.
+
+    Sections only one branch changed are merged locally; sections both rewrote
+    are reconciled with one MoveMergeWorker call. If reconciliation fails, the
+    last branch is re-run on the first branch's result, as in sequential mode.
+    Returns the move's final content.
+    """
+    print(f"\nExecuting steps concurrently: {' and '.join(branch_phases)} development")
+    runs, failures = map_bounded(
+        lambda phase: run_phase(phase, initial_run["result"]), branch_phases, workers=len(branch_phases)
+    )
+    outcomes = dict(runs)
+    for phase, error in failures:
+        logging.error(f"Error processing {phase} branch for {workflow_name}: {str(error)}")
+        outcomes[phase] = {"content": f"Error in {phase} phase: {str(error)}", "result": None,
+                           "history": [], "duration": 0.0}
+    for phase in branch_phases:
+        record(phase, outcomes[phase])
+
+    succeeded = [phase for phase in branch_phases if outcomes[phase]["result"] is not None]
+    if len(succeeded) < len(branch_phases):
+        # Nothing to merge: keep whichever branch finished, else the initial development
+        return outcomes[succeeded[0]]["content"] if succeeded else initial_run["content"]
+
+    merge_start = time.time()
+    with span(f"{workflow_name} merge", "stage"):
+        merged = merge_branches(
+            initial_run["content"],
+            {phase: outcomes[phase]["content"] for phase in branch_phases},
+            settings["min_shared_sections"],
+        )
+        content = None
+        if not merged.conflicts:
+            content = merged.render()
+        else:
+            print(f"Reconciling {len(merged.conflicts)} conflicting sections in one merge call")
+            try:
+                output = MoveMergeWorker(config).execute({"move": move, "conflicts": merged.conflicts})
+                content = merged.render(output.modifications["resolutions"])
+            except Exception as e:
+                logging.error(f"Branch merge failed for {workflow_name}: {str(e)}")
+
+    if content is None:
+        first, last = branch_phases[0], branch_phases[-1]
+        print(f"Merge failed; developing {last} on the {first} result instead")
+        run = run_phase(last, outcomes[first]["result"])
+        record(last, run)
+        return run["content"] if run["result"] is not None else outcomes[first]["content"]
+
+    with open(moves_output_dir / f"{workflow_name}_merged_final.json", "w") as f:
+        json.dump({"content": content, "conflicts": len(merged.conflicts)}, f, indent=2)
+    record("merged", {"content": content, "result": content, "history": [], "duration": time.time() - merge_start})
+    return content
 
 
 def process_all_key_moves(
@@ -48,294 +348,113 @@ def process_all_key_moves(
 
     developed_moves = []
     move_timings = []
+    branches = branch_settings(config)
 
     # Process each key move sequentially
     for i in range(len(moves_list)):  # Process all moves
-        move = moves_list[i]  # Get the actual move text
-        move_start_time = time.time()
+        with span(f"key move {i+1}", "move"):
+            move = moves_list[i]  # Get the actual move text
+            move_start_time = time.time()
         
-        print(f"\n{i+1}. Key Move {i+1} Development")
-        print("-" * 40)
-        logging.info(f"Processing key move {i+1}/{len(moves_list)}: {move}")
-
-        # Create a workflow for this specific move
-        workflow_name = f"key_move_{i+1}"
-
-        # Define development phases
-        development_phases = ["initial", "examples", "literature"]
-
-        # Dictionary to store the results of each phase
-        phase_results = {}
-        phase_timings = {}
-        previous_phase_result = None
-        refinement_history = []
-
-        # Process each development phase sequentially
-        for phase_idx, phase in enumerate(development_phases):
-            phase_start_time = time.time()
-            
-            print(f"\nExecuting step: {phase} development")
-            logging.info(f"Processing development phase: {phase}")
-
-            # For phases after initial, use the previous phase's result
-            initial_state = {
-                "framework": framework,
-                "outline": outline,
-                "key_moves": key_moves,  # Always pass the original key_moves
-                "literature": literature,
-                "move_index": i,  # Pass the index of the current move
-                "development_phase": phase,  # Set the current development phase
-            }
+            print(f"\n{i+1}. Key Move {i+1} Development")
+            print("-" * 40)
+            logging.info(f"Processing key move {i+1}/{len(moves_list)}: {move}")
+
+            # Create a workflow for this specific move
+            workflow_name = f"key_move_{i+1}"
+
+            # Define development phases
+            development_phases = ["initial", "examples", "literature"]
+
+            # Dictionary to store the results of each phase
+            phase_results = {}
+            phase_timings = {}
+            previous_phase_result = None
+            refinement_history = []
+            final_override = None
+
+            def run_phase(phase: str, previous: Any) -> Dict[str, Any]:
+                return _run_development_phase(
+                    config, moves_output_dir, workflow_name, framework, outline, key_moves, literature,
+                    i, move, phase, previous,
+                )
 
-            # Add the previous phase result if available
-            if previous_phase_result is not None:
-                # Pass the previous phase's refined content as the current content
-                if (
-                    isinstance(previous_phase_result, dict)
-                    and "refined_development" in previous_phase_result
-                ):
-                    initial_state["current_move_development"] = previous_phase_result[
-                        "refined_development"
-                    ]
+            def record(phase: str, run: Dict[str, Any]) -> None:
+                phase_results[phase] = run["content"]
+                phase_timings[phase] = run["duration"]
+                refinement_history.extend(run["history"])
+
+            if branches["enabled"]:
+                # Examples and literature each only augment the initial development,
+                # so they run as concurrent branches that are merged afterwards
+                run = run_phase("initial", None)
+                record("initial", run)
+                if run["result"] is None:
+                    logging.error(f"Initial phase failed for key move {i+1}, skipping remaining phases")
                 else:
-                    logging.warning(
-                        f"Previous phase result doesn't contain expected structure: {type(previous_phase_result)}"
+                    final_override = _develop_in_branches(
+                        config, moves_output_dir, workflow_name, move, run_phase, record,
+                        development_phases[1:], run, branches,
                     )
-                    # Try to extract useful content anyway
-                    if isinstance(previous_phase_result, dict):
-                        # Try different possible locations of the content
-                        for key in [
-                            "core_content",
-                            "refined_development",
-                            "full_content",
-                        ]:
-                            if key in previous_phase_result:
-                                initial_state["current_move_development"] = (
-                                    previous_phase_result[key]
-                                )
-                                break
+            else:
+                # Process each development phase sequentially
+                for phase in development_phases:
+                    run = run_phase(phase, previous_phase_result)
+                    record(phase, run)
+                    if run["result"] is not None:
+                        previous_phase_result = run["result"]
+                    elif previous_phase_result:
+                        # For later phases, we can continue with the previous phase's result
+                        logging.warning("Continuing to next phase using previous result")
                     else:
-                        # If it's a string, pass it directly as the current content
-                        initial_state["current_move_development"] = previous_phase_result
-
-            # Create and execute the workflow for this phase
-            workflow = create_key_moves_dev_workflow(
-                config=config,
-                output_dir=moves_output_dir,
-                workflow_name=f"{workflow_name}_{phase}",
-                max_cycles=config.get("key_move_max_cycles", 3),
-            )
-
-            # Execute the workflow and get the result, handling potential errors
-            try:
-                result = workflow.execute(initial_state)
-
-                # Extract only the final refined output for this phase (the most important part)
-                if isinstance(result, dict) and "current_move_development" in result:
-                    # The result might contain the full cycle history - extract just the final refinement
-                    final_refinement = result["current_move_development"]
-
-                    # Record any critique/refinement history if available
-                    if "critiques" in result and "refinements" in result:
-                        for cycle_idx, (critique, refinement) in enumerate(
-                            zip(
-                                result.get("critiques", []),
-                                result.get("refinements", []),
-                            )
-                        ):
-                            # Handle both dict and string critique/refinement objects
-                            if isinstance(critique, dict):
-                                assessment = critique.get("assessment", "UNKNOWN")
-                                recommendations = critique.get("recommendations", [])
-                            else:
-                                assessment = "UNKNOWN"
-                                recommendations = []
-
-                            if isinstance(refinement, dict):
-                                changes_made = refinement.get("changes_made", [])
-                            else:
-                                changes_made = []
-
-                            refinement_history.append(
-                                {
-                                    "phase": phase,
-                                    "cycle": cycle_idx + 1,
-                                    "assessment": assessment,
-                                    "recommendations": recommendations,
-                                    "changes_made": changes_made,
-                                }
-                            )
-                else:
-                    # If we don't have the expected structure, just use the whole result
-                    final_refinement = result
-
-                # Save a simplified version of the result (just the final output) to JSON
-                output_file = moves_output_dir / f"{workflow_name}_{phase}_final.json"
-
-                # Extract just the essential content if possible
-                final_content = ""
-                if isinstance(final_refinement, dict):
-                    if "refined_development" in final_refinement:
-                        final_content = final_refinement["refined_development"]
-                    elif "core_content" in final_refinement:
-                        final_content = final_refinement["core_content"]
-                    else:
-                        # Try to get sections and combine them
-                        sections = final_refinement.get("sections", {})
-                        if sections:
-                            final_content = "\n\n".join(
-                                [
-                                    f"# {section}\n{content}"
-                                    for section, content in sections.items()
-                                ]
-                            )
-                        else:
-                            # Last resort
-                            final_content = str(final_refinement)
-                else:
-                    final_content = str(final_refinement)
-
-                # Save just the essential content
-                with open(output_file, "w") as f:
-                    json.dump({"content": final_content}, f, indent=2)
-
-                # Store this phase's result
-                phase_results[phase] = final_content
-
-                # Update the previous phase result for the next phase
-                previous_phase_result = final_refinement
-
-                # Calculate and store phase timing
-                phase_end_time = time.time()
-                phase_duration = phase_end_time - phase_start_time
-                phase_timings[phase] = phase_duration
-                
-                print(f"⏱️  {phase.title()} development completed in {phase_duration:.1f} seconds")
-                logging.info(f"Completed {phase} phase for key move {i+1}")
-
-            except Exception as e:
-                logging.error(
-                    f"Error processing {phase} phase for key move {i+1}: {str(e)}"
-                )
-
-                # Look for initial development content that might be available despite the error
-                # This ensures we capture the developed content even if critique fails
-                if (
-                    phase == "initial"
-                    and initial_state.get("development_phase") == "initial"
-                ):
-                    try:
-                        # Check if we can find the initial development output file
-                        dev_output_path = (
-                            moves_output_dir / f"{workflow_name}_{phase}.json"
-                        )
-                        if dev_output_path.exists():
-                            with open(dev_output_path, "r") as f:
-                                dev_data = json.load(f)
-                                if (
-                                    "output" in dev_data
-                                    and "modifications" in dev_data["output"]
-                                ):
-                                    mods = dev_data["output"]["modifications"]
-                                    if "core_content" in mods:
-                                        # We found the content! Use it instead of the error message
-                                        content = mods["core_content"]
-                                        logging.info(
-                                            "Recovered content from development phase despite critique error"
-                                        )
-                                        phase_results[phase] = content
-                                        previous_phase_result = {
-                                            "core_content": content
-                                        }
-                    except Exception as recovery_error:
                         logging.error(
-                            f"Failed to recover content after error: {str(recovery_error)}"
+                            f"No previous result available, skipping remaining phases for key move {i+1}"
                         )
+                        break
 
-                # If we couldn't recover content, use the error message
-                if phase not in phase_results:
-                    # Create a minimal result for this phase to allow continuing
-                    error_result = {
-                        "error": str(e),
-                        "phase": phase,
-                        "move_index": i,
-                        "move": move,
-                        "status": "failed",
-                    }
-
-                    # Save the error result
-                    error_file = (
-                        moves_output_dir / f"{workflow_name}_{phase}_error.json"
-                    )
-                    with open(error_file, "w") as f:
-                        json.dump(error_result, f, indent=2)
-
-                    # Store this phase's error result
-                    phase_results[phase] = f"Error in {phase} phase: {str(e)}"
-
-                # Calculate phase timing even for errors
-                phase_end_time = time.time()
-                phase_duration = phase_end_time - phase_start_time
-                phase_timings[phase] = phase_duration
-
-                # If this is the first phase and it failed, we can't continue with this move
-                if phase == "initial" and phase not in phase_results:
-                    logging.error(
-                        f"Initial phase failed for key move {i+1}, skipping remaining phases"
-                    )
-                    break
-
-                # For later phases, we can continue with the previous phase's result
-                if previous_phase_result:
-                    logging.warning("Continuing to next phase using previous result")
-                else:
-                    logging.error(
-                        f"No previous result available, skipping remaining phases for key move {i+1}"
-                    )
-                    break
-
-        # Calculate total move timing
-        move_end_time = time.time()
-        move_duration = move_end_time - move_start_time
-        move_timings.append({
-            "move_index": i,
-            "total_duration": move_duration,
-            "phase_timings": phase_timings
-        })
-
-        # Combine all phase results for this move into a clean, structured format
-        move_result = {
-            "key_move_index": i,
-            "key_move_text": move,
-            "development": {
-                "initial": phase_results.get("initial", ""),
-                "examples": phase_results.get("examples", ""),
-                "literature": phase_results.get("literature", ""),
-            },
-            "final_content": phase_results.get(
-                "literature",
-                phase_results.get("examples", phase_results.get("initial", "")),
-            ),
-            "refinement_history": refinement_history,
-            "timings": {
+            # Calculate total move timing
+            move_end_time = time.time()
+            move_duration = move_end_time - move_start_time
+            move_timings.append({
+                "move_index": i,
                 "total_duration": move_duration,
-                "phase_durations": phase_timings
+                "phase_timings": phase_timings
+            })
+
+            # Combine all phase results for this move into a clean, structured format
+            move_result = {
+                "key_move_index": i,
+                "key_move_text": move,
+                "development": {
+                    "initial": phase_results.get("initial", ""),
+                    "examples": phase_results.get("examples", ""),
+                    "literature": phase_results.get("literature", ""),
+                    **({"merged": phase_results["merged"]} if "merged" in phase_results else {}),
+                },
+                "final_content": final_override if final_override is not None else phase_results.get(
+                    "literature",
+                    phase_results.get("examples", phase_results.get("initial", "")),
+                ),
+                "refinement_history": refinement_history,
+                "timings": {
+                    "total_duration": move_duration,
+                    "phase_durations": phase_timings
+                }
             }
-        }
 
-        # Save the complete move result
-        move_output_file = moves_output_dir / f"{workflow_name}_complete.json"
-        with open(move_output_file, "w") as f:
-            json.dump(move_result, f, indent=2)
+            # Save the complete move result
+            move_output_file = moves_output_dir / f"{workflow_name}_complete.json"
+            with open(move_output_file, "w") as f:
+                json.dump(move_result, f, indent=2)
 
-        developed_moves.append(move_result)
+            developed_moves.append(move_result)
 
-        print(f"⏱️  Key Move {i+1} completed in {move_duration:.1f} seconds ({move_duration/60:.1f} minutes)")
-        print(f"📊 Phase breakdown:")
-        for phase_name, phase_time in phase_timings.items():
-            print(f"   {phase_name.title()}: {phase_time:.1f}s")
+            print(f"⏱️  Key Move {i+1} completed in {move_duration:.1f} seconds ({move_duration/60:.1f} minutes)")
+            print(f"📊 Phase breakdown:")
+            for phase_name, phase_time in phase_timings.items():
+                print(f"   {phase_name.title()}: {phase_time:.1f}s")
 
-        logging.info(f"Completed all phases for key move {i+1}")
+            logging.info(f"Completed all phases for key move {i+1}")
 
     # Create a combined output file with all developed moves - this is the primary output for Phase II.4
     # First check if we have actual content in the developed_moves or if we need to recover it
@@ -350,6 +469,7 @@ def process_all_key_moves(
                 # Check for individual output files
                 move_name = f"key_move_{move_idx+1}"
                 for phase in [
+                    "merged",
                     "literature",
                     "examples",
                     "initial",
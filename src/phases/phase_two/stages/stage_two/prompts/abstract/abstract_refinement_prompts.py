@@ -3,6 +3,8 @@
 from typing import Dict, Optional, List
 import json
 
+from src.phases.core.version_store import format_version_history
+
 
 class AbstractRefinementPrompts:
     """Prompts for refining abstract and framework based on critique"""
@@ -139,7 +141,7 @@ Provide your refinement in the following format:
 <iteration_note>
 Note: This is refinement cycle {len(previous_versions)}.
 Consider the evolution of the framework through previous versions while making further improvements.
-</iteration_note>"""
+{format_version_history(previous_versions)}</iteration_note>"""
 
         return context
 
@@ -63,11 +63,7 @@ class AbstractDevelopmentWorker(DevelopmentWorker):
                 system_prompt=system_prompt
             )
             
-        output = self.process_output(response)
-        if not self.validate_output(output):
-            print(response)
-            raise ValidationError("Worker output failed validation: ", self.stage_name)
-        return output
+        return self._checked_output(response, ValidationError)
 
     def process_input(self, state: Dict[str, Any]) -> WorkerInput:
         """Prepare input for abstract development"""
@@ -2,6 +2,7 @@ from pathlib import Path
 from typing import Dict, Any
 
 from src.phases.core.workflow import Workflow, WorkflowStep
+from src.phases.core.version_store import history_budget_from_config
 
 from src.phases.phase_two.stages.stage_two.workers.critic.abstract_critic import (
     AbstractCriticWorker,
@@ -58,7 +59,7 @@ def create_abstract_framework_workflow(
                 input_mapping={
                     "current_critique": "current_critique",
                     "current_framework": "current_framework",
-                    "previous_versions": "current_framework",
+                    "previous_versions": "?version_history",
                     "literature": "literature",
                 },
                 output_mapping={
@@ -70,4 +71,5 @@ def create_abstract_framework_workflow(
             ),
         ],
         output_dir=output_dir,
+        history_token_budget=history_budget_from_config(config),
     )
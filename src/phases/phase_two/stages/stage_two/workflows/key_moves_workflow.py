@@ -2,6 +2,7 @@ from pathlib import Path
 from typing import Dict, Any
 
 from src.phases.core.workflow import Workflow, WorkflowStep
+from src.phases.core.version_store import history_budget_from_config
 from src.phases.phase_two.stages.stage_two.workers.critic.key_moves_critic import (
     KeyMovesCriticWorker,
 )
@@ -60,7 +61,7 @@ def create_key_moves_workflow(
                 input_mapping={
                     "current_moves": "current_moves",
                     "current_critique": "current_critique",
-                    "previous_versions": "current_moves",
+                    "previous_versions": "?version_history",
                     "outline": "outline",
                     "framework": "framework",
                     "literature": "literature",
@@ -74,4 +75,5 @@ def create_key_moves_workflow(
             ),
         ],
         output_dir=output_dir,
+        history_token_budget=history_budget_from_config(config),
     )
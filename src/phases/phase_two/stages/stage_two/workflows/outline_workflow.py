@@ -2,6 +2,7 @@ from pathlib import Path
 from typing import Dict, Any
 
 from src.phases.core.workflow import Workflow, WorkflowStep
+from src.phases.core.version_store import history_budget_from_config
 from src.phases.phase_two.stages.stage_two.workers.critic.outline_critic import (
     OutlineCriticWorker,
 )
@@ -58,7 +59,7 @@ def create_outline_workflow(
                 input_mapping={
                     "current_outline": "current_outline",
                     "current_critique": "current_critique",
-                    "previous_versions": "current_outline",
+                    "previous_versions": "?version_history",
                     "framework": "framework",
                     "literature": "literature",
                 },
@@ -70,4 +71,5 @@ def create_outline_workflow(
             ),
         ],
         output_dir=output_dir,
+        history_token_budget=history_budget_from_config(config),
     )
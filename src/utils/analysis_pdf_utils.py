@@ -3,70 +3,99 @@ Analysis PDF Integration Utilities
 Enables Analysis journal patterns to be integrated into early development phases (II.2-6)
 """
 
+import os
 import random
+import threading
 from pathlib import Path
 from typing import List, Optional, Dict, Any
 
+# Set to reproduce a run's exemplar assignment; otherwise each run draws its own seed
+SEED_ENV = "ANALYSIS_EXEMPLAR_SEED"
+
 
 class AnalysisPatternIntegrator:
-    """Handles Analysis paper integration for conceptual development phases"""
-    
-    def __init__(self):
-        self.analysis_dir = Path("./Analysis_papers")
-        self.selected_papers = []
-        
+    """Handles Analysis paper integration for conceptual development phases
+
+    Exemplars are assigned once per run: each phase gets a fixed set drawn
+    from a seeded generator, so every cycle of a phase sends the same PDFs
+    and guidance (and can reuse cached document prefixes), and concurrent
+    workers never see each other's selection.
+    """
+
+    PHASE_PDF_COUNTS = {
+        # Phase II.2 - Framework Development
+        "abstract and thesis development": 2,
+        "outline structure": 2,
+        "key moves development": 2,
+
+        # Phase II.3 - Key Moves Development
+        "key moves development (initial)": 1,     # Argumentation patterns
+        "key moves development (examples)": 2,    # Variety crucial for examples
+        "key moves development (literature)": 1,  # Strategic engagement patterns
+
+        # Phase II.4 - Content Development
+        "content development": 1,
+
+        # Default fallback
+        "default": 1
+    }
+
+    def __init__(self, analysis_dir: Optional[Path] = None, seed: Optional[str] = None):
+        self.analysis_dir = Path(analysis_dir or "./Analysis_papers")
+        self.seed = seed if seed is not None else os.getenv(SEED_ENV)
+        self._papers: List[Path] = []
+        self._assignments: Optional[Dict[str, List[Path]]] = None
+        self._lock = threading.Lock()
+
     def get_pdfs_for_phase(self, phase: str) -> int:
         """Return optimal number of PDFs for each development phase"""
-        phase_pdf_counts = {
-            # Phase II.2 - Framework Development
-            "abstract and thesis development": 2,
-            "outline structure": 2, 
-            "key moves development": 2,
-            
-            # Phase II.3 - Key Moves Development  
-            "key moves development (initial)": 1,     # Argumentation patterns
-            "key moves development (examples)": 2,    # Variety crucial for examples
-            "key moves development (literature)": 1,  # Strategic engagement patterns
-            
-            # Phase II.4 - Content Development
-            "content development": 1,
-            
-            # Default fallback
-            "default": 1
-        }
-        
-        return phase_pdf_counts.get(phase, phase_pdf_counts["default"])
-        
+        return self.PHASE_PDF_COUNTS.get(phase, self.PHASE_PDF_COUNTS["default"])
+
+    def _draw_seed(self, announce: bool) -> None:
+        # Called with the lock held
+        if self.seed is None:
+            self.seed = str(random.SystemRandom().randrange(10 ** 6))
+            if announce:
+                print(f"📚 Analysis exemplars assigned with seed {self.seed} (set {SEED_ENV} to reproduce)")
+
+    def rng_for(self, phase: str) -> random.Random:
+        """A generator seeded for this run and phase, for other per-run draws (e.g. style digests)"""
+        with self._lock:
+            self._draw_seed(announce=True)
+        return random.Random(f"{self.seed}:{phase}")
+
+    def _select(self, papers: List[Path], phase: str) -> List[Path]:
+        # Each phase draws from its own generator, so its set does not depend on call order
+        rng = random.Random(f"{self.seed}:{phase}")
+        return rng.sample(papers, min(self.get_pdfs_for_phase(phase), len(papers)))
+
+    def exemplars_for(self, phase: str = "default") -> List[Path]:
+        """This run's Analysis papers for a phase; the same list on every call"""
+        with self._lock:
+            if self._assignments is None:
+                papers = sorted(self.analysis_dir.glob("*.pdf")) if self.analysis_dir.exists() else []
+                self._draw_seed(announce=bool(papers))
+                self._papers = papers
+                self._assignments = {name: self._select(papers, name) for name in self.PHASE_PDF_COUNTS}
+            if phase not in self._assignments:
+                self._assignments[phase] = self._select(self._papers, phase)
+            return list(self._assignments[phase])
+
     def get_analysis_exemplars_for_development(self, phase: str = "default") -> Dict[str, Any]:
         """
         Select Analysis papers for development phases (II.2-6)
         Returns both PDF paths and philosophical guidance
         Phase-aware selection for optimal PDF count
         """
-        if not self.analysis_dir.exists():
-            return {
-                "available": False,
-                "guidance": self._get_fallback_guidance(),
-                "pdf_paths": [],
-                "paper_names": []
-            }
-        
-        papers = list(self.analysis_dir.glob("*.pdf"))
-        if not papers:
+        selected = self.exemplars_for(phase)
+        if not selected:
             return {
                 "available": False,
                 "guidance": self._get_fallback_guidance(),
                 "pdf_paths": [],
                 "paper_names": []
             }
-        
-        # Get optimal number of papers for this phase
-        num_papers = self.get_pdfs_for_phase(phase)
-        
-        # Select papers for style reference
-        selected = random.sample(papers, min(num_papers, len(papers)))
-        self.selected_papers = selected
-        
+
         return {
             "available": True,
             "guidance": self._get_analysis_development_guidance(selected, phase),
@@ -156,15 +185,17 @@ Key principles for Analysis journal style:
 === END ANALYSIS PATTERNS ===
 """
 
-    def get_selected_papers(self) -> List[Path]:
-        """Return currently selected Analysis papers for API calls"""
-        return self.selected_papers
+    def get_selected_papers(self, phase: str = "default") -> List[Path]:
+        """Return the Analysis papers assigned to a phase for API calls"""
+        return self.exemplars_for(phase)
     
-    def enhance_prompt_with_analysis_patterns(self, base_prompt: str, phase: str) -> str:
+    def enhance_prompt_with_analysis_patterns(
+        self, base_prompt: str, phase: str, exemplars: Optional[Dict[str, Any]] = None
+    ) -> str:
         """
         Enhance any development phase prompt with Analysis awareness
         """
-        exemplars = self.get_analysis_exemplars_for_development(phase)
+        exemplars = exemplars or self.get_analysis_exemplars_for_development(phase)
         
         if not exemplars["available"]:
             # Add lightweight guidance without PDFs
@@ -195,12 +226,12 @@ def enhance_development_prompt(prompt: str, phase: str) -> tuple[str, List[Path]
     Returns (enhanced_prompt, pdf_paths_for_api)
     Phase-aware: Returns optimal number of PDFs for the specified phase
     """
-    enhanced_prompt = analysis_integrator.enhance_prompt_with_analysis_patterns(prompt, phase)
-    pdf_paths = analysis_integrator.get_selected_papers()
-    
-    return enhanced_prompt, pdf_paths
+    exemplars = analysis_integrator.get_analysis_exemplars_for_development(phase)
+    enhanced_prompt = analysis_integrator.enhance_prompt_with_analysis_patterns(prompt, phase, exemplars)
+
+    return enhanced_prompt, exemplars["pdf_paths"]
 
 
-def get_analysis_pdfs_for_api() -> List[Path]:
-    """Get current Analysis PDFs for API calls"""
-    return analysis_integrator.get_selected_papers() 
\ No newline at end of file
+def get_analysis_pdfs_for_api(phase: str = "default") -> List[Path]:
+    """Get this run's Analysis PDFs for a phase for API calls"""
+    return analysis_integrator.get_selected_papers(phase) 
\ No newline at end of file
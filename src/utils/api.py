@@ -1,33 +1,66 @@
 # src/utils/api.py
+"""
+Provider-agnostic LLM calls for every pipeline stage.
+
+Provider SDKs (openai, anthropic), tenacity, dotenv and yaml are imported
+on first use, and a provider's client is only built when a stage
+configured for that provider makes a call. Importing this module, or
+constructing an APIHandler, costs milliseconds, which keeps utility
+commands and tests that never call a model fast.
+"""
 from typing import Dict, Any, Optional, Callable
+import importlib
 import os
 import logging
 import base64
 from pathlib import Path
-import openai
-import anthropic
-import yaml
-from dotenv import load_dotenv
-from tenacity import (
-    retry,
-    stop_after_attempt,
-    wait_exponential,
-    wait_random,
-    retry_if_exception_type,
-    RetryCallState,
-)
 import time
+import threading
+from contextlib import nullcontext
+from functools import cached_property
+
+from src.utils.batch import get_api_budget, get_response_cache, reading_cached_responses, remember_response
+from src.utils.prompt_budget import count_tokens, PromptBudgetError
+from src.utils.run_metrics import record_api_call
+from src.utils.tracing import instant, span
+
+MAX_INPUT_TOKENS = 190000  # Leaves headroom below the 200k context window
+
+# Environment variable holding each provider's API key
+PROVIDER_KEYS = {"openai": "OPENAI_API_KEY", "anthropic": "ANTHROPIC_API_KEY"}
+
+# Clients are thread-safe and pool connections, so every handler shares one per key
+_clients: Dict[tuple, Any] = {}
+_clients_lock = threading.Lock()
+
+
+def _shared_client(provider: str, api_key: str) -> Any:
+    """Return the process-wide client for a provider and key, importing its SDK on first use"""
+    with _clients_lock:
+        if (provider, api_key) not in _clients:
+            sdk = importlib.import_module(provider)
+            if provider == "openai":
+                _clients[(provider, api_key)] = sdk.OpenAI(api_key=api_key)
+            else:
+                _clients[(provider, api_key)] = sdk.Client(
+                    api_key=api_key,
+                    # Add any required headers through client configuration
+                    default_headers={"anthropic-beta": "pdfs-2024-09-25"},
+                )
+        return _clients[(provider, api_key)]
 
 
 def create_retry_decorator(
     max_attempts: int = 5, min_wait: int = 4, max_wait: int = 60
 ) -> Callable:
     """Create a retry decorator with custom settings"""
+    from tenacity import RetryCallState, retry, retry_if_exception_type, stop_after_attempt, wait_exponential, wait_random
 
     def before_sleep_handler(retry_state: RetryCallState):
         """Handle logging before sleep"""
         exception = retry_state.outcome.exception()
-        if isinstance(exception, anthropic.RateLimitError):
+        instant("retry", "api", attempt=retry_state.attempt_number, error=type(exception).__name__)
+        if type(exception).__name__ == "RateLimitError":
             print(
                 f"\nRate limit hit, waiting {retry_state.next_action.sleep} seconds..."
             )
@@ -39,42 +72,29 @@ def create_retry_decorator(
         stop=stop_after_attempt(max_attempts),
         wait=wait_exponential(multiplier=2, min=min_wait, max=max_wait)
         + wait_random(0, 2),  # Add jitter
-        retry=retry_if_exception_type(
-            (
-                anthropic.RateLimitError,  # Handle rate limits
-                anthropic.APIError,  # Handle API errors
-                anthropic.APIConnectionError,  # Handle connection issues
-                Exception,  # Handle unexpected errors
-            )
-        ),
+        # Rate limits, API and connection errors and anything unexpected
+        # (the provider exception types are all Exception subclasses)
+        retry=retry_if_exception_type(Exception),
         before_sleep=before_sleep_handler,
     )
 
 
 def load_config() -> Dict[str, Any]:
     """Load configuration from yaml file"""
+    import yaml
+
     with open("config/conceptual_config.yaml", "r") as f:
         return yaml.safe_load(f)
 
 
 class APIHandler:
     def __init__(self, config: Dict[str, Any] = None):
+        from dotenv import load_dotenv
+
         load_dotenv()
-        self.openai_key = os.getenv("OPENAI_API_KEY")
-        self.anthropic_key = os.getenv("ANTHROPIC_API_KEY")
-
-        if not self.openai_key:
-            raise ValueError("OPENAI_API_KEY not found in environment variables")
-        if not self.anthropic_key:
-            raise ValueError("ANTHROPIC_API_KEY not found in environment variables")
-
-        self.openai_client = openai.OpenAI(api_key=self.openai_key)
-        # In APIHandler.__init__
-        self.anthropic_client = anthropic.Client(
-            api_key=self.anthropic_key,
-            # Add any required headers through client configuration
-            default_headers={"anthropic-beta": "pdfs-2024-09-25"},
-        )
+        self.openai_key = os.getenv(PROVIDER_KEYS["openai"])
+        self.anthropic_key = os.getenv(PROVIDER_KEYS["anthropic"])
+
         if config is None:
             self.config = self.load_config()  # Load default if none provided
         else:
@@ -83,20 +103,45 @@ class APIHandler:
 
         self.logger = logging.getLogger(__name__)
 
-        self._retry_with_rate_limit = create_retry_decorator(
-            max_attempts=5, min_wait=4, max_wait=60
-        )
-
-        self._retry_standard = create_retry_decorator(
-            max_attempts=3, min_wait=2, max_wait=30
+    def _client(self, provider: str) -> Any:
+        api_key = self.openai_key if provider == "openai" else self.anthropic_key
+        if not api_key:
+            raise ValueError(f"{PROVIDER_KEYS[provider]} not found in environment variables")
+        return _shared_client(provider, api_key)
+
+    # Clients and retry policies are built on first use, so a handler whose
+    # stages only use one provider never imports the other SDK
+    @property
+    def openai_client(self) -> Any:
+        return self._client("openai")
+
+    @property
+    def anthropic_client(self) -> Any:
+        return self._client("anthropic")
+
+    @cached_property
+    def _retry_with_rate_limit(self) -> Callable:
+        return create_retry_decorator(max_attempts=5, min_wait=4, max_wait=60)
+
+    @cached_property
+    def _retry_standard(self) -> Callable:
+        return create_retry_decorator(max_attempts=3, min_wait=2, max_wait=30)
+
+    @cached_property
+    def _retry_openai(self) -> Callable:
+        from tenacity import retry, retry_if_exception_type, stop_after_attempt, wait_exponential
+
+        return retry(
+            stop=stop_after_attempt(3),
+            wait=wait_exponential(multiplier=1, min=4, max=10),
+            retry=retry_if_exception_type(Exception),
         )
 
     # To make loading the config easier in the run_phase_one script.
     # Check there are no problems when loading a different config for tests.
     def load_config(self) -> Dict[str, Any]:
         """Load configuration from yaml file"""
-        with open("config/conceptual_config.yaml", "r") as f:
-            return yaml.safe_load(f)
+        return load_config()
 
     def _encode_pdf(self, pdf_path: Path) -> str:
         """Convert PDF to base64 encoding"""
@@ -168,6 +213,9 @@ class APIHandler:
                             "data": pdf_data,
                         },
                     })
+                if content:
+                    # Phases reuse the same exemplar PDFs every cycle, so cache the document prefix
+                    content[-1]["cache_control"] = {"type": "ephemeral"}
                 
                 # Add the text prompt last
                 content.append({"type": "text", "text": prompt})
@@ -191,13 +239,11 @@ class APIHandler:
 
         return make_call()
 
-    @retry(
-        stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=4, max=10),
-        retry=retry_if_exception_type((Exception, openai.APIError)),
-    )
     def _call_openai(self, prompt: str, config: Dict[str, Any], system_prompt: Optional[str] = None) -> str:
         """Make OpenAI API call with retries"""
+        return self._retry_openai(self._call_openai_once)(prompt, config, system_prompt)
+
+    def _call_openai_once(self, prompt: str, config: Dict[str, Any], system_prompt: Optional[str] = None) -> str:
         try:
             print(f"\nMaking API call to {config['model']}")
 
@@ -244,6 +290,7 @@ class APIHandler:
 
     def _call_anthropic(self, prompt: str, config: Dict[str, Any], system_prompt: Optional[str] = None) -> str:
         """Make standard Anthropic API call"""
+        import anthropic  # Already loaded by the client; needed for its error types
 
         @self._retry_standard  # Use standard retry for normal calls
         def make_call():
@@ -275,15 +322,14 @@ class APIHandler:
             except anthropic.InternalServerError as e:
                 print(f"Anthropic Internal Server Error: {e}")
                 print("This is likely a temporary issue with the Anthropic API.")
-                print("Retrying with a shorter prompt and fewer tokens...")
+                print("Retrying the same prompt with fewer output tokens...")
 
-                # Try with a much smaller prompt and fewer tokens
-                shortened_prompt = prompt[:20000] if len(prompt) > 20000 else prompt
+                # The prompt was budgeted before sending, so keep it intact
                 try:
                     kwargs_shortened = {
                         "model": config["model"],
                         "max_tokens": min(config["max_tokens"], 4000),
-                        "messages": [{"role": "user", "content": shortened_prompt}],
+                        "messages": [{"role": "user", "content": prompt}],
                     }
                     
                     if system_prompt:
@@ -292,7 +338,7 @@ class APIHandler:
                     response = self.anthropic_client.messages.create(**kwargs_shortened)
                     return response.content[0].text
                 except Exception as inner_e:
-                    print(f"Still failed with shortened prompt: {inner_e}")
+                    print(f"Still failed with fewer output tokens: {inner_e}")
                     raise
             except Exception as e:
                 print(f"Anthropic API call failed: {e}")
@@ -301,11 +347,60 @@ class APIHandler:
         return make_call()
 
     def make_api_call(
-        self, stage: str, prompt: str, pdf_path: Optional[Path] = None, pdf_paths: Optional[list[Path]] = None, system_prompt: Optional[str] = None
+        self, stage: str, prompt: str, pdf_path: Optional[Path] = None, pdf_paths: Optional[list[Path]] = None, system_prompt: Optional[str] = None,
+        model_config: Optional[Dict[str, Any]] = None,
     ) -> str:
-        """Make API call to appropriate provider based on stage"""
-        model_config = self.config["models"][stage]
+        """Make API call to appropriate provider based on stage
+
+        model_config, when given, is used instead of the stage's entry in
+        config["models"]; the stage still names the call in caches, traces
+        and usage records.
+        """
+        if model_config is None:
+            model_config = self.config["models"][stage]
+
+        # Catch oversized prompts locally instead of paying for a rejected request
+        max_input_tokens = model_config.get("max_input_tokens", MAX_INPUT_TOKENS)
+        prompt_tokens = count_tokens(prompt) + count_tokens(system_prompt or "")
+        if prompt_tokens > max_input_tokens:
+            raise PromptBudgetError(
+                f"Prompt for {stage} is ~{prompt_tokens} tokens, over the {max_input_tokens}-token input limit"
+            )
 
+        # Batch mode: answer repeated requests from the shared cache
+        cache = get_response_cache()
+        cache_key = None
+        if cache is not None:
+            cache_key = cache.key(stage, model_config, prompt, system_prompt, pdf_paths or ([pdf_path] if pdf_path else []))
+            remember_response(cache_key)  # Lets the worker drop the response if it rejects it
+            cached = cache.get(cache_key) if reading_cached_responses() else None
+            if cached is not None:
+                print(f"♻️  Reusing cached response for {stage}")
+                instant(f"cache hit {stage}", "api")
+                record_api_call(stage, model_config.get("model"), prompt_tokens, count_tokens(cached), 0.0, cached=True)
+                return cached
+
+        budget = get_api_budget()
+        reservation = budget.reserve(prompt_tokens + model_config.get("max_tokens", 0)) if budget else nullcontext({})
+        with reservation as usage, span(f"api {stage}", "api", model=model_config.get("model"), prompt_tokens=prompt_tokens):
+            started = time.perf_counter()
+            response = self._dispatch(model_config, prompt, pdf_path, pdf_paths, system_prompt)
+            response_tokens = count_tokens(response or "")
+            usage["tokens"] = prompt_tokens + response_tokens
+        record_api_call(stage, model_config.get("model"), prompt_tokens, response_tokens, time.perf_counter() - started)
+
+        if cache is not None and response:
+            cache.put(cache_key, response)
+        return response
+
+    def _dispatch(
+        self, model_config: Dict[str, Any], prompt: str, pdf_path: Optional[Path],
+        pdf_paths: Optional[list[Path]], system_prompt: Optional[str]
+    ) -> str:
+        """Send the request to the configured provider"""
+        if model_config["provider"] in PROVIDER_KEYS:
+            # A missing key fails here at once instead of being retried inside the call
+            self._client(model_config["provider"])
         if model_config["provider"] == "openai":
             if pdf_path or pdf_paths:
                 print("Warning: OpenAI provider doesn't support PDF inputs, ignoring PDF parameters")
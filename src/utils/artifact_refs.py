@@ -0,0 +1,114 @@
+# src/utils/artifact_refs.py
+"""
+Content-addressed references to pipeline artifacts, loaded lazily.
+
+A reference records where an upstream JSON artifact lives (relative to the
+run's output directory), its SHA-256 when the reference was made and,
+optionally, the top-level key to read. ``load_ref`` resolves it through a
+per-process cache keyed on (path, mtime, size), so every worker that asks
+for the same artifact shares one parsed copy and unchanged files are
+never reparsed or rehashed. Cached values are shared: treat them as
+read-only.
+
+``LazyArtifacts`` is a read-only mapping of name → reference that loads
+an artifact on first access, so a document can carry references in place
+of full copies without changing how callers index into it.
+"""
+
+import hashlib
+import json
+import os
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Iterator, Mapping, Optional
+
+
+class StaleArtifactError(ValueError):
+    """An artifact changed after the reference to it was made"""
+
+
+def _stat_key(path: Path):
+    stat = path.stat()
+    return str(path.resolve()), stat.st_mtime_ns, stat.st_size
+
+
+@lru_cache(maxsize=256)
+def _sha256(path: str, mtime_ns: int, size: int) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+@lru_cache(maxsize=64)
+def _parse_json(path: str, mtime_ns: int, size: int) -> Any:
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+@lru_cache(maxsize=32)
+def _read_text(path: str, mtime_ns: int, size: int) -> str:
+    with open(path, encoding="utf-8") as f:
+        return f.read()
+
+
+def load_json_cached(path: Path) -> Any:
+    """Parse a JSON file once per process per version of the file"""
+    return _parse_json(*_stat_key(Path(path)))
+
+
+def load_text_cached(path: Path) -> str:
+    """Read a text file once per process per version of the file"""
+    return _read_text(*_stat_key(Path(path)))
+
+
+def artifact_ref(path: Path, base_dir: Path, key: Optional[str] = None) -> Dict[str, Any]:
+    """Reference to a JSON artifact under base_dir"""
+    path = Path(path)
+    ref: Dict[str, Any] = {
+        "path": Path(os.path.relpath(path, base_dir)).as_posix(),
+        "sha256": _sha256(*_stat_key(path)),
+    }
+    if key:
+        ref["key"] = key
+    return ref
+
+
+def load_ref(ref: Dict[str, Any], base_dir: Path) -> Any:
+    """The referenced artifact (or its ``key`` entry), verified against the recorded digest"""
+    path = Path(base_dir) / ref["path"]
+    if not path.exists():
+        raise FileNotFoundError(f"Referenced artifact {path} is missing")
+    stat_key = _stat_key(path)
+    if ref.get("sha256") and _sha256(*stat_key) != ref["sha256"]:
+        raise StaleArtifactError(f"{path} changed after it was referenced; rerun the phase that referenced it")
+    data = _parse_json(*stat_key)
+    return data.get(ref["key"], {}) if ref.get("key") else data
+
+
+class LazyArtifacts(Mapping):
+    """Read-only mapping that resolves artifact references on first access"""
+
+    def __init__(self, refs: Dict[str, Dict[str, Any]], base_dir: Path):
+        self.refs = dict(refs)
+        self.base_dir = Path(base_dir)
+
+    def __getitem__(self, name: str) -> Any:
+        return load_ref(self.refs[name], self.base_dir)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.refs)
+
+    def __len__(self) -> int:
+        return len(self.refs)
+
+    def __repr__(self) -> str:
+        return f"LazyArtifacts({sorted(self.refs)})"
+
+
+def clear_cache() -> None:
+    """Drop every cached parse and digest (for tests and long-lived processes)"""
+    _sha256.cache_clear()
+    _parse_json.cache_clear()
+    _read_text.cache_clear()
@@ -0,0 +1,220 @@
+# src/utils/artifacts.py
+"""
+Registry of the pipeline's inter-phase artifacts.
+
+Each logical artifact (framework, outline, developed_moves, literature
+files, writing_context, draft, ...) has one ``ArtifactSpec``: its path
+inside the run's output directory, the top-level key holding its payload,
+the payload's type and the phase that produces it. ``load_artifact``
+reads through the per-process cache in ``artifact_refs`` (revalidated on
+mtime and size), so a file is parsed once however many phases and
+workers ask for it. ``save_artifact`` and ``atomic_write_*`` write to a
+temp file in the same directory and rename it into place, so a killed
+run never leaves a torn file. ``write_behind`` moves such writes to a
+background thread for outputs nothing reads back during the run.
+"""
+
+import atexit
+import copy
+import json
+import os
+import queue
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple, Union
+
+from src.utils.artifact_refs import artifact_ref, load_json_cached, load_text_cached
+from src.utils.tracing import span
+
+
+class ArtifactError(ValueError):
+    """An artifact is missing or does not have the expected shape"""
+
+
+@dataclass(frozen=True)
+class ArtifactSpec:
+    """Where an artifact lives and what its payload looks like"""
+
+    parts: Tuple[str, ...]
+    key: Optional[str] = None  # Top-level key wrapping the payload
+    payload_type: Union[type, Tuple[type, ...]] = (dict, list)
+    produced_by: str = ""
+    text: bool = False
+
+    @property
+    def filename(self) -> str:
+        return self.parts[-1]
+
+
+ARTIFACTS: Dict[str, ArtifactSpec] = {
+    "final_selection": ArtifactSpec(("final_selection.json",), payload_type=dict, produced_by="Phase I"),
+    "literature_readings": ArtifactSpec(("literature_readings.json",), produced_by="Phase II.1"),
+    "literature_synthesis": ArtifactSpec(("literature_synthesis.json",), payload_type=dict, produced_by="Phase II.1"),
+    "literature_narrative": ArtifactSpec(("literature_synthesis.md",), payload_type=str, produced_by="Phase II.1",
+                                         text=True),
+    "framework": ArtifactSpec(("framework_development", "abstract_framework.json"), key="abstract_framework",
+                              payload_type=dict, produced_by="Phase II.2"),
+    "outline": ArtifactSpec(("framework_development", "outline.json"), key="outline",
+                            payload_type=(dict, list, str), produced_by="Phase II.2"),
+    "key_moves": ArtifactSpec(("framework_development", "key_moves.json"), key="key_moves", produced_by="Phase II.2"),
+    "developed_moves": ArtifactSpec(("key_moves_development", "key_moves_development", "all_developed_moves.json"),
+                                    key="developed_moves", payload_type=list, produced_by="Phase II.3"),
+    "detailed_outline": ArtifactSpec(("detailed_outline", "detailed_outline_final.json"), payload_type=dict,
+                                     produced_by="Phase II.4"),
+    "phase_3_context": ArtifactSpec(("phase_3_context.json",), payload_type=dict, produced_by="Phase II.5"),
+    "writing_context": ArtifactSpec(("phase_3_writing_context.json",), payload_type=dict, produced_by="Phase II.6"),
+    "draft": ArtifactSpec(("phase_3_1_draft.md",), payload_type=str, produced_by="Phase III.1", text=True),
+}
+
+
+def artifact_path(name: str, base_dir: Path) -> Path:
+    return Path(base_dir).joinpath(*ARTIFACTS[name].parts)
+
+
+def _missing(name: str) -> ArtifactError:
+    spec = ARTIFACTS[name]
+    hint = f" Run {spec.produced_by} first." if spec.produced_by else ""
+    return ArtifactError(f"Could not find {spec.filename}.{hint}")
+
+
+def load_artifact(name: str, base_dir: Path, whole: bool = False, shared: bool = False) -> Any:
+    """An artifact's payload (or the whole document with ``whole=True``)
+
+    Parsed documents are cached per process; by default callers get a deep
+    copy they may modify. Pass ``shared=True`` for read-only use.
+    """
+    spec = ARTIFACTS[name]
+    path = artifact_path(name, base_dir)
+    try:
+        with span(f"load {name}", "io"):
+            document = load_text_cached(path) if spec.text else load_json_cached(path)
+    except FileNotFoundError:
+        raise _missing(name) from None
+    except json.JSONDecodeError as e:
+        raise ArtifactError(f"{spec.filename} is not valid JSON: {e}") from e
+
+    payload = document
+    if spec.key and not whole:
+        if not isinstance(document, dict) or spec.key not in document:
+            raise ArtifactError(f"{spec.filename} has no '{spec.key}' entry")
+        payload = document[spec.key]
+    if not whole and not isinstance(payload, spec.payload_type):
+        raise ArtifactError(f"{spec.filename} holds a {type(payload).__name__}, not the expected shape")
+    return payload if shared or spec.text else copy.deepcopy(payload)
+
+
+def artifact_exists(name: str, base_dir: Path) -> bool:
+    return artifact_path(name, base_dir).exists()
+
+
+def reference_artifact(name: str, base_dir: Path) -> Dict[str, Any]:
+    """Content-addressed reference to an artifact (see artifact_refs)"""
+    return artifact_ref(artifact_path(name, base_dir), base_dir, ARTIFACTS[name].key)
+
+
+def atomic_write_text(path: Path, text: str) -> None:
+    """Write via a temp file in the same directory and rename into place"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        with span(f"write {path.name}", "io", bytes=len(text)):
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write(text)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, path)
+    finally:
+        if tmp_path.exists():
+            tmp_path.unlink()
+
+
+def atomic_write_json(path: Path, data: Any, indent: int = 2) -> None:
+    atomic_write_text(path, json.dumps(data, indent=indent, ensure_ascii=False))
+
+
+def save_artifact(name: str, payload: Any, base_dir: Path, background: bool = False) -> Path:
+    """Write an artifact atomically, wrapping the payload in its key"""
+    spec = ARTIFACTS[name]
+    if not isinstance(payload, spec.payload_type):
+        raise ArtifactError(f"{spec.filename} expects a {spec.payload_type}, got {type(payload).__name__}")
+    path = artifact_path(name, base_dir)
+    if spec.text:
+        text = payload
+    else:
+        text = json.dumps({spec.key: payload} if spec.key else payload, indent=2, ensure_ascii=False)
+    if background:
+        write_behind().submit(path, text)
+    else:
+        atomic_write_text(path, text)
+    return path
+
+
+class WriteBehind:
+    """Background thread that performs atomic writes in submission order
+
+    Writes are serialized by the caller (so later mutation of the data
+    cannot leak into the file); a newer pending write to the same path
+    replaces an older one. ``flush`` blocks until everything is on disk.
+    """
+
+    def __init__(self, write: Callable[[Path, str], None] = atomic_write_text):
+        self._write = write
+        self._queue: "queue.Queue[Optional[Path]]" = queue.Queue()
+        self._pending: Dict[Path, str] = {}
+        self._lock = threading.Lock()
+        self._errors: list = []
+        self._thread = threading.Thread(target=self._run, name="artifact-write-behind", daemon=True)
+        self._thread.start()
+
+    def submit(self, path: Path, text: str) -> None:
+        path = Path(path)
+        with self._lock:
+            queued = path in self._pending
+            self._pending[path] = text
+        if not queued:
+            self._queue.put(path)
+
+    def _run(self) -> None:
+        while True:
+            path = self._queue.get()
+            try:
+                if path is None:
+                    return
+                with self._lock:
+                    text = self._pending.pop(path)
+                try:
+                    self._write(path, text)
+                except OSError as e:
+                    self._errors.append((path, e))
+            finally:
+                self._queue.task_done()
+
+    def flush(self) -> None:
+        """Wait for pending writes; raises the first write error, if any"""
+        self._queue.join()
+        if self._errors:
+            path, error = self._errors.pop(0)
+            self._errors.clear()
+            raise OSError(f"Background write to {path} failed: {error}") from error
+
+
+_write_behind: Optional[WriteBehind] = None
+_write_behind_lock = threading.Lock()
+
+
+def write_behind() -> WriteBehind:
+    """The process-wide background writer, flushed at exit"""
+    global _write_behind
+    with _write_behind_lock:
+        if _write_behind is None:
+            _write_behind = WriteBehind()
+            atexit.register(_write_behind.flush)
+        return _write_behind
+
+
+def flush_writes() -> None:
+    """Block until background writes are on disk (no-op if none were made)"""
+    if _write_behind is not None:
+        _write_behind.flush()
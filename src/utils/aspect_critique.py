@@ -0,0 +1,253 @@
+# src/utils/aspect_critique.py
+"""
+Aspect-parallel critiques.
+
+A critic prompt's rubric (its ``<evaluation_criteria>`` or
+``<requirements>`` block, made of numbered criteria or ``PHASE n`` steps)
+is split into a few groups. Each group becomes its own prompt with the
+same context, only that group's criteria and a short output format. The
+prompts run concurrently, and their answers are merged locally into one
+critique in the layout the critic's parser already reads. Latency becomes
+that of the slowest aspect rather than that of one long generation
+covering every criterion.
+
+The merged assessment is the most severe aspect assessment. Issues and
+recommendations are concatenated, each labelled with its aspect.
+"""
+
+import re
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from src.utils.map_reduce import map_bounded
+
+LEVELS = ("MINIMAL_CHANGES", "MINOR_REFINEMENT", "MAJOR_REVISION")  # Least to most severe
+DEFAULT_ASSESSMENT_LABELS = {
+    "MAJOR_REVISION": "MAJOR REVISION NEEDED",
+    "MINOR_REFINEMENT": "MINOR REFINEMENT NEEDED",
+    "MINIMAL_CHANGES": "MINIMAL CHANGES NEEDED",
+}
+DEFAULT_SETTINGS = {"enabled": False, "max_aspects": 4, "max_concurrent": 4, "max_tokens": 3000}
+
+RUBRIC_TAGS = ("evaluation_criteria", "requirements")
+_ITEM_PATTERNS = (
+    re.compile(r"^PHASE \d+\b.*$", re.MULTILINE),
+    re.compile(r"^\d+\.\s+(?:\*\*|[A-ZÁ][A-ZÁÉ'\- ]{3,}).*$", re.MULTILINE),
+)
+
+ASPECT_OUTPUT_FORMAT = """# Findings
+[Your analysis against the criteria above only. Be specific and quote the text you criticize.]
+
+# Major Issues
+- [Problems that would lead to rejection, one per line; write "- None" if there are none]
+
+# Minor Issues
+- [Improvements that would strengthen the work, one per line]
+
+# Strengths
+- [What works and should be preserved]
+
+# Recommendations
+- [Specific, actionable fixes for the issues above]
+
+# Assessment
+[Exactly one of: MAJOR REVISION NEEDED, MINOR REFINEMENT NEEDED, MINIMAL CHANGES NEEDED]"""
+
+
+@dataclass
+class AspectPrompt:
+    name: str
+    prompt: str
+
+
+@dataclass
+class AspectCritique:
+    name: str
+    findings: str = ""
+    major: List[str] = field(default_factory=list)
+    minor: List[str] = field(default_factory=list)
+    strengths: List[str] = field(default_factory=list)
+    recommendations: List[str] = field(default_factory=list)
+    level: str = "UNCLEAR"
+
+
+def aspect_critic_settings(config: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """parameters.aspect_critics merged over the defaults"""
+    settings = dict(DEFAULT_SETTINGS)
+    settings.update(((config or {}).get("parameters") or {}).get("aspect_critics") or {})
+    return settings
+
+
+def _heading(item: str) -> str:
+    first_line = item.strip().splitlines()[0]
+    first_line = re.sub(r"^(?:PHASE \d+[:.]?|\d+\.)\s*", "", first_line)
+    return first_line.strip("*: ").strip().title() or "Criteria"
+
+
+def split_rubric(block: str) -> Tuple[str, List[str]]:
+    """(text before the first criterion, criteria) of a rubric block"""
+    for pattern in _ITEM_PATTERNS:
+        starts = [match.start() for match in pattern.finditer(block)]
+        if len(starts) >= 2:
+            items = [block[start:end].strip() for start, end in zip(starts, starts[1:] + [len(block)])]
+            return block[:starts[0]].strip(), items
+    return block.strip(), []
+
+
+def group_items(items: Sequence[str], max_aspects: int,
+                groups: Optional[Dict[str, Sequence[int]]] = None) -> List[Tuple[str, List[str]]]:
+    """Named groups of criteria
+
+    ``groups`` maps an aspect name to 1-based criterion numbers; criteria
+    it does not mention join the last group. Without it, the criteria
+    are split into up to ``max_aspects`` contiguous groups of similar length.
+    """
+    if groups:
+        named = [(name, [items[i - 1] for i in numbers if 0 < i <= len(items)]) for name, numbers in groups.items()]
+        named = [(name, chosen) for name, chosen in named if chosen]
+        claimed = {i for numbers in groups.values() for i in numbers}
+        leftovers = [item for i, item in enumerate(items, 1) if i not in claimed]
+        if named and leftovers:
+            named[-1][1].extend(leftovers)
+        return named or [(_heading(items[0]), list(items))]
+
+    count = max(1, min(max_aspects, len(items)))
+    target = sum(len(item) for item in items) / count
+    chunks: List[List[str]] = [[]]
+    size = 0
+    for index, item in enumerate(items):
+        remaining_items = len(items) - index
+        remaining_chunks = count - len(chunks)
+        if chunks[-1] and (size >= target or remaining_items <= remaining_chunks) and remaining_chunks > 0:
+            chunks.append([])
+            size = 0
+        chunks[-1].append(item)
+        size += len(item)
+    return [(" / ".join(_heading(item) for item in chunk), chunk) for chunk in chunks]
+
+
+def _replace_block(prompt: str, tag: str, body: str) -> str:
+    pattern = re.compile(rf"<{tag}>.*?</{tag}>", re.DOTALL)
+    replacement = f"<{tag}>\n{body}\n</{tag}>"
+    if pattern.search(prompt):
+        return pattern.sub(lambda _: replacement, prompt, count=1)
+    return f"{prompt}\n\n{replacement}"
+
+
+def split_critique_prompt(prompt: str, max_aspects: int = 4,
+                          groups: Optional[Dict[str, Sequence[int]]] = None) -> List[AspectPrompt]:
+    """One focused prompt per aspect, or [] if the rubric cannot be split"""
+    for tag in RUBRIC_TAGS:
+        match = re.search(rf"<{tag}>(.*?)</{tag}>", prompt, re.DOTALL)
+        if not match:
+            continue
+        preamble, items = split_rubric(match.group(1))
+        if len(items) < 2:
+            continue
+        named = group_items(items, max_aspects, groups)
+        if len(named) < 2:
+            return []
+
+        aspect_prompts = []
+        for name, criteria in named:
+            others = ", ".join(other for other, _ in named if other != name)
+            body = "\n\n".join(part for part in [preamble, *criteria] if part)
+            focus = (f"\n\n<aspect_focus>\nYou are one of {len(named)} reviewers working in parallel. "
+                     f"Judge ONLY these criteria ({name}); others cover {others}. "
+                     f"Be concise: findings and issues, no restating the input.\n</aspect_focus>")
+            aspect_prompt = prompt[:match.start()] + f"<{tag}>\n{body}\n</{tag}>" + focus + prompt[match.end():]
+            aspect_prompts.append(AspectPrompt(name, _replace_block(aspect_prompt, "output_format", ASPECT_OUTPUT_FORMAT)))
+        return aspect_prompts
+    return []
+
+
+def _sections(response: str) -> Dict[str, str]:
+    sections: Dict[str, str] = {}
+    current = None
+    for line in response.splitlines():
+        if line.startswith("# "):
+            current = line[2:].strip().lower()
+            sections[current] = ""
+        elif current is not None:
+            sections[current] += line + "\n"
+    return sections
+
+
+def _bullets(text: str) -> List[str]:
+    bullets = []
+    for line in text.splitlines():
+        line = re.sub(r"^\s*(?:[-*•]|\d+\.)\s*", "", line).strip()
+        if line and not line.startswith("[") and line.rstrip(".").lower() not in ("none", "n/a"):
+            bullets.append(line)
+    return bullets
+
+
+def parse_level(text: str) -> str:
+    upper = text.upper()
+    for level in reversed(LEVELS):
+        if level.replace("_", " ") in upper or level in upper:
+            return level
+    return "UNCLEAR"
+
+
+def parse_aspect_critique(name: str, response: str) -> AspectCritique:
+    sections = _sections(response)
+    return AspectCritique(
+        name=name,
+        # Headings inside the findings are demoted so they nest under the merged layout
+        findings=re.sub(r"^#+\s*", "#### ", sections.get("findings", "").strip() or response.strip(), flags=re.MULTILINE),
+        major=_bullets(sections.get("major issues", "")),
+        minor=_bullets(sections.get("minor issues", "")),
+        strengths=_bullets(sections.get("strengths", "")),
+        recommendations=_bullets(sections.get("recommendations", "")),
+        level=parse_level(sections.get("assessment", "")),
+    )
+
+
+def merge_level(critiques: Sequence[AspectCritique]) -> str:
+    """The most severe assessment across aspects (major issues imply at least a minor refinement)"""
+    severity = -1
+    for critique in critiques:
+        level = critique.level
+        if level == "UNCLEAR":
+            level = "MINOR_REFINEMENT" if critique.major or critique.minor else "MINIMAL_CHANGES"
+        if level == "MINIMAL_CHANGES" and critique.major:
+            level = "MINOR_REFINEMENT"
+        severity = max(severity, LEVELS.index(level))
+    return LEVELS[severity] if severity >= 0 else "MINOR_REFINEMENT"
+
+
+def run_aspect_critiques(call: Callable[[AspectPrompt], str], aspect_prompts: Sequence[AspectPrompt],
+                         max_concurrent: int = 4) -> List[AspectCritique]:
+    """Run the aspect prompts concurrently; fails only if every aspect fails"""
+    results, failures = map_bounded(call, aspect_prompts, workers=max_concurrent)
+    for aspect, error in failures:
+        print(f"⚠️  Aspect critique '{aspect.name}' failed: {error}")
+    if not results:
+        raise failures[0][1]
+    return [parse_aspect_critique(aspect.name, response) for aspect, response in results]
+
+
+def labelled(critiques: Sequence[AspectCritique], attribute: str) -> List[str]:
+    """Every aspect's entries for one list attribute, prefixed with the aspect name"""
+    return [f"({critique.name}) {entry}" for critique in critiques for entry in getattr(critique, attribute)]
+
+
+def render_critique(critiques: Sequence[AspectCritique], labels: Optional[Dict[str, str]] = None) -> str:
+    """A merged critique in the common Critique / Summary Assessment ("Next steps:") layout"""
+    labels = labels or DEFAULT_ASSESSMENT_LABELS
+    level = merge_level(critiques)
+
+    def bullets(entries: List[str]) -> str:
+        return "\n".join(f"- {entry}" for entry in entries) or "- None"
+
+    parts = ["# Critique"]
+    for critique in critiques:
+        parts.append(f"### {critique.name}\n{critique.findings}")
+    parts.append(f"### Major Issues\n{bullets(labelled(critiques, 'major'))}")
+    parts.append(f"### Minor Issues\n{bullets(labelled(critiques, 'minor'))}")
+    parts.append(f"### Strengths to Preserve\n{bullets(labelled(critiques, 'strengths'))}")
+    next_steps = bullets(labelled(critiques, "recommendations")) if any(c.recommendations for c in critiques) \
+        else "- Keep the current development"
+    parts.append(f"# Summary Assessment\n{labels[level]}\n\nNext steps:\n{next_steps}")
+    return "\n\n".join(parts)
@@ -0,0 +1,252 @@
+# src/utils/batch.py
+"""
+Shared resources for running several papers through the pipeline at once.
+
+``run_batch.py`` installs one ``ApiBudget`` (global cap on concurrent API
+calls and total tokens), one ``ResponseCache`` (identical requests are
+answered once) and one ``LiteratureIndex`` (topic-independent initial
+readings of literature PDFs, keyed by file content) for the whole batch.
+``APIHandler.make_api_call`` and ``LiteratureManager`` pick them up when
+installed; single-paper runs are unaffected.
+
+A cached response that a worker then rejects (unparseable or failing
+validation) is dropped with ``reject_last_response``, and a failed phase
+re-run with ``--resume`` runs under ``fresh_responses`` so it samples the
+model again instead of replaying the responses it failed on.
+"""
+
+import hashlib
+import json
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+
+class TokenBudgetExceeded(RuntimeError):
+    """Raised when a call would take the batch past its token budget"""
+    pass
+
+
+class ApiBudget:
+    """Global limit on in-flight API calls and total tokens across a batch
+
+    Each call reserves its prompt tokens plus ``max_tokens`` up front and
+    settles to the actual prompt + response size when it finishes.
+    """
+
+    def __init__(self, max_concurrent_calls: int = 8, token_budget: Optional[int] = None):
+        self.max_concurrent_calls = max_concurrent_calls
+        self.token_budget = token_budget
+        self._slots = threading.BoundedSemaphore(max_concurrent_calls)
+        self._lock = threading.Lock()
+        self.tokens_used = 0
+        self.tokens_reserved = 0
+        self.calls = 0
+
+    @contextmanager
+    def reserve(self, estimated_tokens: int) -> Iterator[Dict[str, int]]:
+        """Hold a call slot and reserve tokens; set ``usage['tokens']`` to the actual count"""
+        with self._lock:
+            committed = self.tokens_used + self.tokens_reserved
+            if self.token_budget is not None and committed + estimated_tokens > self.token_budget:
+                raise TokenBudgetExceeded(
+                    f"Batch token budget of {self.token_budget} exhausted "
+                    f"({self.tokens_used} used, {self.tokens_reserved} reserved)"
+                )
+            self.tokens_reserved += estimated_tokens
+
+        usage = {"tokens": estimated_tokens}
+        try:
+            with self._slots:
+                yield usage
+        finally:
+            with self._lock:
+                self.tokens_reserved -= estimated_tokens
+                self.tokens_used += usage["tokens"]
+                self.calls += 1
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "tokens_used": self.tokens_used,
+            "token_budget": self.token_budget,
+            "max_concurrent_calls": self.max_concurrent_calls,
+        }
+
+
+def _file_digest(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ResponseCache:
+    """Thread-safe cache of API responses keyed on the full request
+
+    Entries are kept in memory and, with ``cache_dir``, also on disk so a
+    restarted batch reuses them.
+    """
+
+    def __init__(self, cache_dir: Optional[Path] = None):
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        if self.cache_dir:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self._entries: Dict[str, str] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, stage: str, model_config: Dict[str, Any], prompt: str,
+            system_prompt: Optional[str] = None, pdf_paths: Optional[List[Path]] = None) -> str:
+        request = {
+            "stage": stage,
+            "model": model_config.get("model"),
+            "max_tokens": model_config.get("max_tokens"),
+            "temperature": model_config.get("temperature"),
+            "system": system_prompt or "",
+            "prompt": prompt,
+            "pdfs": [_file_digest(Path(path)) for path in pdf_paths or []],
+        }
+        return hashlib.sha256(json.dumps(request, sort_keys=True).encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            response = self._entries.get(key)
+        if response is None and self.cache_dir:
+            path = self.cache_dir / f"{key}.json"
+            if path.exists():
+                with open(path, encoding="utf-8") as f:
+                    response = json.load(f)["response"]
+                with self._lock:
+                    self._entries[key] = response
+        with self._lock:
+            if response is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return response
+
+    def discard(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+        if self.cache_dir:
+            (self.cache_dir / f"{key}.json").unlink(missing_ok=True)
+
+    def put(self, key: str, response: str) -> None:
+        with self._lock:
+            self._entries[key] = response
+        if self.cache_dir:
+            tmp_path = self.cache_dir / f"{key}.json.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"response": response}, f)
+            tmp_path.replace(self.cache_dir / f"{key}.json")
+
+
+class LiteratureIndex:
+    """Initial readings of literature PDFs shared between papers
+
+    Initial readings do not depend on the paper being written, so a PDF
+    read for one paper is reused by every other paper in the batch.
+    """
+
+    def __init__(self, index_dir: Optional[Path] = None):
+        self.index_dir = Path(index_dir) if index_dir else None
+        if self.index_dir:
+            self.index_dir.mkdir(parents=True, exist_ok=True)
+        self._readings: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._key_locks: Dict[str, threading.Lock] = {}
+
+    def key_for(self, pdf_path: Path) -> str:
+        return _file_digest(Path(pdf_path))
+
+    @contextmanager
+    def locked(self, key: str) -> Iterator[None]:
+        """Serialize work on one PDF so it is read only once"""
+        with self._lock:
+            lock = self._key_locks.setdefault(key, threading.Lock())
+        with lock:
+            yield
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            if key in self._readings:
+                return self._readings[key]
+        if self.index_dir and (self.index_dir / f"{key}.json").exists():
+            with open(self.index_dir / f"{key}.json", encoding="utf-8") as f:
+                reading = json.load(f)
+            with self._lock:
+                self._readings[key] = reading
+            return reading
+        return None
+
+    def put(self, key: str, reading: Dict[str, Any]) -> None:
+        with self._lock:
+            self._readings[key] = reading
+        if self.index_dir:
+            tmp_path = self.index_dir / f"{key}.json.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(reading, f, indent=2)
+            tmp_path.replace(self.index_dir / f"{key}.json")
+
+
+# Cache key of the last response make_api_call returned in this context
+_last_response_key: ContextVar[Optional[str]] = ContextVar("last_response_key", default=None)
+_fresh_responses: ContextVar[bool] = ContextVar("fresh_responses", default=False)
+
+_api_budget: Optional[ApiBudget] = None
+_response_cache: Optional[ResponseCache] = None
+_literature_index: Optional[LiteratureIndex] = None
+
+
+def install_batch_resources(
+    api_budget: Optional[ApiBudget] = None,
+    response_cache: Optional[ResponseCache] = None,
+    literature_index: Optional[LiteratureIndex] = None,
+) -> None:
+    """Share these resources with every API handler and literature manager"""
+    global _api_budget, _response_cache, _literature_index
+    _api_budget, _response_cache, _literature_index = api_budget, response_cache, literature_index
+
+
+def get_api_budget() -> Optional[ApiBudget]:
+    return _api_budget
+
+
+def get_response_cache() -> Optional[ResponseCache]:
+    return _response_cache
+
+
+def get_literature_index() -> Optional[LiteratureIndex]:
+    return _literature_index
+
+
+def remember_response(key: Optional[str]) -> None:
+    """Record the cache key of the response about to be returned"""
+    _last_response_key.set(key)
+
+
+def reject_last_response() -> None:
+    """Drop the last response returned in this context from the response cache"""
+    key = _last_response_key.get()
+    if key is not None and _response_cache is not None:
+        _response_cache.discard(key)
+    _last_response_key.set(None)
+
+
+def reading_cached_responses() -> bool:
+    return not _fresh_responses.get()
+
+
+@contextmanager
+def fresh_responses() -> Iterator[None]:
+    """Skip cache lookups in this block; new responses are still stored"""
+    token = _fresh_responses.set(True)
+    try:
+        yield
+    finally:
+        _fresh_responses.reset(token)
@@ -0,0 +1,160 @@
+# src/utils/examples_store.py
+"""
+Streaming storage for the philosophical examples database.
+
+Each processed paper is appended to ``philosophical_examples.jsonl`` (one
+record per paper) and its examples are appended in place to
+``philosophical_examples_database.xml``, which is kept well formed after
+every paper. Nothing is held in memory between papers, and a crash loses
+at most the paper being written. ``compact`` rewrites the XML and the JSON
+array from the latest record of each paper, dropping superseded reruns.
+"""
+
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Set
+from xml.sax.saxutils import escape
+
+XML_HEADER = '<?xml version="1.0" ?>\n<philosophical_examples>\n'
+XML_FOOTER = "</philosophical_examples>\n"
+EXAMPLE_FIELDS = ("paper_title", "type", "purpose", "context", "text")
+
+
+def example_to_xml(example: Dict[str, Any]) -> str:
+    """One <example> element in the database's indented layout"""
+    lines = ["  <example>"]
+    for field in EXAMPLE_FIELDS:
+        lines.append(f"    <{field}>{escape(str(example.get(field, '') or ''))}</{field}>")
+    lines.append("  </example>")
+    return "\n".join(lines) + "\n"
+
+
+class ExamplesDatabaseWriter:
+    """Appends each paper's examples to the JSONL and XML databases as they arrive"""
+
+    def __init__(self, output_dir: Path, name: str = "philosophical_examples"):
+        self.output_dir = Path(output_dir)
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        self.records_path = self.output_dir / f"{name}.jsonl"
+        self.xml_path = self.output_dir / f"{name}_database.xml"
+        self.json_path = self.output_dir / f"{name}_database.json"
+        self._lock = threading.Lock()
+        if not self.records_path.exists() and self.json_path.exists():
+            self._import_per_paper_files()
+        self._recover_xml()
+
+    def _import_per_paper_files(self) -> None:
+        """Seed the record log from the per-paper <stem>_examples.json files of earlier runs"""
+        self.xml_path.write_text(XML_HEADER + XML_FOOTER, encoding="utf-8")
+        for path in sorted(self.output_dir.glob("*_examples.json")):
+            with open(path, encoding="utf-8") as f:
+                examples = json.load(f)
+            self.append(f"{path.name[:-len('_examples.json')]}.pdf", examples)
+
+    def _recover_xml(self) -> None:
+        """Make the XML file well formed again after an interrupted append"""
+        if not self.xml_path.exists() or self.xml_path.stat().st_size == 0:
+            self.xml_path.write_text(XML_HEADER + XML_FOOTER, encoding="utf-8")
+            return
+        with open(self.xml_path, "rb+") as f:
+            data = f.read()
+            if data.endswith(XML_FOOTER.encode("utf-8")):
+                return
+            last_example = data.rfind(b"</example>\n")
+            body_end = last_example + len(b"</example>\n") if last_example >= 0 else len(XML_HEADER.encode("utf-8"))
+            f.seek(body_end)
+            f.truncate()
+            f.write(XML_FOOTER.encode("utf-8"))
+
+    def _iter_lines(self) -> Iterator[bytes]:
+        if not self.records_path.exists():
+            return
+        with open(self.records_path, "rb") as f:
+            for line in f:
+                if line.strip():
+                    yield line
+
+    def _iter_records(self) -> Iterator[Dict[str, Any]]:
+        for line in self._iter_lines():
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                continue  # A line cut short by an interrupted run
+
+    def processed_sources(self) -> Set[str]:
+        """Source files that already have a record"""
+        return {record.get("source_file", "") for record in self._iter_records()}
+
+    def append(self, source_file: str, examples: List[Dict[str, Any]]) -> None:
+        """Durably add one paper's examples to both databases"""
+        line = json.dumps({"source_file": source_file, "examples": examples}, ensure_ascii=False) + "\n"
+        footer = XML_FOOTER.encode("utf-8")
+        with self._lock:
+            with open(self.records_path, "ab") as f:
+                if f.tell():
+                    with open(self.records_path, "rb") as existing:
+                        existing.seek(-1, os.SEEK_END)
+                        if existing.read(1) != b"\n":
+                            f.write(b"\n")
+                f.write(line.encode("utf-8"))
+                f.flush()
+                os.fsync(f.fileno())
+
+            # Overwrite the closing tag with the new elements and close again
+            with open(self.xml_path, "rb+") as f:
+                f.seek(-len(footer), os.SEEK_END)
+                f.truncate()
+                for example in examples:
+                    f.write(example_to_xml(example).encode("utf-8"))
+                f.write(footer)
+                f.flush()
+                os.fsync(f.fileno())
+
+    def _latest_line_numbers(self) -> Set[int]:
+        """Line numbers holding the latest record of each paper"""
+        latest_line: Dict[str, int] = {}
+        for number, line in enumerate(self._iter_lines()):
+            try:
+                latest_line[json.loads(line).get("source_file", "")] = number
+            except json.JSONDecodeError:
+                continue
+        return set(latest_line.values())
+
+    def iter_examples(self) -> Iterator[Dict[str, Any]]:
+        """Examples from the latest record of each paper, streamed in file order"""
+        keep = self._latest_line_numbers()
+        for number, line in enumerate(self._iter_lines()):
+            if number in keep:
+                yield from json.loads(line).get("examples", [])
+
+    def compact(self) -> int:
+        """Rewrite the JSONL, XML and JSON files without superseded records; returns the example count"""
+        with self._lock:
+            keep = self._latest_line_numbers()
+
+            tmp_records = self.records_path.with_name(self.records_path.name + ".tmp")
+            tmp_xml = self.xml_path.with_name(self.xml_path.name + ".tmp")
+            tmp_json = self.json_path.with_name(self.json_path.name + ".tmp")
+            count = 0
+            with open(tmp_records, "wb") as records, open(tmp_xml, "w", encoding="utf-8") as xml_file, \
+                    open(tmp_json, "w", encoding="utf-8") as json_file:
+                xml_file.write(XML_HEADER)
+                json_file.write("[")
+                for number, line in enumerate(self._iter_lines()):
+                    if number not in keep:
+                        continue
+                    records.write(line if line.endswith(b"\n") else line + b"\n")
+                    for example in json.loads(line).get("examples", []):
+                        xml_file.write(example_to_xml(example))
+                        json_file.write(",\n  " if count else "\n  ")
+                        json_file.write(json.dumps(example, ensure_ascii=False))
+                        count += 1
+                xml_file.write(XML_FOOTER)
+                json_file.write("\n]\n" if count else "]\n")
+
+            tmp_records.replace(self.records_path)
+            tmp_xml.replace(self.xml_path)
+            tmp_json.replace(self.json_path)
+            return count
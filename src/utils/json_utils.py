@@ -5,6 +5,8 @@ import os
 from pathlib import Path
 from typing import Any, Optional, Tuple
 
+from src.utils.tracing import span
+
 
 class JSONHandler:
     def __init__(self):
@@ -216,6 +218,10 @@ class JSONHandler:
 
     def _attempt_json_repair(self, s: str, max_attempts: int = 3) -> str:
         """Attempt to repair invalid JSON using progressively more aggressive methods"""
+        with span("json repair", "json", chars=len(s)):
+            return self._repair_json(s, max_attempts)
+
+    def _repair_json(self, s: str, max_attempts: int) -> str:
         for attempt in range(max_attempts):
             print(f"\nAttempting JSON repair (attempt {attempt + 1}/{max_attempts})")
             try:
@@ -0,0 +1,178 @@
+# src/utils/length_control.py
+"""
+Local word counting and length correction for Phase III section writing.
+
+Writers report a ``word_count`` in their JSON, but the number is often
+wrong. Length misses were therefore only caught by the critic and fixed
+with a full refinement of the section. Here, words are counted locally:
+a word is a whitespace token containing at least one letter or digit,
+so Markdown markers and dashes don't count. A section whose length is
+outside the tolerance, but close enough to fix locally, gets a targeted
+rewrite. ``plan_length_fix`` picks a few body paragraphs and the number
+of words each should gain or lose, and ``fit_length`` sends only those
+paragraphs back to the model. Larger misses are left to critique and
+refinement, because they usually mean the content itself is off.
+
+``WordBudget`` carries each section's surplus or deficit into the
+targets of the sections still to be written, so the paper as a whole
+stays near its target length.
+"""
+
+import re
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+DEFAULT_SETTINGS = {
+    "enabled": False,
+    "tolerance": 0.08,  # Fraction of the target a section may miss by without correction
+    "min_tolerance_words": 40,
+    "max_adjust": 0.35,  # Misses beyond this fraction are left to critique and refinement
+    "max_paragraphs": 3,  # Paragraphs a single fix may rewrite
+    "max_paragraph_change": 0.5,  # Largest change asked of one paragraph, as a fraction of its length
+    "carry_over": 0.25,  # Largest shift of a section target to absorb earlier sections' misses
+}
+
+_BLANK_LINE = re.compile(r"\n\s*\n")
+
+
+def length_settings(config: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """parameters.length_control merged over the defaults"""
+    settings = dict(DEFAULT_SETTINGS)
+    settings.update(((config or {}).get("parameters") or {}).get("length_control") or {})
+    return settings
+
+
+def count_words(text: str) -> int:
+    return sum(1 for token in text.split() if any(char.isalnum() for char in token))
+
+
+def _separator(text: str) -> str:
+    return "\n\n" if _BLANK_LINE.search(text) else "\n"
+
+
+def split_paragraphs(text: str) -> List[str]:
+    """Paragraphs separated by blank lines (or by single newlines if there are none)"""
+    parts = _BLANK_LINE.split(text) if _separator(text) == "\n\n" else text.split("\n")
+    return [part.strip() for part in parts if part.strip()]
+
+
+def join_paragraphs(paragraphs: Sequence[str], like: str = "\n\n") -> str:
+    return _separator(like).join(paragraphs)
+
+
+def _is_heading(paragraph: str) -> bool:
+    return paragraph.startswith("#") or (paragraph.startswith("**") and paragraph.endswith("**"))
+
+
+@dataclass
+class LengthPlan:
+    action: str  # keep, expand, trim or leave (too far off to fix locally)
+    target: int
+    actual: int
+    paragraph_targets: Dict[int, int] = field(default_factory=dict)  # Paragraph index -> words wanted
+
+    @property
+    def delta(self) -> int:
+        return self.target - self.actual
+
+
+def tolerance_words(target: int, settings: Dict[str, Any]) -> int:
+    return max(settings["min_tolerance_words"], round(target * settings["tolerance"]))
+
+
+def plan_length_fix(text: str, target: int, settings: Dict[str, Any]) -> LengthPlan:
+    """Decide whether a section needs a local fix and which paragraphs it touches
+
+    Headings are never rewritten. When there are more than three prose
+    paragraphs, the opening and closing ones are kept too, since they
+    carry the transitions. The longest remaining paragraphs absorb the
+    change in proportion to their length, each by at most
+    ``max_paragraph_change``.
+    """
+    actual = count_words(text)
+    delta = target - actual
+    if abs(delta) <= tolerance_words(target, settings):
+        return LengthPlan("keep", target, actual)
+    if abs(delta) > target * settings["max_adjust"]:
+        return LengthPlan("leave", target, actual)
+
+    paragraphs = split_paragraphs(text)
+    prose = [index for index, paragraph in enumerate(paragraphs) if not _is_heading(paragraph)]
+    if len(prose) > 3:
+        prose = prose[1:-1]
+    words = {index: count_words(paragraphs[index]) for index in prose}
+
+    chosen: List[int] = []
+    capacity = 0.0
+    for index in sorted(prose, key=lambda index: words[index], reverse=True)[:settings["max_paragraphs"]]:
+        chosen.append(index)
+        capacity += words[index] * settings["max_paragraph_change"]
+        if capacity >= abs(delta):
+            break
+    if capacity < abs(delta):
+        return LengthPlan("leave", target, actual)
+
+    chosen.sort()
+    total = sum(words[index] for index in chosen)
+    paragraph_targets = {}
+    remaining = delta
+    for position, index in enumerate(chosen):
+        share = remaining if position == len(chosen) - 1 else round(delta * words[index] / total)
+        paragraph_targets[index] = words[index] + share
+        remaining -= share
+    return LengthPlan("expand" if delta > 0 else "trim", target, actual, paragraph_targets)
+
+
+def fit_length(
+    text: str,
+    target: int,
+    settings: Dict[str, Any],
+    rewrite: Callable[[List[str], LengthPlan], Dict[int, str]],
+) -> Tuple[str, LengthPlan]:
+    """Apply one targeted expand-or-trim pass to a section if its length calls for it
+
+    ``rewrite(paragraphs, plan)`` returns replacement text for the planned
+    paragraph indices. The rewrite is kept only if it brings the section
+    closer to its target. Returns the (possibly unchanged) text and the plan.
+    """
+    plan = plan_length_fix(text, target, settings)
+    if plan.action not in ("expand", "trim"):
+        return text, plan
+
+    paragraphs = split_paragraphs(text)
+    replacements = rewrite(paragraphs, plan)
+    revised = [replacements.get(index, paragraph).strip() or paragraph for index, paragraph in enumerate(paragraphs)]
+    revised_text = join_paragraphs(revised, like=text)
+    if abs(target - count_words(revised_text)) < abs(plan.delta):
+        return revised_text, plan
+    print(f"Length fix did not help ({count_words(revised_text)} words); keeping the original")
+    return text, plan
+
+
+class WordBudget:
+    """Running word budget across sections written in order
+
+    ``target_for(index)`` is the section's planned target, shifted so
+    that the sections still to be written absorb the earlier sections'
+    surplus or deficit in proportion to their own targets. The shift
+    is at most ``carry_over`` times the planned target.
+    """
+
+    def __init__(self, targets: Sequence[int], carry_over: float = DEFAULT_SETTINGS["carry_over"]):
+        self.targets = list(targets)
+        self.carry_over = carry_over
+        self.written: Dict[int, int] = {}
+
+    def target_for(self, index: int) -> int:
+        planned = self.targets[index]
+        earlier = [i for i in self.written if i < index]
+        surplus = sum(self.written[i] - self.targets[i] for i in earlier)
+        remaining = sum(self.targets[index:])
+        if not surplus or not remaining:
+            return planned
+        bound = planned * self.carry_over
+        shift = max(-bound, min(bound, -surplus * planned / remaining))
+        return round(planned + shift)
+
+    def record(self, index: int, words: int) -> None:
+        self.written[index] = words
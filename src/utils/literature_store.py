@@ -0,0 +1,146 @@
+# src/utils/literature_store.py
+"""
+Streaming storage for Phase II.1 literature readings.
+
+Each reading is appended to ``literature_readings.jsonl`` as soon as it is
+complete: one record per paper and stage (``initial``, then
+``project_specific``). Each record carries the key of the inputs it was
+made from: the PDF digest, plus the project for project-specific
+readings. A restarted run skips every paper and stage whose record
+matches, so a failure at paper 19 of 20 loses only paper 19.
+
+Only byte offsets and a one-line summary per paper stay in memory. The
+synthesis stage and ``export_json`` (which writes the
+``literature_readings.json`` artifact later phases load) read the
+readings back from disk one paper at a time.
+"""
+
+import hashlib
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional, Sequence, Tuple
+
+from src.utils.batch import _file_digest
+
+STAGES = ("initial", "project_specific")
+
+# One append lock per records file, shared by every store opened on it
+_file_locks: Dict[Path, threading.Lock] = {}
+_file_locks_guard = threading.Lock()
+
+
+def _file_lock(path: Path) -> threading.Lock:
+    with _file_locks_guard:
+        return _file_locks.setdefault(path.resolve(), threading.Lock())
+
+
+def reading_key(paper: Path, context: Optional[Dict[str, Any]] = None) -> str:
+    """Key of a reading's inputs: the PDF's digest, plus the project for project-specific readings"""
+    key = _file_digest(Path(paper))
+    if context is not None:
+        project = json.dumps(context, sort_keys=True, ensure_ascii=False).encode("utf-8")
+        key = f"{key}:{hashlib.sha256(project).hexdigest()[:16]}"
+    return key
+
+
+def summarize_reading(stage: str, reading: Dict[str, Any]) -> Dict[str, Any]:
+    """The few fields kept in memory for each paper"""
+    if not isinstance(reading, dict):
+        return {}
+    summary = {}
+    title = (reading.get("paper_info") or {}).get("title")
+    if title:
+        summary["title"] = title
+    if stage == "project_specific":
+        summary["engagement_type"] = (reading.get("engagement_assessment") or {}).get("type", "Unknown")
+    return summary
+
+
+class ReadingsStore:
+    """Append-only log of per-paper readings, indexed by byte offset"""
+
+    def __init__(self, output_dir: Path, name: str = "literature_readings"):
+        self.output_dir = Path(output_dir)
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        self.records_path = self.output_dir / f"{name}.jsonl"
+        self._lock = _file_lock(self.records_path)
+        self._offsets: Dict[Tuple[str, str], Tuple[int, str]] = {}  # (paper, stage) -> (offset, key)
+        self.summaries: Dict[str, Dict[str, Any]] = {}
+        self._scan()
+
+    def _scan(self) -> None:
+        """Index the latest record of each paper and stage; torn lines are ignored"""
+        if not self.records_path.exists():
+            return
+        with open(self.records_path, "rb") as f:
+            offset = 0
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    record = None  # A line cut short by an interrupted run
+                if isinstance(record, dict) and record.get("stage") in STAGES:
+                    self._index(record, offset)
+                offset += len(line)
+
+    def _index(self, record: Dict[str, Any], offset: int) -> None:
+        paper_id, stage = record["paper_id"], record["stage"]
+        self._offsets[(paper_id, stage)] = (offset, record.get("key", ""))
+        self.summaries.setdefault(paper_id, {}).update(summarize_reading(stage, record["reading"]))
+
+    def has(self, paper_id: str, stage: str, key: Optional[str] = None) -> bool:
+        entry = self._offsets.get((paper_id, stage))
+        return entry is not None and (key is None or entry[1] == key)
+
+    def get(self, paper_id: str, stage: str, key: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """The stored reading, or None if missing or made from other inputs than ``key``"""
+        if not self.has(paper_id, stage, key):
+            return None
+        offset, _ = self._offsets[(paper_id, stage)]
+        with open(self.records_path, "rb") as f:
+            f.seek(offset)
+            return json.loads(f.readline())["reading"]
+
+    def put(self, paper_id: str, stage: str, reading: Dict[str, Any], key: str = "") -> None:
+        """Durably append one reading"""
+        record = {"paper_id": paper_id, "stage": stage, "key": key, "reading": reading}
+        line = (json.dumps(record, ensure_ascii=False) + "\n").encode("utf-8")
+        with self._lock:
+            with open(self.records_path, "ab") as f:
+                if f.tell():
+                    with open(self.records_path, "rb") as existing:
+                        existing.seek(-1, os.SEEK_END)
+                        if existing.read(1) != b"\n":
+                            f.write(b"\n")
+                offset = f.tell()
+                f.write(line)
+                f.flush()
+                os.fsync(f.fileno())
+            self._index(record, offset)
+
+    def iter_readings(self, paper_ids: Optional[Sequence[str]] = None) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """(paper id, {"initial": ..., "project_specific": ...}) for each fully read paper, loaded lazily"""
+        for paper_id in paper_ids if paper_ids is not None else list(self.summaries):
+            if all(self.has(paper_id, stage) for stage in STAGES):
+                yield paper_id, {stage: self.get(paper_id, stage) for stage in STAGES}
+
+    def export_json(self, path: Path, paper_ids: Optional[Sequence[str]] = None) -> Path:
+        """Write the readings as one JSON object (the literature_readings artifact), paper by paper
+
+        The output matches ``json.dump(readings, f, indent=2)`` without
+        building the whole object in memory.
+        """
+        path = Path(path)
+        tmp_path = path.with_name(path.name + ".tmp")
+        count = 0
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write("{")
+            for paper_id, readings in self.iter_readings(paper_ids):
+                f.write(",\n  " if count else "\n  ")
+                f.write(f"{json.dumps(paper_id)}: " + json.dumps(readings, indent=2).replace("\n", "\n  "))
+                count += 1
+            f.write("\n}" if count else "}")
+        tmp_path.replace(path)
+        return path
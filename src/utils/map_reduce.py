@@ -0,0 +1,78 @@
+# src/utils/map_reduce.py
+"""
+Bounded-concurrency map and hierarchical reduce for corpus-wide LLM jobs.
+
+``map_bounded`` runs one call per item in a thread pool and keeps going
+past individual failures. ``tree_reduce`` combines results in groups of
+``fan_in``, level by level, running the groups of each level concurrently,
+so a corpus of n papers is summarized in about log_fan_in(n) rounds and no
+single prompt has to hold more than ``fan_in`` inputs.
+"""
+
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List, Optional, Sequence, Tuple, TypeVar
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+def map_bounded(
+    fn: Callable[[T], R], items: Sequence[T], workers: int = 4
+) -> Tuple[List[Tuple[T, R]], List[Tuple[T, Exception]]]:
+    """Apply fn to every item with at most ``workers`` in flight
+
+    Returns (item, result) pairs for successes and (item, error) pairs for
+    failures, both in input order.
+    """
+    def attempt(item: T):
+        try:
+            return item, fn(item), None
+        except Exception as e:
+            return item, None, e
+
+    # Each call runs in a copy of the caller's context, so context-scoped
+    # settings (usage log, tracer) follow the work into the pool
+    contexts = [contextvars.copy_context() for _ in items]
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        outcomes = list(executor.map(lambda context, item: context.run(attempt, item), contexts, items))
+    results = [(item, result) for item, result, error in outcomes if error is None]
+    failures = [(item, error) for item, _, error in outcomes if error is not None]
+    return results, failures
+
+
+def tree_reduce(
+    items: Sequence[R],
+    combine: Callable[[List[R], int], R],
+    fan_in: int = 8,
+    workers: int = 4,
+    on_level: Optional[Callable[[int, int], None]] = None,
+) -> Optional[R]:
+    """Reduce items to one by combining groups of at most fan_in, level by level
+
+    ``combine(group, level)`` receives the group and the level number
+    (1 for the first merge of raw items). A group of one is passed up
+    unchanged. ``on_level(level, group_count)`` is called before each level.
+    """
+    if fan_in < 2:
+        raise ValueError("fan_in must be at least 2")
+    level_items: List[R] = list(items)
+    if not level_items:
+        return None
+
+    level = 0
+    while len(level_items) > 1:
+        level += 1
+        groups = [level_items[i:i + fan_in] for i in range(0, len(level_items), fan_in)]
+        if on_level:
+            on_level(level, len(groups))
+
+        def merge(group: List[R], level: int = level) -> R:
+            return group[0] if len(group) == 1 else combine(group, level)
+
+        # Merges run in copies of the caller's context, as in map_bounded
+        contexts = [contextvars.copy_context() for _ in groups]
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+            level_items = list(executor.map(lambda context, group: context.run(merge, group), contexts, groups))
+    return level_items[0]
+
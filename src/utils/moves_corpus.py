@@ -0,0 +1,122 @@
+# src/utils/moves_corpus.py
+"""
+Bookkeeping for incremental philosophical moves extraction.
+
+``ExtractionManifest`` records, per Analysis paper, the hash of its text,
+the version of the extraction prompt it was processed with, and its
+status, so a rerun only sends new or changed papers to the API.
+``MovesStore`` is an append-only JSONL file of extraction results; the
+last record for a paper supersedes earlier ones.
+"""
+
+import hashlib
+import json
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+
+def content_hash(text: str) -> str:
+    """Stable short hash of a paper text or prompt"""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()[:16]
+
+
+def _atomic_write_json(path: Path, data: Any) -> None:
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2)
+    tmp_path.replace(path)
+
+
+class ExtractionManifest:
+    """Per-paper extraction state, saved after every change"""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self.papers: Dict[str, Dict[str, Any]] = {}
+        if self.path.exists():
+            with open(self.path, encoding="utf-8") as f:
+                self.papers = json.load(f).get("papers", {})
+
+    def needs_extraction(self, paper: str, text_hash: str, prompt_version: str) -> bool:
+        """True unless the paper was extracted from this exact text with this prompt"""
+        entry = self.papers.get(paper)
+        return not (
+            entry
+            and entry.get("status") == "done"
+            and entry.get("text_hash") == text_hash
+            and entry.get("prompt_version") == prompt_version
+        )
+
+    def mark(self, paper: str, **fields: Any) -> None:
+        with self._lock:
+            entry = self.papers.setdefault(paper, {})
+            entry.update(fields)
+            entry["updated"] = datetime.now().isoformat()
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            _atomic_write_json(self.path, {"papers": self.papers})
+
+    def counts(self) -> Dict[str, int]:
+        counts: Dict[str, int] = {}
+        for entry in self.papers.values():
+            counts[entry.get("status", "unknown")] = counts.get(entry.get("status", "unknown"), 0) + 1
+        return counts
+
+
+class MovesStore:
+    """Append-only JSONL store of per-paper extraction results"""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+
+    def append(self, extraction: Dict[str, Any]) -> None:
+        line = json.dumps(extraction, ensure_ascii=False)
+        with self._lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, "ab") as f:
+                # Start on a fresh line if an interrupted run left a partial record
+                if f.tell() and not self._ends_with_newline():
+                    f.write(b"\n")
+                f.write((line + "\n").encode("utf-8"))
+
+    def _ends_with_newline(self) -> bool:
+        with open(self.path, "rb") as f:
+            f.seek(-1, 2)
+            return f.read(1) == b"\n"
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        if not self.path.exists():
+            return
+        with open(self.path, encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # A line cut short by an interrupted run
+
+    def latest(self) -> List[Dict[str, Any]]:
+        """Most recent extraction for each source file, in first-seen order"""
+        latest: Dict[str, Dict[str, Any]] = {}
+        for extraction in self:
+            latest[extraction.get("source_file", "")] = extraction
+        return list(latest.values())
+
+
+def load_database(path: Path) -> Optional[Dict[str, Any]]:
+    """Load a consolidated moves database if it exists"""
+    path = Path(path)
+    if not path.exists():
+        return None
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_database(path: Path, database: Dict[str, Any]) -> None:
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    _atomic_write_json(Path(path), database)
@@ -0,0 +1,269 @@
+# src/utils/moves_index.py
+"""
+Indexed philosophical moves store.
+
+Moves extracted from Analysis papers are kept in a local SQLite database
+with an FTS5 full-text index (move name, pattern, quote, mechanism,
+achievement) and secondary indexes on pattern, classification, domain and
+quality. Prompt classes call ``relevant_moves_block`` while building a
+prompt to pull the few moves most relevant to the key move or section at
+hand instead of embedding a fixed list.
+"""
+
+import json
+import re
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+DEFAULT_INDEX_PATH = Path("outputs/philosophical_moves_db_v2/moves_index.sqlite")
+
+QUALITY_RANK = {"High": 2, "Medium": 1, "Low": 0}
+
+QUERY_STOPWORDS = {
+    "about", "after", "against", "also", "because", "being", "between", "could",
+    "does", "from", "have", "into", "more", "most", "move", "other", "paper",
+    "should", "such", "than", "that", "their", "there", "these", "they", "this",
+    "those", "through", "what", "when", "where", "which", "while", "with", "would",
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS moves (
+    id INTEGER PRIMARY KEY,
+    source_file TEXT,
+    source_paper TEXT,
+    source_author TEXT,
+    move_name TEXT,
+    pattern TEXT,
+    domain TEXT,
+    quality TEXT,
+    quality_rank INTEGER,
+    quote TEXT,
+    mechanism TEXT,
+    achievement TEXT,
+    payload TEXT
+);
+CREATE TABLE IF NOT EXISTS move_classification (
+    move_id INTEGER REFERENCES moves(id) ON DELETE CASCADE,
+    classification TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_moves_source ON moves(source_file);
+CREATE INDEX IF NOT EXISTS idx_moves_pattern ON moves(pattern);
+CREATE INDEX IF NOT EXISTS idx_moves_domain ON moves(domain);
+CREATE INDEX IF NOT EXISTS idx_moves_quality ON moves(quality_rank);
+CREATE INDEX IF NOT EXISTS idx_classification ON move_classification(classification, move_id);
+CREATE VIRTUAL TABLE IF NOT EXISTS moves_fts USING fts5(
+    move_name, pattern, quote, mechanism, achievement,
+    content='moves', content_rowid='id'
+);
+"""
+
+FTS_COLUMNS = ("move_name", "pattern", "quote", "mechanism", "achievement")
+
+
+def _text(value: Any) -> str:
+    if isinstance(value, str):
+        return value
+    return json.dumps(value, ensure_ascii=False) if value else ""
+
+
+def _match_expression(query: str, columns: Optional[Sequence[str]] = None) -> str:
+    """Turn free text into an FTS5 OR-query of its content words (prefix matches)"""
+    words = re.findall(r"[a-z][a-z\-']{2,}", query.lower())
+    terms = list(dict.fromkeys(word for word in words if word not in QUERY_STOPWORDS))
+    expression = " OR ".join(f'"{term}"*' for term in terms[:32])
+    if expression and columns:
+        expression = f"{{{' '.join(columns)}}} : ({expression})"
+    return expression
+
+
+class MovesIndex:
+    """SQLite/FTS5 store of philosophical moves with a top-k query API"""
+
+    def __init__(self, path: Path = DEFAULT_INDEX_PATH):
+        self.path = Path(path)
+        if str(path) != ":memory:":
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+        # One connection shared across threads, serialized by a lock
+        self._conn = sqlite3.connect(str(path), check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA foreign_keys = ON")
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.executescript(SCHEMA)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM moves").fetchone()[0]
+
+    def _insert(self, move: Dict[str, Any], source_file: str) -> None:
+        values = {
+            "source_file": source_file,
+            "source_paper": _text(move.get("source_paper", "")),
+            "source_author": _text(move.get("source_author", "")),
+            "move_name": _text(move.get("move_name", "")),
+            "pattern": _text(move.get("pattern", "")),
+            "domain": _text(move.get("domain", "General")),
+            "quality": _text(move.get("quality", "")),
+            "quote": _text(move.get("quote", "")),
+            "mechanism": _text(move.get("mechanism", "")),
+            "achievement": _text(move.get("achievement", "")),
+        }
+        cursor = self._conn.execute(
+            """INSERT INTO moves (source_file, source_paper, source_author, move_name, pattern,
+                                  domain, quality, quality_rank, quote, mechanism, achievement, payload)
+               VALUES (:source_file, :source_paper, :source_author, :move_name, :pattern,
+                       :domain, :quality, :quality_rank, :quote, :mechanism, :achievement, :payload)""",
+            {**values, "quality_rank": QUALITY_RANK.get(values["quality"], 0),
+             "payload": json.dumps(move, ensure_ascii=False)},
+        )
+        move_id = cursor.lastrowid
+        self._conn.execute(
+            "INSERT INTO moves_fts (rowid, move_name, pattern, quote, mechanism, achievement) VALUES (?, ?, ?, ?, ?, ?)",
+            (move_id, *(values[column] for column in FTS_COLUMNS)),
+        )
+        self._conn.executemany(
+            "INSERT INTO move_classification (move_id, classification) VALUES (?, ?)",
+            [(move_id, category) for category in move.get("classification", []) if isinstance(category, str)],
+        )
+
+    def _delete_source(self, source_file: str) -> None:
+        rows = self._conn.execute(
+            f"SELECT id, {', '.join(FTS_COLUMNS)} FROM moves WHERE source_file = ?", (source_file,)
+        ).fetchall()
+        for row in rows:
+            self._conn.execute(
+                "INSERT INTO moves_fts (moves_fts, rowid, move_name, pattern, quote, mechanism, achievement) "
+                "VALUES ('delete', ?, ?, ?, ?, ?, ?)",
+                (row["id"], *(row[column] for column in FTS_COLUMNS)),
+            )
+        self._conn.execute("DELETE FROM moves WHERE source_file = ?", (source_file,))
+
+    def replace_paper(self, source_file: str, moves: Iterable[Dict[str, Any]]) -> None:
+        """Replace every move from one paper (used for incremental updates)"""
+        with self._lock, self._conn:
+            self._delete_source(source_file)
+            for move in moves:
+                self._insert(move, source_file)
+
+    def rebuild(self, moves: Iterable[Dict[str, Any]]) -> None:
+        """Replace the whole index with the given moves"""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM move_classification")
+            self._conn.execute("DELETE FROM moves")
+            self._conn.execute("INSERT INTO moves_fts (moves_fts) VALUES ('delete-all')")
+            for move in moves:
+                self._insert(move, move.get("source_file", move.get("source_paper", "")))
+
+    def search(
+        self,
+        query: str = "",
+        k: Optional[int] = 3,
+        classification: Optional[str] = None,
+        domain: Optional[str] = None,
+        pattern: Optional[str] = None,
+        min_quality: str = "Low",
+        columns: Optional[Sequence[str]] = None,
+    ) -> List[Dict[str, Any]]:
+        """Top-k moves for free text, best full-text match first, higher quality breaking ties
+
+        ``columns`` restricts the text match to some of the indexed fields
+        (move_name, pattern, quote, mechanism, achievement); ``k=None``
+        returns every match.
+        """
+        clauses = ["m.quality_rank >= ?"]
+        params: List[Any] = [QUALITY_RANK.get(min_quality, 0)]
+        if classification:
+            clauses.append("m.id IN (SELECT move_id FROM move_classification WHERE classification = ?)")
+            params.append(classification)
+        if domain:
+            clauses.append("m.domain = ?")
+            params.append(domain)
+        if pattern:
+            clauses.append("m.pattern = ?")
+            params.append(pattern)
+
+        match = _match_expression(query, columns)
+        if match:
+            sql = (
+                "SELECT m.payload FROM moves_fts JOIN moves m ON m.id = moves_fts.rowid "
+                f"WHERE moves_fts MATCH ? AND {' AND '.join(clauses)} "
+                "ORDER BY bm25(moves_fts, 4.0, 3.0, 1.0, 2.0, 1.0) - m.quality_rank, m.id"
+            )
+            params.insert(0, match)
+        else:
+            sql = f"SELECT m.payload FROM moves m WHERE {' AND '.join(clauses)} ORDER BY m.quality_rank DESC, m.id"
+        if k is not None:
+            sql += " LIMIT ?"
+            params.append(k)
+
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        return [json.loads(row["payload"]) for row in rows]
+
+
+def format_moves_for_prompt(moves: List[Dict[str, Any]]) -> str:
+    """Render moves in the numbered style used by the development prompts"""
+    entries = []
+    for i, move in enumerate(moves, 1):
+        entry = f"{i}. **{move.get('move_name', 'Unnamed move')}**\n   Pattern: {move.get('pattern', '')}"
+        if move.get("quote"):
+            entry += f'\n   Example: "{move["quote"]}"'
+        if move.get("achievement"):
+            entry += f"\n   Achievement: {move['achievement']}"
+        entries.append(entry)
+    return "\n\n".join(entries)
+
+
+def index_settings(config: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """Read the moves index settings from the pipeline config"""
+    settings = {"path": str(DEFAULT_INDEX_PATH), "top_k": 3, "min_quality": "Medium"}
+    settings.update((config or {}).get("parameters", {}).get("moves_index", {}))
+    return settings
+
+
+# One open index per path, with the mtime it was opened at
+_open_indexes: Dict[str, Tuple[float, MovesIndex]] = {}
+_open_indexes_lock = threading.Lock()
+
+
+def _open_index(path: str, mtime: float) -> MovesIndex:
+    """The shared index for a path, reopened (and the old connection closed) when the file changed"""
+    with _open_indexes_lock:
+        opened = _open_indexes.get(path)
+        if opened is not None and opened[0] == mtime:
+            return opened[1]
+        if opened is not None:
+            opened[1].close()
+        index = MovesIndex(Path(path))
+        _open_indexes[path] = (mtime, index)
+        return index
+
+
+def load_moves_index(config: Optional[Dict[str, Any]] = None) -> Optional[MovesIndex]:
+    """Open the moves index if it has been built, else None"""
+    path = Path(index_settings(config)["path"])
+    if not path.exists():
+        return None
+    try:
+        index = _open_index(str(path), path.stat().st_mtime)
+        return index if len(index) else None
+    except sqlite3.Error as e:
+        print(f"⚠️ Could not open moves index at {path}: {e}")
+        return None
+
+
+def relevant_moves_block(config: Optional[Dict[str, Any]], query: str, classification: Optional[str] = None) -> str:
+    """Formatted top-k moves for a prompt ("" when no index is available)"""
+    index = load_moves_index(config)
+    if index is None:
+        return ""
+    settings = index_settings(config)
+    moves = index.search(query, k=settings["top_k"], classification=classification,
+                         min_quality=settings["min_quality"])
+    return format_moves_for_prompt(moves)
@@ -0,0 +1,123 @@
+# src/utils/near_duplicates.py
+"""
+Near-duplicate detection for extracted philosophical moves.
+
+Texts are reduced to word shingles and MinHash signatures; locality
+sensitive hashing over signature bands finds candidate duplicates without
+comparing every pair, and candidates are confirmed with the exact Jaccard
+similarity of their shingle sets. Adding n texts costs roughly O(n) rather
+than the O(n^2) of pairwise comparison.
+"""
+
+import random
+import re
+import zlib
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+_PRIME = (1 << 61) - 1
+
+
+def shingles(text: str, size: int = 3) -> Set[int]:
+    """Hashed word n-grams of a text (the whole text if it is shorter than n words)"""
+    words = re.findall(r"\w+", text.lower())
+    if len(words) <= size:
+        return {zlib.crc32(" ".join(words).encode("utf-8"))} if words else set()
+    return {
+        zlib.crc32(" ".join(words[i:i + size]).encode("utf-8"))
+        for i in range(len(words) - size + 1)
+    }
+
+
+def jaccard(a: Set[int], b: Set[int]) -> float:
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+class NearDuplicateIndex:
+    """MinHash/LSH index mapping keys to texts, queried for near duplicates
+
+    With ``bands`` bands of ``rows`` rows, pairs above roughly
+    (1/bands)^(1/rows) Jaccard similarity become candidates; only candidates
+    at or above ``threshold`` are reported.
+    """
+
+    def __init__(self, threshold: float = 0.8, bands: int = 16, rows: int = 4,
+                 shingle_size: int = 3, seed: int = 1):
+        self.threshold = threshold
+        self.bands = bands
+        self.rows = rows
+        self.shingle_size = shingle_size
+        rng = random.Random(seed)
+        self._perms = [(rng.randrange(1, _PRIME), rng.randrange(0, _PRIME)) for _ in range(bands * rows)]
+        self._buckets: Dict[Tuple[int, Tuple[int, ...]], Set[str]] = {}
+        self._entries: Dict[str, Tuple[Set[int], Tuple[int, ...]]] = {}
+        self._items: Dict[str, Any] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._entries
+
+    def _signature(self, shingle_set: Set[int]) -> Tuple[int, ...]:
+        if not shingle_set:
+            return ()
+        return tuple(min((a * h + b) % _PRIME for h in shingle_set) for a, b in self._perms)
+
+    def _band_keys(self, signature: Tuple[int, ...]) -> Iterable[Tuple[int, Tuple[int, ...]]]:
+        for band in range(self.bands if signature else 0):
+            yield band, signature[band * self.rows:(band + 1) * self.rows]
+
+    def find(self, text: str) -> Optional[str]:
+        """Key of the most similar indexed text at or above the threshold, else None"""
+        shingle_set = shingles(text, self.shingle_size)
+        candidates: Set[str] = set()
+        for band_key in self._band_keys(self._signature(shingle_set)):
+            candidates |= self._buckets.get(band_key, set())
+
+        best_key, best_score = None, self.threshold
+        for key in sorted(candidates):
+            score = jaccard(shingle_set, self._entries[key][0])
+            if score >= best_score and (best_key is None or score > best_score):
+                best_key, best_score = key, score
+        return best_key
+
+    def add(self, key: str, text: str, item: Any = None) -> None:
+        """Index a text under key, keeping ``item`` for retrieval with ``get``"""
+        self.remove(key)
+        shingle_set = shingles(text, self.shingle_size)
+        signature = self._signature(shingle_set)
+        self._entries[key] = (shingle_set, signature)
+        self._items[key] = item
+        for band_key in self._band_keys(signature):
+            self._buckets.setdefault(band_key, set()).add(key)
+
+    def get(self, key: str) -> Any:
+        return self._items.get(key)
+
+    def remove(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        self._items.pop(key, None)
+        if entry is None:
+            return
+        for band_key in self._band_keys(entry[1]):
+            bucket = self._buckets.get(band_key)
+            if bucket is not None:
+                bucket.discard(key)
+                if not bucket:
+                    del self._buckets[band_key]
+
+
+def cluster_near_duplicates(texts: Dict[str, str], threshold: float = 0.8) -> List[List[str]]:
+    """Group keys whose texts are near duplicates; the first key of each cluster is canonical"""
+    index = NearDuplicateIndex(threshold=threshold)
+    clusters: Dict[str, List[str]] = {}
+    for key, text in texts.items():
+        canonical = index.find(text)
+        if canonical is None:
+            index.add(key, text)
+            clusters[key] = [key]
+        else:
+            clusters[canonical].append(key)
+    return list(clusters.values())
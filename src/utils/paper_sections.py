@@ -0,0 +1,156 @@
+# src/utils/paper_sections.py
+"""
+Markdown paper section utilities for Phase III.
+
+Splits a draft paper into heading-delimited sections, maps free-text review
+issues onto those sections, and splices revised sections back in. Splitting
+is lossless: joining the ``text`` of every section reproduces the draft
+byte-for-byte, so untouched sections pass through unchanged.
+"""
+
+import re
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+HEADING_PATTERN = re.compile(r"^(#{1,2})\s+(.+?)\s*$")
+SECTION_REFERENCE_PATTERN = re.compile(r"(?:section|§)\s*(\d+)", re.IGNORECASE)
+NUMBERED_TITLE_PATTERN = re.compile(r"^(\d+)(?:\.\d+)*\.?\s+(.*)$")
+
+STOPWORDS = {
+    "about", "above", "after", "again", "against", "argument", "arguments",
+    "because", "before", "being", "between", "could", "does", "doesn't",
+    "during", "example", "examples", "further", "issue", "issues", "might",
+    "other", "paper", "section", "sections", "should", "their", "there",
+    "these", "thesis", "those", "through", "under", "until", "where",
+    "which", "while", "would",
+}
+
+
+@dataclass
+class PaperSection:
+    index: int  # Position in the draft, including the preamble
+    heading: str  # Heading line without trailing newline ("" for the preamble)
+    title: str  # Heading text with leading number and markers removed
+    number: Optional[str]  # Leading section number from the heading, if any
+    text: str  # Exact source text, including heading and trailing whitespace
+
+    @property
+    def body(self) -> str:
+        """Section text without the heading line"""
+        if not self.heading:
+            return self.text
+        return self.text[len(self.heading):].lstrip("\n")
+
+    @property
+    def word_count(self) -> int:
+        return len(self.body.split())
+
+    @property
+    def revisable(self) -> bool:
+        """Title-only chunks and empty preambles have nothing to revise"""
+        return self.word_count > 0
+
+
+def split_sections(draft: str) -> List[PaperSection]:
+    """Split a markdown draft at level-one and level-two headings"""
+    lines = draft.splitlines(keepends=True)
+    chunks: List[List[str]] = [[]]
+    for line in lines:
+        if HEADING_PATTERN.match(line.rstrip("\n")) and chunks[-1]:
+            chunks.append([])
+        chunks[-1].append(line)
+
+    sections = []
+    for index, chunk in enumerate(chunks):
+        text = "".join(chunk)
+        first_line = chunk[0].rstrip("\n") if chunk else ""
+        match = HEADING_PATTERN.match(first_line)
+        heading = first_line if match else ""
+        title, number = "", None
+        if match:
+            title = match.group(2).strip()
+            numbered = NUMBERED_TITLE_PATTERN.match(title)
+            if numbered:
+                number, title = numbered.group(1), numbered.group(2).strip()
+        sections.append(
+            PaperSection(index=index, heading=heading, title=title, number=number, text=text)
+        )
+    return sections
+
+
+def splice_sections(sections: List[PaperSection], replacements: Dict[int, str]) -> str:
+    """Rebuild the draft, substituting revised text for the given section indices
+
+    Replacement text inherits the original section's trailing whitespace so
+    section boundaries stay intact.
+    """
+    parts = []
+    for section in sections:
+        if section.index in replacements:
+            trailing = section.text[len(section.text.rstrip()):]
+            parts.append(replacements[section.index].rstrip() + trailing)
+        else:
+            parts.append(section.text)
+    return "".join(parts)
+
+
+def _keywords(text: str) -> set:
+    words = re.findall(r"[a-z][a-z'\-]{4,}", text.lower())
+    return {word for word in words if word not in STOPWORDS}
+
+
+def map_issues_to_sections(
+    issues: List[str], sections: List[PaperSection], min_overlap: int = 2
+) -> Dict[int, List[str]]:
+    """Assign each issue to the sections it concerns
+
+    An issue is matched by explicit section number ("Section 3", "§3"), by
+    quoting a section title, or by "introduction"/"conclusion". Failing
+    that, it goes to the section sharing the most keywords with it. Issues
+    that cannot be localized at all go to the first body section, where
+    paper-level framing is set up.
+    """
+    body_sections = [section for section in sections if section.revisable and section.heading]
+    if not body_sections:
+        return {}
+
+    by_number = {section.number: section.index for section in body_sections if section.number}
+    section_keywords = {
+        section.index: _keywords(section.title) | _keywords(section.body)
+        for section in body_sections
+    }
+
+    mapping: Dict[int, List[str]] = {}
+    for issue in issues:
+        lowered = issue.lower()
+        targets = []
+
+        for reference in SECTION_REFERENCE_PATTERN.findall(issue):
+            if reference in by_number:
+                targets.append(by_number[reference])
+            elif 0 < int(reference) <= len(body_sections):
+                targets.append(body_sections[int(reference) - 1].index)
+
+        for section in body_sections:
+            if section.title and len(section.title) > 3 and section.title.lower() in lowered:
+                targets.append(section.index)
+
+        if not targets:
+            if "introduction" in lowered:
+                targets.append(body_sections[0].index)
+            if "conclusion" in lowered:
+                targets.append(body_sections[-1].index)
+
+        if not targets:
+            issue_keywords = _keywords(issue)
+            scores = {
+                index: len(issue_keywords & keywords)
+                for index, keywords in section_keywords.items()
+            }
+            best = max(scores, key=lambda index: (scores[index], -index))
+            targets.append(best if scores[best] >= min_overlap else body_sections[0].index)
+
+        for target in dict.fromkeys(targets):
+            mapping.setdefault(target, []).append(issue)
+
+    return mapping
@@ -0,0 +1,194 @@
+# src/utils/prompt_budget.py
+"""
+Token-budgeted prompt assembly.
+
+Prompt classes declare their parts (instructions, style guide, literature,
+content bank, previous versions, exemplars) as prioritized components.
+``PromptAssembler.build`` renders them in declaration order and, when the
+total exceeds the stage budget, trims or drops the lowest-priority optional
+components first. Token counts are computed locally and cached by a digest
+of the text, so the cache does not keep prompt strings alive.
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional
+
+DEFAULT_PROMPT_TOKEN_BUDGET = 150000
+CHARS_PER_TOKEN = 3.5  # Conservative estimate used when tiktoken is unavailable
+
+TOKEN_CACHE_SIZE = 4096
+
+_encoding = None
+_token_counts: "OrderedDict[bytes, int]" = OrderedDict()
+_token_counts_lock = threading.Lock()
+
+
+class PromptBudgetError(ValueError):
+    """Raised when required prompt components alone exceed the token budget"""
+    pass
+
+
+def _get_encoding():
+    """Load the tiktoken encoding once; False if tiktoken cannot be used"""
+    global _encoding
+    if _encoding is None:
+        try:
+            import tiktoken
+
+            _encoding = tiktoken.get_encoding("cl100k_base")
+        except Exception:
+            _encoding = False
+    return _encoding
+
+
+def count_tokens(text: str) -> int:
+    """Count tokens locally (tiktoken if available, character estimate otherwise)"""
+    if not text:
+        return 0
+    key = hashlib.blake2b(text.encode("utf-8", "surrogatepass"), digest_size=16).digest()
+    with _token_counts_lock:
+        count = _token_counts.get(key)
+        if count is not None:
+            _token_counts.move_to_end(key)
+            return count
+    count = _count_tokens(text)
+    with _token_counts_lock:
+        _token_counts[key] = count
+        if len(_token_counts) > TOKEN_CACHE_SIZE:
+            _token_counts.popitem(last=False)
+    return count
+
+
+def _count_tokens(text: str) -> int:
+    encoding = _get_encoding()
+    if encoding:
+        return len(encoding.encode(text, disallowed_special=()))
+    return int(len(text) / CHARS_PER_TOKEN) + 1
+
+
+def trim_to_tokens(text: str, max_tokens: int, keep: str = "start", marker: str = "") -> str:
+    """Shorten text to at most max_tokens, keeping its start or end, cutting at a line break"""
+    if count_tokens(text) <= max_tokens:
+        return text
+    marker = marker or "[... trimmed to fit the prompt budget ...]"
+    budget = max(0, max_tokens - count_tokens(marker) - 1)
+
+    length = int(len(text) * budget / max(count_tokens(text), 1))
+    while length > 0:
+        piece = text[:length] if keep == "start" else text[-length:]
+        if count_tokens(piece) <= budget:
+            break
+        length = int(length * 0.9)
+    if length <= 0:
+        return marker
+
+    if keep == "start":
+        piece = text[:length]
+        cut = piece.rfind("\n")
+        piece = piece[:cut] if cut > length // 2 else piece
+        return f"{piece.rstrip()}\n{marker}"
+    piece = text[-length:]
+    cut = piece.find("\n")
+    piece = piece[cut + 1:] if 0 <= cut < length // 2 else piece
+    return f"{marker}\n{piece.lstrip()}"
+
+
+def stage_token_budget(config: Dict[str, Any], stage: str, default: int = DEFAULT_PROMPT_TOKEN_BUDGET) -> int:
+    """Read a stage's prompt token budget from the model config"""
+    return config.get("models", {}).get(stage, {}).get("prompt_token_budget", default)
+
+
+@dataclass
+class PromptComponent:
+    name: str
+    content: str
+    priority: int = 0  # Lower priorities are trimmed first
+    required: bool = False  # Required components are never trimmed
+    tag: Optional[str] = None  # Consecutive components sharing a tag render inside one <tag> block
+    keep: str = "start"  # Which end to keep when trimming: "start" or "end"
+    min_tokens: int = 50  # Below this a component is dropped rather than trimmed
+    summarizer: Optional[Callable[[str, int], str]] = None  # Custom (content, max_tokens) -> content
+
+
+class PromptAssembler:
+    """Builds a prompt from prioritized components under a token budget"""
+
+    def __init__(self, token_budget: int = DEFAULT_PROMPT_TOKEN_BUDGET, separator: str = "\n\n"):
+        self.token_budget = token_budget
+        self.separator = separator
+        self.components: List[PromptComponent] = []
+        self.last_report: Dict[str, int] = {}
+
+    def add(self, name: str, content: str, priority: int = 0, required: bool = False,
+            tag: Optional[str] = None, keep: str = "start", min_tokens: int = 50,
+            summarizer: Optional[Callable[[str, int], str]] = None) -> "PromptAssembler":
+        """Declare a prompt component; empty components are ignored"""
+        if content and content.strip():
+            self.components.append(
+                PromptComponent(name, content.strip("\n"), priority, required, tag, keep, min_tokens, summarizer)
+            )
+        return self
+
+    def _fit(self) -> List[PromptComponent]:
+        contents = {id(c): c.content for c in self.components}
+        tokens = {id(c): count_tokens(c.content) for c in self.components}
+        overhead = count_tokens(self.separator) * len(self.components)
+        over = sum(tokens.values()) + overhead - self.token_budget
+
+        if over > 0:
+            optional = [c for c in self.components if not c.required]
+            # Lowest priority first; among equals, later components go first
+            for component in sorted(optional, key=lambda c: (c.priority, -self.components.index(c))):
+                if over <= 0:
+                    break
+                available = tokens[id(component)] - over
+                if available >= component.min_tokens:
+                    if component.summarizer:
+                        shortened = component.summarizer(component.content, available)
+                    else:
+                        shortened = trim_to_tokens(
+                            component.content, available, component.keep,
+                            f"[... {component.name} trimmed to fit the prompt budget ...]",
+                        )
+                    over -= tokens[id(component)] - count_tokens(shortened)
+                    contents[id(component)] = shortened
+                    tokens[id(component)] = count_tokens(shortened)
+                else:
+                    over -= tokens[id(component)]
+                    contents[id(component)] = ""
+                    tokens[id(component)] = 0
+                print(f"✂️  Prompt over budget: {component.name} reduced to {tokens[id(component)]} tokens")
+
+        if over > 0:
+            raise PromptBudgetError(
+                f"Required prompt components exceed the {self.token_budget}-token budget by {over} tokens"
+            )
+
+        self.last_report = {c.name: tokens[id(c)] for c in self.components}
+        return [
+            PromptComponent(c.name, contents[id(c)], c.priority, c.required, c.tag, c.keep)
+            for c in self.components
+            if contents[id(c)]
+        ]
+
+    def build(self) -> str:
+        """Render the components in declaration order within the token budget"""
+        blocks: List[str] = []
+        groups: List[List[PromptComponent]] = []
+        for component in self._fit():
+            if groups and component.tag and groups[-1][0].tag == component.tag:
+                groups[-1].append(component)
+            else:
+                groups.append([component])
+        for group in groups:
+            body = self.separator.join(component.content for component in group)
+            tag = group[0].tag
+            blocks.append(f"<{tag}>\n{body}\n</{tag}>" if tag else body)
+        return self.separator.join(blocks)
+
+    def total_tokens(self) -> int:
+        """Tokens used by the most recent build"""
+        return sum(self.last_report.values())
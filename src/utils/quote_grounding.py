@@ -0,0 +1,174 @@
+# src/utils/quote_grounding.py
+"""
+Quote grounding: check that quotes attributed to a paper occur in its text.
+
+``QuoteCorpus`` indexes extracted paper texts by word n-grams. To place a
+quote, every n-gram it shares with a document votes for an alignment
+start; the best-supported alignment is then scored with a word-level
+sequence match that tolerates OCR noise, punctuation and elisions
+("..."). Each quote gets a status (exact / fuzzy / not_found), a score and
+a character location, so a whole corpus of claimed quotes is checked in
+one pass.
+"""
+
+import re
+from collections import Counter
+from dataclasses import asdict, dataclass
+from difflib import SequenceMatcher
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+ANALYSIS_TEXTS_DIR = Path("analysis_cache/extracted_texts")
+LITERATURE_TEXTS_DIR = Path("analysis_cache/literature_texts")  # <PDF digest>/<stem>.txt
+
+DEFAULT_MATCH_THRESHOLD = 0.8
+
+_WORD = re.compile(r"\w+")
+
+
+def _tokenize(text: str) -> Tuple[List[str], List[Tuple[int, int]]]:
+    """Lowercased words of a text with their character spans"""
+    words, spans = [], []
+    for match in _WORD.finditer(text):
+        words.append(match.group().lower())
+        spans.append(match.span())
+    return words, spans
+
+
+@dataclass
+class QuoteMatch:
+    """Where (and how well) a quote was found"""
+
+    status: str  # exact | fuzzy | not_found
+    score: float
+    document: Optional[str] = None
+    start: Optional[int] = None
+    end: Optional[int] = None
+    matched_text: str = ""
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+class QuoteCorpus:
+    """Word n-gram index over a set of documents"""
+
+    def __init__(self, ngram: int = 4, threshold: float = DEFAULT_MATCH_THRESHOLD):
+        self.ngram = ngram
+        self.threshold = threshold
+        self._texts: Dict[str, str] = {}
+        self._words: Dict[str, List[str]] = {}
+        self._spans: Dict[str, List[Tuple[int, int]]] = {}
+        self._postings: Dict[Tuple[str, ...], List[Tuple[str, int]]] = {}
+
+    def __len__(self) -> int:
+        return len(self._texts)
+
+    def __contains__(self, document: str) -> bool:
+        return document in self._texts
+
+    def add_document(self, document: str, text: str) -> None:
+        if document in self._texts:
+            raise ValueError(f"Document already indexed: {document}")
+        words, spans = _tokenize(text)
+        self._texts[document] = text
+        self._words[document] = words
+        self._spans[document] = spans
+        for position in range(len(words) - self.ngram + 1):
+            gram = tuple(words[position:position + self.ngram])
+            self._postings.setdefault(gram, []).append((document, position))
+
+    def add_directory(self, directory: Path, pattern: str = "*.txt") -> int:
+        """Index every text file in a directory under its path relative to the directory
+
+        Literature texts sit in one subdirectory per PDF digest, so
+        same-named papers stay separate documents ("<digest>/<name>.txt").
+        """
+        added = 0
+        for path in sorted(Path(directory).glob(pattern)):
+            document = path.relative_to(directory).as_posix()
+            if document in self._texts:
+                print(f"⚠️ Skipping {path}: a document named {document} is already indexed")
+                continue
+            self.add_document(document, path.read_text(encoding="utf-8", errors="replace"))
+            added += 1
+        return added
+
+    def _candidates(self, words: List[str], document: Optional[str]) -> List[Tuple[str, int]]:
+        """Alignment starts ranked by how many of the quote's n-grams support them"""
+        votes: Counter = Counter()
+        if len(words) >= self.ngram:
+            for offset in range(len(words) - self.ngram + 1):
+                for doc, position in self._postings.get(tuple(words[offset:offset + self.ngram]), ()):
+                    if document is None or doc == document:
+                        votes[(doc, max(0, position - offset))] += 1
+        else:
+            # Too short for the n-gram index: scan for the first word
+            for doc in ([document] if document else list(self._words)):
+                for position, word in enumerate(self._words.get(doc, [])):
+                    if word == words[0]:
+                        votes[(doc, position)] += 1
+        return [candidate for candidate, _ in votes.most_common(5)]
+
+    def locate(self, quote: str, document: Optional[str] = None) -> QuoteMatch:
+        """Best location of a quote, optionally restricted to one document"""
+        words, _ = _tokenize(quote)
+        if not words:
+            return QuoteMatch(status="not_found", score=0.0)
+
+        best: Optional[QuoteMatch] = None
+        for doc, start in self._candidates(words, document):
+            # Window wide enough to cover text elided from the quote
+            window = self._words[doc][start:start + 2 * len(words) + 5]
+            matcher = SequenceMatcher(None, words, window, autojunk=False)
+            blocks = [block for block in matcher.get_matching_blocks() if block.size]
+            if not blocks:
+                continue
+            score = sum(block.size for block in blocks) / len(words)
+            if best is not None and score <= best.score:
+                continue
+            spans = self._spans[doc]
+            first = start + blocks[0].b
+            last = start + blocks[-1].b + blocks[-1].size - 1
+            exact = len(blocks) == 1 and blocks[0].size == len(words)
+            best = QuoteMatch(
+                status="exact" if exact else "fuzzy",
+                score=round(score, 3),
+                document=doc,
+                start=spans[first][0],
+                end=spans[last][1],
+                matched_text=self._texts[doc][spans[first][0]:spans[last][1]],
+            )
+
+        if best is None or best.score < self.threshold:
+            return QuoteMatch(status="not_found", score=best.score if best else 0.0,
+                              document=best.document if best else document)
+        return best
+
+
+def verify_quotes(corpus: QuoteCorpus, claims: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Ground each claim ({"quote", "document", ...}) and return it with its match"""
+    results = []
+    for claim in claims:
+        document = claim.get("document")
+        if document is not None and document not in corpus:
+            match = QuoteMatch(status="no_source", score=0.0, document=document)
+        else:
+            match = corpus.locate(claim.get("quote", ""), document)
+        results.append({**claim, "grounding": match.to_dict()})
+    return results
+
+
+def summarize_grounding(results: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Counts per status, overall and per document"""
+    summary: Dict[str, Any] = {"total": len(results), "by_status": {}, "by_document": {}}
+    for result in results:
+        status = result["grounding"]["status"]
+        document = result.get("document") or result["grounding"].get("document") or "unknown"
+        summary["by_status"][status] = summary["by_status"].get(status, 0) + 1
+        per_doc = summary["by_document"].setdefault(document, {})
+        per_doc[status] = per_doc.get(status, 0) + 1
+    grounded = summary["by_status"].get("exact", 0) + summary["by_status"].get("fuzzy", 0)
+    checked = len(results) - summary["by_status"].get("no_source", 0)
+    summary["grounded_rate"] = round(grounded / checked, 3) if checked else None
+    return summary
@@ -0,0 +1,145 @@
+# src/utils/rivet_client.py
+"""
+Client for the local Rivet graph server (``rivet/server.js``).
+
+Each phase that runs a Rivet graph (I.2 literature research, II.5 context
+coalescing) posts its inputs through one ``RivetClient``. The client:
+
+- keeps a pooled HTTP session, so keep-alive connections are reused;
+- gzips request bodies above ``compress_min_bytes`` (Express inflates
+  them transparently);
+- caches graph results on disk, keyed by a hash of the route and the
+  canonical JSON of its inputs. API keys are left out of the hash.
+
+A repeated run on unchanged inputs is therefore answered from the cache
+without contacting the server. The server URL comes from ``RIVET_URL``
+(default http://localhost:4040). Set ``RIVET_CACHE=0`` to always rerun
+graphs.
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+from src.utils.batch import ResponseCache
+from src.utils.tracing import instant, span
+
+DEFAULT_URL = "http://localhost:4040"
+DEFAULT_CACHE_DIR = Path("outputs/.rivet_cache")
+SECRET_FIELDS = ("openAIKey",)  # Sent to the server, never part of the cache key
+
+
+class RivetError(RuntimeError):
+    """The Rivet server is unreachable or a graph run failed"""
+
+
+def canonical_body(payload: Dict[str, Any]) -> bytes:
+    return json.dumps(payload, sort_keys=True, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+def cache_key(route: str, payload: Dict[str, Any]) -> str:
+    """Hash of the graph route and its inputs (secrets excluded)"""
+    inputs = {name: value for name, value in payload.items() if name not in SECRET_FIELDS}
+    digest = hashlib.sha256(route.encode("utf-8") + b"\0")
+    digest.update(canonical_body(inputs))
+    return digest.hexdigest()
+
+
+def encode_body(payload: Dict[str, Any], compress_min_bytes: int = 1024) -> Tuple[bytes, Dict[str, str]]:
+    """Request body and headers, gzipped when the body is large enough to benefit"""
+    body = canonical_body(payload)
+    headers = {"Content-Type": "application/json"}
+    if len(body) >= compress_min_bytes:
+        body = gzip.compress(body, compresslevel=5)
+        headers["Content-Encoding"] = "gzip"
+    return body, headers
+
+
+class RivetClient:
+    def __init__(
+        self,
+        base_url: Optional[str] = None,
+        cache_dir: Optional[Path] = DEFAULT_CACHE_DIR,
+        timeout: Tuple[float, float] = (5, 900),  # (connect, read) seconds; graphs make LLM calls
+        compress_min_bytes: int = 1024,
+        pool_size: int = 4,
+    ):
+        self.base_url = (base_url or os.getenv("RIVET_URL", DEFAULT_URL)).rstrip("/")
+        use_cache = cache_dir is not None and os.getenv("RIVET_CACHE", "1") != "0"
+        self.cache = ResponseCache(cache_dir) if use_cache else None
+        self.timeout = timeout
+        self.compress_min_bytes = compress_min_bytes
+        self.pool_size = pool_size
+        self._session = None
+        self._session_lock = threading.Lock()
+
+    @property
+    def session(self):
+        """Pooled keep-alive session, created on first use"""
+        with self._session_lock:
+            if self._session is None:
+                import requests  # Deferred: only Rivet phases need it
+                from requests.adapters import HTTPAdapter
+
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=self.pool_size, pool_maxsize=self.pool_size)
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                self._session = session
+            return self._session
+
+    def alive(self) -> bool:
+        """True if the server answers /life"""
+        import requests
+
+        try:
+            return self.session.get(f"{self.base_url}/life", timeout=self.timeout[0]).ok
+        except requests.RequestException:
+            return False
+
+    def run_graph(self, route: str, payload: Dict[str, Any], use_cache: bool = True) -> str:
+        """POST inputs to a graph route and return the response text"""
+        import requests
+
+        key = cache_key(route, payload) if self.cache is not None and use_cache else None
+        if key is not None:
+            cached = self.cache.get(key)
+            if cached is not None:
+                print(f"♻️  Reusing cached Rivet result for {route}")
+                instant(f"rivet cache hit {route}", "rivet")
+                return cached
+
+        body, headers = encode_body(payload, self.compress_min_bytes)
+        with span(f"rivet {route}", "rivet", bytes=len(body)):
+            try:
+                response = self.session.post(f"{self.base_url}{route}", data=body, headers=headers,
+                                             timeout=self.timeout)
+            except requests.RequestException as e:
+                raise RivetError(
+                    f"Could not reach the Rivet server at {self.base_url}. "
+                    "Please run `cd rivet && node server.js` in another terminal process"
+                ) from e
+        if response.status_code != 200:
+            raise RivetError(f"Rivet graph {route} failed ({response.status_code}): {response.text[:500]}")
+
+        text = response.content.decode("utf-8")
+        if key is not None:
+            self.cache.put(key, text)
+        return text
+
+
+_client: Optional[RivetClient] = None
+_client_lock = threading.Lock()
+
+
+def rivet_client() -> RivetClient:
+    """The process-wide client, so every phase shares one connection pool"""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = RivetClient()
+        return _client
@@ -0,0 +1,288 @@
+# src/utils/run_archive.py
+"""
+Content-addressed storage and a SQLite catalog for archived pipeline runs.
+
+``BlobStore`` keeps one copy of each distinct file under its SHA-256
+(``<root>/blobs/ab/abcdef...``) and materializes run directories as
+hardlinks (falling back to a reflink, then a plain copy), so unchanged
+configs and literature files cost no extra space from run to run. Blobs
+that a run directory links to stay uncompressed (a compressed blob plus an
+unpacked copy would cost more than the plain blob). With ``compress=True``
+and the ``zstandard`` package, ``compress_unlinked`` packs the blobs no run
+directory links to any more, and materializing one unpacks it again.
+
+``RunCatalog`` records each run, its files and its numeric metrics, so
+listing, filtering and comparing runs are indexed queries.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Not available on Windows; clones fall back to copies
+    fcntl = None
+
+try:
+    import zstandard
+except ImportError:  # Compression is optional
+    zstandard = None
+
+FICLONE = 0x40049409  # Linux ioctl for copy-on-write clones (btrfs, xfs)
+
+
+def file_sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _clone_or_copy(source: Path, dest: Path) -> str:
+    """Hardlink, else reflink, else copy source to dest; returns the method used"""
+    try:
+        os.link(source, dest)
+        return "hardlink"
+    except OSError:
+        pass
+    if fcntl is not None:
+        try:
+            with open(source, "rb") as src, open(dest, "wb") as dst:
+                fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+            return "reflink"
+        except OSError:
+            pass
+    shutil.copyfile(source, dest)
+    return "copy"
+
+
+class BlobStore:
+    """Deduplicated file store keyed on content hash"""
+
+    def __init__(self, root: Path, compress: bool = False):
+        self.root = Path(root)
+        self.compress = compress and zstandard is not None
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, digest: str, compressed: bool) -> Path:
+        return self.root / digest[:2] / (digest + (".zst" if compressed else ""))
+
+    def locate(self, digest: str) -> Optional[Path]:
+        for compressed in (False, True):
+            path = self._path(digest, compressed)
+            if path.exists():
+                return path
+        return None
+
+    def put(self, source: Path) -> Tuple[str, int, bool]:
+        """Store a file; returns (digest, stored size, whether it was new)"""
+        digest = file_sha256(source)
+        existing = self.locate(digest)
+        if existing is not None:
+            return digest, existing.stat().st_size, False
+
+        path = self._path(digest, False)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(path.name + ".tmp")
+        shutil.copyfile(source, tmp_path)
+        os.chmod(tmp_path, 0o444)  # Blobs are shared between runs: never edit in place
+        tmp_path.replace(path)
+        return digest, path.stat().st_size, True
+
+    def _unpack(self, digest: str, blob: Path) -> Path:
+        """Replace a compressed blob with its plain content, ready to link"""
+        if zstandard is None:
+            raise RuntimeError("zstandard is needed to read compressed archive blobs")
+        path = self._path(digest, False)
+        tmp_path = path.with_name(path.name + ".tmp")
+        with open(blob, "rb") as src, open(tmp_path, "wb") as dst:
+            zstandard.ZstdDecompressor().copy_stream(src, dst)
+        os.chmod(tmp_path, 0o444)
+        tmp_path.replace(path)
+        blob.unlink()
+        return path
+
+    def materialize(self, digest: str, dest: Path) -> str:
+        """Place the blob's content at dest; returns how it was placed"""
+        blob = self.locate(digest)
+        if blob is None:
+            raise FileNotFoundError(f"Blob {digest} is missing from {self.root}")
+        if blob.suffix == ".zst":
+            blob = self._unpack(digest, blob)
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        if dest.exists():
+            dest.unlink()
+        return _clone_or_copy(blob, dest)
+
+    def compress_unlinked(self) -> Tuple[int, int]:
+        """Compress the plain blobs no run directory links to; returns (blobs, bytes saved)"""
+        if not self.compress:
+            return 0, 0
+        count, saved = 0, 0
+        for path in self.root.glob("*/*"):
+            if path.suffix or path.stat().st_nlink > 1:
+                continue
+            packed = self._path(path.name, True)
+            tmp_path = packed.with_name(packed.name + ".tmp")
+            with open(path, "rb") as src, open(tmp_path, "wb") as dst:
+                zstandard.ZstdCompressor(level=10).copy_stream(src, dst)
+            os.chmod(tmp_path, 0o444)
+            tmp_path.replace(packed)
+            saved += path.stat().st_size - packed.stat().st_size
+            path.unlink()
+            count += 1
+        return count, saved
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_name TEXT PRIMARY KEY,
+    timestamp TEXT,
+    notes TEXT,
+    archive_path TEXT,
+    metadata TEXT
+);
+CREATE TABLE IF NOT EXISTS run_files (
+    run_name TEXT REFERENCES runs(run_name) ON DELETE CASCADE,
+    name TEXT,
+    source TEXT,
+    digest TEXT,
+    size INTEGER,
+    PRIMARY KEY (run_name, name)
+);
+CREATE TABLE IF NOT EXISTS run_metrics (
+    run_name TEXT REFERENCES runs(run_name) ON DELETE CASCADE,
+    metric TEXT,
+    value REAL,
+    PRIMARY KEY (run_name, metric)
+);
+CREATE INDEX IF NOT EXISTS idx_runs_timestamp ON runs(timestamp);
+CREATE INDEX IF NOT EXISTS idx_run_files_digest ON run_files(digest);
+CREATE INDEX IF NOT EXISTS idx_run_metrics_metric ON run_metrics(metric, value);
+"""
+
+
+def numeric_metrics(stats: Optional[Dict[str, Any]]) -> Dict[str, float]:
+    """Flatten the numeric (and boolean) entries of a stats dict"""
+    metrics = {}
+    for key, value in (stats or {}).items():
+        if isinstance(value, (bool, int, float)):
+            metrics[key] = float(value)
+    return metrics
+
+
+class RunCatalog:
+    """SQLite index of archived runs, their files and metrics"""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA foreign_keys = ON")
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.executescript(SCHEMA)
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def __contains__(self, run_name: str) -> bool:
+        with self._lock:
+            return self._conn.execute("SELECT 1 FROM runs WHERE run_name = ?", (run_name,)).fetchone() is not None
+
+    def record_run(self, metadata: Dict[str, Any], files: Iterable[Dict[str, Any]],
+                   metrics: Dict[str, float]) -> None:
+        """Insert or replace a run with its files and metrics"""
+        run_name = metadata["run_name"]
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM runs WHERE run_name = ?", (run_name,))
+            self._conn.execute(
+                "INSERT INTO runs (run_name, timestamp, notes, archive_path, metadata) VALUES (?, ?, ?, ?, ?)",
+                (run_name, metadata.get("timestamp"), metadata.get("notes", ""),
+                 metadata.get("archive_path"), json.dumps(metadata)),
+            )
+            self._conn.executemany(
+                "INSERT INTO run_files (run_name, name, source, digest, size) VALUES (?, ?, ?, ?, ?)",
+                [(run_name, f["name"], f.get("source"), f["digest"], f.get("size")) for f in files],
+            )
+            self._conn.executemany(
+                "INSERT INTO run_metrics (run_name, metric, value) VALUES (?, ?, ?)",
+                [(run_name, metric, value) for metric, value in metrics.items()],
+            )
+
+    def set_metrics(self, run_name: str, metrics: Dict[str, float]) -> None:
+        """Add or update metrics for an existing run"""
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO run_metrics (run_name, metric, value) VALUES (?, ?, ?)",
+                [(run_name, metric, value) for metric, value in metrics.items()],
+            )
+
+    def metrics(self, run_name: str) -> Dict[str, float]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT metric, value FROM run_metrics WHERE run_name = ?", (run_name,)
+            ).fetchall()
+        return {row["metric"]: row["value"] for row in rows}
+
+    def files(self, run_name: str) -> List[Dict[str, Any]]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT name, source, digest, size FROM run_files WHERE run_name = ? ORDER BY name", (run_name,)
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def list_runs(self, filters: Optional[Dict[str, Tuple[str, float]]] = None,
+                  notes_like: Optional[str] = None, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Runs newest first, optionally filtered as {metric: (op, value)} and by notes"""
+        clauses, params = [], []
+        for metric, (op, value) in (filters or {}).items():
+            if op not in ("<", "<=", "=", ">=", ">", "!="):
+                raise ValueError(f"Unsupported comparison: {op}")
+            clauses.append(
+                f"run_name IN (SELECT run_name FROM run_metrics WHERE metric = ? AND value {op} ?)"
+            )
+            params.extend([metric, value])
+        if notes_like:
+            clauses.append("notes LIKE ?")
+            params.append(f"%{notes_like}%")
+
+        sql = "SELECT run_name, timestamp, notes, archive_path FROM runs"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY timestamp DESC"
+        if limit:
+            sql += " LIMIT ?"
+            params.append(limit)
+
+        with self._lock:
+            runs = [dict(row) for row in self._conn.execute(sql, params).fetchall()]
+        for run in runs:
+            run["metrics"] = self.metrics(run["run_name"])
+        return runs
+
+    def compare(self, run_a: str, run_b: str) -> Dict[str, Dict[str, Optional[float]]]:
+        """Metric-by-metric comparison of two runs (b minus a)"""
+        metrics_a, metrics_b = self.metrics(run_a), self.metrics(run_b)
+        comparison = {}
+        for metric in sorted(set(metrics_a) | set(metrics_b)):
+            a, b = metrics_a.get(metric), metrics_b.get(metric)
+            comparison[metric] = {"a": a, "b": b, "change": b - a if a is not None and b is not None else None}
+        return comparison
+
+    def storage_summary(self) -> Dict[str, int]:
+        """Logical bytes across runs versus bytes of distinct content"""
+        with self._lock:
+            logical = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM run_files").fetchone()[0]
+            distinct = self._conn.execute(
+                "SELECT COALESCE(SUM(size), 0) FROM (SELECT digest, MAX(size) AS size FROM run_files GROUP BY digest)"
+            ).fetchone()[0]
+        return {"logical_bytes": logical, "distinct_bytes": distinct}
@@ -0,0 +1,314 @@
+# src/utils/run_metrics.py
+"""
+Fixed metric vectors for pipeline runs, and comparisons between runs.
+
+``extract_run_metrics`` reads a run's output directory (a live
+``outputs/`` or an archived run) and returns numeric metrics: paper and
+per-section word counts, citation and hedging density, critic assessment
+counts and per-history trajectories, refinement cycles, API tokens and
+latency (from ``api_usage.jsonl``) and phase durations. Vectors are cached
+per run and only recomputed when one of the run's files changes, so
+``compare_runs`` over many runs is a single fast pass.
+
+``APIHandler.make_api_call`` appends one line per call to the current
+run's ``api_usage.jsonl`` via ``record_api_call``. A new run empties the
+log with ``start_usage_log``, and standalone tools log to their own file
+under ``outputs/tool_usage/``, so a run's file holds only that run's calls.
+"""
+
+import hashlib
+import json
+import re
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+
+METRICS_VERSION = 1
+API_USAGE_FILE = "api_usage.jsonl"
+DEFAULT_CACHE_DIR = Path("outputs/.run_metrics_cache")
+
+ASSESSMENT_LEVELS = ("MAJOR_REVISION", "MINOR_REFINEMENT", "MINIMAL_CHANGES")
+HEDGING_PHRASES = ("might", "perhaps", "arguably", "seems", "appears", "suggests", "could be", "may be", "possibly")
+PAPER_CANDIDATES = ("final_paper.md", "phase_3_1_draft.md")
+
+# Direction in which a metric gets better, for flagging regressions
+BETTER_WHEN = {
+    "api_calls": "lower",
+    "api_tokens": "lower",
+    "api_seconds": "lower",
+    "duration_total": "lower",
+    "cycles_total": "lower",
+    "assessments_major": "lower",
+    "assessments_minimal": "higher",
+    "hedges_per_1000_words": "lower",
+    "citations_per_1000_words": "higher",
+}
+
+# Parenthetical containing a year: "(Pritchard 2005)", "Quine (1951)", "(see Chalmers and Jackson 2001, p. 3)"
+_CITATION = re.compile(r"\([^()]*?\b(?:1[89]\d{2}|20\d{2})[a-z]?\b[^()]*\)")
+_SECTION_HEADING = re.compile(r"^##\s+(.+?)\s*$", re.MULTILINE)
+
+_usage_log: ContextVar[Path] = ContextVar("api_usage_log", default=Path("./outputs") / API_USAGE_FILE)
+_usage_lock = threading.Lock()
+
+
+@contextmanager
+def usage_log(path: Path) -> Iterator[Path]:
+    """Send API usage records to another file (batch mode: one per paper)"""
+    token = _usage_log.set(Path(path))
+    try:
+        yield Path(path)
+    finally:
+        _usage_log.reset(token)
+
+
+def start_usage_log() -> Path:
+    """Empty the current usage log at the start of a new run"""
+    path = _usage_log.get()
+    with _usage_lock:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text("", encoding="utf-8")
+    return path
+
+
+@contextmanager
+def tool_usage_log(tool: str) -> Iterator[Path]:
+    """Log a standalone tool's API calls apart from the pipeline run's usage log"""
+    with usage_log(Path("./outputs") / "tool_usage" / f"{tool}.jsonl") as path:
+        yield path
+
+
+def record_api_call(stage: str, model: Optional[str], prompt_tokens: int, response_tokens: int,
+                    seconds: float, cached: bool = False) -> None:
+    """Append one API call to the current run's usage log"""
+    path = _usage_log.get()
+    record = {
+        "time": time.time(),
+        "stage": stage,
+        "model": model,
+        "prompt_tokens": prompt_tokens,
+        "response_tokens": response_tokens,
+        "seconds": round(seconds, 3),
+        "cached": cached,
+    }
+    try:
+        with _usage_lock:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with open(path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(record) + "\n")
+    except OSError:
+        pass  # Usage logging must never break an API call
+
+
+def _slug(title: str) -> str:
+    return re.sub(r"[^a-z0-9]+", "_", title.lower()).strip("_")[:40]
+
+
+def paper_text_metrics(content: str) -> Dict[str, Any]:
+    """Statistics of a paper in markdown"""
+    words = len(content.split())
+    citations = len(_CITATION.findall(content))
+    lower = content.lower()
+    hedges = sum(lower.count(phrase) for phrase in HEDGING_PHRASES)
+    stats: Dict[str, Any] = {
+        "word_count": words,
+        "citation_count": citations,
+        "citations_per_1000_words": round(1000 * citations / words, 2) if words else 0.0,
+        "hedges_per_1000_words": round(1000 * hedges / words, 2) if words else 0.0,
+        "quote_count": content.count('"') // 2,
+        "section_count": content.count("\n##") - content.count("\n###"),
+        "subsection_count": content.count("\n###"),
+        "has_abstract": "abstract" in lower,
+        "has_objections": "objection" in lower,
+        "references_count": content.count("\n- ") if "References" in content else 0,
+    }
+
+    # Words per top-level section
+    headings = list(_SECTION_HEADING.finditer(content))
+    for i, heading in enumerate(headings):
+        end = headings[i + 1].start() if i + 1 < len(headings) else len(content)
+        body = content[heading.end():end]
+        stats[f"section_words.{i + 1:02d}_{_slug(heading.group(1))}"] = len(body.split())
+    return stats
+
+
+def _assessments(node: Any) -> List[str]:
+    """Critic assessment levels found anywhere in a JSON document, in order"""
+    found: List[str] = []
+    if isinstance(node, dict):
+        for key, value in node.items():
+            if key in ("summary_assessment", "assessment_level") and value in ASSESSMENT_LEVELS:
+                found.append(value)
+                continue
+            found.extend(_assessments(value))
+    elif isinstance(node, list):
+        for item in node:
+            found.extend(_assessments(item))
+    return found
+
+
+def _cycle_counts(node: Any) -> List[int]:
+    """Lengths of every "cycles" list in a history document"""
+    counts: List[int] = []
+    if isinstance(node, dict):
+        for key, value in node.items():
+            if key == "cycles" and isinstance(value, list):
+                counts.append(len(value))
+            counts.extend(_cycle_counts(value))
+    elif isinstance(node, list):
+        for item in node:
+            counts.extend(_cycle_counts(item))
+    return counts
+
+
+def _run_files(run_dir: Path) -> List[Path]:
+    return sorted(
+        path for path in run_dir.rglob("*")
+        if path.is_file() and path.suffix in (".json", ".jsonl", ".md") and ".run_metrics_cache" not in path.parts
+        and "archive" not in path.relative_to(run_dir).parts[:1] and "papers" not in path.relative_to(run_dir).parts[:1]
+    )
+
+
+def _fingerprint(files: Sequence[Path], run_dir: Path) -> str:
+    digest = hashlib.sha256(f"v{METRICS_VERSION}".encode())
+    for path in files:
+        stat = path.stat()
+        digest.update(f"{path.relative_to(run_dir)}:{stat.st_size}:{stat.st_mtime_ns}\n".encode())
+    return digest.hexdigest()
+
+
+def _usage_records(path: Path) -> Iterator[Dict[str, Any]]:
+    for line in path.read_text(encoding="utf-8", errors="replace").splitlines():
+        if not line.strip():
+            continue
+        try:
+            yield json.loads(line)
+        except json.JSONDecodeError:
+            continue  # A line cut short by an interrupted run
+
+
+def compute_run_metrics(run_dir: Path, files: Optional[Sequence[Path]] = None) -> Dict[str, Any]:
+    """Metric vector of one run, computed from its files"""
+    run_dir = Path(run_dir)
+    files = list(files) if files is not None else _run_files(run_dir)
+    metrics: Dict[str, float] = {}
+    trajectories: Dict[str, List[str]] = {}
+
+    for name in PAPER_CANDIDATES:
+        if (run_dir / name).exists():
+            for key, value in paper_text_metrics((run_dir / name).read_text(encoding="utf-8")).items():
+                metrics[key] = float(value)
+            break
+
+    cycle_counts: List[int] = []
+    for path in files:
+        if path.name == API_USAGE_FILE:
+            calls = list(_usage_records(path))
+            metrics["api_calls"] = float(sum(1 for call in calls if not call.get("cached")))
+            metrics["api_cached_calls"] = float(sum(1 for call in calls if call.get("cached")))
+            metrics["api_tokens"] = float(sum(call.get("prompt_tokens", 0) + call.get("response_tokens", 0)
+                                              for call in calls))
+            metrics["api_seconds"] = round(sum(call.get("seconds", 0.0) for call in calls), 1)
+            continue
+        if path.suffix != ".json":
+            continue
+        try:
+            with open(path, encoding="utf-8") as f:
+                document = json.load(f)
+        except (json.JSONDecodeError, UnicodeDecodeError):
+            continue
+
+        if path.name == "batch_status.json":
+            durations = document.get("phase_durations", {})
+            for phase, seconds in durations.items():
+                metrics[f"duration.phase_{phase}"] = float(seconds)
+            metrics["duration_total"] = float(sum(durations.values()))
+            continue
+
+        levels = _assessments(document)
+        if levels:
+            trajectories[str(path.relative_to(run_dir))] = levels
+        if "history" in path.stem:
+            cycle_counts.extend(_cycle_counts(document))
+
+    all_levels = [level for levels in trajectories.values() for level in levels]
+    if all_levels:
+        metrics["assessments_total"] = float(len(all_levels))
+        metrics["assessments_major"] = float(all_levels.count("MAJOR_REVISION"))
+        metrics["assessments_minor"] = float(all_levels.count("MINOR_REFINEMENT"))
+        metrics["assessments_minimal"] = float(all_levels.count("MINIMAL_CHANGES"))
+    if cycle_counts:
+        metrics["cycles_total"] = float(sum(cycle_counts))
+        metrics["cycles_max"] = float(max(cycle_counts))
+        metrics["cycles_mean"] = round(sum(cycle_counts) / len(cycle_counts), 2)
+
+    return {"run": str(run_dir), "metrics": metrics, "trajectories": trajectories}
+
+
+def extract_run_metrics(run_dir: Path, cache_dir: Optional[Path] = DEFAULT_CACHE_DIR) -> Dict[str, Any]:
+    """Metric vector of a run, reusing the cached vector if no file changed"""
+    run_dir = Path(run_dir)
+    files = _run_files(run_dir)
+    fingerprint = _fingerprint(files, run_dir)
+
+    cache_file = None
+    if cache_dir is not None:
+        key = hashlib.sha256(str(run_dir.resolve()).encode()).hexdigest()[:16]
+        cache_file = Path(cache_dir) / f"{key}.json"
+        if cache_file.exists():
+            with open(cache_file, encoding="utf-8") as f:
+                cached = json.load(f)
+            if cached.get("fingerprint") == fingerprint:
+                return cached["vector"]
+
+    vector = compute_run_metrics(run_dir, files)
+    if cache_file is not None:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = cache_file.with_name(cache_file.name + ".tmp")
+        with open(tmp_file, "w", encoding="utf-8") as f:
+            json.dump({"fingerprint": fingerprint, "vector": vector}, f)
+        tmp_file.replace(cache_file)
+    return vector
+
+
+def compare_runs(run_dirs: Sequence[Path], cache_dir: Optional[Path] = DEFAULT_CACHE_DIR,
+                 tolerance: float = 0.1) -> Dict[str, Any]:
+    """Side-by-side metrics of several runs against the first (the baseline)
+
+    A metric is flagged as a regression when it moves more than
+    ``tolerance`` (relative) in its worse direction per ``BETTER_WHEN``.
+    """
+    vectors = [extract_run_metrics(Path(run_dir), cache_dir) for run_dir in run_dirs]
+    names = sorted({metric for vector in vectors for metric in vector["metrics"]})
+    rows = []
+    for metric in names:
+        values = [vector["metrics"].get(metric) for vector in vectors]
+        baseline = values[0]
+        regressions = []
+        for value in values[1:]:
+            regressed = False
+            direction = BETTER_WHEN.get(metric)
+            if direction and baseline is not None and value is not None:
+                change = (value - baseline) / abs(baseline) if baseline else (1.0 if value else 0.0)
+                regressed = change > tolerance if direction == "lower" else change < -tolerance
+            regressions.append(regressed)
+        rows.append({"metric": metric, "values": values, "regressions": regressions})
+    return {"runs": [vector["run"] for vector in vectors], "rows": rows,
+            "trajectories": [vector["trajectories"] for vector in vectors]}
+
+
+def format_comparison(comparison: Dict[str, Any]) -> str:
+    """Markdown table of a comparison; regressions are marked with ⚠️"""
+    runs = comparison["runs"]
+    lines = ["| metric | " + " | ".join(Path(run).name or run for run in runs) + " |",
+             "|---" * (len(runs) + 1) + "|"]
+    for row in comparison["rows"]:
+        cells = ["—" if row["values"][0] is None else f"{row['values'][0]:g}"]
+        for value, regressed in zip(row["values"][1:], row["regressions"]):
+            cell = "—" if value is None else f"{value:g}"
+            cells.append(f"{cell} ⚠️" if regressed else cell)
+        lines.append(f"| {row['metric']} | " + " | ".join(cells) + " |")
+    return "\n".join(lines)
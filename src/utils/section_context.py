@@ -0,0 +1,124 @@
+# src/utils/section_context.py
+"""
+Per-section slices of the Phase III content bank.
+
+Phase II.6 maps each outline section to the developed arguments and
+example sets it draws on (``map_sections_to_content``). Phase III prompts
+then embed only those in full, plus a one-line summary of every other
+argument (``section_content_bank``), instead of the whole content bank
+for every section's writer, critic and refiner calls.
+
+A section is mapped to an argument when its outline guidance names the
+move explicitly ("Key Move 2") or shares enough content words with the
+move's statement. Argumentative sections with no match fall back to
+their best-scoring argument; introductions and conclusions can rely on
+the summaries alone.
+"""
+
+import re
+from typing import Any, Dict, List, Optional
+
+from src.utils.style_digests import classify_section
+
+MATCH_THRESHOLD = 0.3
+MAX_ARGUMENTS_PER_SECTION = 3
+SUMMARY_WORDS = 40
+
+_MOVE_REFERENCE = re.compile(r"\b(?:key\s+)?move\s*#?\s*(\d+)\b", re.IGNORECASE)
+_WORD = re.compile(r"[a-z][a-z'-]{2,}")
+_STOPWORDS = frozenset("""
+    the and that this with from for are not but its into than then they them their there these those
+    which what when where while will would could should can may might must been being have has had
+    does did doing such also only more most other some any each both very just about over under
+    between because however thus hence argue argues argument arguments section move moves show shows
+""".split())
+
+
+def content_words(text: str) -> set:
+    return {word for word in _WORD.findall(text.lower()) if word not in _STOPWORDS}
+
+
+def _relevance(section_words: set, move_text: str) -> float:
+    """Share of the move's content words that the section mentions"""
+    move_words = content_words(move_text)
+    if not move_words:
+        return 0.0
+    return len(section_words & move_words) / len(move_words)
+
+
+def map_sections_to_content(sections: List[Dict[str, Any]], content_bank: Dict[str, Any],
+                            threshold: float = MATCH_THRESHOLD,
+                            max_arguments: int = MAX_ARGUMENTS_PER_SECTION) -> List[Dict[str, List[int]]]:
+    """For each section, the move indices of the arguments and examples it should see in full"""
+    arguments = content_bank.get("arguments", [])
+    example_moves = {example.get("move_index") for example in content_bank.get("examples", [])}
+    known_moves = {argument.get("move_index") for argument in arguments}
+
+    content_map = []
+    for index, section in enumerate(sections):
+        guidance = f"{section.get('section_name', '')}\n{section.get('content_guidance', '')}"
+        words = content_words(guidance)
+
+        explicit = [int(number) - 1 for number in _MOVE_REFERENCE.findall(guidance)]
+        selected = [move for move in dict.fromkeys(explicit) if move in known_moves]
+
+        scored = sorted(
+            ((_relevance(words, argument.get("move_text", "")), argument.get("move_index")) for argument in arguments),
+            key=lambda pair: -pair[0],
+        )
+        for score, move in scored:
+            if len(selected) >= max_arguments:
+                break
+            if score >= threshold and move not in selected:
+                selected.append(move)
+
+        section_type = classify_section(section.get("section_name", ""), index, len(sections))
+        if not selected and section_type in ("argument", "objection") and scored and scored[0][0] > 0:
+            selected.append(scored[0][1])
+
+        content_map.append({
+            "arguments": selected,
+            "examples": [move for move in selected if move in example_moves],
+        })
+    return content_map
+
+
+def summarize_argument(argument: Dict[str, Any], words: int = SUMMARY_WORDS) -> str:
+    """One line per argument: its statement, or the opening of its content"""
+    text = argument.get("move_text") or argument.get("content", "")
+    tokens = " ".join(str(text).split()).split(" ")
+    summary = " ".join(tokens[:words])
+    return summary + ("..." if len(tokens) > words else "")
+
+
+def section_content_bank(writing_context: Dict[str, Any], section_index: int) -> Dict[str, Any]:
+    """The part of the content bank one section's prompts should carry
+
+    Uses the map stored by Phase II.6 and computes it on the fly for
+    writing contexts created before the map existed.
+    """
+    content_bank = writing_context["content_bank"]
+    content_map: Optional[List[Dict[str, List[int]]]] = writing_context.get("section_content_map")
+    if not content_map or len(content_map) != len(writing_context["sections"]):
+        content_map = map_sections_to_content(writing_context["sections"], content_bank)
+    mapped = content_map[section_index]
+
+    arguments = [arg for arg in content_bank.get("arguments", []) if arg.get("move_index") in mapped["arguments"]]
+    examples = [ex for ex in content_bank.get("examples", []) if ex.get("move_index") in mapped["examples"]]
+    other_arguments = [
+        f"Move {arg.get('move_index', 0) + 1}: {summarize_argument(arg)}"
+        for arg in content_bank.get("arguments", []) if arg.get("move_index") not in mapped["arguments"]
+    ]
+    return {
+        "arguments": arguments,
+        "examples": examples,
+        "citations": content_bank.get("citations", []),
+        "other_arguments": other_arguments,
+    }
+
+
+def format_other_arguments(bank: Dict[str, Any]) -> str:
+    """Summaries of the arguments other sections develop in full"""
+    if not bank["other_arguments"]:
+        return "None (all developed arguments are given in full above)"
+    return "\n".join(f"- {line}" for line in bank["other_arguments"])
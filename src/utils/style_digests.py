@@ -0,0 +1,236 @@
+# src/utils/style_digests.py
+"""
+Compact Analysis style digests.
+
+``build_style_digests.py`` distills the extracted Analysis papers
+(``analysis_cache/extracted_texts``) into short, categorized snippets:
+opening hooks, transitions, objection handling, example usage and
+conclusions. Prompts then include only the few snippets relevant to the
+section being written instead of attaching whole Analysis PDFs.
+"""
+
+import json
+import random
+import re
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from src.utils.analysis_pdf_utils import analysis_integrator
+from src.utils.prompt_budget import count_tokens
+
+DEFAULT_DIGEST_PATH = Path("./analysis_cache/style_digests.json")
+DIGEST_VERSION = 1
+
+CATEGORY_LABELS = {
+    "opening_hooks": "OPENING HOOKS",
+    "transitions": "TRANSITIONS AND SIGNPOSTING",
+    "objection_handling": "OBJECTION HANDLING",
+    "example_usage": "EXAMPLE USAGE",
+    "conclusions": "CLOSING MOVES",
+}
+
+# How many snippets of each category a section type gets
+SECTION_TYPE_CATEGORIES = {
+    "introduction": {"opening_hooks": 2, "example_usage": 1, "transitions": 1},
+    "argument": {"example_usage": 2, "transitions": 1, "objection_handling": 1},
+    "objection": {"objection_handling": 2, "transitions": 1, "example_usage": 1},
+    "conclusion": {"conclusions": 2, "transitions": 1},
+    "outline": {"opening_hooks": 1, "transitions": 1, "objection_handling": 1, "example_usage": 1},
+    "full_paper": {"opening_hooks": 1, "transitions": 1, "objection_handling": 1, "example_usage": 1, "conclusions": 1},
+}
+
+TRANSITION_PATTERN = re.compile(
+    r"^(However|But|So|Thus|Hence|Still|Now|This suggests|It follows|In this section|"
+    r"I will|Let me|To see why|Here is why|The upshot|Notice that)\b"
+)
+OBJECTION_PATTERN = re.compile(
+    r"\b(one might (object|worry|think|reply)|it might be (objected|thought)|an objector|"
+    r"the objection|in reply|in response|my reply|I respond)\b",
+    re.IGNORECASE,
+)
+EXAMPLE_PATTERN = re.compile(r"^(Consider|Suppose|Imagine|Take|For example|For instance)\b")
+CONCLUSION_PATTERN = re.compile(r"^(#+\s*)?(\d+\.?\s*)?(Conclusion|Concluding)", re.IGNORECASE)
+NOISE_PATTERN = re.compile(r"(doi:|Analysis Vol|©|https?://|Downloaded from)", re.IGNORECASE)
+
+SENTENCE_SPLIT = re.compile(r"(?<=[.!?])\s+(?=[A-Z\"'(])")
+
+
+def _paragraphs(text: str) -> List[str]:
+    paragraphs = [" ".join(p.split()) for p in re.split(r"\n\s*\n", text)]
+    return [p for p in paragraphs if len(p.split()) >= 25 and not NOISE_PATTERN.search(p)]
+
+
+def _clip(text: str, max_words: int) -> str:
+    """Cut a paragraph to whole sentences within max_words"""
+    words = text.split()
+    if len(words) <= max_words:
+        return text
+    kept, count = [], 0
+    for sentence in SENTENCE_SPLIT.split(text):
+        sentence_words = len(sentence.split())
+        if kept and count + sentence_words > max_words:
+            break
+        kept.append(sentence)
+        count += sentence_words
+    clipped = " ".join(kept)
+    return clipped if len(clipped.split()) <= max_words else " ".join(words[:max_words]) + " ..."
+
+
+def distill_paper(text: str, source: str, max_words: int = 90, per_category: int = 2) -> Dict[str, List[Dict[str, str]]]:
+    """Pick representative snippets from one paper's extracted text"""
+    paragraphs = _paragraphs(text)
+    digest: Dict[str, List[Dict[str, str]]] = {category: [] for category in CATEGORY_LABELS}
+    if not paragraphs:
+        return digest
+
+    def add(category: str, paragraph: str) -> None:
+        if len(digest[category]) < per_category:
+            digest[category].append({"source": source, "text": _clip(paragraph, max_words)})
+
+    # The abstract is usually the first long paragraph; the hook follows it
+    opening = paragraphs[1:3] if len(paragraphs) > 3 else paragraphs[:1]
+    for paragraph in opening:
+        add("opening_hooks", paragraph)
+
+    lines = text.splitlines()
+    conclusion_start = next(
+        (i for i, line in enumerate(lines) if CONCLUSION_PATTERN.match(line.strip())), None
+    )
+    if conclusion_start is not None:
+        for paragraph in _paragraphs("\n".join(lines[conclusion_start + 1:]))[:per_category]:
+            add("conclusions", paragraph)
+    elif len(paragraphs) > 4:
+        add("conclusions", paragraphs[-1])
+
+    for paragraph in paragraphs[1:]:
+        if OBJECTION_PATTERN.search(paragraph):
+            add("objection_handling", paragraph)
+        elif EXAMPLE_PATTERN.match(paragraph):
+            add("example_usage", paragraph)
+        elif TRANSITION_PATTERN.match(paragraph):
+            add("transitions", paragraph)
+    return digest
+
+
+def build_digest_store(texts: Dict[str, str], max_words: int = 90, per_category: int = 2) -> Dict[str, Any]:
+    """Distill every paper and index the snippets by category"""
+    categories: Dict[str, List[Dict[str, str]]] = {category: [] for category in CATEGORY_LABELS}
+    for source in sorted(texts):
+        for category, snippets in distill_paper(texts[source], source, max_words, per_category).items():
+            categories[category].extend(snippets)
+    return {
+        "version": DIGEST_VERSION,
+        "papers": sorted(texts),
+        "categories": categories,
+    }
+
+
+def classify_section(section_name: str, section_index: int = 0, total_sections: int = 0) -> str:
+    """Map a section to a digest section type"""
+    name = section_name.lower()
+    if "introduc" in name or (section_index == 0 and total_sections > 1):
+        return "introduction"
+    if "conclu" in name or (total_sections > 1 and section_index == total_sections - 1):
+        return "conclusion"
+    if any(word in name for word in ("objection", "reply", "replies", "response", "worry")):
+        return "objection"
+    return "argument"
+
+
+class StyleDigestStore:
+    """Categorized Analysis snippets with section-aware selection"""
+
+    def __init__(self, data: Dict[str, Any]):
+        self.categories: Dict[str, List[Dict[str, str]]] = data.get("categories", {})
+        self.papers: List[str] = data.get("papers", [])
+
+    def __bool__(self) -> bool:
+        return any(self.categories.values())
+
+    def select(self, section_type: str, rng: Optional[random.Random] = None) -> Dict[str, List[Dict[str, str]]]:
+        """Pick snippets for a section type, drawing from different papers where possible
+
+        Without an explicit rng the draw is seeded per run and section type
+        (like the Analysis exemplars), so every prompt for that section type
+        in a run gets the same snippets and a run can be reproduced.
+        """
+        rng = rng or analysis_integrator.rng_for(f"style_digests:{section_type}")
+        quotas = SECTION_TYPE_CATEGORIES.get(section_type, SECTION_TYPE_CATEGORIES["argument"])
+        selected = {}
+        for category, count in quotas.items():
+            pool = self.categories.get(category, [])
+            if not pool:
+                continue
+            chosen, sources = [], set()
+            for snippet in rng.sample(pool, len(pool)):
+                if snippet["source"] in sources and len(sources) < len({s["source"] for s in pool}):
+                    continue
+                chosen.append(snippet)
+                sources.add(snippet["source"])
+                if len(chosen) == count:
+                    break
+            selected[category] = chosen
+        return selected
+
+    def format_for(self, section_type: str, max_tokens: int = 1200, rng: Optional[random.Random] = None) -> str:
+        """Render selected snippets as a prompt block within max_tokens"""
+        selected = self.select(section_type, rng)
+        if not selected:
+            return ""
+
+        header = (
+            "=== ANALYSIS JOURNAL STYLE DIGEST ===\n"
+            "Short excerpts from published Analysis papers, chosen for this kind of section.\n"
+            "Match their voice and moves; do not copy their content."
+        )
+        footer = "=== END DIGEST ==="
+        blocks, used = [], count_tokens(header) + count_tokens(footer)
+        for category, snippets in selected.items():
+            lines = [f"{CATEGORY_LABELS[category]}:"]
+            for snippet in snippets:
+                line = f'- "{snippet["text"]}" ({snippet["source"]})'
+                if used + count_tokens(line) > max_tokens:
+                    break
+                lines.append(line)
+                used += count_tokens(line)
+            if len(lines) > 1:
+                blocks.append("\n".join(lines))
+        if not blocks:
+            return ""
+        return "\n\n".join([header] + blocks + [footer])
+
+
+@lru_cache(maxsize=8)
+def _load_store(path: str, mtime: float) -> StyleDigestStore:
+    with open(path, "r", encoding="utf-8") as f:
+        return StyleDigestStore(json.load(f))
+
+
+def digest_settings(config: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """Read the style digest settings from the pipeline config"""
+    settings = {"enabled": True, "path": str(DEFAULT_DIGEST_PATH), "max_tokens": 1200}
+    settings.update((config or {}).get("parameters", {}).get("style_digests", {}))
+    return settings
+
+
+def load_style_digests(config: Optional[Dict[str, Any]] = None) -> Optional[StyleDigestStore]:
+    """Load the digest store, or None when disabled or not yet built"""
+    settings = digest_settings(config)
+    path = Path(settings["path"])
+    if not settings["enabled"] or not path.exists():
+        return None
+    try:
+        store = _load_store(str(path), path.stat().st_mtime)
+    except (OSError, json.JSONDecodeError) as e:
+        print(f"⚠️ Could not load style digests from {path}: {e}")
+        return None
+    return store or None
+
+
+def style_digest_block(config: Optional[Dict[str, Any]], section_type: str) -> str:
+    """Prompt block of style snippets for a section type ("" if no digests)"""
+    store = load_style_digests(config)
+    if store is None:
+        return ""
+    return store.format_for(section_type, max_tokens=digest_settings(config)["max_tokens"])
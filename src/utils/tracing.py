@@ -0,0 +1,182 @@
+# src/utils/tracing.py
+"""
+Nested timing spans for pipeline runs, exported as Chrome trace-event JSON.
+
+``span(name, cat, **args)`` times a block. Spans opened inside it are its
+children, including those in pool threads that run in a copy of the
+caller's context (``map_bounded``, ``SpeculativeStart``); other workers can name their parent
+explicitly with ``parent=``. The hierarchy is run → phase → workflow →
+cycle → step → API call / retry / JSON repair / file I/O. ``trace_run``
+starts a tracer for a run when tracing is enabled (``PIPELINE_TRACE=1``)
+and writes the trace when the run ends. The file opens in Perfetto
+(ui.perfetto.dev) or chrome://tracing. With tracing disabled, ``span``
+only reads a context variable and yields.
+
+``critical_path`` walks a written trace from the root span, always
+following the child that finishes last. The result is the chain of spans
+that determined the run's wall-clock time.
+"""
+
+import itertools
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+TRACE_ENV = "PIPELINE_TRACE"
+
+# Innermost open span; copied contexts (map_bounded) carry it into pool threads
+_current_span: ContextVar[Optional[int]] = ContextVar("current_span", default=None)
+
+
+class Tracer:
+    """Collects complete ("X") and instant ("i") trace events from any thread"""
+
+    def __init__(self):
+        self.events: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self._threads: Dict[int, str] = {}
+        self._epoch_ns = time.perf_counter_ns()
+        self.pid = os.getpid()
+
+    def _now_us(self) -> float:
+        return (time.perf_counter_ns() - self._epoch_ns) / 1000
+
+    def current(self) -> Optional[int]:
+        """Id of the innermost open span in this context"""
+        return _current_span.get()
+
+    def _thread(self) -> int:
+        thread = threading.current_thread()
+        if thread.ident not in self._threads:
+            with self._lock:
+                self._threads[thread.ident] = thread.name
+        return thread.ident
+
+    @contextmanager
+    def span(self, name: str, cat: str, parent: Optional[int], args: Dict[str, Any]) -> Iterator[int]:
+        span_id = next(self._ids)
+        parent = parent if parent is not None else self.current()
+        token = _current_span.set(span_id)
+        start = self._now_us()
+        error = None
+        try:
+            yield span_id
+        except BaseException as e:
+            error = type(e).__name__
+            raise
+        finally:
+            _current_span.reset(token)
+            event_args = dict(args, id=span_id, parent=parent)
+            if error:
+                event_args["error"] = error
+            event = {"name": name, "cat": cat, "ph": "X", "ts": start, "dur": self._now_us() - start,
+                     "pid": self.pid, "tid": self._thread(), "args": event_args}
+            with self._lock:
+                self.events.append(event)
+
+    def instant(self, name: str, cat: str, args: Dict[str, Any]) -> None:
+        event = {"name": name, "cat": cat, "ph": "i", "s": "t", "ts": self._now_us(), "pid": self.pid,
+                 "tid": self._thread(), "args": dict(args, parent=self.current())}
+        with self._lock:
+            self.events.append(event)
+
+    def to_chrome(self) -> Dict[str, Any]:
+        with self._lock:
+            events = sorted(self.events, key=lambda event: event["ts"])
+            names = [{"name": "thread_name", "ph": "M", "pid": self.pid, "tid": tid, "args": {"name": name}}
+                     for tid, name in self._threads.items()]
+        return {"traceEvents": names + events, "displayTimeUnit": "ms"}
+
+    def write(self, path: Path) -> Path:
+        from src.utils.artifacts import atomic_write_text  # Deferred: artifacts itself records spans
+
+        atomic_write_text(Path(path), json.dumps(self.to_chrome()))
+        return Path(path)
+
+
+# Each run's tracer; pool threads see it only when they run in a copied context
+_tracer: ContextVar[Optional[Tracer]] = ContextVar("tracer", default=None)
+
+
+def current_tracer() -> Optional[Tracer]:
+    return _tracer.get()
+
+
+def tracing_enabled() -> bool:
+    return os.getenv(TRACE_ENV, "").lower() in ("1", "true", "yes")
+
+
+@contextmanager
+def span(name: str, cat: str = "pipeline", parent: Optional[int] = None, **args: Any) -> Iterator[Optional[int]]:
+    """Time a block as a trace span; yields its id (None when tracing is off)"""
+    tracer = current_tracer()
+    if tracer is None:
+        yield None
+        return
+    with tracer.span(name, cat, parent, args) as span_id:
+        yield span_id
+
+
+def instant(name: str, cat: str = "pipeline", **args: Any) -> None:
+    """Record a point event (a retry, a cache hit) inside the current span"""
+    tracer = current_tracer()
+    if tracer is not None:
+        tracer.instant(name, cat, args)
+
+
+def current_span() -> Optional[int]:
+    """Id of the innermost open span, to pass as ``parent=`` to pool workers"""
+    tracer = current_tracer()
+    return tracer.current() if tracer else None
+
+
+@contextmanager
+def trace_run(name: str, path: Path, cat: str = "run", enabled: Optional[bool] = None, **args: Any) -> Iterator[Optional[int]]:
+    """A top-level span that also owns the tracer if none is active yet
+
+    If tracing is enabled and no tracer is active, a tracer is started
+    and the trace is written to ``path`` when the block exits, even if
+    the block fails. Inside an active trace, this is just a span.
+    """
+    if current_tracer() is not None or not (tracing_enabled() if enabled is None else enabled):
+        with span(name, cat, **args) as span_id:
+            yield span_id
+        return
+
+    tracer = Tracer()
+    token = _tracer.set(tracer)
+    try:
+        with span(name, cat, **args) as span_id:
+            yield span_id
+    finally:
+        _tracer.reset(token)
+        print(f"🧭 Trace written to {tracer.write(path)} (open in ui.perfetto.dev)")
+
+
+def critical_path(trace: Dict[str, Any]) -> List[Tuple[str, float]]:
+    """(span name, duration in ms) from the longest root span down its last-finishing children"""
+    spans = [event for event in trace.get("traceEvents", []) if event.get("ph") == "X"]
+    if not spans:
+        return []
+    children: Dict[Any, List[Dict[str, Any]]] = {}
+    for event in spans:
+        children.setdefault(event["args"].get("parent"), []).append(event)
+
+    node = max(children.get(None, spans), key=lambda event: event["dur"])
+    path = []
+    while node is not None:
+        path.append((node["name"], round(node["dur"] / 1000, 1)))
+        kids = children.get(node["args"]["id"], [])
+        node = max(kids, key=lambda event: event["ts"] + event["dur"]) if kids else None
+    return path
+
+
+def load_trace(path: Path) -> Dict[str, Any]:
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
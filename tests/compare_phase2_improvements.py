@@ -5,6 +5,8 @@ import json
 from pathlib import Path
 from typing import Dict, List, Any
 
+from src.utils.run_metrics import compare_runs, format_comparison
+
 
 def load_json_safe(path: Path) -> Dict:
     """Load JSON file safely"""
@@ -124,6 +126,9 @@ def main():
         print("Baseline archive not found")
         return
     
+    # Fixed metric vectors first (⚠️ marks a regression against the baseline)
+    print("\n" + format_comparison(compare_runs([baseline_path, enhanced_path])))
+    
     # Run analyses
     analyze_literature_synthesis(baseline_path, enhanced_path)
     analyze_quote_extraction()
@@ -0,0 +1,43 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from src.utils.analysis_pdf_utils import AnalysisPatternIntegrator
+
+
+def _papers(tmp_path, count=6):
+    for number in range(count):
+        (tmp_path / f"analysis_{number}.pdf").write_bytes(b"%PDF-1.4")
+    return tmp_path
+
+
+def test_each_phase_keeps_its_exemplars_for_the_run(tmp_path):
+    integrator = AnalysisPatternIntegrator(_papers(tmp_path), seed="7")
+    examples = integrator.get_analysis_exemplars_for_development("key moves development (examples)")
+    assert len(examples["pdf_paths"]) == 2
+
+    # Other phases, in any order, leave a phase's set and guidance alone
+    integrator.exemplars_for("key moves development (literature)")
+    integrator.exemplars_for("some unlisted phase")
+    again = integrator.get_analysis_exemplars_for_development("key moves development (examples)")
+    assert again == examples
+
+    # The seed, not the call order, fixes the assignment
+    fresh = AnalysisPatternIntegrator(tmp_path, seed="7")
+    assert fresh.exemplars_for("key moves development (examples)") == examples["pdf_paths"]
+
+
+def test_concurrent_callers_see_their_own_phase(tmp_path):
+    integrator = AnalysisPatternIntegrator(_papers(tmp_path), seed="7")
+    phases = ["key moves development (initial)", "key moves development (examples)",
+              "key moves development (literature)"] * 20
+    expected = {phase: AnalysisPatternIntegrator(tmp_path, seed="7").exemplars_for(phase) for phase in phases}
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(integrator.get_selected_papers, phases))
+    assert results == [expected[phase] for phase in phases]
+
+
+def test_missing_papers_fall_back_to_guidance(tmp_path):
+    integrator = AnalysisPatternIntegrator(tmp_path / "missing", seed="7")
+    exemplars = integrator.get_analysis_exemplars_for_development("content development")
+    assert not exemplars["available"] and exemplars["pdf_paths"] == []
+    assert "from memory" in integrator.enhance_prompt_with_analysis_patterns("Prompt", "content development")
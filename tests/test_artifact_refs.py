@@ -0,0 +1,32 @@
+import json
+import os
+
+import pytest
+
+from src.utils.artifact_refs import LazyArtifacts, StaleArtifactError, artifact_ref, load_json_cached, load_ref
+
+
+def test_refs_load_lazily_and_share_one_parse(tmp_path):
+    moves = tmp_path / "key_moves" / "all_developed_moves.json"
+    moves.parent.mkdir()
+    moves.write_text(json.dumps({"developed_moves": [{"key_move_index": 0}]}))
+
+    ref = artifact_ref(moves, tmp_path, key="developed_moves")
+    assert ref["path"] == "key_moves/all_developed_moves.json"
+
+    inputs = LazyArtifacts({"developed_moves": ref}, tmp_path)
+    assert inputs["developed_moves"] == [{"key_move_index": 0}]
+    assert inputs["developed_moves"] is load_ref(ref, tmp_path)
+
+
+def test_rewritten_artifact_is_reparsed_and_flagged_stale(tmp_path):
+    outline = tmp_path / "outline.json"
+    outline.write_text(json.dumps({"outline": "## 1. Introduction"}))
+    ref = artifact_ref(outline, tmp_path)
+    assert load_json_cached(outline)["outline"] == "## 1. Introduction"
+
+    outline.write_text(json.dumps({"outline": "## 1. Intro, revised"}))
+    os.utime(outline, ns=(1, 1))
+    assert load_json_cached(outline)["outline"] == "## 1. Intro, revised"
+    with pytest.raises(StaleArtifactError):
+        load_ref(ref, tmp_path)
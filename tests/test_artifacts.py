@@ -0,0 +1,44 @@
+import json
+
+import pytest
+
+from src.utils.artifacts import (
+    ArtifactError, WriteBehind, artifact_path, atomic_write_json, load_artifact, save_artifact,
+)
+
+
+def test_load_unwraps_payload_and_hands_out_copies(tmp_path):
+    save_artifact("framework", {"main_thesis": "Safety is not necessary"}, tmp_path)
+    assert json.loads(artifact_path("framework", tmp_path).read_text()) == {
+        "abstract_framework": {"main_thesis": "Safety is not necessary"}
+    }
+
+    framework = load_artifact("framework", tmp_path)
+    framework["main_thesis"] = "edited by a worker"
+    assert load_artifact("framework", tmp_path)["main_thesis"] == "Safety is not necessary"
+    assert load_artifact("framework", tmp_path, shared=True) is load_artifact("framework", tmp_path, shared=True)
+
+
+def test_missing_and_malformed_artifacts_name_the_phase(tmp_path):
+    with pytest.raises(ArtifactError, match="Run Phase II.3 first"):
+        load_artifact("developed_moves", tmp_path)
+
+    atomic_write_json(artifact_path("developed_moves", tmp_path), {"moves": []})
+    with pytest.raises(ArtifactError, match="no 'developed_moves' entry"):
+        load_artifact("developed_moves", tmp_path)
+
+
+def test_atomic_write_leaves_no_temp_files(tmp_path):
+    atomic_write_json(tmp_path / "out" / "step.json", {"a": 1})
+    assert [path.name for path in (tmp_path / "out").iterdir()] == ["step.json"]
+
+
+def test_write_behind_keeps_the_latest_version_of_each_file(tmp_path):
+    writer = WriteBehind(write=lambda path, text: path.write_text(text))
+    for version in range(5):
+        writer.submit(tmp_path / "step.json", str(version))
+    writer.submit(tmp_path / "step.md", "content")
+    writer.flush()
+
+    assert (tmp_path / "step.json").read_text() == "4"
+    assert (tmp_path / "step.md").read_text() == "content"
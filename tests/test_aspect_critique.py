@@ -0,0 +1,109 @@
+import threading
+
+import pytest
+
+from src.utils.aspect_critique import (
+    merge_level, parse_aspect_critique, render_critique, run_aspect_critiques, split_critique_prompt,
+)
+
+PROMPT = """<task>Critique this section.</task>
+
+<evaluation_criteria>
+Assess the section against:
+
+1. PHILOSOPHICAL RIGOR AND DEPTH
+- Are the arguments valid?
+
+2. HÁJEK HEURISTICS TESTS
+- Extreme cases?
+
+3. STRUCTURAL INTEGRATION
+- Transitions?
+
+4. CLARITY AND PRECISION
+- Defined terms?
+</evaluation_criteria>
+
+<output_format>
+# Scratch Work
+...
+</output_format>"""
+
+
+def aspect_response(level, major="- None"):
+    return (f"# Findings\nThe argument in ## 2 is thin.\n\n# Major Issues\n{major}\n\n# Minor Issues\n- Tighten prose\n\n"
+            f"# Strengths\n- Clear thesis\n\n# Recommendations\n- Add an example\n\n# Assessment\n{level}")
+
+
+def test_split_keeps_context_and_partitions_the_rubric():
+    prompts = split_critique_prompt(PROMPT, max_aspects=2)
+    assert [p.name for p in prompts] == [
+        "Philosophical Rigor And Depth / Hájek Heuristics Tests",
+        "Structural Integration / Clarity And Precision",
+    ]
+    first, second = prompts[0].prompt, prompts[1].prompt
+    assert "<task>Critique this section.</task>" in first and "Assess the section against:" in second
+    assert "HÁJEK" in first and "STRUCTURAL INTEGRATION" not in first
+    assert "STRUCTURAL INTEGRATION" in second and "# Scratch Work" not in second
+    assert "# Assessment" in second
+
+    grouped = split_critique_prompt(PROMPT, groups={"Content": (1, 2), "Form": (3,)})
+    assert [p.name for p in grouped] == ["Content", "Form"]
+    assert "CLARITY AND PRECISION" in grouped[1].prompt  # Unassigned items join the last group
+    assert split_critique_prompt("<evaluation_criteria>\n1. ONLY ONE\n</evaluation_criteria>") == []
+
+
+def test_worst_aspect_decides_and_major_issues_block_minimal_changes():
+    minimal = parse_aspect_critique("Form", aspect_response("MINIMAL CHANGES NEEDED"))
+    assert minimal.major == [] and minimal.recommendations == ["Add an example"]
+    assert "#### 2 is thin" not in minimal.findings and minimal.findings.startswith("The argument")
+    flagged = parse_aspect_critique("Content", aspect_response("MINIMAL CHANGES NEEDED", "- Circular premise"))
+    major = parse_aspect_critique("Depth", aspect_response("MAJOR REVISION NEEDED"))
+
+    assert merge_level([minimal]) == "MINIMAL_CHANGES"
+    assert merge_level([minimal, flagged]) == "MINOR_REFINEMENT"
+    assert merge_level([minimal, flagged, major]) == "MAJOR_REVISION"
+
+    merged = render_critique([minimal, flagged])
+    assert "- (Content) Circular premise" in merged
+    assert merged.split("# Summary Assessment\n")[1].startswith("MINOR REFINEMENT NEEDED")
+    assert "Next steps:\n- (Form) Add an example" in merged
+
+
+def test_aspects_run_concurrently_and_tolerate_partial_failure():
+    prompts = split_critique_prompt(PROMPT, max_aspects=4)
+    barrier = threading.Barrier(3, timeout=5)
+
+    def call(aspect):
+        if aspect.name == "Clarity And Precision":
+            raise RuntimeError("rate limited")
+        barrier.wait()  # Deadlocks unless the other aspects are in flight at once
+        return aspect_response("MINOR REFINEMENT NEEDED")
+
+    critiques = run_aspect_critiques(call, prompts, max_concurrent=4)
+    assert [c.name for c in critiques] == [
+        "Philosophical Rigor And Depth", "Hájek Heuristics Tests", "Structural Integration",
+    ]
+
+    with pytest.raises(RuntimeError):
+        run_aspect_critiques(lambda aspect: (_ for _ in ()).throw(RuntimeError("down")), prompts)
+
+
+def test_section_critic_prompt_is_budgeted_and_still_splits():
+    from src.phases.phase_three.stages.stage_one.prompts.section_writing.section_writing_prompts import (
+        SectionWritingPrompts,
+    )
+    from src.utils.prompt_budget import count_tokens
+
+    sections = [{"section_name": f"Section {i}", "word_target": 800} for i in range(40)]
+    context = {"sections": sections}
+    overview = {"thesis": "Luck matters.", "target_words": 4000, "abstract": "About luck."}
+    full = SectionWritingPrompts().construct_critic_prompt(context, 3, "Body text.", overview)
+    assert "<structural_context>" in full
+
+    budget = count_tokens(full) - 20
+    tight = SectionWritingPrompts(token_budget=budget).construct_critic_prompt(context, 3, "Body text.", overview)
+    assert "<structural_context>" not in tight or "trimmed to fit" in tight
+    assert count_tokens(tight) <= budget
+    assert "Body text." in tight
+    assert len(split_critique_prompt(tight, max_aspects=4)) == 4
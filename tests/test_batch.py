@@ -0,0 +1,78 @@
+import threading
+import time
+
+import pytest
+
+from src.utils.batch import (
+    ApiBudget, LiteratureIndex, ResponseCache, TokenBudgetExceeded, fresh_responses, install_batch_resources,
+    reading_cached_responses, reject_last_response, remember_response,
+)
+
+
+def test_api_budget_caps_concurrency_and_settles_tokens():
+    budget = ApiBudget(max_concurrent_calls=2, token_budget=1000)
+    active, peak = [0], [0]
+    lock = threading.Lock()
+
+    def call():
+        with budget.reserve(100) as usage:
+            with lock:
+                active[0] += 1
+                peak[0] = max(peak[0], active[0])
+            time.sleep(0.02)
+            with lock:
+                active[0] -= 1
+            usage["tokens"] = 40
+
+    threads = [threading.Thread(target=call) for _ in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert peak[0] <= 2
+    assert budget.calls == 6 and budget.tokens_used == 240 and budget.tokens_reserved == 0
+    with pytest.raises(TokenBudgetExceeded):
+        with budget.reserve(800):
+            pass
+
+
+def test_response_cache_persists_across_instances(tmp_path):
+    config = {"model": "m", "max_tokens": 10, "temperature": 0.5}
+    cache = ResponseCache(tmp_path)
+    key = cache.key("stage", config, "prompt", "system")
+    assert key != cache.key("stage", config, "prompt", "other system")
+    assert cache.get(key) is None
+    cache.put(key, "answer")
+
+    reopened = ResponseCache(tmp_path)
+    assert reopened.get(key) == "answer"
+    assert (cache.misses, reopened.hits) == (1, 1)
+
+
+def test_rejected_responses_are_not_replayed(tmp_path):
+    cache = ResponseCache(tmp_path)
+    key = cache.key("stage", {"model": "m"}, "prompt")
+    cache.put(key, "not json")
+    install_batch_resources(response_cache=cache)
+    try:
+        remember_response(key)
+        reject_last_response()
+    finally:
+        install_batch_resources()
+    assert ResponseCache(tmp_path).get(key) is None
+
+    assert reading_cached_responses()
+    with fresh_responses():
+        assert not reading_cached_responses()
+    assert reading_cached_responses()
+
+
+def test_literature_index_keys_on_file_content(tmp_path):
+    first, second = tmp_path / "a.pdf", tmp_path / "b.pdf"
+    first.write_bytes(b"same bytes")
+    second.write_bytes(b"same bytes")
+
+    index = LiteratureIndex(tmp_path / "index")
+    index.put(index.key_for(first), {"paper_info": {"title": "T"}})
+    assert LiteratureIndex(tmp_path / "index").get(index.key_for(second)) == {"paper_info": {"title": "T"}}
@@ -0,0 +1,84 @@
+import pytest
+
+from src.phases.core.branch_merge import merge_branches, parse_resolutions, split_sections
+
+BASE = """The move defends safety.
+
+## 1. The Argument
+Safety rules out luck.
+
+## 2. The Objection
+Lotteries look like a problem."""
+
+
+def test_sections_match_by_heading_text_not_numbering():
+    sections = split_sections(BASE.replace("## 1. The Argument", "### **The argument**"))
+    assert [section.key for section in sections] == ["", "the argument", "the objection"]
+    assert sections[0].body == "The move defends safety."
+
+
+def test_changes_in_different_sections_merge_without_a_call():
+    examples = BASE.replace("Safety rules out luck.", "Safety rules out luck. Consider Adam's clock.")
+    literature = BASE.replace("Lotteries look like a problem.", "Lotteries look like a problem (Hawthorne 2004).") \
+        + "\n\n## 3. Related Work\nSosa (1999) first stated safety."
+
+    merged = merge_branches(BASE, {"examples": examples, "literature": literature})
+    assert not merged.conflicts
+    assert merged.render() == """The move defends safety.
+
+## 1. The Argument
+Safety rules out luck. Consider Adam's clock.
+
+## 2. The Objection
+Lotteries look like a problem (Hawthorne 2004).
+
+## 3. Related Work
+Sosa (1999) first stated safety."""
+
+
+def test_repeated_headings_match_by_order():
+    base = """## Objection 1
+Luck.
+
+### Response
+resp one
+
+## Objection 2
+Lotteries.
+
+### Response
+resp two"""
+    examples = base.replace("resp two", "resp two, as the lottery case shows")
+    literature = base.replace("resp one", "resp one (Pritchard 2005)")
+
+    merged = merge_branches(base, {"examples": examples, "literature": literature})
+    assert not merged.conflicts
+    assert merged.render() == base.replace("resp one", "resp one (Pritchard 2005)").replace(
+        "resp two", "resp two, as the lottery case shows"
+    )
+
+
+def test_sections_both_branches_rewrote_are_conflicts():
+    examples = BASE.replace("Safety rules out luck.", "Safety rules out luck, as Adam's clock shows.")
+    literature = BASE.replace("Safety rules out luck.", "Safety rules out luck (Sosa 1999).")
+
+    merged = merge_branches(BASE, {"examples": examples, "literature": literature})
+    assert [conflict.heading for conflict in merged.conflicts] == ["## 1. The Argument"]
+    assert merged.conflicts[0].versions == {"examples": "Safety rules out luck, as Adam's clock shows.",
+                                            "literature": "Safety rules out luck (Sosa 1999)."}
+    with pytest.raises(ValueError):
+        merged.render()
+
+    resolutions, missing = parse_resolutions(
+        'Here you go.\n<resolved id="1">\nSafety rules out luck (Sosa 1999), as Adam\'s clock shows.\n</resolved>', 1
+    )
+    assert missing == []
+    assert "## 1. The Argument\nSafety rules out luck (Sosa 1999), as Adam's clock shows." in merged.render(resolutions)
+    assert parse_resolutions('<resolved id="2">x</resolved>', 2)[1] == [1]
+
+
+def test_restructured_branch_conflicts_as_a_whole():
+    literature = "A single rewritten paragraph citing Sosa (1999) and Hawthorne (2004)."
+    merged = merge_branches(BASE, {"examples": BASE, "literature": literature})
+    assert len(merged.conflicts) == 1 and merged.conflicts[0].heading == ""
+    assert merged.render(["Whole merged text."]) == "Whole merged text."
@@ -0,0 +1,44 @@
+import json
+import xml.etree.ElementTree as ET
+
+from src.utils.examples_store import ExamplesDatabaseWriter
+
+
+def _example(title, text):
+    return {"paper_title": title, "type": "thought_experiment", "purpose": "p", "context": "c", "text": text}
+
+
+def test_appends_stay_well_formed_and_compaction_drops_reruns(tmp_path):
+    writer = ExamplesDatabaseWriter(tmp_path)
+    writer.append("a.pdf", [_example("A", "Adam & Eve <choose>")])
+    writer.append("b.pdf", [_example("B", "Beth"), _example("B", "Paula")])
+    assert len(ET.parse(writer.xml_path).getroot()) == 3
+
+    # An interrupted append leaves a half-written element behind
+    with open(writer.xml_path, "r+", encoding="utf-8") as f:
+        content = f.read().replace("</philosophical_examples>\n", "  <example>\n    <type>thou")
+        f.seek(0)
+        f.truncate()
+        f.write(content)
+    writer = ExamplesDatabaseWriter(tmp_path)
+    assert len(ET.parse(writer.xml_path).getroot()) == 3
+    assert writer.processed_sources() == {"a.pdf", "b.pdf"}
+
+    writer.append("a.pdf", [_example("A", "Adam revisited")])
+    assert writer.compact() == 3
+    root = ET.parse(writer.xml_path).getroot()
+    assert [example.findtext("text") for example in root] == ["Beth", "Paula", "Adam revisited"]
+    with open(writer.json_path) as f:
+        assert [example["text"] for example in json.load(f)] == ["Beth", "Paula", "Adam revisited"]
+    assert len(writer.records_path.read_text().splitlines()) == 2
+
+
+def test_imports_per_paper_files_from_earlier_runs(tmp_path):
+    with open(tmp_path / "anab031_examples.json", "w") as f:
+        json.dump([_example("A", "Adam")], f)
+    with open(tmp_path / "philosophical_examples_database.json", "w") as f:
+        json.dump([_example("A", "Adam")], f)
+
+    writer = ExamplesDatabaseWriter(tmp_path)
+    assert writer.processed_sources() == {"anab031.pdf"}
+    assert [example["text"] for example in writer.iter_examples()] == ["Adam"]
@@ -0,0 +1,35 @@
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+HEAVY = ("openai", "anthropic", "tenacity", "yaml", "dotenv", "requests", "tiktoken", "tavily", "markdownify")
+IMPORT_BUDGET_MS = 500  # Generous for slow CI machines; these imports take tens of ms locally
+
+PROBE = """
+import json, sys, time
+started = time.perf_counter()
+import {module}
+print(json.dumps({{"ms": (time.perf_counter() - started) * 1000,
+                   "heavy": [name for name in {heavy!r} if name in sys.modules]}}))
+"""
+
+
+@pytest.mark.parametrize("module", [
+    "src.utils.api",
+    "src.phases.core.workflow",
+    "run_utils",
+    "archive_run",
+    "compare_runs",
+])
+def test_import_is_fast_and_defers_provider_sdks(module):
+    result = subprocess.run(
+        [sys.executable, "-c", PROBE.format(module=module, heavy=HEAVY)],
+        cwd=ROOT, capture_output=True, text=True, check=True,
+    )
+    probe = json.loads(result.stdout.strip().splitlines()[-1])
+    assert probe["heavy"] == []
+    assert probe["ms"] < IMPORT_BUDGET_MS
@@ -0,0 +1,67 @@
+from src.utils.length_control import (
+    DEFAULT_SETTINGS, WordBudget, count_words, fit_length, plan_length_fix, split_paragraphs,
+)
+
+SETTINGS = dict(DEFAULT_SETTINGS, enabled=True)
+
+
+def paragraph(words: int, word: str = "claim") -> str:
+    return " ".join([word] * words) + "."
+
+
+def section(*lengths: int) -> str:
+    return "\n\n".join(["## 2. The Argument"] + [paragraph(n) for n in lengths])
+
+
+def test_count_words_ignores_markup_and_dashes():
+    assert count_words("## 2. The *safety* condition — revisited\n\n- I argue (Sosa 1999: 141) that") == 11
+    assert split_paragraphs("One.\nTwo.\nThree.") == ["One.", "Two.", "Three."]
+    assert split_paragraphs("One.\nstill one.\n\n  \nTwo.") == ["One.\nstill one.", "Two."]
+
+
+def test_plan_keeps_small_misses_and_leaves_large_ones():
+    text = section(100, 150, 120, 130, 100)  # 600 words plus a 4-word heading
+    assert plan_length_fix(text, 600, SETTINGS).action == "keep"
+    assert plan_length_fix(text, 1200, SETTINGS).action == "leave"
+
+
+def test_plan_spreads_a_trim_over_the_longest_body_paragraphs():
+    text = section(100, 150, 120, 130, 200)
+    plan = plan_length_fix(text, 600, SETTINGS)  # 703 words: trim 103
+
+    assert plan.action == "trim" and plan.delta == -103
+    # Heading (0) and the opening/closing paragraphs (1, 5) are left alone
+    assert sorted(plan.paragraph_targets) == [2, 4]
+    assert plan.paragraph_targets == {2: 150 - 55, 4: 130 - 48}
+
+
+def test_fit_length_only_replaces_planned_paragraphs():
+    text = section(100, 150, 120, 130, 100)
+    seen = {}
+
+    def rewrite(paragraphs, plan):
+        seen.update(plan.paragraph_targets)
+        return {index: paragraph(words, "longer") for index, words in plan.paragraph_targets.items()}
+
+    fitted, plan = fit_length(text, 700, SETTINGS, rewrite)
+    assert plan.action == "expand" and count_words(fitted) == 700
+    kept = [index for index in range(6) if index not in seen]
+    assert [split_paragraphs(fitted)[index] for index in kept] == [split_paragraphs(text)[index] for index in kept]
+
+    # A rewrite that overshoots further than the original miss is discarded
+    unchanged, _ = fit_length(text, 700, SETTINGS, lambda paragraphs, plan: {2: paragraph(600)})
+    assert unchanged == text
+
+
+def test_word_budget_carries_misses_into_later_sections():
+    budget = WordBudget([400, 800, 800], carry_over=0.25)
+    assert budget.target_for(0) == 400
+
+    budget.record(0, 560)  # 160 over: the remaining 1600 words absorb it pro rata
+    assert budget.target_for(1) == 720
+    budget.record(1, 720)
+    assert budget.target_for(2) == 720
+
+    budget = WordBudget([400, 400], carry_over=0.25)
+    budget.record(0, 100)
+    assert budget.target_for(1) == 500  # The shift is capped
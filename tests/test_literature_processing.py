@@ -101,18 +101,10 @@ def test_literature_processing(pdfs: List[Path], final_selection: Dict):
         # Save results
         output_dir = Path("./test_outputs")
         
-        # Extract actual data from WorkerOutput objects
-        paper_readings = {
-            paper_id: {
-                "initial": reading["initial"].modifications["initial_reading"],
-                "project_specific": reading["project_specific"].modifications["project_specific_reading"]
-            }
-            for paper_id, reading in result['paper_readings'].items()
-        }
-        
-        # Save paper readings
-        with open(output_dir / config['paths']['literature_output']['initial_readings'], 'w') as f:
-            json.dump(paper_readings, f, indent=2)
+        # Readings were streamed to the store as each paper finished
+        result['readings_store'].export_json(
+            output_dir / config['paths']['literature_output']['initial_readings'], result['paper_ids']
+        )
             
         # Save synthesis separately
         if 'synthesis' in result:
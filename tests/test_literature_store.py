@@ -0,0 +1,81 @@
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+from run_utils import output_path, run_directories
+from src.utils.literature_store import ReadingsStore, reading_key
+
+
+def _reading(title, quote="Knowledge requires safety"):
+    return {"paper_info": {"title": title}, "extracted_quotes": [{"text": quote}],
+            "engagement_assessment": {"type": "Primary"}}
+
+
+def test_readings_survive_a_restart_and_stale_keys_are_redone(tmp_path):
+    pdf = tmp_path / "sosa1999.pdf"
+    pdf.write_bytes(b"%PDF-1.4 safety")
+    selection = {"current_thesis": "Safety is not necessary"}
+
+    store = ReadingsStore(tmp_path)
+    store.put("sosa1999", "initial", _reading("How to Defeat Opposition to Moore"), reading_key(pdf))
+    store.put("sosa1999", "project_specific", _reading("How to Defeat Opposition to Moore"), reading_key(pdf, selection))
+    # The run dies while writing the next paper's record
+    with open(store.records_path, "ab") as f:
+        f.write(b'{"paper_id": "williamson2000", "stage": "init')
+
+    store = ReadingsStore(tmp_path)
+    assert store.summaries == {"sosa1999": {"title": "How to Defeat Opposition to Moore", "engagement_type": "Primary"}}
+    assert store.has("sosa1999", "initial", reading_key(pdf))
+    assert store.get("sosa1999", "initial")["extracted_quotes"] == [{"text": "Knowledge requires safety"}]
+    assert not store.has("sosa1999", "project_specific", reading_key(pdf, {"current_thesis": "Safety is necessary"}))
+    assert not store.has("williamson2000", "initial")
+
+    # The next append starts on a fresh line, and a rerun supersedes the earlier record
+    store.put("williamson2000", "initial", _reading("Knowledge and its Limits"), "k")
+    store.put("sosa1999", "initial", _reading("Sosa, revised"), "k2")
+    store = ReadingsStore(tmp_path)
+    assert store.get("williamson2000", "initial")["paper_info"]["title"] == "Knowledge and its Limits"
+    assert store.get("sosa1999", "initial", "k2")["paper_info"]["title"] == "Sosa, revised"
+
+
+def test_export_matches_a_one_shot_dump_of_complete_papers(tmp_path):
+    store = ReadingsStore(tmp_path)
+    for paper_id in ("b_paper", "a_paper"):
+        store.put(paper_id, "initial", _reading(paper_id, 'said "ü"\nthen'))
+        store.put(paper_id, "project_specific", _reading(paper_id))
+    store.put("unfinished", "initial", _reading("unfinished"))
+
+    path = store.export_json(tmp_path / "literature_readings.json", ["a_paper", "b_paper", "unfinished"])
+    expected = {paper_id: {"initial": _reading(paper_id, 'said "ü"\nthen'), "project_specific": _reading(paper_id)}
+                for paper_id in ("a_paper", "b_paper")}
+    assert path.read_text() == json.dumps(expected, indent=2)
+
+    store.export_json(tmp_path / "empty.json", [])
+    assert json.loads((tmp_path / "empty.json").read_text()) == {}
+
+
+def test_concurrent_runs_keep_readings_in_their_own_directories(tmp_path):
+    def read_papers(paper):
+        with run_directories(tmp_path / paper):
+            store = ReadingsStore(output_path())
+            for number in range(20):
+                store.put(f"{paper}_{number}", "initial", _reading(f"{paper} {number}"))
+            return store.records_path, store.get(f"{paper}_7", "initial")["paper_info"]["title"]
+
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        results = dict(zip(["p0", "p1"], pool.map(read_papers, ["p0", "p1"])))
+    for paper, (records_path, title) in results.items():
+        assert records_path == tmp_path / paper / "literature_readings.jsonl"
+        assert title == f"{paper} 7"
+        assert set(ReadingsStore(tmp_path / paper).summaries) == {f"{paper}_{number}" for number in range(20)}
+
+
+def test_stores_sharing_a_file_index_their_own_records(tmp_path):
+    def read_papers(paper):
+        store = ReadingsStore(tmp_path)
+        for number in range(50):
+            store.put(f"{paper}_{number}", "initial", _reading(f"{paper} {number}"))
+        return all(store.get(f"{paper}_{number}", "initial")["paper_info"]["title"] == f"{paper} {number}"
+                   for number in range(50))
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        assert all(pool.map(read_papers, ["p0", "p1", "p2", "p3"]))
@@ -0,0 +1,55 @@
+import contextvars
+import threading
+
+from src.utils.map_reduce import map_bounded, tree_reduce
+
+
+def test_map_bounded_limits_concurrency_and_collects_failures():
+    active, peak, lock = [0], [0], threading.Lock()
+
+    def work(n):
+        with lock:
+            active[0] += 1
+            peak[0] = max(peak[0], active[0])
+        try:
+            if n == 3:
+                raise ValueError("bad paper")
+            return n * n
+        finally:
+            with lock:
+                active[0] -= 1
+
+    results, failures = map_bounded(work, list(range(10)), workers=2)
+    assert [item for item, _ in results] == [0, 1, 2, 4, 5, 6, 7, 8, 9]
+    assert results[2] == (2, 4)
+    assert [item for item, _ in failures] == [3]
+    assert peak[0] <= 2
+
+
+def test_tree_reduce_merges_in_bounded_groups():
+    calls = []
+
+    def combine(group, level):
+        calls.append((level, len(group)))
+        return sum(group)
+
+    levels = []
+    assert tree_reduce(list(range(1, 21)), combine, fan_in=4,
+                       on_level=lambda level, groups: levels.append(groups)) == 210
+    assert levels == [5, 2, 1]
+    assert max(size for _, size in calls) <= 4
+    assert tree_reduce([7], combine) == 7
+    assert tree_reduce([], combine) is None
+
+
+def test_tree_reduce_merges_in_the_callers_context():
+    paper = contextvars.ContextVar("paper", default=None)
+    paper.set("p0")
+    seen = []
+
+    def combine(group, level):
+        seen.append(paper.get())
+        return sum(group)
+
+    assert tree_reduce(list(range(9)), combine, fan_in=2, workers=3) == 36
+    assert seen and set(seen) == {"p0"}
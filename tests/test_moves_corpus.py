@@ -0,0 +1,69 @@
+from extract_all_philosophical_moves import (
+    add_extraction, build_duplicate_index, catch_up_extractions, consolidate_moves_v2,
+)
+from src.utils.moves_corpus import ExtractionManifest, MovesStore, content_hash
+
+
+def test_manifest_only_flags_new_or_changed_papers(tmp_path):
+    manifest = ExtractionManifest(tmp_path / "manifest.json")
+    text_hash, prompt_version = content_hash("paper text"), content_hash("prompt v2")
+    assert manifest.needs_extraction("a.txt", text_hash, prompt_version)
+
+    manifest.mark("a.txt", status="done", text_hash=text_hash, prompt_version=prompt_version)
+    manifest.mark("b.txt", status="failed", text_hash=text_hash, prompt_version=prompt_version)
+
+    reloaded = ExtractionManifest(tmp_path / "manifest.json")
+    assert not reloaded.needs_extraction("a.txt", text_hash, prompt_version)
+    assert reloaded.needs_extraction("a.txt", content_hash("edited text"), prompt_version)
+    assert reloaded.needs_extraction("a.txt", text_hash, content_hash("prompt v3"))
+    assert reloaded.needs_extraction("b.txt", text_hash, prompt_version)
+    assert reloaded.counts() == {"done": 1, "failed": 1}
+
+
+def test_store_keeps_latest_extraction_per_paper(tmp_path):
+    store = MovesStore(tmp_path / "extractions.jsonl")
+    store.append({"source_file": "a.txt", "philosophical_moves": [1]})
+    store.append({"source_file": "b.txt", "philosophical_moves": [2]})
+    store.append({"source_file": "a.txt", "philosophical_moves": [3, 4]})
+    with open(tmp_path / "extractions.jsonl", "a") as f:
+        f.write('{"source_file": "c.txt", "philo')  # Interrupted write
+
+    latest = store.latest()
+    assert [e["source_file"] for e in latest] == ["a.txt", "b.txt"]
+    assert latest[0]["philosophical_moves"] == [3, 4]
+
+
+def test_append_after_interrupted_write_starts_new_line(tmp_path):
+    path = tmp_path / "extractions.jsonl"
+    path.write_text('{"source_file": "a.txt"}\n{"source_file": "b.t')
+    store = MovesStore(path)
+    store.append({"source_file": "c.txt"})
+    assert [e["source_file"] for e in store.latest()] == ["a.txt", "c.txt"]
+
+
+def test_catch_up_consolidates_forced_re_extractions():
+    def extraction(pattern, text_hash):
+        return {"source_file": "a.txt", "text_hash": text_hash, "prompt_version": "p1",
+                "paper_info": {"title": "A"},
+                "philosophical_moves": [{"move_name": "Move", "pattern": pattern, "quote": ""}]}
+
+    consolidated = consolidate_moves_v2([extraction("restrict the scope of the thesis", "t1")])
+    duplicates = build_duplicate_index(consolidated)
+    assert catch_up_extractions(consolidated, [extraction("restrict the scope of the thesis", "t1")],
+                                duplicates) == set()
+
+    # A --force run stored a newer extraction, then stopped before saving the database
+    changed = catch_up_extractions(consolidated, [extraction("build a counterexample to safety", "t2")], duplicates)
+    assert changed == {"a.txt"}
+    assert [move["pattern"] for move in consolidated["all_moves"]] == ["build a counterexample to safety"]
+    assert consolidated["papers_analyzed"] == 1
+
+
+def test_duplicates_mark_the_canonical_paper_changed():
+    def extraction(source_file):
+        return {"source_file": source_file, "paper_info": {"title": source_file},
+                "philosophical_moves": [{"move_name": "Move", "pattern": "restrict the scope of the thesis"}]}
+
+    consolidated = consolidate_moves_v2([extraction("a.txt")])
+    assert add_extraction(consolidated, extraction("b.txt"), build_duplicate_index(consolidated)) == {"a.txt", "b.txt"}
+    assert consolidated["all_moves"][0]["duplicates"][0]["source_file"] == "b.txt"
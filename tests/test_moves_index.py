@@ -0,0 +1,58 @@
+import os
+import sqlite3
+
+import pytest
+
+from src.utils.moves_index import MovesIndex, format_moves_for_prompt, load_moves_index, relevant_moves_block
+
+
+def _move(name, pattern, quote="", quality="High", classification=("defensive",)):
+    return {
+        "move_name": name,
+        "pattern": pattern,
+        "quote": quote,
+        "quality": quality,
+        "classification": list(classification),
+        "achievement": f"{name} achieved",
+    }
+
+
+def test_search_ranks_text_matches_and_filters(tmp_path):
+    index = MovesIndex(tmp_path / "moves.sqlite")
+    index.replace_paper("a.txt", [
+        _move("Scope Restriction Maneuver", "restrict the scope of a universal claim"),
+        _move("Counterexample Generation", "build a counterexample to the principle", quality="Medium",
+              classification=("offensive",)),
+    ])
+    index.replace_paper("b.txt", [_move("Weak Scope Hedge", "limit scope", quality="Low")])
+
+    assert [m["move_name"] for m in index.search("restricting scope of claims", k=3)][0] == "Scope Restriction Maneuver"
+    assert [m["move_name"] for m in index.search("scope", min_quality="Medium")] == ["Scope Restriction Maneuver"]
+    assert [m["move_name"] for m in index.search("", classification="offensive")] == ["Counterexample Generation"]
+    assert index.search("counterexample", columns=["move_name", "pattern"])[0]["move_name"] == "Counterexample Generation"
+
+    index.replace_paper("a.txt", [])
+    assert len(index) == 1
+    assert index.search("restrict universal") == []
+
+
+def test_prompt_block_uses_index_when_built(tmp_path):
+    config = {"parameters": {"moves_index": {"path": str(tmp_path / "moves.sqlite"), "top_k": 1}}}
+    assert relevant_moves_block(config, "scope") == ""
+
+    index = MovesIndex(tmp_path / "moves.sqlite")
+    index.rebuild([_move("Scope Restriction Maneuver", "restrict scope", quote="we can simply restrict (PG)")])
+    block = relevant_moves_block(config, "restrict the scope of the thesis")
+    assert block == format_moves_for_prompt([index.search("scope")[0]])
+    assert block.startswith("1. **Scope Restriction Maneuver**")
+    assert 'Example: "we can simply restrict (PG)"' in block
+
+    # The connection is reused until the file changes, then replaced
+    assert load_moves_index(config) is load_moves_index(config)
+    opened = load_moves_index(config)
+    index.replace_paper("b.txt", [_move("Counterexample Generation", "build a counterexample")])
+    os.utime(tmp_path / "moves.sqlite", (1, 1))
+    reopened = load_moves_index(config)
+    assert reopened is not opened and len(reopened) == 2
+    with pytest.raises(sqlite3.ProgrammingError):
+        len(opened)
@@ -0,0 +1,29 @@
+from src.utils.near_duplicates import NearDuplicateIndex, cluster_near_duplicates, jaccard, shingles
+
+SCOPE = ("Restrict the universal claim to the cases that survive the counterexamples: "
+         "we can simply restrict the principle to conjunctions of ordinary facts, "
+         "a result that is surely surprising enough on its own")
+
+
+def test_near_duplicates_cluster_and_distinct_moves_stay_apart():
+    texts = {
+        "a.txt:0": SCOPE,
+        "b.txt:3": SCOPE.upper(),
+        "c.txt:1": SCOPE + " indeed",
+        "d.txt:0": "Construct a weaker principle that avoids the objection but still yields the conclusion",
+    }
+    clusters = cluster_near_duplicates(texts, threshold=0.8)
+    assert clusters == [["a.txt:0", "b.txt:3", "c.txt:1"], ["d.txt:0"]]
+    assert jaccard(shingles(texts["a.txt:0"]), shingles(texts["d.txt:0"])) < 0.1
+
+
+def test_index_remove_and_items():
+    index = NearDuplicateIndex(threshold=0.8)
+    index.add("a.txt:0", SCOPE, {"move_name": "Scope Restriction"})
+    assert index.find(SCOPE + " indeed") == "a.txt:0"
+    assert index.get("a.txt:0") == {"move_name": "Scope Restriction"}
+
+    index.remove("a.txt:0")
+    assert len(index) == 0
+    assert index.find(SCOPE) is None
+    assert index.find("") is None
@@ -0,0 +1,58 @@
+# tests/test_paper_sections.py
+
+from src.utils.paper_sections import split_sections, splice_sections, map_issues_to_sections
+
+DRAFT = """# Blame in Professional Contexts
+
+## 1. Introduction
+
+Consider Dr. Martinez, who misreads a chart. I argue that epistemic blame differs from moral blame.
+
+## 2. The Distinction
+
+Epistemic blame targets belief formation. Moral blame targets quality of will.
+
+## 3. Objections
+
+One might say the distinction collapses in medical contexts.
+
+## 4. Conclusion
+
+The distinction survives.
+"""
+
+
+def test_split_is_lossless():
+    """Joining the sections reproduces the draft exactly"""
+    sections = split_sections(DRAFT)
+    assert "".join(section.text for section in sections) == DRAFT
+    assert [section.number for section in sections] == [None, "1", "2", "3", "4"]
+    assert sections[2].title == "The Distinction"
+    assert not sections[0].revisable
+
+
+def test_splice_passes_untouched_sections_through():
+    """Only replaced sections change; boundaries are preserved"""
+    sections = split_sections(DRAFT)
+    revised = splice_sections(sections, {3: "## 3. Objections\n\nA sharper objection."})
+    assert revised.startswith(sections[0].text + sections[1].text + sections[2].text)
+    assert "A sharper objection.\n\n## 4. Conclusion" in revised
+    assert splice_sections(sections, {}) == DRAFT
+
+
+def test_issue_mapping():
+    """Issues are routed by number, title, position keyword and overlap"""
+    sections = split_sections(DRAFT)
+    mapping = map_issues_to_sections(
+        [
+            "- Section 3 does not answer the collapse worry",
+            "- The Distinction needs a sharper criterion",
+            "- The conclusion is abrupt",
+            "- Tone is uneven",
+        ],
+        sections,
+    )
+    assert mapping[3] == ["- Section 3 does not answer the collapse worry"]
+    assert mapping[2] == ["- The Distinction needs a sharper criterion"]
+    assert mapping[4] == ["- The conclusion is abrupt"]
+    assert mapping[1] == ["- Tone is uneven"]
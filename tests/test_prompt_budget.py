@@ -0,0 +1,69 @@
+import pytest
+
+from src.utils.prompt_budget import (
+    PromptAssembler,
+    PromptBudgetError,
+    count_tokens,
+    stage_token_budget,
+    trim_to_tokens,
+)
+
+
+def test_under_budget_renders_everything_in_order():
+    assembler = PromptAssembler(token_budget=10000)
+    assembler.add("context", "<context>\nIntro\n</context>", required=True)
+    assembler.add("thesis", "THESIS: X", tag="input_data", required=True)
+    assembler.add("moves", "MOVES: Y", tag="input_data", priority=2)
+    assembler.add("empty", "   ")
+    prompt = assembler.build()
+
+    assert prompt == "<context>\nIntro\n</context>\n\n<input_data>\nTHESIS: X\n\nMOVES: Y\n</input_data>"
+    assert "empty" not in assembler.last_report
+
+
+def test_over_budget_trims_lowest_priority_first():
+    filler = "\n".join(f"line {i} of supporting material" for i in range(400))
+    assembler = PromptAssembler(token_budget=count_tokens(filler) + 200)
+    assembler.add("instructions", "Write the section.", required=True)
+    assembler.add("examples", filler, priority=0)
+    assembler.add("literature", filler, priority=5)
+    prompt = assembler.build()
+
+    assert assembler.total_tokens() <= assembler.token_budget
+    assert assembler.last_report["literature"] == count_tokens(filler)
+    assert assembler.last_report["examples"] < count_tokens(filler)
+    assert "Write the section." in prompt
+
+
+def test_required_components_over_budget_raise():
+    assembler = PromptAssembler(token_budget=20)
+    assembler.add("instructions", "word " * 200, required=True)
+    with pytest.raises(PromptBudgetError):
+        assembler.build()
+
+
+def test_trim_keeps_requested_end_and_stage_budget_from_config():
+    text = "\n".join(f"entry {i}" for i in range(500))
+    trimmed = trim_to_tokens(text, 100, keep="end")
+    assert count_tokens(trimmed) <= 100
+    assert trimmed.endswith("entry 499")
+
+    config = {"models": {"section_writing": {"prompt_token_budget": 1234}}}
+    assert stage_token_budget(config, "section_writing") == 1234
+    assert stage_token_budget(config, "other", default=99) == 99
+
+
+def test_count_tokens_cache_does_not_keep_texts():
+    import gc
+    import weakref
+
+    class Text(str):
+        pass
+
+    text = Text("a prompt that should not outlive its caller " * 50)
+    ref = weakref.ref(text)
+    first = count_tokens(text)
+    assert count_tokens(str(text)) == first
+    del text
+    gc.collect()
+    assert ref() is None
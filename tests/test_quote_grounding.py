@@ -0,0 +1,61 @@
+from src.utils.quote_grounding import QuoteCorpus, summarize_grounding, verify_quotes
+
+PAPER = (
+    "1. Introduction\n"
+    "Truthmaker maximalism is the view that every truth has a truthmaker. "
+    "However, in order to ward off this objection it appears sufficient to replace (PG) "
+    "with the following, similarly plausible principle. The same train of thought used "
+    "above to defend (PG) can also be used to defend (PG+)."
+)
+
+
+def test_locate_exact_fuzzy_and_missing_quotes():
+    corpus = QuoteCorpus()
+    corpus.add_document("paper.txt", PAPER)
+    corpus.add_document("other.txt", "An unrelated paper about the metaphysics of colour and perception.")
+
+    exact = corpus.locate("in order to ward off this objection it appears sufficient")
+    assert (exact.status, exact.document, exact.score) == ("exact", "paper.txt", 1.0)
+    assert PAPER[exact.start:exact.end] == "in order to ward off this objection it appears sufficient"
+
+    # Elided, re-punctuated and with an OCR slip
+    fuzzy = corpus.locate("In order to ward off this objection ... it appears sufficient to replace (PG) "
+                          "with the folowing, similarly plausible principle")
+    assert fuzzy.status == "fuzzy" and fuzzy.document == "paper.txt" and fuzzy.score >= 0.8
+
+    assert corpus.locate("Knowledge is justified true belief plus a fourth condition").status == "not_found"
+    assert corpus.locate("ward off this objection", document="other.txt").status == "not_found"
+
+
+def test_verify_quotes_reports_missing_sources():
+    corpus = QuoteCorpus()
+    corpus.add_document("paper.txt", PAPER)
+    results = verify_quotes(corpus, [
+        {"document": "paper.txt", "quote": "every truth has a truthmaker"},
+        {"document": "paper.txt", "quote": "a completely invented sentence that nobody wrote"},
+        {"document": "missing.txt", "quote": "anything"},
+    ])
+    assert [r["grounding"]["status"] for r in results] == ["exact", "not_found", "no_source"]
+    summary = summarize_grounding(results)
+    assert summary["by_status"] == {"exact": 1, "not_found": 1, "no_source": 1}
+    assert summary["grounded_rate"] == 0.5
+
+
+def test_same_named_texts_in_digest_directories_stay_separate(tmp_path):
+    import json
+
+    from compare_extraction_to_source import collect_reading_claims
+
+    for digest, text in (("aaaa", PAPER), ("bbbb", "A different paper that happens to share a file name.")):
+        (tmp_path / "texts" / digest).mkdir(parents=True)
+        (tmp_path / "texts" / digest / "smith.txt").write_text(text)
+    corpus = QuoteCorpus()
+    assert corpus.add_directory(tmp_path / "texts", "**/*.txt") == 2
+    assert corpus.add_directory(tmp_path / "texts", "**/*.txt") == 0
+
+    readings = {"smith": {"initial": {"source_digest": "aaaa",
+                                      "extracted_quotes": [{"text": "every truth has a truthmaker"}]}}}
+    (tmp_path / "readings.json").write_text(json.dumps(readings))
+    claims = collect_reading_claims(tmp_path / "readings.json")
+    assert claims[0]["document"] == "aaaa/smith.txt"
+    assert verify_quotes(corpus, claims)[0]["grounding"]["status"] == "exact"
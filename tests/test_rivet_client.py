@@ -0,0 +1,89 @@
+import gzip
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from src.utils.rivet_client import RivetClient, RivetError, cache_key, encode_body
+
+
+def test_cache_key_ignores_secrets_and_field_order():
+    payload = {"final_selection": {"title": "Safety"}, "outline": ["I", "II"], "openAIKey": "sk-one"}
+    reordered = {"openAIKey": "sk-two", "outline": ["I", "II"], "final_selection": {"title": "Safety"}}
+    assert cache_key("/mergedContext", payload) == cache_key("/mergedContext", reordered)
+    assert cache_key("/mergedContext", payload) != cache_key("/litResearch", payload)
+    assert cache_key("/mergedContext", payload) != cache_key("/mergedContext", dict(payload, outline=["I"]))
+
+
+def test_only_large_bodies_are_gzipped():
+    body, headers = encode_body({"moves": ["short"]})
+    assert "Content-Encoding" not in headers and json.loads(body) == {"moves": ["short"]}
+
+    payload = {"literature": ["a long paper summary"] * 200}
+    body, headers = encode_body(payload)
+    assert headers["Content-Encoding"] == "gzip"
+    assert json.loads(gzip.decompress(body)) == payload
+    assert len(body) < len(json.dumps(payload))
+
+
+@pytest.fixture
+def graph_server():
+    """Stand-in for rivet/server.js: inflates gzip bodies and echoes the inputs"""
+    calls = []
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            self.send_response(200 if self.path == "/life" else 404)
+            self.end_headers()
+
+        def do_POST(self):
+            body = self.rfile.read(int(self.headers["Content-Length"]))
+            if self.headers.get("Content-Encoding") == "gzip":
+                body = gzip.decompress(body)
+            calls.append(self.path)
+            inputs = json.loads(body)
+            status = 200 if self.path == "/mergedContext" else 500
+            reply = json.dumps({"route": self.path, "outline": inputs.get("outline")}).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Length", str(len(reply)))
+            self.end_headers()
+            self.wfile.write(reply)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_port}", calls
+    server.shutdown()
+    server.server_close()
+
+
+def test_repeated_graph_run_is_served_from_cache(graph_server, tmp_path):
+    pytest.importorskip("requests")
+    url, calls = graph_server
+    client = RivetClient(url, cache_dir=tmp_path, compress_min_bytes=64)
+    payload = {"outline": ["section"] * 50, "openAIKey": "sk-test"}
+
+    assert client.alive()
+    first = client.run_graph("/mergedContext", payload)
+    assert json.loads(first) == {"route": "/mergedContext", "outline": payload["outline"]}
+
+    # A restarted phase (fresh client, new key) reuses the on-disk result
+    again = RivetClient(url, cache_dir=tmp_path).run_graph("/mergedContext", dict(payload, openAIKey="sk-new"))
+    assert again == first and calls == ["/mergedContext"]
+
+    with pytest.raises(RivetError, match="failed \\(500\\)"):
+        client.run_graph("/litResearch", payload)
+    with pytest.raises(RivetError, match="failed \\(500\\)"):
+        client.run_graph("/litResearch", payload)
+    assert calls == ["/mergedContext", "/litResearch", "/litResearch"]  # Failures are never cached
+
+
+def test_unreachable_server_raises_with_start_command(tmp_path):
+    pytest.importorskip("requests")
+    client = RivetClient("http://127.0.0.1:9", cache_dir=None, timeout=(0.5, 0.5))
+    assert not client.alive()
+    with pytest.raises(RivetError, match="node server.js"):
+        client.run_graph("/mergedContext", {"outline": []})
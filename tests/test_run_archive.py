@@ -0,0 +1,86 @@
+import json
+import os
+
+import pytest
+
+from archive_run import PipelineArchiver
+from src.utils.run_archive import BlobStore, RunCatalog
+
+
+def test_blob_store_dedups_identical_content(tmp_path):
+    store = BlobStore(tmp_path / "blobs")
+    (tmp_path / "a.yaml").write_text("models: {}\n")
+    (tmp_path / "b.yaml").write_text("models: {}\n")
+
+    digest_a, _, new_a = store.put(tmp_path / "a.yaml")
+    digest_b, _, new_b = store.put(tmp_path / "b.yaml")
+    assert digest_a == digest_b and new_a and not new_b
+
+    store.materialize(digest_a, tmp_path / "run1" / "config_used.yaml")
+    store.materialize(digest_a, tmp_path / "run2" / "config_used.yaml")
+    assert (tmp_path / "run2" / "config_used.yaml").read_text() == "models: {}\n"
+    assert os.stat(tmp_path / "run1" / "config_used.yaml").st_ino == os.stat(store.locate(digest_a)).st_ino
+
+
+def test_catalog_filters_and_compares_runs(tmp_path):
+    catalog = RunCatalog(tmp_path / "catalog.sqlite")
+    catalog.record_run({"run_name": "base", "timestamp": "20250101_000000", "notes": "baseline"},
+                       [{"name": "final_paper.md", "digest": "x", "size": 10}], {"word_count": 2500.0})
+    catalog.record_run({"run_name": "new", "timestamp": "20250102_000000", "notes": "hajek critics"},
+                       [{"name": "final_paper.md", "digest": "x", "size": 10}], {"word_count": 3400.0})
+
+    assert [run["run_name"] for run in catalog.list_runs()] == ["new", "base"]
+    assert [run["run_name"] for run in catalog.list_runs(filters={"word_count": (">=", 3000)})] == ["new"]
+    assert [run["run_name"] for run in catalog.list_runs(notes_like="baseline")] == ["base"]
+    assert catalog.compare("base", "new")["word_count"]["change"] == 900.0
+    assert catalog.storage_summary() == {"logical_bytes": 20, "distinct_bytes": 10}
+
+
+def test_archiver_imports_old_runs_and_links_new_ones(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    old_run = tmp_path / "outputs" / "archive" / "old_run"
+    old_run.mkdir(parents=True)
+    (old_run / "final_paper.md").write_text("# Old\n")
+    with open(old_run / "archive_metadata.json", "w") as f:
+        json.dump({"timestamp": "20240101_000000", "notes": "", "paper_stats": {"word_count": 2}}, f)
+    (tmp_path / "config").mkdir()
+    (tmp_path / "config" / "conceptual_config.yaml").write_text("parameters: {}\n")
+    (tmp_path / "outputs" / "final_paper.md").write_text("# Paper\n\n## One\nSome words here.\n")
+
+    archiver = PipelineArchiver()
+    first = archiver.archive_run("first")
+    second = archiver.archive_run("second")
+    assert os.stat(os.path.join(first, "config_used.yaml")).st_ino == \
+        os.stat(os.path.join(second, "config_used.yaml")).st_ino
+
+    runs = {run["run_name"]: run for run in archiver.list_archives()}
+    assert set(runs) == {"old_run", "first", "second"}
+    assert runs["old_run"]["word_count"] == 2
+    assert runs["first"]["word_count"] == 7
+
+    # The old run's files now live in the blob store, so the run can be restored
+    blob = archiver.blobs.locate(archiver.catalog.files("old_run")[0]["digest"])
+    assert os.stat(old_run / "final_paper.md").st_ino == os.stat(blob).st_ino
+    (old_run / "final_paper.md").unlink()
+    archiver.restore_run("old_run")
+    assert (old_run / "final_paper.md").read_text() == "# Old\n"
+
+
+def test_only_unlinked_blobs_are_compressed(tmp_path):
+    pytest.importorskip("zstandard")
+    store = BlobStore(tmp_path / "blobs", compress=True)
+    (tmp_path / "kept.md").write_text("kept " * 200)
+    (tmp_path / "dropped.md").write_text("dropped " * 200)
+    kept, _, _ = store.put(tmp_path / "kept.md")
+    dropped, _, _ = store.put(tmp_path / "dropped.md")
+    store.materialize(kept, tmp_path / "run" / "kept.md")
+    store.materialize(dropped, tmp_path / "old_run" / "dropped.md")
+    (tmp_path / "old_run" / "dropped.md").unlink()
+
+    assert store.compress_unlinked()[0] == 1
+    assert store.locate(kept).suffix == "" and store.locate(dropped).suffix == ".zst"
+
+    store.materialize(dropped, tmp_path / "old_run" / "dropped.md")
+    assert store.locate(dropped).suffix == ""
+    assert os.stat(tmp_path / "old_run" / "dropped.md").st_ino == os.stat(store.locate(dropped)).st_ino
+    assert (tmp_path / "old_run" / "dropped.md").read_text() == "dropped " * 200
@@ -0,0 +1,115 @@
+import json
+
+from src.utils.run_metrics import (
+    compare_runs, extract_run_metrics, format_comparison, paper_text_metrics, record_api_call, start_usage_log,
+    tool_usage_log, usage_log,
+)
+
+PAPER = """# Knowledge and Luck
+
+## Abstract
+I argue that safety is not necessary for knowledge (Pritchard 2005).
+
+## 1. Introduction
+Perhaps luck matters, as Williamson (2000) and others (see Sosa 1999, p. 3) suggest.
+
+## 2. Objections
+One objection seems strong.
+"""
+
+
+def _write_run(run_dir, assessments, cycles, tokens):
+    run_dir.mkdir(parents=True)
+    (run_dir / "final_paper.md").write_text(PAPER)
+    history = {"cycles": [{"critique": {"summary_assessment": level}} for level in assessments[:cycles]]}
+    (run_dir / "abstract_refinement_history.json").write_text(json.dumps(history))
+    with usage_log(run_dir / "api_usage.jsonl"):
+        record_api_call("phase_2_2_critic", "claude", tokens, 100, 2.5)
+        record_api_call("phase_2_2_critic", "claude", tokens, 100, 0.0, cached=True)
+
+
+def test_paper_text_metrics_counts_sections_and_citations():
+    stats = paper_text_metrics(PAPER)
+    assert stats["citation_count"] == 3
+    assert stats["section_count"] == 3
+    assert stats["section_words.01_abstract"] == 11
+    assert stats["has_objections"] and stats["hedges_per_1000_words"] > 0
+
+
+def test_run_vector_reads_critics_cycles_and_usage(tmp_path):
+    run_dir = tmp_path / "run"
+    _write_run(run_dir, ["MAJOR_REVISION", "MINOR_REFINEMENT"], 2, 1000)
+    vector = extract_run_metrics(run_dir, cache_dir=tmp_path / "cache")
+
+    metrics = vector["metrics"]
+    assert metrics["cycles_total"] == 2 and metrics["assessments_major"] == 1
+    assert metrics["api_calls"] == 1 and metrics["api_cached_calls"] == 1
+    assert metrics["api_tokens"] == 2200 and metrics["api_seconds"] == 2.5
+    assert vector["trajectories"] == {"abstract_refinement_history.json": ["MAJOR_REVISION", "MINOR_REFINEMENT"]}
+
+
+def test_torn_usage_line_is_skipped(tmp_path):
+    run_dir = tmp_path / "run"
+    _write_run(run_dir, ["MAJOR_REVISION"], 1, 1000)
+    with open(run_dir / "api_usage.jsonl", "a", encoding="utf-8") as f:
+        f.write('{"stage": "phase_3_1", "prompt_tok')
+    metrics = extract_run_metrics(run_dir, cache_dir=None)["metrics"]
+    assert metrics["api_calls"] == 1 and metrics["api_tokens"] == 2200
+
+
+def test_cached_vector_is_refreshed_when_a_file_changes(tmp_path):
+    run_dir = tmp_path / "run"
+    _write_run(run_dir, ["MAJOR_REVISION"], 1, 1000)
+    assert extract_run_metrics(run_dir, cache_dir=tmp_path / "cache")["metrics"]["api_calls"] == 1
+
+    with usage_log(run_dir / "api_usage.jsonl"):
+        record_api_call("phase_3_1", "claude", 500, 500, 1.0)
+    assert extract_run_metrics(run_dir, cache_dir=tmp_path / "cache")["metrics"]["api_calls"] == 2
+
+
+def test_a_new_run_counts_only_its_own_calls(tmp_path, monkeypatch):
+    run_dir = tmp_path / "run"
+    _write_run(run_dir, ["MAJOR_REVISION"], 1, 1000)
+    monkeypatch.chdir(tmp_path)
+    with usage_log(run_dir / "api_usage.jsonl"):
+        start_usage_log()
+        record_api_call("phase_1_1", "claude", 300, 100, 1.0)
+        with tool_usage_log("analyze_analysis_style"):
+            record_api_call("style_analysis", "claude", 9000, 100, 5.0)
+
+    metrics = extract_run_metrics(run_dir, cache_dir=None)["metrics"]
+    assert metrics["api_calls"] == 1 and metrics["api_tokens"] == 400
+    assert (tmp_path / "outputs" / "tool_usage" / "analyze_analysis_style.jsonl").exists()
+
+
+def test_comparison_flags_regressions_against_baseline(tmp_path):
+    _write_run(tmp_path / "base", ["MAJOR_REVISION", "MINIMAL_CHANGES"], 2, 1000)
+    _write_run(tmp_path / "new", ["MAJOR_REVISION", "MINOR_REFINEMENT"], 1, 5000)
+    comparison = compare_runs([tmp_path / "base", tmp_path / "new"], cache_dir=None)
+
+    rows = {row["metric"]: row for row in comparison["rows"]}
+    assert rows["api_tokens"]["regressions"] == [True]
+    assert rows["cycles_total"]["regressions"] == [False]
+    assert rows["word_count"]["values"][0] == rows["word_count"]["values"][1]
+    assert "| api_tokens | 2200 | 10200 ⚠️ |" in format_comparison(comparison)
+
+
+def test_pooled_tool_calls_land_in_the_tool_log(tmp_path, monkeypatch):
+    import extract_all_philosophical_moves as tool
+
+    class FakeHandler:
+        def _call_anthropic_with_pdf(self, prompt, pdf_path, config):
+            record_api_call("pdf_extraction", config["model"], 100, 50, 0.1)
+            return f"text of {pdf_path.stem}"
+
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(tool, "APIHandler", FakeHandler)
+    (tmp_path / "Analysis_papers").mkdir()
+    for name in ("a", "b", "c"):
+        (tmp_path / "Analysis_papers" / f"{name}.pdf").write_bytes(b"%PDF")
+
+    with tool_usage_log("extract_all_philosophical_moves") as path:
+        assert tool.extract_new_texts_first(workers=3) == 3
+
+    assert len(path.read_text().splitlines()) == 3
+    assert not (tmp_path / "outputs" / "api_usage.jsonl").exists()
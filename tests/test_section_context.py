@@ -0,0 +1,52 @@
+import json
+
+from src.utils.prompt_budget import count_tokens
+from src.utils.section_context import map_sections_to_content, section_content_bank
+
+MOVES = [
+    "Safety conditions fail for necessary truths because beliefs in them cannot easily be false",
+    "Sensitivity accounts mishandle inductive knowledge about lottery outcomes",
+    "Virtue reliabilism explains credit for knowledge without modal conditions",
+]
+
+SECTIONS = [
+    {"section_name": "1. Introduction", "content_guidance": "Motivate the puzzle and preview the thesis."},
+    {"section_name": "2. Necessary Truths", "content_guidance": "Show that safety fails for beliefs in necessary truths."},
+    {"section_name": "3. Lotteries", "content_guidance": "Develop Key Move 2 on lottery outcomes."},
+    {"section_name": "4. Credit", "content_guidance": "Virtue reliabilism explains credit for knowledge."},
+    {"section_name": "5. Conclusion", "content_guidance": "Summarize."},
+]
+
+
+def _context():
+    bank = {
+        "arguments": [{"move_text": text, "content": text + " " + "developed prose " * 400, "move_index": i}
+                      for i, text in enumerate(MOVES)],
+        "examples": [{"move_index": i, "examples_content": "Consider a case. " * 50} for i in range(3)],
+        "citations": ["Sosa (1999)"],
+    }
+    return {"sections": SECTIONS, "content_bank": bank,
+            "section_content_map": map_sections_to_content(SECTIONS, bank)}
+
+
+def test_sections_map_to_their_moves():
+    content_map = _context()["section_content_map"]
+    assert [entry["arguments"] for entry in content_map] == [[], [0], [1], [2], []]
+    assert content_map[2]["examples"] == [1]
+
+
+def test_section_bank_carries_only_mapped_content_in_full():
+    context = _context()
+    bank = section_content_bank(context, 1)
+    assert [arg["move_index"] for arg in bank["arguments"]] == [0]
+    assert len(bank["other_arguments"]) == 2 and bank["other_arguments"][0].startswith("Move 2: Sensitivity")
+
+    full = count_tokens(json.dumps(context["content_bank"]))
+    sliced = count_tokens(json.dumps(bank))
+    assert sliced * 2.5 < full
+
+
+def test_contexts_without_a_map_are_sliced_on_the_fly():
+    context = _context()
+    del context["section_content_map"]
+    assert [arg["move_index"] for arg in section_content_bank(context, 3)["arguments"]] == [2]
@@ -0,0 +1,43 @@
+import threading
+
+from src.phases.core.speculation import SpeculativeStart, input_drift, reconcile_decision, speculation_settings
+
+FRAMEWORK = {
+    "main_thesis": "Knowledge does not require safety because safe beliefs can be lucky",
+    "key_moves": ["Motivate safety", "Present the counterexample", "Answer the reply"],
+    "changes_made": ["Tightened the abstract"],
+}
+
+
+def test_drift_ignores_bookkeeping_and_flags_structural_changes():
+    settings = speculation_settings({})
+    fields = settings["compare_fields"]
+    touched_up = dict(FRAMEWORK, changes_made=["Something else entirely"])
+    assert input_drift(FRAMEWORK, touched_up, fields) == 0.0
+
+    reworded = dict(FRAMEWORK, main_thesis="Knowledge does not require safety because safe beliefs can be fortunate")
+    drift = input_drift(FRAMEWORK, reworded, fields)
+    assert 0 < drift <= settings["refine_below"]
+    assert reconcile_decision(drift, settings["keep_below"], settings["refine_below"]) == "refine"
+
+    restructured = dict(FRAMEWORK, key_moves=FRAMEWORK["key_moves"][:2])
+    assert input_drift(FRAMEWORK, restructured, fields) == 1.0
+    assert reconcile_decision(0.0, 0.05, 0.3) == "keep"
+
+
+def test_downstream_starts_on_the_chosen_version_while_upstream_continues():
+    upstream_done = threading.Event()
+    seen = []
+
+    def downstream(provisional):
+        seen.append(provisional["main_thesis"])
+        return upstream_done.wait(timeout=5)  # Only finishes if upstream keeps running meanwhile
+
+    speculative = SpeculativeStart(downstream, after_version=2)
+    for number in (1, 2, 3):
+        speculative.listener(number, dict(FRAMEWORK, main_thesis=f"v{number}"))
+    upstream_done.set()
+
+    assert speculative.result() is True
+    assert seen == ["v2"]
+    assert speculative.reconcile(dict(FRAMEWORK, main_thesis="v2"), speculation_settings({})).decision == "keep"
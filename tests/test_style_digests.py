@@ -0,0 +1,73 @@
+import json
+import random
+
+from src.utils.style_digests import (
+    build_digest_store,
+    classify_section,
+    load_style_digests,
+    StyleDigestStore,
+)
+
+PAPER = """Why Luck Matters
+
+Abstract: This paper argues that moral luck is pervasive and that standard responses fail to accommodate it in any plausible way.
+
+I argue that luck undermines the control condition on responsibility. The argument is simple and I think it is decisive, although it has been neglected by almost everyone writing on the topic recently.
+
+Consider two drivers who both run a red light. One of them hits a child who steps into the road and the other does not. Intuitively we blame the first driver more, even though both acted identically in every respect.
+
+However, this intuition may not survive reflection. Once we notice that the difference lies entirely outside the agents' control, the asymmetry in blame looks hard to defend on any principled account of desert.
+
+One might object that the first driver is simply more culpable because of the outcome. In reply, I note that this begs the question against the control principle, which is exactly what is in dispute in this debate.
+
+Conclusion
+
+So luck matters for responsibility in ways that the standard views cannot accommodate. I have argued that the control principle must be revised, and the revision has consequences well beyond the driver case.
+"""
+
+
+def test_build_digest_store_categorizes_snippets():
+    store = build_digest_store({"luck": PAPER})
+    categories = store["categories"]
+    assert categories["example_usage"][0]["text"].startswith("Consider two drivers")
+    assert categories["objection_handling"][0]["text"].startswith("One might object")
+    assert categories["transitions"][0]["text"].startswith("However")
+    assert categories["conclusions"][0]["text"].startswith("So luck matters")
+    assert categories["opening_hooks"][0]["source"] == "luck"
+
+
+def test_format_for_stays_within_budget_and_matches_section_type():
+    digests = StyleDigestStore(build_digest_store({"luck": PAPER}))
+    block = digests.format_for("objection", max_tokens=2000, rng=random.Random(0))
+    assert "OBJECTION HANDLING" in block and "One might object" in block
+    assert "CLOSING MOVES" not in block
+    assert digests.format_for("objection", max_tokens=60) == ""
+
+    assert classify_section("Introduction", 0, 5) == "introduction"
+    assert classify_section("Replies to Objections", 3, 5) == "objection"
+    assert classify_section("The Control Argument", 2, 5) == "argument"
+    assert classify_section("Upshot", 4, 5) == "conclusion"
+
+
+def test_load_style_digests_respects_config(tmp_path):
+    path = tmp_path / "digests.json"
+    assert load_style_digests({"parameters": {"style_digests": {"path": str(path)}}}) is None
+    path.write_text(json.dumps(build_digest_store({"luck": PAPER})))
+    config = {"parameters": {"style_digests": {"path": str(path)}}}
+    assert load_style_digests(config) is not None
+    config["parameters"]["style_digests"]["enabled"] = False
+    assert load_style_digests(config) is None
+
+
+def test_select_is_seeded_per_run(monkeypatch):
+    from src.utils.analysis_pdf_utils import analysis_integrator
+
+    papers = {f"paper{i}": PAPER.replace("luck", f"luck{i}") for i in range(6)}
+    digests = StyleDigestStore(build_digest_store(papers))
+    monkeypatch.setattr(analysis_integrator, "seed", "7")
+    first = digests.select("argument")
+    random.seed(1)
+    assert digests.select("argument") == first
+    monkeypatch.setattr(analysis_integrator, "seed", "8")
+    draws = [digests.select("argument") for _ in range(2)]
+    assert draws[0] == draws[1]
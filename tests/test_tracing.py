@@ -0,0 +1,67 @@
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from run_utils import run_directories
+from src.utils.map_reduce import map_bounded
+from src.utils.tracing import critical_path, current_span, load_trace, span, trace_run
+
+
+def test_disabled_tracing_records_nothing(tmp_path, monkeypatch):
+    monkeypatch.delenv("PIPELINE_TRACE", raising=False)
+    with trace_run("run", tmp_path / "trace.json") as run_id:
+        with span("step") as step_id:
+            assert run_id is None and step_id is None and current_span() is None
+    assert not (tmp_path / "trace.json").exists()
+
+
+def test_nested_spans_export_chrome_events_and_critical_path(tmp_path):
+    def call(stage):
+        with span(f"api {stage}", "api"):
+            return stage
+
+    with trace_run("run paper", tmp_path / "trace.json", enabled=True):
+        with span("Phase II.2", "phase"):
+            with span("abstract_framework", "workflow"):
+                with span("cycle 1", "cycle"):
+                    pass
+            with span("sections", "workflow"):
+                results, failures = map_bounded(call, ["intro", "objections"], workers=2)
+    assert [result for _, result in results] == ["intro", "objections"] and not failures
+
+    trace = load_trace(tmp_path / "trace.json")
+    assert trace["displayTimeUnit"] == "ms"
+    events = {event["name"]: event for event in trace["traceEvents"] if event["ph"] == "X"}
+    assert {event["ph"] for event in trace["traceEvents"]} == {"M", "X"}
+    assert events["cycle 1"]["args"]["parent"] == events["abstract_framework"]["args"]["id"]
+    # Pool workers nest under the span that submitted them
+    assert events["api intro"]["args"]["parent"] == events["sections"]["args"]["id"]
+    assert events["run paper"]["args"]["parent"] is None
+    json.dumps(trace)
+
+    path = [name for name, _ in critical_path(trace)]
+    assert path[:3] == ["run paper", "Phase II.2", "sections"]
+    assert path[3] in ("api intro", "api objections")
+
+
+def test_concurrent_papers_each_write_their_own_trace(tmp_path, monkeypatch):
+    monkeypatch.setenv("PIPELINE_TRACE", "1")
+    started = threading.Barrier(3)
+
+    def step(name):
+        with span(name):
+            return name
+
+    def run_paper(paper):
+        with run_directories(tmp_path / paper):
+            started.wait(timeout=5)  # Every paper's run is open before any spans are recorded
+            with span(f"phase {paper}", "phase"):
+                map_bounded(step, [f"step {paper}"], workers=2)
+
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        list(pool.map(run_paper, ["p0", "p1", "p2"]))
+
+    for paper in ("p0", "p1", "p2"):
+        names = {event["name"] for event in load_trace(tmp_path / paper / "trace.json")["traceEvents"]
+                 if event["ph"] == "X"}
+        assert names == {f"run {paper}", f"phase {paper}", f"step {paper}"}
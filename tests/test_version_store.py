@@ -0,0 +1,44 @@
+# tests/test_version_store.py
+
+from src.phases.core.version_store import VersionStore, format_version_history
+
+
+def make_outline(sections):
+    return "\n".join(f"## {name}\n{body}" for name, body in sections)
+
+
+def test_versions_persist_to_disk(tmp_path):
+    """Full versions are written to disk and reloadable; only the latest stays resident"""
+    store = VersionStore("outline", storage_dir=tmp_path)
+    store.add({"thesis": "A"})
+    store.add({"thesis": "B"})
+    assert len(store) == 2
+    assert store.get(1) == {"thesis": "A"}
+    assert store.latest == {"thesis": "B"}
+    assert store.all() == [{"thesis": "A"}, {"thesis": "B"}]
+    assert (tmp_path / "outline_v1.json").exists()
+
+
+def test_compact_history_stays_within_budget():
+    """History grows by one short entry per version, not by whole copies"""
+    store = VersionStore("outline", token_budget=300)
+    body = "word " * 30
+    for cycle in range(6):
+        store.add(make_outline([(f"Section {i}", f"{body} revision {cycle if i == cycle else 0}") for i in range(6)]))
+
+    history = store.compact_history()
+    assert len(history) == 5
+    assert sum(len(entry) for entry in history) // 4 <= 300
+    assert history[-1].count("\n") > 0  # Newest change shown in detail
+    assert history[0].count("\n") == 0  # Oldest collapsed to statistics
+
+
+def test_format_version_history():
+    """Only compact entries are rendered into prompts"""
+    store = VersionStore("abstract")
+    store.add("first draft")
+    store.add("second draft")
+    rendered = format_version_history(store.compact_history(include_latest=True))
+    assert "Version 1 -> 2" in rendered
+    assert "Version 2: current version" in rendered
+    assert format_version_history(["a whole outline"]) == ""